@@ -0,0 +1,5 @@
+"""
+Standalone performance benchmarks (not collected by pytest).
+
+Run each one as a module, e.g. `uv run python -m src.benchmarks.task_loop --help`.
+"""
@@ -0,0 +1,110 @@
+"""
+Local S3 stand-in for storage benchmarks (not a benchmark itself).
+
+It implements just enough of the S3 REST API for StorageS3: HEAD object, PUT object and
+multipart upload (create / upload part / complete). Uploaded bodies are read and dropped.
+`bandwidth_mbps` limits throughput of each connection, which makes concurrency effects
+visible on a loopback interface (where a single connection isn't a bottleneck).
+"""
+
+import os
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+READ_SIZE = 1024 * 1024
+
+
+class FakeS3Server(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, bandwidth_mbps: float | None = None) -> None:
+        super().__init__(("127.0.0.1", 0), _FakeS3Handler)
+        self.bytes_per_sec = bandwidth_mbps * 1024 * 1024 / 8 if bandwidth_mbps else None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_port}"
+
+    def __enter__(self) -> "FakeS3Server":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        # StorageS3 reads its settings from env (settings are created lazily)
+        os.environ |= {
+            "S3_STORAGE_URL": self.url,
+            "S3_ACCESS_KEY_ID": "benchmark",
+            "S3_SECRET_ACCESS_KEY": "benchmark",
+            "S3_REGION_NAME": "us-east-1",
+        }
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class _FakeS3Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: FakeS3Server
+
+    def do_HEAD(self) -> None:  # pylint: disable=invalid-name
+        self._send(200, headers={"Content-Length": "1024", "Content-Type": "audio/mpeg"})
+
+    def do_PUT(self) -> None:  # pylint: disable=invalid-name
+        self._consume_body()
+        self._send(200, headers={"ETag": f'"{uuid.uuid4().hex}"', "Content-Length": "0"})
+
+    def do_POST(self) -> None:  # pylint: disable=invalid-name
+        self._consume_body()
+        query = parse_qs(urlsplit(self.path).query, keep_blank_values=True)
+        bucket, _, key = urlsplit(self.path).path.lstrip("/").partition("/")
+        if "uploads" in query:
+            body = (
+                "<InitiateMultipartUploadResult>"
+                f"<Bucket>{bucket}</Bucket><Key>{key}</Key>"
+                f"<UploadId>{uuid.uuid4().hex}</UploadId>"
+                "</InitiateMultipartUploadResult>"
+            )
+        else:
+            body = (
+                "<CompleteMultipartUploadResult>"
+                f'<Bucket>{bucket}</Bucket><Key>{key}</Key><ETag>"done"</ETag>'
+                "</CompleteMultipartUploadResult>"
+            )
+
+        self._send(200, body=body.encode(), headers={"Content-Type": "application/xml"})
+
+    def log_message(self, *args: Any) -> None:
+        return None
+
+    def _send(self, code: int, body: bytes = b"", headers: dict[str, str] | None = None) -> None:
+        self.send_response(code)
+        headers = {"Content-Length": str(len(body))} | (headers or {})
+        for name, value in headers.items():
+            self.send_header(name, value)
+
+        self.end_headers()
+        if body and self.command != "HEAD":
+            self.wfile.write(body)
+
+    def _consume_body(self) -> None:
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            while chunk_size := int(self.rfile.readline().split(b";")[0], 16):
+                self._read(chunk_size)
+                self.rfile.readline()
+
+            self.rfile.readline()
+            return
+
+        self._read(int(self.headers.get("Content-Length") or 0))
+
+    def _read(self, size: int) -> None:
+        started_at = time.perf_counter()
+        received = 0
+        while received < size:
+            received += len(self.rfile.read(min(READ_SIZE, size - received)))
+            if self.server.bytes_per_sec:
+                expected_at = started_at + received / self.server.bytes_per_sec
+                time.sleep(max(0.0, expected_at - time.perf_counter()))
@@ -0,0 +1,302 @@
+"""
+Benchmark: EXPLAIN ANALYZE of hot repository queries before / after composite indexes (0025).
+
+A synthetic dataset is generated by SQL in a transaction, which is rolled back at the end
+(nothing is left in the DB). Each repository method runs once to capture its SQL, then every
+captured statement is explained with the current indexes ("after") and with the single-column
+ones only ("before"). Indexes are replaced inside the same transaction, so the tables are locked
+until the end: use a local / staging DB, migrated to the latest revision (configured via .env):
+
+    uv run python -m src.benchmarks.db_indexes --users 20 --podcasts-per-user 10 --episodes 200000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, NamedTuple
+
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from src.constants import EpisodeStatus, FileType, SourceType
+from src.modules.db import close_database, get_session_factory, initialize_database
+from src.modules.db.models.podcasts import Episode
+from src.modules.db.repositories import EpisodeRepository, FileRepository, PodcastRepository
+
+MARKER = "benchmark:db-indexes"
+COMPOSITE_INDEXES = (
+    "ix_podcast_episodes__owner_id__created_at__id",
+    "ix_podcast_episodes__podcast_id__created_at__id",
+    "ix_podcast_podcasts__owner_id__created_at__id",
+    "ix_podcast_episodes__owner_id__status",
+    "ix_podcast_episodes__podcast_id__status__published_at",
+    "ix_podcast_episodes__source_id__source_type",
+    "ix_podcast_episodes__in_progress",
+    "ix_media_files_source_url",
+    "ix_media_files__owner_id__hash__type",
+)
+SINGLE_COLUMN_INDEXES = {
+    "ix_podcast_episodes_owner_id": "podcast_episodes (owner_id)",
+    "ix_podcast_episodes_podcast_id": "podcast_episodes (podcast_id)",
+    "ix_podcast_episodes_source_id": "podcast_episodes (source_id)",
+}
+SEED_STATEMENTS = (
+    """
+    INSERT INTO auth_users (email, password, is_active, is_superuser)
+    SELECT 'benchmark-' || g || '@db-indexes.local', '', true, false
+    FROM generate_series(1, :users) AS g
+    """,
+    """
+    INSERT INTO podcast_podcasts
+        (publish_id, name, description, created_at, download_automatically, owner_id)
+    SELECT md5(random()::text), 'Podcast ' || g, :marker, now() - g * interval '1 day', false, id
+    FROM auth_users, generate_series(1, :podcasts_per_user) AS g
+    WHERE email LIKE 'benchmark-%@db-indexes.local'
+    """,
+    # episodes are spread over podcasts evenly, each one has an audio file (with known ID)
+    """
+    CREATE TEMP TABLE benchmark_episodes (
+        g integer, file_id bigint, podcast_id integer, owner_id integer, status text
+    ) ON COMMIT DROP
+    """,
+    """
+    INSERT INTO benchmark_episodes
+    SELECT
+        g,
+        nextval(pg_get_serial_sequence('media_files', 'id')) AS file_id,
+        podcasts.id AS podcast_id,
+        podcasts.owner_id,
+        CASE
+            WHEN g % 1000 = 0 THEN 'DOWNLOADING'
+            WHEN g % 20 = 0 THEN 'NEW'
+            ELSE 'PUBLISHED'
+        END AS status
+    FROM generate_series(1, :episodes) AS g
+    JOIN (
+        SELECT id, owner_id, row_number() OVER (ORDER BY id) - 1 AS num, count(*) OVER () AS total
+        FROM podcast_podcasts
+        WHERE description = :marker
+    ) AS podcasts ON podcasts.num = g % podcasts.total
+    """,
+    """
+    INSERT INTO media_files (
+        id, type, path, size, source_url, available, access_token, owner_id, created_at, public, hash
+    )
+    SELECT
+        file_id, 'AUDIO', 'audio/benchmark-' || g || '.mp3', 1048576,
+        'https://benchmark.local/watch/' || (g % :sources), true, md5(random()::text || g),
+        owner_id, now(), false, md5(g::text)
+    FROM benchmark_episodes
+    """,
+    """
+    INSERT INTO podcast_episodes (
+        title, source_id, source_type, podcast_id, audio_id, owner_id, length, status,
+        created_at, published_at
+    )
+    SELECT
+        'Episode ' || g, 'source-' || (g % :sources), 'YOUTUBE', podcast_id, file_id, owner_id,
+        600, status::episode_status, now() - g * interval '1 minute',
+        CASE WHEN status = 'PUBLISHED' THEN now() - g * interval '1 minute' END
+    FROM benchmark_episodes
+    """,
+    "ANALYZE auth_users, podcast_podcasts, podcast_episodes, media_files",
+)
+SAMPLE_STATEMENT = """
+    SELECT episodes.owner_id, episodes.podcast_id, episodes.source_id, files.source_url, files.hash
+    FROM podcast_episodes AS episodes
+    JOIN media_files AS files ON files.id = episodes.audio_id
+    WHERE files.path = 'audio/benchmark-1.mp3'
+"""
+
+
+class Sample(NamedTuple):
+    owner_id: int
+    podcast_id: int
+    source_id: str
+    source_url: str
+    file_hash: str
+
+
+class Case(NamedTuple):
+    name: str
+    run: Callable[[AsyncSession, Sample], Awaitable[Any]]
+
+
+class Explained(NamedTuple):
+    execution_ms: float
+    indexes: list[str]
+
+
+CASES = (
+    Case(
+        "episodes: owner's page (offset 2000)",
+        lambda session, sample: EpisodeRepository(session).all_paginated(
+            offset=2000, limit=20, owner_id=sample.owner_id
+        ),
+    ),
+    Case(
+        "episodes: owner's page (cursor)",
+        lambda session, sample: EpisodeRepository(session).all_by_cursor(
+            limit=20, owner_id=sample.owner_id
+        ),
+    ),
+    Case(
+        "episodes: podcast's page",
+        lambda session, sample: EpisodeRepository(session).all_paginated(
+            limit=20, podcast_id=sample.podcast_id
+        ),
+    ),
+    Case(
+        "episodes: published for RSS",
+        lambda session, sample: EpisodeRepository(session).all(
+            podcast_id=sample.podcast_id,
+            status=EpisodeStatus.PUBLISHED,
+            published_at__ne=None,
+        ),
+    ),
+    Case(
+        "episodes: in progress",
+        lambda session, sample: Episode.get_in_progress(session, user_id=sample.owner_id),
+    ),
+    Case(
+        "episodes: update by source",
+        lambda session, sample: EpisodeRepository(session).update_by_filters(
+            filters={
+                "source_id": sample.source_id,
+                "source_type": SourceType.YOUTUBE,
+                "status__ne": EpisodeStatus.ARCHIVED,
+            },
+            value={"length": 600},
+        ),
+    ),
+    Case(
+        "files: update by source URL",
+        lambda session, sample: FileRepository(session).update_by_filters(
+            filters={"source_url": sample.source_url},
+            value={"available": True},
+        ),
+    ),
+    Case(
+        "files: uploaded by hash",
+        lambda session, sample: FileRepository(session).first(
+            hash=sample.file_hash, owner_id=sample.owner_id, type=FileType.AUDIO
+        ),
+    ),
+    Case(
+        "podcasts: list with aggregations",
+        lambda session, sample: PodcastRepository(session).all_with_aggregations(
+            owner_id=sample.owner_id
+        ),
+    ),
+)
+
+
+async def _seed(session: AsyncSession, users: int, podcasts_per_user: int, episodes: int) -> None:
+    params = {
+        "marker": MARKER,
+        "users": users,
+        "podcasts_per_user": podcasts_per_user,
+        "episodes": episodes,
+        "sources": max(episodes // 2, 1),
+    }
+    for statement in SEED_STATEMENTS:
+        statement_params = {key: value for key, value in params.items() if f":{key}" in statement}
+        await session.execute(sa.text(statement), statement_params)
+
+
+async def _capture(session: AsyncSession, case: Case, sample: Sample) -> list[tuple[str, Any]]:
+    """Run repository method and return SQL statements (with params) which it executed"""
+    statements: list[tuple[str, Any]] = []
+
+    def on_execute(conn: Any, cursor: Any, statement: str, parameters: Any, *args: Any) -> None:
+        statements.append((statement, parameters))
+
+    engine = session.bind.sync_engine
+    event.listen(engine, "before_cursor_execute", on_execute)
+    try:
+        await case.run(session, sample)
+    finally:
+        event.remove(engine, "before_cursor_execute", on_execute)
+
+    return statements
+
+
+async def _explain(session: AsyncSession, statement: str, parameters: Any) -> Explained:
+    connection = await session.connection()
+    result = await connection.exec_driver_sql(
+        f"EXPLAIN (ANALYZE, FORMAT JSON) {statement}", parameters
+    )
+    plan = result.scalar_one()
+    explained = (json.loads(plan) if isinstance(plan, str) else plan)[0]
+
+    indexes: list[str] = []
+    nodes = [explained["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if index_name := node.get("Index Name"):
+            indexes.append(index_name)
+        nodes.extend(node.get("Plans", []))
+
+    return Explained(execution_ms=explained["Execution Time"], indexes=indexes)
+
+
+async def _explain_all(
+    session: AsyncSession,
+    captured: dict[str, list[tuple[str, Any]]],
+) -> dict[str, list[Explained]]:
+    return {
+        name: [await _explain(session, statement, parameters) for statement, parameters in items]
+        for name, items in captured.items()
+    }
+
+
+async def _use_single_column_indexes(session: AsyncSession) -> None:
+    for index_name in COMPOSITE_INDEXES:
+        await session.execute(sa.text(f"DROP INDEX IF EXISTS {index_name}"))
+
+    for index_name, definition in SINGLE_COLUMN_INDEXES.items():
+        await session.execute(sa.text(f"CREATE INDEX IF NOT EXISTS {index_name} ON {definition}"))
+
+
+async def _run(users: int, podcasts_per_user: int, episodes: int) -> None:
+    await initialize_database()
+    session = get_session_factory()()
+    try:
+        await _seed(session, users, podcasts_per_user, episodes)
+        sample = Sample(*(await session.execute(sa.text(SAMPLE_STATEMENT))).one())
+        captured = {case.name: await _capture(session, case, sample) for case in CASES}
+        after = await _explain_all(session, captured)
+        await _use_single_column_indexes(session)
+        before = await _explain_all(session, captured)
+    finally:
+        await session.rollback()
+        await session.close()
+        await close_database()
+
+    for name, explained_after in after.items():
+        for num, (old, new) in enumerate(zip(before[name], explained_after, strict=True), 1):
+            print(
+                f"{name:<38} #{num}  before {old.execution_ms:>9.3f}ms"
+                f"  after {new.execution_ms:>9.3f}ms"
+                f"  x{old.execution_ms / max(new.execution_ms, 0.001):>7.1f}"
+                f"  {', '.join(new.indexes) or 'no index'}"
+            )
+
+
+def main() -> None:
+    """Seed synthetic data, explain repository queries with both index sets and print timings"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--podcasts-per-user", type=int, default=10)
+    parser.add_argument("--episodes", type=int, default=200_000, help="episodes in total")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    asyncio.run(_run(args.users, args.podcasts_per_user, args.episodes))
+
+
+if __name__ == "__main__":
+    main()
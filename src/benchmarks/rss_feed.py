@@ -0,0 +1,130 @@
+"""
+Benchmark: RSS feed generation with full re-rendering vs. cached `<item>` fragments.
+
+Episodes are built in memory (no DB), rendered items are cached in Redis exactly like
+`GenerateRSSTask` does it. Benchmark's keys use episode IDs far above the real ones and are
+deleted at the end. Requires reachable Redis (configured via .env, same as the worker):
+
+    uv run python -m src.benchmarks.rss_feed --episodes 5000 --rounds 5
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from datetime import timedelta
+
+from src.constants import EpisodeStatus, SourceType
+from src.modules.db.models import Episode, File, Podcast
+from src.modules.db.models.media import MediaType
+from src.modules.services.redis import RedisClient, close_async_redis_connection
+from src.modules.tasks.rss import RSS_ITEM_CACHE_KEY, GenerateRSSTask, get_rss_environment
+from src.utils import utcnow
+
+FIRST_EPISODE_ID = 10**9
+FEED_ITEMS_LOOP = "{% for item in items %}{{ item }}{% endfor %}"
+
+
+def _make_episodes(count: int) -> list[Episode]:
+    published_at = utcnow()
+    episodes = []
+    for num in range(count):
+        episode = Episode(
+            id=FIRST_EPISODE_ID + num,
+            title=f"Benchmark episode #{num}",
+            source_id=f"source-{num}",
+            source_type=SourceType.YOUTUBE,
+            watch_url=f"https://benchmark.local/watch/{num}",
+            description="Episode's description\nwith some lines\n[LINK]https://benchmark.local",
+            author="Benchmark author",
+            chapters=[
+                {"title": f"Chapter {chapter}", "start": chapter * 60, "end": chapter * 60 + 60}
+                for chapter in range(5)
+            ],
+            status=EpisodeStatus.PUBLISHED,
+            published_at=published_at - timedelta(minutes=num),
+        )
+        episode.image = None
+        episode.audio = File(
+            type=MediaType.AUDIO,
+            path=f"audio/benchmark-{num}.mp3",
+            size=32 * 1024 * 1024,
+            access_token=File.generate_token(),
+            available=True,
+            public=False,
+        )
+        episodes.append(episode)
+
+    return episodes
+
+
+async def _measure(name: str, render: Callable[[], Awaitable[str]], rounds: int) -> float:
+    timings = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        await render()
+        timings.append(time.perf_counter() - started_at)
+
+    median = statistics.median(timings)
+    print(f"{name:<28} median {median * 1000:>9.1f}ms  min {min(timings) * 1000:>9.1f}ms")
+    return median
+
+
+async def _run(episodes_count: int, rounds: int) -> None:
+    task = GenerateRSSTask()
+    podcast = Podcast(id=FIRST_EPISODE_ID, name="Benchmark podcast", description="Benchmark")
+    episodes = _make_episodes(episodes_count)
+    environment = get_rss_environment(task.settings.template_path)
+    feed_template = environment.get_template("feed_template.xml")
+    feed_source = (task.settings.template_path / "rss" / "feed_template.xml").read_text()
+    item_source = (task.settings.template_path / "rss" / "feed_item.xml").read_text()
+    # the whole feed in one template: items are rendered every time (as before caching)
+    full_template = environment.from_string(
+        feed_source.replace(
+            FEED_ITEMS_LOOP, f"{{% for episode in episodes %}}{item_source}{{% endfor %}}"
+        )
+    )
+
+    async def render_full() -> str:
+        return full_template.render(podcast=podcast, episodes=episodes, settings=task.settings)
+
+    async def render_cached() -> str:
+        items = await task._render_items(podcast, episodes)
+        return feed_template.render(podcast=podcast, items=items, settings=task.settings)
+
+    async def render_changed() -> str:
+        episodes[0].title = f"Benchmark episode (changed at {time.monotonic()})"
+        return await render_cached()
+
+    redis_client = RedisClient()
+    try:
+        full = await _measure("full render", render_full, rounds)
+        await _measure("fragments: cold cache", render_cached, 1)
+        changed = await _measure("fragments: 1 changed item", render_changed, rounds)
+        cached = await _measure("fragments: all cached", render_cached, rounds)
+    finally:
+        # 10-digit IDs, starting from FIRST_EPISODE_ID
+        keys_pattern = RSS_ITEM_CACHE_KEY.format(episode_id="1" + "?" * 9, digest="*")
+        async for key in redis_client.async_redis.scan_iter(match=keys_pattern, count=1000):
+            await redis_client.async_redis.delete(key)
+
+        await close_async_redis_connection()
+
+    print(f"speedup: x{full / changed:.1f} (1 changed item), x{full / cached:.1f} (all cached)")
+
+
+def main() -> None:
+    """Render feed of synthetic episodes in all modes and print timings"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--episodes", type=int, default=5000)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    asyncio.run(_run(args.episodes, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark: S3 HEAD / presign latency with a client per request vs. the shared pooled client.
+
+A local S3 stand-in (see `_fake_s3`) answers requests, so numbers show client construction
+and connection setup overhead, not the network:
+
+    uv run python -m src.benchmarks.s3_client --requests 300
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.benchmarks._fake_s3 import FakeS3Server
+from src.modules.services.storage import StorageS3, close_s3_client
+
+
+async def _head(storage: StorageS3) -> None:
+    if not await storage.get_file_size(dst_path="audio/episode.mp3"):
+        raise RuntimeError("HEAD request to local S3 stand-in failed")
+
+
+async def _presign(storage: StorageS3) -> None:
+    async def generate_presigned_url(s3: Any) -> str:
+        return await s3.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": storage.settings.s3.bucket_name, "Key": "audio/episode.mp3"},
+            ExpiresIn=600,
+        )
+
+    # redis cache (used by get_presigned_url) is bypassed on purpose
+    _, url = await storage._run_with_client(generate_presigned_url)
+    if not url:
+        raise RuntimeError("Presigning failed")
+
+
+async def _measure(
+    name: str,
+    operation: Callable[[StorageS3], Awaitable[None]],
+    requests: int,
+    pooled: bool,
+) -> float:
+    storage = StorageS3()
+    latencies: list[float] = []
+    for _ in range(requests):
+        started_at = time.perf_counter()
+        await operation(storage)
+        latencies.append(time.perf_counter() - started_at)
+        if not pooled:
+            # previous behavior: client (and its connections) lived for one request only
+            await close_s3_client()
+
+    await close_s3_client()
+    mean_ms = statistics.fmean(latencies) * 1000
+    p95_ms = statistics.quantiles(latencies, n=20)[-1] * 1000
+    mode = "pooled" if pooled else "per-request"
+    print(f"{name:<8} {mode:<12} {requests:>6} req  mean {mean_ms:>7.3f}ms  p95 {p95_ms:>7.3f}ms")
+    return mean_ms
+
+
+async def _run(requests: int) -> None:
+    for name, operation in (("HEAD", _head), ("presign", _presign)):
+        per_request_ms = await _measure(name, operation, requests, pooled=False)
+        pooled_ms = await _measure(name, operation, requests, pooled=True)
+        print(f"{name:<8} speedup: x{per_request_ms / pooled_ms:.2f}")
+
+
+def main() -> None:
+    """Measure HEAD and presign latency for both client strategies."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=300, help="requests per case")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with FakeS3Server():
+        asyncio.run(_run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
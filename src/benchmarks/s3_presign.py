@@ -0,0 +1,100 @@
+"""
+Benchmark: presigned URLs by S3 client (StorageS3 + `_run_with_client`) vs. local signer.
+
+Presigning doesn't use the network: S3 settings are taken from the local S3 stand-in (see
+`_fake_s3`), which gets no requests at all. Redis cache of presigned URLs is bypassed:
+
+    uv run python -m src.benchmarks.s3_presign --keys 500 --rounds 5
+"""
+
+import argparse
+import asyncio
+import logging
+import statistics
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from src.benchmarks._fake_s3 import FakeS3Server
+from src.modules.services.storage import StorageS3, close_s3_client, get_presign_signer
+
+
+async def _presign_by_client(storage: StorageS3, remote_path: str) -> str:
+    async def generate_presigned_url(s3: Any) -> str:
+        return await s3.generate_presigned_url(
+            "get_object",
+            Params={"Bucket": storage.settings.s3.bucket_name, "Key": remote_path},
+            ExpiresIn=storage.settings.s3.link_expires_in,
+        )
+
+    _, url = await storage._run_with_client(generate_presigned_url)
+    return url
+
+
+async def _storage_per_key(keys: list[str]) -> list[str]:
+    # previous behavior of /m/ and /r/ redirects: new StorageS3 (and aioboto3 session) per URL
+    return [await _presign_by_client(StorageS3(), key) for key in keys]
+
+
+async def _shared_storage(keys: list[str]) -> list[str]:
+    storage = StorageS3()
+    return [await _presign_by_client(storage, key) for key in keys]
+
+
+async def _signer_per_key(keys: list[str]) -> list[str]:
+    return [get_presign_signer().presign(key) for key in keys]
+
+
+async def _signer_many(keys: list[str]) -> list[str]:
+    return get_presign_signer().presign_many(keys)
+
+
+async def _measure(
+    name: str,
+    presign: Callable[[list[str]], Awaitable[list[str]]],
+    keys: list[str],
+    rounds: int,
+) -> float:
+    timings = []
+    for _ in range(rounds):
+        started_at = time.perf_counter()
+        urls = await presign(keys)
+        timings.append(time.perf_counter() - started_at)
+        if len(urls) != len(keys) or not all(urls):
+            raise RuntimeError(f"{name}: presigning failed")
+
+    per_key_us = statistics.median(timings) / len(keys) * 1_000_000
+    print(f"{name:<26} {len(keys):>6} keys  median {per_key_us:>9.2f}us per key")
+    return per_key_us
+
+
+async def _run(keys_count: int, rounds: int) -> None:
+    keys = [f"audio/benchmark-episode-{num}.mp3" for num in range(keys_count)]
+    try:
+        storage_per_key = await _measure("client: StorageS3 per key", _storage_per_key, keys, 1)
+        shared_storage = await _measure("client: shared StorageS3", _shared_storage, keys, rounds)
+        await _measure("signer: key by key", _signer_per_key, keys, rounds)
+        signer_many = await _measure("signer: presign_many", _signer_many, keys, rounds)
+    finally:
+        await close_s3_client()
+
+    print(
+        f"speedup: x{storage_per_key / signer_many:.0f} (vs. StorageS3 per key), "
+        f"x{shared_storage / signer_many:.0f} (vs. shared StorageS3)"
+    )
+
+
+def main() -> None:
+    """Presign the same keys by each way and print time per key"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--keys", type=int, default=500)
+    parser.add_argument("--rounds", type=int, default=5)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with FakeS3Server():
+        asyncio.run(_run(args.keys, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark: StorageS3.upload_file throughput for large files at different part concurrency.
+
+Files are uploaded to a local S3 stand-in (see `_fake_s3`) which limits bandwidth of each
+connection (like a real uplink to S3 does for a single TCP stream), so the result shows
+how well concurrent parts saturate the available bandwidth:
+
+    uv run python -m src.benchmarks.s3_upload --sizes-mb 100 1024 --concurrency 1 4 8 16
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from src.benchmarks._fake_s3 import FakeS3Server
+from src.modules.services.storage import StorageS3, close_s3_client
+
+MB = 1024 * 1024
+
+
+def _make_file(directory: Path, size_mb: int) -> Path:
+    """Sparse file: no time spent to generate content, reading returns zeros"""
+    file_path = directory / f"episode_{size_mb}mb.mp3"
+    with open(file_path, "wb") as file:
+        file.truncate(size_mb * MB)
+
+    return file_path
+
+
+async def _upload(file_path: Path, part_size_mb: int, concurrency: int) -> float:
+    storage = StorageS3()
+    parts_reported: list[int] = []
+    started_at = time.perf_counter()
+    remote_path = await storage.upload_file(
+        file_path,
+        dst_path="benchmark/",
+        callback=parts_reported.append,
+        part_size=part_size_mb * MB,
+        max_concurrency=concurrency,
+    )
+    elapsed = time.perf_counter() - started_at
+    await close_s3_client()
+    if not remote_path:
+        raise RuntimeError(f"Upload of {file_path} failed")
+
+    if sum(parts_reported) != file_path.stat().st_size:
+        raise RuntimeError(f"Progress reported {sum(parts_reported)} bytes of {file_path}")
+
+    return elapsed
+
+
+def main() -> None:
+    """Upload each file with each concurrency level and print MB/s"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes-mb", type=int, nargs="+", default=[100, 1024])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8, 16])
+    parser.add_argument("--part-size-mb", type=int, default=8)
+    parser.add_argument(
+        "--bandwidth-mbps", type=float, default=400, help="bandwidth limit per connection"
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    with FakeS3Server(bandwidth_mbps=args.bandwidth_mbps), tempfile.TemporaryDirectory() as tmp:
+        for size_mb in args.sizes_mb:
+            file_path = _make_file(Path(tmp), size_mb)
+            for concurrency in args.concurrency:
+                elapsed = asyncio.run(_upload(file_path, args.part_size_mb, concurrency))
+                print(
+                    f"{size_mb:>6} MB  concurrency {concurrency:>3}  part {args.part_size_mb} MB"
+                    f"  {elapsed:>8.2f}s  {size_mb / elapsed:>8.1f} MB/s"
+                )
+
+            file_path.unlink()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: RQ task throughput with a loop/engine per job vs. the persistent worker loop.
+
+Each job does what a small task (like `GenerateRSSTask` for an empty podcast) does around
+its real work: opens a UOW session, runs one query and touches Redis.
+Requires reachable DB and Redis (configured via .env, same as the worker):
+
+    uv run python -m src.benchmarks.task_loop --jobs 200
+"""
+
+import argparse
+import logging
+import time
+from collections.abc import Callable
+
+import sqlalchemy as sa
+
+from src.modules.db import close_database, initialize_database
+from src.modules.services.redis import RedisClient, close_async_redis_connection
+from src.modules.tasks.base import RQTask, TaskResultCode, persistent_event_loop
+
+
+class BenchmarkPingTask(RQTask):
+    """Minimal task: one DB round trip and one Redis round trip."""
+
+    async def run(self, *args, **kwargs) -> TaskResultCode:
+        await self.db_session.execute(sa.text("SELECT 1"))
+        await RedisClient().async_get("benchmark:task-loop")
+        return TaskResultCode.SUCCESS
+
+
+def _run_jobs(jobs: int) -> None:
+    task = BenchmarkPingTask()
+    for job_index in range(jobs):
+        if task(job_index) != TaskResultCode.SUCCESS:
+            raise RuntimeError(f"Benchmark job #{job_index} failed")
+
+
+def bench_fork_mode(jobs: int) -> None:
+    """Current behavior: asyncio.run() + engine init/dispose for every job."""
+    _run_jobs(jobs)
+
+
+def bench_persistent_mode(jobs: int) -> None:
+    """Worker persistent mode: one loop, engine and Redis client for all jobs."""
+    with persistent_event_loop() as runner:
+        runner.run(initialize_database())
+        try:
+            _run_jobs(jobs)
+        finally:
+            runner.run(close_database())
+            runner.run(close_async_redis_connection())
+
+
+def _measure(name: str, bench: Callable[[int], None], jobs: int) -> float:
+    started_at = time.perf_counter()
+    bench(jobs)
+    elapsed = time.perf_counter() - started_at
+    jobs_per_sec = jobs / elapsed
+    print(f"{name:<12} {jobs:>6} jobs  {elapsed:>8.3f}s  {jobs_per_sec:>10.1f} jobs/sec")
+    return jobs_per_sec
+
+
+def main() -> None:
+    """Run both modes and print jobs/sec for each one."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--jobs", type=int, default=200, help="jobs per mode")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    fork_rate = _measure("fork", bench_fork_mode, args.jobs)
+    persistent_rate = _measure("persistent", bench_persistent_mode, args.jobs)
+    print(f"speedup: x{persistent_rate / fork_rate:.2f}")
+
+
+if __name__ == "__main__":
+    main()
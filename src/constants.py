@@ -53,6 +53,28 @@ class AuthSkip(enum.StrEnum):
     SKIP_AUTH_WEB = "SKIP_AUTH_WEB"
 
 
+class WorkerMode(enum.StrEnum):
+    """How RQ worker process executes background tasks (see src/worker.py)"""
+
+    # forked work-horse per job: new event loop, DB engine and Redis client for each job
+    FORK = "fork"
+    # jobs run inside the worker process on one long-lived loop with warm DB/Redis pools
+    PERSISTENT = "persistent"
+
+
+class CoverFormat(enum.StrEnum):
+    """Image formats of cover renditions (values are used as files' extensions)"""
+
+    AVIF = "avif"
+    WEBP = "webp"
+    JPEG = "jpeg"
+
+    @property
+    def media_type(self) -> str:
+        """Media type of the format (as in Accept / Content-Type headers)"""
+        return f"image/{self.value}"
+
+
 class SourceType(StringEnumMixin, enum.StrEnum):
     """Episode source type enumeration"""
 
@@ -24,8 +24,9 @@ from src.modules.auth.middlewares import APIAuthMiddleware, WebAuthMiddleware
 from src.modules.auth.utils import provide_current_user
 from src.modules.admin import create_admin_route
 from src.modules.db import close_database, initialize_database, verify_database_reachable
+from src.modules.services.cover_cache import run_cover_cache_sweeper
 from src.modules.services.redis import check_redis_connection, close_async_redis_connection
-from src.modules.services.storage import validate_s3_settings
+from src.modules.services.storage import close_s3_client, validate_s3_settings
 from src.modules.api import BaseApiController
 from src.modules.api.errors import (
     api_error_handler,
@@ -115,6 +116,8 @@ async def lifespan(
     except Exception as exc:
         logger.debug("Async Redis shutdown: %r", exc)
 
+    await close_s3_client()
+
     logger.info("=====")
 
 
@@ -149,7 +152,7 @@ def make_app(settings: AppSettings | None = None) -> PodcastApp:
                 },
             ),
         ],
-        lifespan=[lambda _: lifespan(app_settings)],
+        lifespan=[lambda _: lifespan(app_settings), lambda _: run_cover_cache_sweeper()],
         debug=app_settings.flags.debug_mode,
         exception_handlers={
             APIError: api_error_handler,
@@ -0,0 +1,101 @@
+"""Episodes, podcasts, files: composite indexes for real query shapes
+
+Revision ID: 0025
+Revises: 0024
+Create Date: 2026-10-17
+
+"""
+
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+revision: str = "0025"
+down_revision: Union[str, Sequence[str], None] = "0024"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+IN_PROGRESS_CONDITION = "status IN ('DOWNLOADING', 'CANCELING')"
+# (name, table, columns, partial index condition)
+INDEXES: tuple[tuple[str, str, list[str], str | None], ...] = (
+    # lists (filtered by owner or podcast) are sorted by (created_at, id)
+    (
+        "ix_podcast_episodes__owner_id__created_at__id",
+        "podcast_episodes",
+        ["owner_id", "created_at", "id"],
+        None,
+    ),
+    (
+        "ix_podcast_episodes__podcast_id__created_at__id",
+        "podcast_episodes",
+        ["podcast_id", "created_at", "id"],
+        None,
+    ),
+    (
+        "ix_podcast_podcasts__owner_id__created_at__id",
+        "podcast_podcasts",
+        ["owner_id", "created_at", "id"],
+        None,
+    ),
+    # status filters, published episodes for RSS and episodes' updates by the source
+    ("ix_podcast_episodes__owner_id__status", "podcast_episodes", ["owner_id", "status"], None),
+    (
+        "ix_podcast_episodes__podcast_id__status__published_at",
+        "podcast_episodes",
+        ["podcast_id", "status", "published_at"],
+        None,
+    ),
+    (
+        "ix_podcast_episodes__source_id__source_type",
+        "podcast_episodes",
+        ["source_id", "source_type"],
+        None,
+    ),
+    # Episode.get_in_progress: tiny index, only for episodes which are being downloaded
+    ("ix_podcast_episodes__in_progress", "podcast_episodes", ["owner_id"], IN_PROGRESS_CONDITION),
+    # files' updates by source URL and lookups of uploaded files by hash
+    ("ix_media_files_source_url", "media_files", ["source_url"], None),
+    ("ix_media_files__owner_id__hash__type", "media_files", ["owner_id", "hash", "type"], None),
+)
+# single-column indexes, which are leading columns of the composite ones above
+REPLACED_INDEXES: tuple[tuple[str, str, list[str]], ...] = (
+    ("ix_podcast_episodes_owner_id", "podcast_episodes", ["owner_id"]),
+    ("ix_podcast_episodes_podcast_id", "podcast_episodes", ["podcast_id"]),
+    ("ix_podcast_episodes_source_id", "podcast_episodes", ["source_id"]),
+)
+
+
+def upgrade() -> None:
+    """Create indexes without locking tables for writes (CONCURRENTLY can't run in transaction)"""
+    with op.get_context().autocommit_block():
+        for name, table, columns, condition in INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_where=sa.text(condition) if condition else None,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        for name, table, _ in REPLACED_INDEXES:
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
+
+
+def downgrade() -> None:
+    """Restore single-column indexes and drop the composite ones."""
+    with op.get_context().autocommit_block():
+        for name, table, columns in REPLACED_INDEXES:
+            op.create_index(
+                name,
+                table,
+                columns,
+                unique=False,
+                postgresql_concurrently=True,
+                if_not_exists=True,
+            )
+
+        for name, table, _, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=True, if_exists=True)
@@ -114,6 +114,8 @@ class PodcastAdmin(SecureModelView, model=Podcast):
     column_searchable_list = [Podcast.name, Podcast.publish_id]
     column_sortable_list = [Podcast.id, Podcast.name, Podcast.created_at]
     column_filters = [Podcast.download_automatically, Podcast.owner_id]
+    # loading of all podcast's episodes for the form's select is too heavy
+    form_excluded_columns = [Podcast.episodes]
     column_default_sort = (Podcast.id, True)
 
 
@@ -12,6 +12,7 @@ from src.modules.api.base import BaseApiController
 from src.modules.db import User
 from src.modules.db.models import Episode, File
 from src.modules.db.repositories import (
+    CursorPage,
     EpisodeOrderT,
     EpisodeRepository,
     FileRepository,
@@ -61,6 +62,26 @@ class EpisodeTaskMixin:
             raise NotFoundException(f"Episode with id {episode_id} not found")
         return episode
 
+    @staticmethod
+    async def _get_page_by_cursor(
+        repository: EpisodeRepository,
+        cursor: str,
+        limit: int,
+        order_by: EpisodeOrderT,
+        with_total: bool,
+        **filters: Any,
+    ) -> CursorPage[Episode]:
+        try:
+            return await repository.all_by_cursor(
+                cursor=cursor,
+                limit=limit,
+                order_by=order_by,
+                with_total=with_total,
+                **filters,
+            )
+        except ValueError as exc:
+            raise HTTPException(status_code=400, detail=str(exc)) from exc
+
     @staticmethod
     async def _ensure_owned_podcast(
         repository: PodcastRepository,
@@ -84,8 +105,13 @@ class PodcastEpisodeAPIController(EpisodeTaskMixin, BaseApiController):
         limit: int = 10,
         offset: int = 0,
         order_by: EpisodeOrderT = "-created_at",
+        cursor: str | None = None,
+        with_total: bool = False,
     ) -> LimitOffsetPagination[EpisodeResponse]:
-        """Return paginated episodes for a podcast owned by the current user."""
+        """
+        Return paginated episodes for a podcast owned by the current user.
+        Pages requested by `cursor` (instead of offset) have total count only with `with_total`.
+        """
         logger.info(
             "[API] Getting podcast episodes | user #%i | podcast #%i",
             request.user.id,
@@ -96,17 +122,29 @@ class PodcastEpisodeAPIController(EpisodeTaskMixin, BaseApiController):
             await self._ensure_owned_podcast(podcast_repository, podcast_id, request.user.id)
 
             episode_repository = EpisodeRepository(session=uow.session, user_id=request.user.id)
-            episodes, total = await episode_repository.all_paginated(
-                podcast_id=podcast_id,
-                limit=limit,
-                offset=offset,
-                order_by=order_by,
-            )
+            if cursor:
+                page = await self._get_page_by_cursor(
+                    episode_repository,
+                    cursor=cursor,
+                    limit=limit,
+                    order_by=order_by,
+                    with_total=with_total,
+                    podcast_id=podcast_id,
+                )
+            else:
+                episodes, total = await episode_repository.all_paginated(
+                    podcast_id=podcast_id,
+                    limit=limit,
+                    offset=offset,
+                    order_by=order_by,
+                )
+                page = CursorPage.from_offset(episodes, offset, total, order_by=order_by)
 
         return LimitOffsetPagination[EpisodeResponse](
-            items=[EpisodeResponse.model_validate(episode) for episode in episodes],
+            items=[EpisodeResponse.model_validate(episode) for episode in page.items],
             offset=offset,
-            total=total,
+            total=page.total,
+            next_cursor=page.next_cursor,
         )
 
     @post("/", status_code=HTTP_201_CREATED)
@@ -281,22 +319,39 @@ class EpisodeAPIController(EpisodeTaskMixin, BaseApiController):
         limit: int = 10,
         offset: int = 0,
         order_by: EpisodeOrderT = "-created_at",
+        cursor: str | None = None,
+        with_total: bool = False,
     ) -> LimitOffsetPagination[EpisodeResponse]:
-        """Return paginated episodes owned by the current user."""
+        """
+        Return paginated episodes owned by the current user.
+        Pages requested by `cursor` (instead of offset) have total count only with `with_total`.
+        """
         logger.info("[API] Getting paginated list of episodes | user #%i", request.user.id)
         async with SASessionUOW() as uow:
             episode_repository = EpisodeRepository(session=uow.session, user_id=request.user.id)
-            episodes, total = await episode_repository.all_paginated(
-                owner_id=request.user.id,
-                limit=limit,
-                offset=offset,
-                order_by=order_by,
-            )
+            if cursor:
+                page = await self._get_page_by_cursor(
+                    episode_repository,
+                    cursor=cursor,
+                    limit=limit,
+                    order_by=order_by,
+                    with_total=with_total,
+                    owner_id=request.user.id,
+                )
+            else:
+                episodes, total = await episode_repository.all_paginated(
+                    owner_id=request.user.id,
+                    limit=limit,
+                    offset=offset,
+                    order_by=order_by,
+                )
+                page = CursorPage.from_offset(episodes, offset, total, order_by=order_by)
 
         return LimitOffsetPagination[EpisodeResponse](
-            items=[EpisodeResponse.model_validate(episode) for episode in episodes],
+            items=[EpisodeResponse.model_validate(episode) for episode in page.items],
             offset=offset,
-            total=total,
+            total=page.total,
+            next_cursor=page.next_cursor,
         )
 
     @get("/{episode_id:int}/")
@@ -37,7 +37,7 @@ class MediaUploadAPIController(BaseApiController):
             max_file_size=settings.max_upload_audio_filesize,
             tmp_path=settings.tmp_audio_path,
         )
-        metadata = ffmpeg_utils.audio_metadata(local_path)
+        metadata = await ffmpeg_utils.audio_metadata(local_path)
         metadata_dict = metadata._asdict()
         uploaded_hash = _hash_upload(
             uploaded_file.filename, get_file_size(local_path), metadata_dict
@@ -113,7 +113,7 @@ def _hash_upload(filename: str, filesize: int, metadata: dict | None) -> str:
 
 
 async def _upload_audio_cover(audio_path) -> UploadedImageData | None:
-    cover = ffmpeg_utils.audio_cover(audio_path)
+    cover = await ffmpeg_utils.audio_cover(audio_path)
     if cover is None:
         return None
 
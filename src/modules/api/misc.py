@@ -1,20 +1,24 @@
 import asyncio
+import json
 import logging
+import time
+from collections.abc import AsyncGenerator
 from functools import partial
 from typing import Any, Iterable, cast
 
 import yt_dlp
 from litestar import get
+from litestar.response import ServerSentEvent, ServerSentEventMessage
 
 from src.constants import AuthSkip
 from src.modules.api.base import BaseApiController
 from src.exceptions import InvalidParametersAPIError
 from src.modules.db import User
-from src.modules.db.models import Episode
+from src.modules.db.models import Episode, Podcast
 from src.modules.db.repositories import EpisodeRepository, PodcastRepository
 from src.modules.db.services import SASessionUOW
 from src.modules.db.utils import cookie_file_ctx
-from src.modules.services.redis import check_redis_connection
+from src.modules.services.redis import RedisClient, check_redis_connection
 from src.modules.utils import common as common_utils
 from src.modules.utils.processing import check_state
 from src.modules.schemas.playlist import PlaylistEntryResponse, PlaylistResponse
@@ -110,13 +114,19 @@ class ProgressAPIController(BaseApiController):
         async with SASessionUOW() as uow:
             episode_repository = EpisodeRepository(uow.session, user_id=current_user.id)
             podcast_repository = PodcastRepository(uow.session, user_id=current_user.id)
-            podcasts = {podcast.id: podcast for podcast in await podcast_repository.all()}
             if episode_id:
                 episode = await episode_repository.first(id=episode_id)
                 episodes = [episode] if episode else []
             else:
                 episodes = await Episode.get_in_progress(uow.session, user_id=current_user.id)
 
+            # only podcasts of requested episodes (not all user's ones)
+            podcasts: dict[int, Podcast] = {}
+            if podcast_ids := sorted({episode.podcast_id for episode in episodes}):
+                podcasts = {
+                    podcast.id: podcast for podcast in await podcast_repository.all(ids=podcast_ids)
+                }
+
             states = await check_state(episodes)
 
         progress_items: list[ProgressItemResponse] = []
@@ -141,6 +151,63 @@ class ProgressAPIController(BaseApiController):
 
         return {"progressItems": progress_items}
 
+    @get("/stream/")
+    async def stream_progress(self, current_user: User, settings: AppSettings) -> ServerSentEvent:
+        """
+        Push progress' events of the current user's episodes (Server-Sent Events):
+        "progress" - episode's progress delta, "refresh" - episodes' statuses were changed
+        (current state can be fetched by GET /api/progress/)
+        """
+        return ServerSentEvent(_progress_events(current_user.id, settings))
+
+
+async def _progress_events(
+    owner_id: int,
+    settings: AppSettings,
+) -> AsyncGenerator[ServerSentEventMessage, None]:
+    """One pub/sub subscription per connection, events are filtered by episodes' owner"""
+    pubsub = RedisClient().async_pubsub(ignore_subscribe_messages=True)
+    await pubsub.subscribe(settings.redis.progress_pubsub_ch)
+    keepalive = settings.progress_stream_keepalive
+    sent_at = time.monotonic()
+    try:
+        while True:
+            message = await pubsub.get_message(timeout=keepalive)
+            event = _progress_event(message, owner_id, settings) if message else None
+            if event is None:
+                if time.monotonic() - sent_at >= keepalive:
+                    sent_at = time.monotonic()
+                    yield ServerSentEventMessage(comment="keepalive")
+
+                continue
+
+            sent_at = time.monotonic()
+            yield event
+
+    finally:
+        await pubsub.aclose()
+
+
+def _progress_event(
+    message: dict[str, Any],
+    owner_id: int,
+    settings: AppSettings,
+) -> ServerSentEventMessage | None:
+    data = message.get("data")
+    try:
+        event_data = json.loads(data)
+    except (TypeError, ValueError):  # fmt: skip
+        logger.warning("Progress stream: unexpected message %r", data)
+        return None
+
+    if not isinstance(event_data, dict) or event_data.get("owner_id") != owner_id:
+        return None
+
+    if event_data.get("signal") == settings.redis.progress_pubsub_signal:
+        return ServerSentEventMessage(event="refresh", data=data)
+
+    return ServerSentEventMessage(event="progress", data=data)
+
 
 def _prepare_description(data: dict) -> str:
     if data.get("description"):
@@ -13,7 +13,12 @@ from src.constants import FileType
 from src.modules.db import User
 from src.modules.db.models import File
 from src.modules.db.models.podcasts import Podcast
-from src.modules.db.repositories import EpisodeRepository, FileRepository, PodcastOrderT
+from src.modules.db.repositories import (
+    CursorPage,
+    EpisodeRepository,
+    FileRepository,
+    PodcastOrderT,
+)
 from src.modules.services.storage import StorageS3
 from src.modules.tasks import GenerateRSSTask
 from src.modules.tasks.base import RQTask
@@ -72,6 +77,8 @@ class PodcastAPIController(BaseApiController):
         limit: int = 10,
         offset: int = 0,
         order_by: PodcastOrderT = "-created_at",
+        cursor: str | None = None,
+        with_total: bool = False,
     ) -> LimitOffsetPagination[PodcastResponse]:
         """
         Get paginated list of podcasts (for current user) with pagination
@@ -81,6 +88,8 @@ class PodcastAPIController(BaseApiController):
             limit: Limit of podcasts to return
             offset: Offset of podcasts to return
             order_by: Order by field
+            cursor: Cursor of the page (`next_cursor` of the previous one), replaces offset
+            with_total: Count total number of podcasts for the page requested by cursor
 
         Returns:
             Paginated list of podcasts
@@ -88,23 +97,37 @@ class PodcastAPIController(BaseApiController):
         logger.info("[API] Getting paginated list of podcasts | user #%i", current_user.id)
         async with SASessionUOW() as uow:
             podcast_repository = PodcastRepository(session=uow.session)
-            podcasts, total = await podcast_repository.all_with_aggregations(
-                limit=limit,
-                offset=offset,
-                order_by=order_by,
-                owner_id=current_user.id,
-            )
+            if cursor:
+                try:
+                    page = await podcast_repository.all_with_aggregations_by_cursor(
+                        cursor=cursor,
+                        limit=limit,
+                        order_by=order_by,
+                        with_total=with_total,
+                        owner_id=current_user.id,
+                    )
+                except ValueError as exc:
+                    raise HTTPException(status_code=400, detail=str(exc)) from exc
+            else:
+                podcasts, total = await podcast_repository.all_with_aggregations(
+                    limit=limit,
+                    offset=offset,
+                    order_by=order_by,
+                    owner_id=current_user.id,
+                )
+                page = CursorPage.from_offset(podcasts, offset, total, order_by=order_by)
 
         logger.info(
-            "[API] Returned podcasts list | user #%i | found %i podcasts, total: %i",
+            "[API] Returned podcasts list | user #%i | found %i podcasts, total: %s",
             current_user.id,
-            len(podcasts),
-            total,
+            len(page.items),
+            page.total,
         )
         return LimitOffsetPagination[PodcastResponse](
-            items=[PodcastResponse.model_validate(podcast) for podcast in podcasts],
+            items=[PodcastResponse.model_validate(podcast) for podcast in page.items],
             offset=offset,
-            total=total,
+            total=page.total,
+            next_cursor=page.next_cursor,
         )
 
     @get("/{podcast_id:int}/")
@@ -182,11 +205,22 @@ class PodcastAPIController(BaseApiController):
                 podcast_id=podcast_id,
                 owner_id=current_user.id,
             )
+            removed_paths: list[str] = []
             for episode in episodes:
-                await episode_repository.safe_delete(episode)
+                removed_paths += await episode_repository.safe_delete(episode)
 
             await podcast_repository.delete(podcast)
 
+        if removed_paths:
+            # DB changes are committed: stored objects aren't referenced anymore
+            failed = await StorageS3().delete_objects(removed_paths)
+            if failed:
+                logger.warning(
+                    "[API] Podcast #%i: %i files weren't removed from storage",
+                    podcast_id,
+                    len(failed),
+                )
+
         logger.info("[API] Deleted podcast #%i | user #%i", podcast_id, current_user.id)
 
     @post("/{podcast_id:int}/upload-image/")
@@ -34,6 +34,7 @@ class File(BaseModel):
     """SQLAlchemy schema for file instances"""
 
     __tablename__ = "media_files"
+    __table_args__ = (sa.Index("ix_media_files__owner_id__hash__type", "owner_id", "hash", "type"),)
 
     id: Mapped[int] = mapped_column(sa.Integer, primary_key=True)
     type: Mapped[MediaType] = mapped_column(
@@ -41,7 +42,9 @@ class File(BaseModel):
     )
     path: Mapped[str] = mapped_column(sa.String(length=256), nullable=False, default="")
     size: Mapped[int] = mapped_column(sa.Integer, default=0, nullable=False)
-    source_url: Mapped[str] = mapped_column(sa.String(length=512), nullable=False, default="")
+    source_url: Mapped[str] = mapped_column(
+        sa.String(length=512), nullable=False, default="", index=True
+    )
     available: Mapped[bool] = mapped_column(sa.Boolean, nullable=False, default=False)
     access_token: Mapped[str] = mapped_column(
         sa.String(length=64), nullable=False, index=True, unique=True
@@ -101,12 +104,9 @@ class File(BaseModel):
         if not self.path:
             raise NotSupportedError(f"File {self} has no S3 key; cannot presign.")
 
-        from src.modules.services.storage import StorageS3
+        from src.modules.services.storage import generate_presigned_url
 
-        url = await StorageS3().get_presigned_url(self.path)
-        if not url:
-            raise NotSupportedError(f"Presign failed for path {self.path!r}.")
-        return url
+        return generate_presigned_url(self.path)
 
     @property
     def content_type(self) -> str:
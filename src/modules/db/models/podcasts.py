@@ -67,6 +67,9 @@ class Podcast(BaseModel):
     """SQLAlchemy schema for podcast instances"""
 
     __tablename__ = "podcast_podcasts"
+    __table_args__ = (
+        sa.Index("ix_podcast_podcasts__owner_id__created_at__id", "owner_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(sa.Integer, primary_key=True)
     publish_id: Mapped[str] = mapped_column(sa.String(length=32), unique=True, nullable=False)
@@ -88,10 +91,10 @@ class Podcast(BaseModel):
     )
     owner_id: Mapped[int] = mapped_column(sa.ForeignKey("auth_users.id"))
 
-    # relations
-    rss: Mapped["File | None"] = relationship("File", foreign_keys=[rss_id], lazy="subquery")
-    image: Mapped["File | None"] = relationship("File", foreign_keys=[image_id], lazy="subquery")
-    episodes: Mapped[list["Episode"]] = relationship(back_populates="podcast", lazy="subquery")
+    # relations (files are loaded by batched SELECT ... IN, episodes must be loaded explicitly)
+    rss: Mapped["File | None"] = relationship("File", foreign_keys=[rss_id], lazy="selectin")
+    image: Mapped["File | None"] = relationship("File", foreign_keys=[image_id], lazy="selectin")
+    episodes: Mapped[list["Episode"]] = relationship(back_populates="podcast", lazy="raise")
 
     def __str__(self):
         return f'<Podcast #{self.id} "{self.name}">'
@@ -198,6 +201,25 @@ class Episode(BaseModel):
     """SQLAlchemy schema for episode instances"""
 
     __tablename__ = "podcast_episodes"
+    __table_args__ = (
+        sa.Index("ix_podcast_episodes__owner_id__created_at__id", "owner_id", "created_at", "id"),
+        sa.Index(
+            "ix_podcast_episodes__podcast_id__created_at__id", "podcast_id", "created_at", "id"
+        ),
+        sa.Index("ix_podcast_episodes__owner_id__status", "owner_id", "status"),
+        sa.Index(
+            "ix_podcast_episodes__podcast_id__status__published_at",
+            "podcast_id",
+            "status",
+            "published_at",
+        ),
+        sa.Index("ix_podcast_episodes__source_id__source_type", "source_id", "source_type"),
+        sa.Index(
+            "ix_podcast_episodes__in_progress",
+            "owner_id",
+            postgresql_where=sa.text("status IN ('DOWNLOADING', 'CANCELING')"),
+        ),
+    )
 
     Status = EpisodeStatus
     Sources = SourceType
@@ -205,14 +227,14 @@ class Episode(BaseModel):
 
     id: Mapped[int] = mapped_column(sa.Integer, primary_key=True)
     title: Mapped[str] = mapped_column(sa.String(length=256), nullable=False)
-    source_id: Mapped[str] = mapped_column(sa.String(length=32), index=True, nullable=False)
+    source_id: Mapped[str] = mapped_column(sa.String(length=32), nullable=False)
     source_type: Mapped[SourceType] = mapped_column(
         sa.Enum(SourceType, name=SourceType.__enum_name__),
         default=SourceType.YOUTUBE,
         nullable=False,
     )
     podcast_id: Mapped[int] = mapped_column(
-        sa.ForeignKey("podcast_podcasts.id", ondelete="RESTRICT"), index=True, nullable=False
+        sa.ForeignKey("podcast_podcasts.id", ondelete="RESTRICT"), nullable=False
     )
     audio_id: Mapped[int | None] = mapped_column(
         sa.ForeignKey("media_files.id", ondelete="SET NULL"), nullable=True
@@ -220,9 +242,7 @@ class Episode(BaseModel):
     image_id: Mapped[int | None] = mapped_column(
         sa.ForeignKey("media_files.id", ondelete="SET NULL"), nullable=True
     )
-    owner_id: Mapped[int] = mapped_column(
-        sa.ForeignKey("auth_users.id"), index=True, nullable=False
-    )
+    owner_id: Mapped[int] = mapped_column(sa.ForeignKey("auth_users.id"), nullable=False)
     cookie_id: Mapped[int | None] = mapped_column(
         sa.ForeignKey("podcast_cookies.id", ondelete="SET NULL"), nullable=True
     )
@@ -243,10 +263,10 @@ class Episode(BaseModel):
     )
     published_at: Mapped[datetime | None] = mapped_column(sa.DateTime(timezone=True), nullable=True)
 
-    # relations
-    podcast: Mapped["Podcast"] = relationship(back_populates="episodes", lazy="subquery")
-    image: Mapped["File"] = relationship("File", foreign_keys=[image_id], lazy="subquery")
-    audio: Mapped["File"] = relationship("File", foreign_keys=[audio_id], lazy="subquery")
+    # relations (podcast must be loaded explicitly: see `EpisodeRepository.with_podcast`)
+    podcast: Mapped["Podcast"] = relationship(back_populates="episodes", lazy="raise_on_sql")
+    image: Mapped["File"] = relationship("File", foreign_keys=[image_id], lazy="selectin")
+    audio: Mapped["File"] = relationship("File", foreign_keys=[audio_id], lazy="selectin")
 
     def __str__(self) -> str:
         return f'<Episode #{self.id} {self.source_id} [{self.status}] "{self.title[:10]}..." >'
@@ -1,6 +1,11 @@
 """DB-specific module that provides specific operations on the database."""
 
+import base64
+import copy
+import json
 import logging
+import time
+from functools import lru_cache, partial
 from pathlib import Path
 from datetime import UTC, datetime
 from typing import (
@@ -14,12 +19,14 @@ from typing import (
     cast,
     Literal,
     NamedTuple,
+    Self,
 )
 
 from sqlalchemy import (
     select,
     BinaryExpression,
     delete,
+    insert,
     Select,
     update,
     CursorResult,
@@ -28,8 +35,11 @@ from sqlalchemy import (
     Row,
     and_,
     ColumnElement,
+    tuple_,
 )
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import raiseload, selectinload
+from sqlalchemy.sql.base import ExecutableOption
 from sqlalchemy.sql.elements import SQLCoreOperations
 from sqlalchemy.sql.operators import isnot
 from sqlalchemy.sql.roles import ColumnsClauseRole
@@ -48,6 +58,9 @@ __all__ = (
 )
 
 from src.modules.schemas.statistics import PodcastStatistics
+from src.modules.db.session import AfterCommitCallback, after_commit
+from src.modules.services.media_tokens import MediaTokenCache
+from src.settings.db import get_db_settings
 
 ModelT = TypeVar("ModelT", bound=BaseModel)
 logger = logging.getLogger(__name__)
@@ -63,6 +76,10 @@ type PodcastOrderT = Literal["id", "name", "created_at", "updated_at", "-created
 type EpisodeOrderT = Literal[
     "id", "title", "created_at", "updated_at", "-created_at", "-updated_at"
 ]
+CURSOR_ORDER_BY = ("created_at", "-created_at")
+MAX_CACHED_COUNTS = 1024
+# total counts of large result sets: (table, filters) -> (count, expires at)
+_cached_counts: dict[tuple[Any, ...], tuple[int, float]] = {}
 
 
 class VendorsFilter(TypedDict):
@@ -85,6 +102,54 @@ class EpisodesStatData(NamedTuple):
     last_published_at: datetime | None = None
 
 
+class PageCursor(NamedTuple):
+    """Keyset (created_at, id) of the last item on a page, opaque for API clients"""
+
+    created_at: datetime
+    id: int
+
+    def encode(self) -> str:
+        """Return URL-safe token for the cursor"""
+        raw_cursor = json.dumps([self.created_at.isoformat(), self.id])
+        return base64.urlsafe_b64encode(raw_cursor.encode()).decode().rstrip("=")
+
+    @classmethod
+    def decode(cls, token: str) -> "PageCursor":
+        """Restore the cursor from a token (raises ValueError for an invalid one)"""
+        try:
+            raw_cursor = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            created_at, instance_id = json.loads(raw_cursor)
+            return cls(created_at=datetime.fromisoformat(created_at), id=int(instance_id))
+        except (ValueError, TypeError) as exc:
+            raise ValueError(f"Invalid pagination cursor: {token!r}") from exc
+
+    @classmethod
+    def after(cls, instances: Sequence[Any], has_more: bool) -> str | None:
+        """Token for the page which follows given instances (None for the last page)"""
+        if not (has_more and instances):
+            return None
+
+        return cls(created_at=instances[-1].created_at, id=instances[-1].id).encode()
+
+
+class CursorPage(NamedTuple, Generic[ModelT]):
+    items: list[ModelT]
+    next_cursor: str | None
+    total: int | None
+
+    @classmethod
+    def from_offset(
+        cls,
+        items: list[ModelT],
+        offset: int,
+        total: int,
+        order_by: str,
+    ) -> "CursorPage[ModelT]":
+        """Page of OFFSET pagination, which lets to continue by cursor (if order allows it)"""
+        has_more = order_by in CURSOR_ORDER_BY and offset + len(items) < total
+        return cls(items=items, next_cursor=PageCursor.after(items, has_more=has_more), total=total)
+
+
 class BaseRepository(Generic[ModelT]):
     """Base repository interface."""
 
@@ -93,6 +158,16 @@ class BaseRepository(Generic[ModelT]):
     def __init__(self, session: AsyncSession, user_id: int | None = None) -> None:
         self.session: AsyncSession = session
         self.user_id: int | None = user_id
+        self.options: tuple[ExecutableOption, ...] = ()
+
+    def with_options(self, *options: ExecutableOption) -> Self:
+        """
+        Repository's copy which applies loader options (selectinload, raiseload, etc.)
+        to the selected instances, so callers load only relations they need.
+        """
+        repository = copy.copy(self)
+        repository.options = self.options + options
+        return repository
 
     async def get(self, instance_id: int, **filters: FilterT) -> ModelT:
         """Selects instance by provided ID"""
@@ -138,26 +213,58 @@ class BaseRepository(Generic[ModelT]):
 
         Returns:
             Tuple of (objects list, total count)
+
+        Total count is selected by the same query (`count(*) OVER ()`), large ones are cached
+        for a while (DBSettings.count_cache_*), so next pages skip counting at all. Cached counts
+        are dropped after commit of the table's changes, made by repositories.
         """
         logger.debug("[DB] Getting paginated %s (offset=%i, limit=%i)", self.model, offset, limit)
+        statement = (
+            self._prepare_statement(filters=dict(filters))
+            .order_by(self._sort_criteria(order_by))
+            .offset(offset)
+            .limit(limit)
+        )
+        rows, total = await self._fetch_with_total(
+            statement, offset=offset, count_filters=filters | self._get_owner_kwarg()
+        )
+        instances: list[ModelT] = [row[0] for row in rows]
+        logger.debug("[DB] Found %i instances, total: %i", len(instances), total)
+        return instances, total
 
-        # TODO: recheck and remove commented
-        # Prepare base statement for count
-        # count_filters = filters.copy() | self._get_owner_kwarg()
-        # count_filters_stmts: list[BinaryExpression[bool]] = []
-        # if (ids := count_filters.pop("ids", None)) and isinstance(ids, list):
-        #     count_filters_stmts.append(self.model.id.in_(ids))
+    async def all_by_cursor(
+        self,
+        cursor: str | None = None,
+        limit: int = 10,
+        order_by: BaseOrderT = "-created_at",
+        with_total: bool = False,
+        **filters: FilterT,
+    ) -> CursorPage[ModelT]:
+        """Get objects by keyset pagination (on created_at, id) with optional filters.
 
-        # Get paginated releases
-        statement = self._prepare_statement(filters=filters)
-        oder_by_criteria = self._sort_criteria(order_by)
+        Unlike OFFSET, the page is found by an index range scan from the cursor,
+        so any page costs the same as the first one.
+
+        Args:
+            cursor: Token of the previous page's `next_cursor` (None for the first page)
+            limit: Maximum number of items to return
+            order_by: "created_at" or "-created_at"
+            with_total: Count all matched objects too (it's an extra query)
+            **filters: Optional filters to apply
+
+        Returns:
+            CursorPage (objects list, cursor for the next page, total count or None)
+        """
+        logger.debug("[DB] Getting %s by cursor (cursor=%s, limit=%i)", self.model, cursor, limit)
+        statement = self._prepare_statement(filters=dict(filters))
         objects = await self.session.scalars(
-            statement.order_by(oder_by_criteria).offset(offset).limit(limit)
+            self._paginate_by_cursor(statement, cursor=cursor, limit=limit, order_by=order_by)
         )
-        total: int = await self.get_total_count(**filters | self._get_owner_kwarg())
-        instances: list[ModelT] = list(objects.all())
-        logger.debug("[DB] Found %i instances, total: %i", len(instances), total)
-        return instances, total
+        total: int | None = None
+        if with_total:
+            total = await self.get_total_count(**filters | self._get_owner_kwarg())
+
+        return self._cursor_page(list(objects.all()), limit=limit, total=total)
 
     async def create(self, **value: CreateT) -> ModelT:
         """Creates new instance"""
@@ -165,23 +272,39 @@ class BaseRepository(Generic[ModelT]):
         value |= self._get_owner_kwarg()
         instance = self.model(**value)
         self.session.add(instance)
+        self._invalidate_counts()
         return instance
 
+    async def create_many(self, values: Sequence[dict[str, CreateT]]) -> list[ModelT]:
+        """Creates new instances by one bulk INSERT (instances are returned in the same order)"""
+        logger.debug("[DB] Creating %i [%s] instances", len(values), self.model.__name__)
+        if not values:
+            return []
+
+        owner_kwarg = self._get_owner_kwarg()
+        statement = insert(self.model).returning(self.model, sort_by_parameter_order=True)
+        result = await self.session.scalars(statement, [value | owner_kwarg for value in values])
+        self._invalidate_counts()
+        return list(result.all())
+
     async def update(self, instance: ModelT, **value: UpdateT) -> None:
         """Just updates the instance with provided update_value."""
         for key, field_value in value.items():
             setattr(instance, key, field_value)
 
         self.session.add(instance)
+        self._invalidate_counts()
 
     async def delete(self, instance: ModelT) -> None:
         """Remove the instance from the DB."""
         await self.session.delete(instance)
+        self._invalidate_counts()
 
     async def delete_by_ids(self, removing_ids: Sequence[int]) -> None:
         """Remove the instances from the DB."""
         statement = delete(self.model).filter(self.model.id.in_(removing_ids))
         await self.session.execute(statement)
+        self._invalidate_counts()
 
     async def update_by_ids(self, updating_ids: Sequence[int], value: dict[str, Any]) -> None:
         """Update the instances by their IDs"""
@@ -204,8 +327,22 @@ class BaseRepository(Generic[ModelT]):
             CursorResult[Any], await self.session.execute(statement, value)
         )
         await self.session.flush()
+        self._invalidate_counts()
         logger.info("[DB] Updated %i instances", result.rowcount)
 
+    async def update_many(self, values: Sequence[dict[str, Any]]) -> None:
+        """
+        Update the instances with their own values by one bulk UPDATE (by primary key),
+        so each dict must contain instance's `id`. Owner's filter isn't applied here.
+        """
+        logger.info("[DB] Updating %i instances by their own values", len(values))
+        if not values:
+            return
+
+        await self.session.execute(update(self.model), list(values))
+        await self.session.flush()
+        self._invalidate_counts()
+
     async def update_by_filters(self, filters: dict[str, FilterT], value: dict[str, Any]) -> None:
         """Update the instances by some filters"""
         filters |= self._get_owner_kwarg()
@@ -216,6 +353,7 @@ class BaseRepository(Generic[ModelT]):
             CursorResult[Any], await self.session.execute(statement, value)
         )
         await self.session.flush()
+        self._invalidate_counts()
         logger.info("[DB] Updated %i instances", result.rowcount)
 
     async def get_total_count(self, **filters: FilterT) -> int:
@@ -234,13 +372,78 @@ class BaseRepository(Generic[ModelT]):
             filters_stmts.append(self.model.id.in_(ids))
 
         filters |= self._get_owner_kwarg()
-        statement = select(*entities) if entities is not None else select(self.model)
+        if entities is not None:
+            statement = select(*entities)
+        else:
+            statement = select(self.model).options(*self.options)
+
         statement = statement.filter_by(**filters)
         if filters_stmts:
             statement = statement.filter(*filters_stmts)
 
         return statement
 
+    async def _fetch_with_total(
+        self,
+        statement: Select,
+        offset: int,
+        count_filters: dict[str, FilterT],
+    ) -> tuple[Sequence[Row], int]:
+        """Select page's rows and total count of all matched rows by one round trip"""
+        count_key = (self.model.__tablename__, tuple(sorted(map(repr, count_filters.items()))))
+        if (cached_total := _get_cached_count(count_key)) is not None:
+            result = await self.session.execute(statement)
+            return result.all(), cached_total
+
+        result = await self.session.execute(
+            statement.add_columns(func.count().over().label("total_count"))
+        )
+        rows = result.all()
+        if rows:
+            total = rows[0].total_count
+        elif offset:
+            # page is out of range: there are no rows to carry the window's count
+            total = await self.get_total_count(**count_filters)
+        else:
+            total = 0
+
+        _cache_count(count_key, total)
+        return rows, total
+
+    def _paginate_by_cursor(
+        self,
+        statement: Select,
+        cursor: str | None,
+        limit: int,
+        order_by: str,
+    ) -> Select:
+        if order_by not in CURSOR_ORDER_BY:
+            raise ValueError(f"Cursor pagination doesn't support ordering by {order_by!r}")
+
+        created_at, instance_id = getattr(self.model, "created_at"), self.model.id
+        descending = order_by.startswith("-")
+        if cursor:
+            keyset, position = tuple_(created_at, instance_id), tuple_(*PageCursor.decode(cursor))
+            statement = statement.filter(keyset < position if descending else keyset > position)
+
+        if descending:
+            statement = statement.order_by(created_at.desc(), instance_id.desc())
+        else:
+            statement = statement.order_by(created_at.asc(), instance_id.asc())
+
+        # one extra row shows whether the next page exists
+        return statement.limit(limit + 1)
+
+    @staticmethod
+    def _cursor_page(instances: list[Any], limit: int, total: int | None) -> CursorPage:
+        has_more = len(instances) > limit
+        instances = instances[:limit]
+        return CursorPage(
+            items=instances,
+            next_cursor=PageCursor.after(instances, has_more=has_more),
+            total=total,
+        )
+
     def _filter_criteria(self, filter_kwargs) -> ColumnElement[bool]:
         filters: list[BinaryExpression[bool]] = []
         for filter_name, filter_value in filter_kwargs.items():
@@ -278,6 +481,58 @@ class BaseRepository(Generic[ModelT]):
 
         return {}
 
+    def _invalidate_counts(self) -> None:
+        """
+        Drop cached counts of the model's table after commit of its changes (cached counts
+        of other processes expire by DBSettings.count_cache_ttl)
+        """
+        after_commit(self.session, _drop_cached_counts(self.model.__tablename__))
+
+
+def _get_cached_count(key: tuple[Any, ...]) -> int | None:
+    cached = _cached_counts.get(key)
+    if cached is None:
+        return None
+
+    total, expires_at = cached
+    if expires_at < time.monotonic():
+        _cached_counts.pop(key, None)
+        return None
+
+    return total
+
+
+def _cache_count(key: tuple[Any, ...], total: int) -> None:
+    """Cache only large counts: they are expensive, and an approximate value is fine there"""
+    settings = get_db_settings()
+    if not settings.count_cache_threshold or total < settings.count_cache_threshold:
+        return
+
+    if len(_cached_counts) >= MAX_CACHED_COUNTS:
+        _cached_counts.pop(next(iter(_cached_counts)))
+
+    _cached_counts[key] = (total, time.monotonic() + settings.count_cache_ttl)
+
+
+@lru_cache
+def _drop_cached_counts(table_name: str) -> AfterCommitCallback:
+    """The same callback for the table: it's scheduled once per transaction"""
+
+    async def drop_cached_counts() -> None:
+        for key in [key for key in _cached_counts if key[0] == table_name]:
+            del _cached_counts[key]
+
+    return drop_cached_counts
+
+
+def _invalidate_media_tokens(session: AsyncSession, access_tokens: list[str]) -> None:
+    """
+    Drop cached media tokens of changed files after commit: before it, concurrent requests
+    still read old rows (and would cache them again)
+    """
+    if access_tokens:
+        after_commit(session, partial(MediaTokenCache.invalidate, access_tokens))
+
 
 class UserRepository(BaseRepository[User]):
     """User's repository."""
@@ -374,6 +629,72 @@ class PodcastRepository(BaseRepository[Podcast]):
         - last_download_date: datetime | None
         """
         logger.debug("[DB] Getting podcasts with aggregations: %s", filters)
+        statement = (
+            self._aggregations_statement(filters)
+            .order_by(self._sort_criteria(order_by))
+            .offset(offset)
+            .limit(limit)
+        )
+        rows, total = await self._fetch_with_total(statement, offset=offset, count_filters=filters)
+        podcasts_with_stats = self._with_statistics(rows)
+        logger.debug(
+            "[DB] Found %i podcasts with aggregations, total: %i",
+            len(podcasts_with_stats),
+            total,
+        )
+        return podcasts_with_stats, total
+
+    async def all_with_aggregations_by_cursor(
+        self,
+        cursor: str | None = None,
+        limit: int = 10,
+        order_by: PodcastOrderT = "-created_at",
+        with_total: bool = False,
+        **filters: FilterT,
+    ) -> CursorPage[Podcast]:
+        """Same as all_with_aggregations, but paginated by keyset (see `all_by_cursor`)"""
+        logger.debug("[DB] Getting podcasts with aggregations by cursor: %s", filters)
+        statement = self._paginate_by_cursor(
+            self._aggregations_statement(filters),
+            cursor=cursor,
+            limit=limit,
+            order_by=order_by,
+        )
+        result = await self.session.execute(statement)
+        total: int | None = None
+        if with_total:
+            total = await self.get_total_count(**filters)
+
+        return self._cursor_page(self._with_statistics(result.all()), limit=limit, total=total)
+
+    async def get_first_with_aggregations(self, **filters: FilterT) -> Podcast | None:
+        """Return the first podcast with aggregation fields populated."""
+        logger.info("[DB] Getting 1st instance by filter: %s", filters)
+        instances, _ = await self.all_with_aggregations(
+            limit=1,
+            order_by="id",
+            **cast(Any, filters),
+        )
+        if not instances:
+            return None
+
+        if len(instances) > 1:
+            logger.warning("[DB] Found %i instances (expected 1) with aggregations", len(instances))
+
+        return instances[0]
+
+    async def update_by_filters(self, filters: dict[str, FilterT], value: dict[str, Any]) -> None:
+        """Update the instances by some filters"""
+        logger.info("[DB] Updating instances by filter: %s", filters)
+        statement = update(self.model).filter(self._filter_criteria(filters))
+        result: CursorResult[Any] = cast(
+            CursorResult[Any], await self.session.execute(statement, value)
+        )
+        await self.session.flush()
+        self._invalidate_counts()
+        logger.info("[DB] Updated %i instances", result.rowcount)
+
+    def _aggregations_statement(self, filters: dict[str, FilterT]) -> Select:
         filters_dict = dict(filters) | self._get_owner_kwarg()
 
         # Build aggregation query with LEFT JOINs to include podcasts without episodes
@@ -389,8 +710,7 @@ class PodcastRepository(BaseRepository[Podcast]):
             .outerjoin(Episode, Podcast.id == Episode.podcast_id)
             .outerjoin(File, Episode.audio_id == File.id)
             .group_by(Podcast.id)
-            .offset(offset)
-            .limit(limit)
+            .options(*self.options)
         )
 
         # Apply filters similar to _prepare_statement logic
@@ -398,14 +718,17 @@ class PodcastRepository(BaseRepository[Podcast]):
         if (ids := filters_dict.pop("ids", None)) and isinstance(ids, list):
             filters_stmts.append(Podcast.id.in_(ids))
 
-        statement = statement.filter_by(**filters_dict)
+        # filter_by() would be applied to the last joined entity (File), not to podcasts
+        filters_stmts.extend(
+            getattr(Podcast, field_name) == value for field_name, value in filters_dict.items()
+        )
         if filters_stmts:
             statement = statement.filter(*filters_stmts)
 
-        statement = statement.order_by(self._sort_criteria(order_by))
+        return statement
 
-        result = await self.session.execute(statement)
-        rows = result.all()
+    @staticmethod
+    def _with_statistics(rows: Sequence[Row]) -> list[Podcast]:
         podcasts_with_stats = []
         for row in rows:
             podcast: Podcast = row[0]
@@ -418,39 +741,7 @@ class PodcastRepository(BaseRepository[Podcast]):
             )
             podcasts_with_stats.append(podcast)
 
-        total = await self.get_total_count(**filters)
-        logger.debug(
-            "[DB] Found %i podcasts with aggregations, total: %i",
-            len(podcasts_with_stats),
-            total,
-        )
-        return podcasts_with_stats, total
-
-    async def get_first_with_aggregations(self, **filters: FilterT) -> Podcast | None:
-        """Return the first podcast with aggregation fields populated."""
-        logger.info("[DB] Getting 1st instance by filter: %s", filters)
-        instances, _ = await self.all_with_aggregations(
-            limit=1,
-            order_by="id",
-            **cast(Any, filters),
-        )
-        if not instances:
-            return None
-
-        if len(instances) > 1:
-            logger.warning("[DB] Found %i instances (expected 1) with aggregations", len(instances))
-
-        return instances[0]
-
-    async def update_by_filters(self, filters: dict[str, FilterT], value: dict[str, Any]) -> None:
-        """Update the instances by some filters"""
-        logger.info("[DB] Updating instances by filter: %s", filters)
-        statement = update(self.model).filter(self._filter_criteria(filters))
-        result: CursorResult[Any] = cast(
-            CursorResult[Any], await self.session.execute(statement, value)
-        )
-        await self.session.flush()
-        logger.info("[DB] Updated %i instances", result.rowcount)
+        return podcasts_with_stats
 
 
 class EpisodeRepository(BaseRepository[Episode]):
@@ -458,14 +749,29 @@ class EpisodeRepository(BaseRepository[Episode]):
 
     model = Episode
 
-    async def safe_delete(self, episode: Episode) -> None:
-        """Delete an episode row and unreferenced linked file rows without touching S3."""
+    def with_podcast(self) -> Self:
+        """Load episodes' podcasts too (by one batched query)"""
+        return self.with_options(selectinload(Episode.podcast))
+
+    def without_files(self) -> Self:
+        """Skip loading of episodes' audio and image (accessing them raises an error)"""
+        return self.with_options(raiseload(Episode.audio), raiseload(Episode.image))
+
+    async def safe_delete(self, episode: Episode) -> list[str]:
+        """
+        Delete an episode row and unreferenced linked file rows without touching S3.
+        Returns remote paths of deleted files which aren't used by other files anymore
+        (callers may remove them from S3 after commit, e.g. via StorageS3.delete_objects).
+        """
         if episode.status in Episode.PROGRESS_STATUSES:
             raise ValueError("Episode in progress cannot be deleted")
 
+        removed_paths: list[str] = []
+        access_tokens: list[str] = []
         file_ids = [file_id for file_id in (episode.audio_id, episode.image_id) if file_id]
         await self.session.delete(episode)
         await self.session.flush()
+        self._invalidate_counts()
 
         for file_id in file_ids:
             is_used = await self.session.scalar(
@@ -487,15 +793,27 @@ class EpisodeRepository(BaseRepository[Episode]):
                 continue
 
             path = Path(str(file.path))
-            if path.is_absolute() and path.exists() and path.is_file():
-                path.unlink(missing_ok=True)
+            if path.is_absolute():
+                if path.exists() and path.is_file():
+                    path.unlink(missing_ok=True)
+
+            elif not await self.session.scalar(
+                select(func.count(File.id)).filter(File.path == file.path, File.id != file.id)
+            ):
+                removed_paths.append(str(file.path))
 
             await self.session.delete(file)
+            access_tokens.append(file.access_token)
+
+        _invalidate_media_tokens(self.session, access_tokens)
+        return removed_paths
 
     async def all(self, **filters: FilterT) -> list[Episode]:
         """Get all episodes, but with extended filters' logic."""
         logger.debug("[DB] Getting all episodes: %s", filters)
-        statement = select(self.model).outerjoin(File, Episode.audio_id == File.id)
+        statement = (
+            select(self.model).outerjoin(File, Episode.audio_id == File.id).options(*self.options)
+        )
 
         def _process_suffix(statement: Select, field_name: str, suffix: str, value: Any) -> Select:
             field = getattr(self.model, field_name)
@@ -510,6 +828,8 @@ class EpisodeRepository(BaseRepository[Episode]):
                     statement = statement.filter(field <= value)
                 case "gte":
                     statement = statement.filter(field >= value)
+                case "in":
+                    statement = statement.filter(field.in_(value))
                 case "isnot":
                     if not isinstance(value, bool):
                         raise TypeError("Filter statement can take only boolean values")
@@ -583,6 +903,7 @@ class EpisodeRepository(BaseRepository[Episode]):
             CursorResult[Any], await self.session.execute(statement, value)
         )
         await self.session.flush()
+        self._invalidate_counts()
         logger.info("[DB] Updated %i instances", result.rowcount)
 
     #
@@ -730,6 +1051,48 @@ class FileRepository(BaseRepository[File]):
         row = result.first()
         return row[0] if row else None
 
+    async def update(self, instance: File, **value: UpdateT) -> None:
+        """Updates the file (its cached media token is dropped after commit)"""
+        await super().update(instance, **value)
+        _invalidate_media_tokens(self.session, [instance.access_token])
+
+    async def delete(self, instance: File) -> None:
+        """Remove the file from the DB (its cached media token is dropped after commit)"""
+        await super().delete(instance)
+        _invalidate_media_tokens(self.session, [instance.access_token])
+
+    async def delete_by_ids(self, removing_ids: Sequence[int]) -> None:
+        """Remove the files from the DB (their cached media tokens are dropped after commit)"""
+        access_tokens = await self._access_tokens(ids=list(removing_ids))
+        await super().delete_by_ids(removing_ids)
+        _invalidate_media_tokens(self.session, access_tokens)
+
+    async def update_by_ids(self, updating_ids: Sequence[int], value: dict[str, Any]) -> None:
+        """Update the files by their IDs (their cached media tokens are dropped after commit)"""
+        access_tokens = await self._access_tokens(ids=list(updating_ids))
+        await super().update_by_ids(updating_ids, value)
+        _invalidate_media_tokens(self.session, access_tokens)
+
+    async def update_many(self, values: Sequence[dict[str, Any]]) -> None:
+        """Update the files with their own values (their cached media tokens are dropped after commit)"""
+        access_tokens = await self._access_tokens(ids=[value["id"] for value in values])
+        await super().update_many(values)
+        _invalidate_media_tokens(self.session, access_tokens)
+
+    async def update_by_filters(self, filters: dict[str, FilterT], value: dict[str, Any]) -> None:
+        """Update the files by some filters (their cached media tokens are dropped after commit)"""
+        access_tokens = await self._access_tokens(**filters)
+        await super().update_by_filters(filters, value)
+        _invalidate_media_tokens(self.session, access_tokens)
+
+    async def _access_tokens(self, **filters: FilterT) -> list[str]:
+        """Access tokens of the files, which are going to be changed"""
+        if filters.get("ids") == []:
+            return []
+
+        statement = self._prepare_statement(filters=filters, entities=[File.access_token])
+        return list((await self.session.scalars(statement)).all())
+
     async def copy(self, file_id: int, owner_id: int, available: bool = True) -> File:
         """Create a file row copied from an existing file for another owner."""
         source_file: File = await self.get(file_id)
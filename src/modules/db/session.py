@@ -1,4 +1,5 @@
 import logging
+from collections.abc import Awaitable, Callable
 
 import sqlalchemy as sa
 from sqlalchemy.ext.asyncio import (
@@ -15,6 +16,47 @@ from src.utils import singleton
 
 logger = logging.getLogger(__name__)
 type sm_type = async_sessionmaker[AsyncSession]
+type AfterCommitCallback = Callable[[], Awaitable[None]]
+AFTER_COMMIT_INFO_KEY = "after_commit_callbacks"
+
+
+class AppSession(AsyncSession):
+    """
+    Async session, which runs callbacks (see `after_commit`) once its transaction is committed:
+    e.g. caches are invalidated, when changed rows are visible for other sessions already.
+    """
+
+    async def commit(self) -> None:
+        await super().commit()
+        await run_after_commit_callbacks(self)
+
+    async def rollback(self) -> None:
+        self.info.pop(AFTER_COMMIT_INFO_KEY, None)
+        await super().rollback()
+
+    async def close(self) -> None:
+        self.info.pop(AFTER_COMMIT_INFO_KEY, None)
+        await super().close()
+
+
+def after_commit(session: AsyncSession, callback: AfterCommitCallback) -> None:
+    """
+    Schedule callback for the session's commit (it's dropped on rollback).
+    Already scheduled callback isn't added again.
+    """
+    callbacks: list[AfterCommitCallback] = session.info.setdefault(AFTER_COMMIT_INFO_KEY, [])
+    if callback not in callbacks:
+        callbacks.append(callback)
+
+
+async def run_after_commit_callbacks(session: AsyncSession) -> None:
+    """Run callbacks, scheduled for just committed transaction (their errors are logged only)"""
+    callbacks: list[AfterCommitCallback] = session.info.pop(AFTER_COMMIT_INFO_KEY, [])
+    for callback in callbacks:
+        try:
+            await callback()
+        except Exception as exc:
+            logger.error("[DB] Failed to run after-commit callback %r: %r", callback, exc)
 
 
 @singleton
@@ -48,7 +90,7 @@ class AsyncDBConnectors:
             session_factory = async_sessionmaker(
                 bind=engine,
                 expire_on_commit=False,
-                class_=AsyncSession,
+                class_=AppSession,
             )
 
             self.engine = engine
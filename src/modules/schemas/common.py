@@ -12,7 +12,14 @@ class LimitOffsetPagination(BaseModel, Generic[ResponseModelT]):
     items: list[ResponseModelT] = Field(
         default_factory=list, description="List of items for requested limit and offset"
     )
-    total: int = Field(default=0, description="Total number of items in the database")
+    total: int | None = Field(
+        default=0,
+        description="Total number of items in the database (null if it wasn't requested)",
+    )
+    next_cursor: str | None = Field(
+        default=None,
+        description="Cursor for the next page (pass it instead of offset), null for the last page",
+    )
 
 
 class OKResponse(BaseModel):
@@ -3,17 +3,40 @@
 import hashlib
 import logging
 import urllib.parse
+from contextlib import suppress
+from functools import partial
 from pathlib import Path
+from typing import NamedTuple
 
 import httpx
 from litestar.exceptions import NotFoundException
 
+from src.constants import CoverFormat
+from src.exceptions import FFMPegPreparationError
 from src.modules.db.models import File as MediaFile
+from src.modules.services.cover_cache import get_cover_cache
 from src.modules.services.storage import StorageS3
+from src.modules.utils import ffmpeg
 from src.settings.app import get_app_settings
 
 logger = logging.getLogger(__name__)
-__all__ = ("CoverService",)
+__all__ = ("CoverService", "CoverRendition", "COVER_SIZES")
+# widths (in px) of cover renditions: list pages use small ones, detail pages use the largest
+COVER_SIZES = (64, 160, 600)
+# formats, which ffmpeg of the current process can't encode (e.g. it's built without AVIF)
+_unsupported_formats: set[CoverFormat] = set()
+# ffmpeg's errors about missing encoder/muxer (other failures, like timeouts, are transient)
+MISSING_ENCODER_ERRORS = (
+    "Unknown encoder",
+    "Encoder not found",
+    "Unknown output format",
+    "Requested output format",
+)
+
+
+class CoverRendition(NamedTuple):
+    size: int
+    format: CoverFormat
 
 
 class CoverService:
@@ -28,25 +51,91 @@ class CoverService:
         """
         Return path to cached cover file; download from S3 or source_url if not yet cached.
         Cache key is hash of file path or source_url so the same image is stored once.
+        Cache is size-bounded (see CoverCache): concurrent requests of missed cover wait for
+        one download.
         """
         media_cache_dir = get_app_settings().media_cache_dir
         cache_key, ext = self._cache_key_and_ext(file_obj)
         cache_filename = self._cache_filename(cache_key, cache_file_prefix, ext)
         cached_path = media_cache_dir / cache_dir_prefix / cache_filename
 
-        if cached_path.exists():
-            return cached_path
+        async def download(dst_path: Path) -> None:
+            if file_obj.public and file_obj.source_url:
+                await self._download_from_url(file_obj.source_url, dst_path, file_obj.type.value)
+            elif file_obj.path:
+                await self._download_from_s3(file_obj.path, dst_path, file_obj.type.value)
+            else:
+                raise NotFoundException(f"{file_obj.type.value} cover has no path or source_url")
 
-        cached_path.parent.mkdir(parents=True, exist_ok=True)
+        return await get_cover_cache().get_or_fill(cached_path, download)
 
-        if file_obj.public and file_obj.source_url:
-            await self._download_from_url(file_obj.source_url, cached_path, file_obj.type.value)
-        elif file_obj.path:
-            await self._download_from_s3(file_obj.path, cached_path, file_obj.type.value)
-        else:
-            raise NotFoundException(f"{file_obj.type.value} cover has no path or source_url")
+    async def get_rendition(
+        self,
+        file_obj: MediaFile,
+        cache_dir_prefix: str,
+        cache_file_prefix: str,
+        rendition: CoverRendition,
+    ) -> Path:
+        """
+        Return path to cached rendition of cover: it's rendered once from the cached original
+        and is kept in the same cache. If rendering of the format fails, JPEG rendition is
+        returned (and original one, if image can't be rendered at all). Format is skipped for
+        next requests only if ffmpeg doesn't have its encoder.
+        Original is requested from the cache again right before each rendering and returning:
+        concurrent requests may evict it from the cache meanwhile.
+        """
+        get_original = partial(self.get_or_download, file_obj, cache_dir_prefix, cache_file_prefix)
+        original_path = await get_original()
+        for image_format in dict.fromkeys((rendition.format, CoverFormat.JPEG)):
+            if image_format in _unsupported_formats:
+                continue
+
+            rendition_path = original_path.with_name(
+                f"{original_path.stem}_{rendition.size}.{image_format}"
+            )
+
+            async def render(dst_path: Path, image_format: CoverFormat = image_format) -> None:
+                await ffmpeg.image_rendition(
+                    await get_original(),
+                    dst_path,
+                    width=rendition.size,
+                    image_format=image_format,
+                )
 
-        return cached_path
+            try:
+                rendition_path = await get_cover_cache().get_or_fill(rendition_path, render)
+            except FFMPegPreparationError as exc:
+                logger.warning("Couldn't render cover %s: %r", rendition_path, exc)
+                if any(error in str(exc) for error in MISSING_ENCODER_ERRORS):
+                    _unsupported_formats.add(image_format)
+
+                continue
+
+            return rendition_path
+
+        return await get_original()
+
+    @staticmethod
+    def select_rendition(size: int | None, accept: str) -> CoverRendition | None:
+        """
+        Rendition for requested width: the smallest one, which isn't narrower (None if size
+        isn't requested: original is returned then). Format is the first of
+        COVER_RENDITION_FORMATS, which is accepted explicitly (`*/*` doesn't count), or JPEG.
+        """
+        if not size:
+            return None
+
+        rendition_size = next((width for width in COVER_SIZES if width >= size), COVER_SIZES[-1])
+        accepted = _accepted_media_types(accept)
+        image_format = next(
+            (
+                image_format
+                for image_format in get_app_settings().cover_rendition_formats
+                if image_format.media_type in accepted and image_format not in _unsupported_formats
+            ),
+            CoverFormat.JPEG,
+        )
+        return CoverRendition(rendition_size, image_format)
 
     @staticmethod
     def _cache_key_and_ext(file_obj: MediaFile) -> tuple[str, str]:
@@ -103,3 +192,18 @@ class CoverService:
             url,
             dst_path,
         )
+
+
+def _accepted_media_types(accept: str) -> set[str]:
+    """Media types from Accept header (excluding ones with q=0)"""
+    media_types = set()
+    for accepted in accept.split(","):
+        media_type, *params = (part.strip() for part in accepted.split(";"))
+        quality = next((param[2:] for param in params if param.startswith("q=")), "1")
+        with suppress(ValueError):
+            if float(quality) == 0:
+                continue
+
+        media_types.add(media_type.lower())
+
+    return media_types
@@ -0,0 +1,218 @@
+"""
+Size-bounded disk cache of cover images (MEDIA_CACHE_DIR): LRU by access time, atomic writes,
+one download per missed cover (single-flight) and background sweeper.
+"""
+
+import asyncio
+import logging
+import os
+import secrets
+import time
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager, suppress
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+from src.settings.app import get_app_settings
+
+logger = logging.getLogger(__name__)
+__all__ = ("CoverCache", "CoverCacheStats", "get_cover_cache", "run_cover_cache_sweeper")
+TMP_SUFFIX = ".tmp"
+# temp files of writes, which are interrupted (e.g. by process' crash), are removed by sweeper
+TMP_FILE_MAX_AGE = 3600
+
+
+class CoverCacheStats(NamedTuple):
+    hits: int
+    misses: int
+    evictions: int
+    files: int
+    size: int
+
+
+class CoverCache:
+    """
+    Files under `cache_dir` up to `max_size` bytes in total: the least recently used ones are
+    evicted. Access time is kept in the process' index and in files' atime (it is set
+    explicitly, so it doesn't depend on mount's noatime/relatime): sweeper rebuilds the index
+    from disk. Files are written to temp files and renamed, so readers never get partially
+    written covers.
+    """
+
+    def __init__(self, cache_dir: Path, max_size: int) -> None:
+        self.cache_dir = cache_dir
+        self.max_size = max_size
+        # path -> file's size (in LRU order: the least recently used first)
+        self._index: OrderedDict[Path, int] = OrderedDict()
+        self._size = 0
+        # path -> (lock, number of its users): concurrent misses wait for the first download
+        self._locks: dict[Path, tuple[asyncio.Lock, int]] = {}
+        # paths, which are added/dropped by the process while sweeper scans the disk
+        self._changed_while_scan: set[Path] | None = None
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    async def get_or_fill(self, path: Path, fill: Callable[[Path], Awaitable[None]]) -> Path:
+        """
+        Return cached `path`, or fill it in: `fill` writes file's content into the given temp
+        path, which is renamed to `path` then. Concurrent calls for the same missed path
+        share one `fill` call.
+        """
+        if self._touch(path):
+            self._hits += 1
+            return path
+
+        async with self._locked(path):
+            if self._touch(path):
+                # filled in by concurrent call, which has held the lock
+                self._hits += 1
+                return path
+
+            self._misses += 1
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{secrets.token_hex(4)}{TMP_SUFFIX}")
+            try:
+                await fill(tmp_path)
+                os.replace(tmp_path, path)
+            finally:
+                tmp_path.unlink(missing_ok=True)
+
+            self._add(path, path.stat().st_size)
+            self._evict()
+
+        return path
+
+    def stats(self) -> CoverCacheStats:
+        """Counters of the current process (since its start) and size of the indexed files"""
+        return CoverCacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            files=len(self._index),
+            size=self._size,
+        )
+
+    async def sweep(self) -> None:
+        """
+        Merge files from disk (by files' atime) into the index, so files of other processes are
+        counted, evict files above the max size and remove stale temp files. Entries, which are
+        changed by the process during the scan, are newer than the scanned ones and kept as is.
+        """
+        self._changed_while_scan = changed = set()
+        try:
+            entries = await asyncio.to_thread(self._scan)
+        finally:
+            self._changed_while_scan = None
+
+        index = OrderedDict(
+            (path, size) for _, path, size in sorted(entries) if path not in changed
+        )
+        index.update((path, size) for path, size in self._index.items() if path in changed)
+        self._index = index
+        self._size = sum(index.values())
+        self._evict()
+        logger.info("Cover cache: swept: %s", self.stats())
+
+    def _scan(self) -> list[tuple[float, Path, int]]:
+        entries: list[tuple[float, Path, int]] = []
+        for path in self.cache_dir.rglob("*"):
+            with suppress(FileNotFoundError):
+                stat = path.stat()
+                if not path.is_file():
+                    continue
+
+                if path.name.endswith(TMP_SUFFIX):
+                    if time.time() - stat.st_mtime > TMP_FILE_MAX_AGE:
+                        path.unlink(missing_ok=True)
+                    continue
+
+                entries.append((stat.st_atime, path, stat.st_size))
+
+        return entries
+
+    def _touch(self, path: Path) -> bool:
+        """Mark existing file as recently used (False for missing ones)"""
+        try:
+            stat = path.stat()
+            os.utime(path, (time.time(), stat.st_mtime))
+        except FileNotFoundError:
+            self._discard(path)
+            return False
+
+        self._add(path, stat.st_size)
+        return True
+
+    def _add(self, path: Path, size: int) -> None:
+        self._mark_changed(path)
+        self._size += size - self._index.get(path, 0)
+        self._index[path] = size
+        self._index.move_to_end(path)
+
+    def _discard(self, path: Path) -> None:
+        self._mark_changed(path)
+        self._size -= self._index.pop(path, 0)
+
+    def _mark_changed(self, path: Path) -> None:
+        if self._changed_while_scan is not None:
+            self._changed_while_scan.add(path)
+
+    def _evict(self) -> None:
+        # the most recently used file is kept even if it's larger than the whole cache
+        while self._size > self.max_size and len(self._index) > 1:
+            path, size = self._index.popitem(last=False)
+            self._mark_changed(path)
+            self._size -= size
+            self._evictions += 1
+            path.unlink(missing_ok=True)
+            logger.debug("Cover cache: evicted %s (%i bytes)", path, size)
+
+    @asynccontextmanager
+    async def _locked(self, path: Path) -> AsyncIterator[None]:
+        lock, users = self._locks.get(path, (asyncio.Lock(), 0))
+        self._locks[path] = (lock, users + 1)
+        try:
+            async with lock:
+                yield
+        finally:
+            lock, users = self._locks[path]
+            if users > 1:
+                self._locks[path] = (lock, users - 1)
+            else:
+                del self._locks[path]
+
+
+@lru_cache
+def _cover_cache(cache_dir: Path, max_size: int) -> CoverCache:
+    return CoverCache(cache_dir, max_size)
+
+
+def get_cover_cache() -> CoverCache:
+    """Process-wide cover cache (MEDIA_CACHE_DIR, MEDIA_CACHE_MAX_SIZE)"""
+    settings = get_app_settings()
+    return _cover_cache(settings.media_cache_dir, settings.media_cache_max_size)
+
+
+@asynccontextmanager
+async def run_cover_cache_sweeper() -> AsyncIterator[None]:
+    """App's lifespan: sweep cover cache at startup and every MEDIA_CACHE_SWEEP_INTERVAL"""
+
+    async def sweep_periodically() -> None:
+        interval = get_app_settings().media_cache_sweep_interval
+        while True:
+            try:
+                await get_cover_cache().sweep()
+            except OSError as exc:
+                logger.warning("Cover cache: couldn't sweep: %r", exc)
+
+            await asyncio.sleep(interval)
+
+    sweeper = asyncio.create_task(sweep_periodically())
+    try:
+        yield
+    finally:
+        sweeper.cancel()
+        with suppress(asyncio.CancelledError):
+            await sweeper
@@ -0,0 +1,164 @@
+"""RSS feeds, served by /r/{token}/ directly (RSS_DIRECT_SERVE): feed's content with its ETag."""
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import NamedTuple
+
+from litestar.exceptions import NotFoundException
+from redis.exceptions import WatchError
+
+from src.modules.db import SASessionUOW
+from src.modules.db.models.media import MediaType
+from src.modules.db.repositories import FileRepository
+from src.modules.services.redis import RedisClient
+from src.modules.services.storage import StorageS3
+from src.settings.app import get_app_settings
+
+logger = logging.getLogger(__name__)
+__all__ = ("RSSFeed", "RSSFeedService", "RSS_FEED_CACHE_KEY")
+# redis hash with fields: "etag", "content" and "version" (File.hash of the last committed feed)
+RSS_FEED_CACHE_KEY = "rss-feed:{access_token}"
+
+
+class RSSFeed(NamedTuple):
+    etag: str
+    content: bytes
+
+
+# process' LRU of feeds by access token (its entries are validated by ETag from Redis)
+_local_feeds: OrderedDict[str, RSSFeed] = OrderedDict()
+_local_feeds_size = 0
+
+
+class RSSFeedService:
+    """
+    Feed's ETag and content are cached in Redis (shared by all app's processes) by access token,
+    content is also kept in process' LRU (up to RSS_FEED_LOCAL_CACHE_SIZE bytes). Requests
+    cost one HGET of ETag (and one more of content on local miss): DB and S3 are requested
+    on Redis miss only. GenerateRSSTask invalidates cached feeds after commit of uploaded ones:
+    feed's version is kept in its place, so requests, which have read the previous feed before,
+    don't cache it again.
+    """
+
+    async def get_etag(self, access_token: str) -> str | None:
+        """ETag of cached feed (None if it isn't cached)"""
+        etag = await RedisClient().async_redis.hget(self._cache_key(access_token), "etag")
+        return etag.decode() if isinstance(etag, bytes) else etag
+
+    async def get_feed(self, access_token: str, etag: str | None = None) -> RSSFeed:
+        """
+        Cached feed (with already known ETag), or one, which is read from S3 and cached.
+        Raises NotFoundException for unknown tokens and unavailable feeds.
+        """
+        if etag:
+            if (feed := _local_feeds.get(access_token)) and feed.etag == etag:
+                _local_feeds.move_to_end(access_token)
+                return feed
+
+            cache_key = self._cache_key(access_token)
+            if content := await RedisClient().async_redis.hget(cache_key, "content"):
+                feed = RSSFeed(
+                    etag=etag,
+                    content=content.encode() if isinstance(content, str) else content,
+                )
+                self._store_local(access_token, feed)
+                return feed
+
+        feed, version = await self._fetch_feed(access_token)
+        # feed, which is uploaded, but isn't committed yet, will be invalidated: it isn't cached
+        if not version or version == feed.etag:
+            await self._store(access_token, feed)
+
+        return feed
+
+    @classmethod
+    async def invalidate(cls, versions: dict[str, str]) -> None:
+        """
+        Drop cached feeds (by access tokens) and keep their new versions (File.hash) instead:
+        only feeds of these versions can be cached then. Local caches of other processes
+        are dropped by their ETag check.
+        """
+        for access_token in versions:
+            cls._drop_local(access_token)
+
+        if not versions:
+            return
+
+        ttl = get_app_settings().rss_feed_cache_ttl
+        pipeline = RedisClient().async_redis.pipeline(transaction=True)
+        for access_token, version in versions.items():
+            cache_key = cls._cache_key(access_token)
+            pipeline.delete(cache_key)
+            pipeline.hset(cache_key, "version", version)
+            pipeline.expire(cache_key, ttl)
+
+        await pipeline.execute()
+
+    @staticmethod
+    async def _fetch_feed(access_token: str) -> tuple[RSSFeed, str]:
+        """Feed from S3 and its version (hash of the file, which is committed in DB)"""
+        async with SASessionUOW() as uow:
+            media_file = await FileRepository(session=uow.session).first_by_access_token(
+                access_token
+            )
+            if media_file is None or not media_file.available or media_file.type != MediaType.RSS:
+                raise NotFoundException("Media not found")
+
+        content = await StorageS3().get_file_content(media_file.path)
+        if content is None:
+            raise NotFoundException("Media not found")
+
+        # ETag is built from the content (not File.hash): they differ between upload of the new
+        # feed and commit of its hash
+        logger.info("[rss_feed] feed is read from storage: file_id=%s", media_file.id)
+        return RSSFeed(etag=hashlib.md5(content).hexdigest(), content=content), media_file.hash
+
+    async def _store(self, access_token: str, feed: RSSFeed) -> None:
+        """Cache the feed unless another version of it is committed (see invalidate)"""
+        cache_key = self._cache_key(access_token)
+        async with RedisClient().async_redis.pipeline(transaction=True) as pipeline:
+            try:
+                await pipeline.watch(cache_key)
+                version = await pipeline.hget(cache_key, "version")
+                version = version.decode() if isinstance(version, bytes) else version
+                if version and version != feed.etag:
+                    logger.info("[rss_feed] outdated feed isn't cached: version %s", feed.etag)
+                    return
+
+                pipeline.multi()
+                pipeline.hset(cache_key, mapping={"etag": feed.etag, "content": feed.content})
+                pipeline.expire(cache_key, get_app_settings().rss_feed_cache_ttl)
+                await pipeline.execute()
+
+            except WatchError:
+                logger.info("[rss_feed] feed is invalidated while caching: version %s", feed.etag)
+                return
+
+        self._store_local(access_token, feed)
+
+    @classmethod
+    def _store_local(cls, access_token: str, feed: RSSFeed) -> None:
+        global _local_feeds_size
+
+        max_size = get_app_settings().rss_feed_local_cache_size
+        if len(feed.content) > max_size:
+            return
+
+        cls._drop_local(access_token)
+        _local_feeds[access_token] = feed
+        _local_feeds_size += len(feed.content)
+        while _local_feeds_size > max_size:
+            _, evicted = _local_feeds.popitem(last=False)
+            _local_feeds_size -= len(evicted.content)
+
+    @staticmethod
+    def _drop_local(access_token: str) -> None:
+        global _local_feeds_size
+
+        if feed := _local_feeds.pop(access_token, None):
+            _local_feeds_size -= len(feed.content)
+
+    @staticmethod
+    def _cache_key(access_token: str) -> str:
+        return RSS_FEED_CACHE_KEY.format(access_token=access_token)
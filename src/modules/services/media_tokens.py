@@ -0,0 +1,102 @@
+"""Media tokens (/m/{token}/, /r/{token}/): cached location of the file, which token refers to."""
+
+import logging
+import time
+from collections import OrderedDict
+from typing import NamedTuple
+
+from src.modules.db.models.media import MediaType
+from src.modules.services.redis import RedisClient
+from src.settings.app import get_app_settings
+
+logger = logging.getLogger(__name__)
+__all__ = ("MediaToken", "MediaTokenCache", "MEDIA_TOKEN_CACHE_KEY")
+MEDIA_TOKEN_CACHE_KEY = "media-token:{access_token}"
+
+
+class MediaToken(NamedTuple):
+    file_id: int
+    path: str
+    type: MediaType
+    available: bool
+
+
+# process' LRU: access token -> (media token, expiration time by time.monotonic)
+_local_tokens: OrderedDict[str, tuple[MediaToken, float]] = OrderedDict()
+
+
+class MediaTokenCache:
+    """
+    Two-tier cache of tokens: process' TTL/LRU (MEDIA_TOKEN_LOCAL_*) backed by Redis.
+    FileRepository invalidates both tiers of the current process after commit of file's
+    changes, local caches of other processes expire by MEDIA_TOKEN_LOCAL_TTL (a few seconds).
+    Changes, which bypass FileRepository (e.g. edits of files in admin panel), aren't seen
+    until Redis entry expires (MEDIA_TOKEN_CACHE_TTL).
+    """
+
+    @staticmethod
+    def get_local(access_token: str) -> MediaToken | None:
+        """Token from process' cache: no I/O at all"""
+        if not (cached := _local_tokens.get(access_token)):
+            return None
+
+        media_token, expires_at = cached
+        if expires_at < time.monotonic():
+            del _local_tokens[access_token]
+            return None
+
+        _local_tokens.move_to_end(access_token)
+        return media_token
+
+    @classmethod
+    async def get(cls, access_token: str) -> MediaToken | None:
+        """Token from process' cache or from Redis (it is kept locally then)"""
+        if media_token := cls.get_local(access_token):
+            return media_token
+
+        cached = await RedisClient().async_get(cls._cache_key(access_token))
+        if not isinstance(cached, list):
+            return None
+
+        file_id, path, media_type, available = cached
+        media_token = MediaToken(file_id, path, MediaType(media_type), available)
+        cls._set_local(access_token, media_token)
+        return media_token
+
+    @classmethod
+    async def set(cls, access_token: str, media_token: MediaToken) -> None:
+        """Keep token in both tiers"""
+        await RedisClient().async_set(
+            cls._cache_key(access_token),
+            value=list(media_token),
+            ttl=get_app_settings().media_token_cache_ttl,
+        )
+        cls._set_local(access_token, media_token)
+
+    @classmethod
+    async def invalidate(cls, access_tokens: list[str]) -> None:
+        """Drop tokens of changed (or deleted) files"""
+        access_tokens = [access_token for access_token in access_tokens if access_token]
+        if not access_tokens:
+            return
+
+        for access_token in access_tokens:
+            _local_tokens.pop(access_token, None)
+
+        logger.debug("Media tokens cache: invalidating %i tokens", len(access_tokens))
+        await RedisClient().async_redis.delete(*map(cls._cache_key, access_tokens))
+
+    @staticmethod
+    def _set_local(access_token: str, media_token: MediaToken) -> None:
+        settings = get_app_settings()
+        _local_tokens[access_token] = (
+            media_token,
+            time.monotonic() + settings.media_token_local_ttl,
+        )
+        _local_tokens.move_to_end(access_token)
+        while len(_local_tokens) > settings.media_token_local_cache_size:
+            _local_tokens.popitem(last=False)
+
+    @staticmethod
+    def _cache_key(access_token: str) -> str:
+        return MEDIA_TOKEN_CACHE_KEY.format(access_token=access_token)
@@ -106,6 +106,22 @@ class RedisClient:
         """Sync pub/sub publish."""
         self.sync_redis.publish(channel, message)
 
+    def set_and_publish(
+        self,
+        key: str,
+        value: JSONT,
+        ttl: int,
+        channel: str,
+        messages: Iterable[str],
+    ) -> None:
+        """Sync JSON set + pub/sub publish sent in one round trip (non-transactional pipeline)."""
+        pipeline = self.sync_redis.pipeline(transaction=False)
+        pipeline.set(key, json.dumps(value), ex=ttl)
+        for message in messages:
+            pipeline.publish(channel, message)
+
+        pipeline.execute()
+
     async def async_set(self, key: str, value: JSONT, ttl: int = 120) -> None:
         """Set a JSON value in Redis asynchronously with a TTL."""
         logger.debug("AsyncRedis > Setting value by key %s", key)
@@ -116,6 +132,26 @@ class RedisClient:
         logger.debug("AsyncRedis > Getting value by key %s", key)
         return json.loads(await self.async_redis.get(key) or "null")
 
+    async def async_get_values(self, keys: list[str]) -> list[JSONT]:
+        """Get and decode JSON values for all keys by one MGET (None for the missing ones)."""
+        logger.debug("AsyncRedis > Getting values by %i keys", len(keys))
+        if not keys:
+            return []
+
+        return [json.loads(raw or "null") for raw in await self.async_redis.mget(keys)]
+
+    async def async_set_many(self, values: dict[str, JSONT], ttl: int = 120) -> None:
+        """Set JSON values with a TTL in one round trip (non-transactional pipeline)."""
+        logger.debug("AsyncRedis > Setting values by %i keys", len(values))
+        if not values:
+            return
+
+        pipeline = self.async_redis.pipeline(transaction=False)
+        for key, value in values.items():
+            pipeline.set(key, json.dumps(value), ex=ttl)
+
+        await pipeline.execute()
+
     async def async_publish(self, channel: str, message: str) -> None:
         """Publish a message to a Redis channel asynchronously."""
         logger.debug("AsyncRedis > Publishing message %s to channel %s ", message, channel)
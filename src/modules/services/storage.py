@@ -1,19 +1,33 @@
-import inspect
+import asyncio
+import hashlib
+import hmac
 import logging
 import mimetypes
 import os
+import urllib.parse
+from collections.abc import AsyncIterator, Iterable, Sequence
+from contextlib import suppress
+from datetime import UTC, datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Awaitable, Callable, Optional
 
 import aioboto3
 import botocore.exceptions
+from aiobotocore.config import AioConfig
+from boto3.s3.transfer import TransferConfig
 
-from src.exceptions import StorageConfigurationError
+from src.exceptions import StorageConfigurationError, UserCancellationError
 from src.modules.services.redis import RedisClient
 from src.settings.app import get_app_settings
 from src.settings.db import S3Settings
 
 logger = logging.getLogger(__name__)
+S3ClientT = Any
+
+# One S3 client (with its connection pool) per event loop; must be closed before the loop
+# stops (see close_s3_client), like async redis clients.
+_s3_client_for_loop: dict[int, tuple[Any, S3ClientT]] = {}
 
 
 def validate_s3_settings(s3_settings: S3Settings) -> None:
@@ -38,12 +52,38 @@ def validate_s3_settings(s3_settings: S3Settings) -> None:
         raise StorageConfigurationError(details=f"Missing S3 settings: {', '.join(missing)}")
 
 
+class _PartProgress:
+    """
+    Aggregates transfer's progress callbacks (called for each small read chunk)
+    into one call per uploaded part, so progress hooks (redis writes) aren't flooded.
+    """
+
+    def __init__(self, callback: Callable[[int], Any], part_size: int) -> None:
+        self._callback = callback
+        self._part_size = part_size
+        self._pending = 0
+
+    def __call__(self, chunk: int) -> None:
+        self._pending += chunk
+        if self._pending >= self._part_size:
+            self._callback(self._pending)
+            self._pending = 0
+
+    def flush(self) -> None:
+        """Report the rest of transferred bytes (the last part is usually smaller)"""
+        if self._pending:
+            self._callback(self._pending)
+            self._pending = 0
+
+
 class StorageS3:
     """Async S3 client (session singleton) for access to S3 bucket via aioboto3."""
 
     CODE_OK = 0
     CODE_CLIENT_ERROR = 1
     CODE_COMMON_ERROR = 2
+    # S3 limit for keys in one DeleteObjects request
+    DELETE_OBJECTS_LIMIT = 1000
 
     def __init__(self) -> None:
         logger.debug("Creating S3 session (aioboto3)...")
@@ -68,28 +108,139 @@ class StorageS3:
         dst_path: str | Path,
         filename: str | None = None,
         callback: Optional[Callable] = None,
+        *,
+        multipart_threshold: int | None = None,
+        part_size: int | None = None,
+        max_concurrency: int | None = None,
+        cache_control: str | None = None,
     ) -> str | None:
-        """Upload file to S3 storage."""
+        """
+        Upload file to S3 storage.
+        Large files are sent by multipart upload with parts uploaded concurrently; transfer
+        settings come from S3Settings (multipart_*) and can be overridden per call.
+        Callback is called once per uploaded part (with part's size), not per read chunk.
+        Cache-Control is stored with the object and returned by S3 on GET (along with ETag).
+        """
         mimetype, _ = mimetypes.guess_type(str(src_path))
         filename = filename or os.path.basename(str(src_path))
         dst_path = os.path.join(dst_path, filename)
+        transfer_config = TransferConfig(
+            multipart_threshold=multipart_threshold or self.settings.s3.multipart_threshold,
+            multipart_chunksize=part_size or self.settings.s3.multipart_chunksize,
+            max_concurrency=max_concurrency or self.settings.s3.multipart_max_concurrency,
+        )
+        progress = (
+            _PartProgress(callback, part_size=transfer_config.multipart_chunksize)
+            if callback
+            else None
+        )
+        extra_args = {"ContentType": mimetype}
+        if cache_control:
+            extra_args["CacheControl"] = cache_control
 
         async def _upload(s3: Any) -> None:
             await s3.upload_file(
                 Filename=str(src_path),
                 Bucket=self.settings.s3.bucket_name,
                 Key=str(dst_path),
-                Callback=callback,
-                ExtraArgs={"ContentType": mimetype},
+                Callback=progress,
+                Config=transfer_config,
+                ExtraArgs=extra_args,
             )
 
         code, _ = await self._run_with_client(_upload)
         if code != self.CODE_OK:
             return None
 
+        if progress:
+            progress.flush()
+
         logger.info("File %s successful uploaded. Remote path: %s", filename, dst_path)
         return dst_path
 
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        dst_path: str | Path,
+        filename: str,
+        content_type: str | None = None,
+        callback: Optional[Callable[[int], None]] = None,
+    ) -> tuple[str, int] | None:
+        """
+        Upload bytes produced by async iterator as S3 multipart upload.
+        Each part is sent while the next one is still being produced, so memory usage is
+        bounded by ~2 parts. Returns (remote path, uploaded size) or None on failure.
+        """
+        content_type = content_type or mimetypes.guess_type(filename)[0]
+        dst_path = os.path.join(dst_path, filename)
+        part_size = self.settings.s3.multipart_chunksize
+        bucket_kwargs = {"Bucket": self.settings.s3.bucket_name, "Key": str(dst_path)}
+
+        async def _upload_stream(s3: Any) -> int:
+            upload = await s3.create_multipart_upload(**bucket_kwargs, ContentType=content_type)
+            upload_kwargs = bucket_kwargs | {"UploadId": upload["UploadId"]}
+            parts_queue: asyncio.Queue[tuple[int, bytes] | None] = asyncio.Queue(maxsize=1)
+            uploaded_parts: list[dict[str, Any]] = []
+
+            async def _send_parts() -> None:
+                while (part := await parts_queue.get()) is not None:
+                    part_number, body = part
+                    response = await s3.upload_part(
+                        **upload_kwargs, PartNumber=part_number, Body=body
+                    )
+                    uploaded_parts.append({"ETag": response["ETag"], "PartNumber": part_number})
+                    if callback:
+                        callback(len(body))
+
+            sender = asyncio.create_task(_send_parts())
+
+            async def _put(part: tuple[int, bytes] | None) -> None:
+                put_task = asyncio.ensure_future(parts_queue.put(part))
+                await asyncio.wait({put_task, sender}, return_when=asyncio.FIRST_COMPLETED)
+                if not put_task.done():
+                    # sender has failed: nobody will consume this part, raise sender's error
+                    put_task.cancel()
+                    sender.result()
+
+            total_size, part_number, buffer = 0, 0, bytearray()
+            try:
+                async for chunk in chunks:
+                    buffer += chunk
+                    total_size += len(chunk)
+                    while len(buffer) >= part_size:
+                        part_number += 1
+                        await _put((part_number, bytes(buffer[:part_size])))
+                        del buffer[:part_size]
+
+                if buffer or not part_number:
+                    part_number += 1
+                    await _put((part_number, bytes(buffer)))
+
+                await _put(None)
+                await sender
+                await s3.complete_multipart_upload(
+                    **upload_kwargs,
+                    MultipartUpload={
+                        "Parts": sorted(uploaded_parts, key=lambda item: item["PartNumber"])
+                    },
+                )
+            except BaseException:
+                sender.cancel()
+                with suppress(Exception):
+                    await s3.abort_multipart_upload(**upload_kwargs)
+                raise
+
+            return total_size
+
+        code, uploaded_size = await self._run_with_client(_upload_stream)
+        if code != self.CODE_OK:
+            return None
+
+        logger.info(
+            "Stream %s successful uploaded (%i bytes): %s", filename, uploaded_size, dst_path
+        )
+        return dst_path, uploaded_size
+
     async def download_file(self, src_path: str | Path, dst_path: str | Path) -> str | None:
         """Download file from S3 storage."""
 
@@ -147,6 +298,16 @@ class StorageS3:
         _, result = await self._run_with_client(_head, error_log_level=error_log_level)
         return result
 
+    async def get_file_content(self, remote_path: str) -> bytes | None:
+        """Read (small) object's content into memory, e.g. RSS feed, which is served directly."""
+
+        async def _get_object(s3: Any) -> bytes:
+            response = await s3.get_object(Key=remote_path, Bucket=self.settings.s3.bucket_name)
+            return await response["Body"].read()
+
+        _, content = await self._run_with_client(_get_object)
+        return content
+
     async def get_file_size(
         self,
         filename: str | None = None,
@@ -190,57 +351,140 @@ class StorageS3:
         _, result = await self._run_with_client(_delete)
         return result
 
-    async def delete_files(self, filenames: list[str], remote_path: str) -> None:
-        """Delete multiple objects from S3."""
-        for filename in filenames:
-            dst_path = os.path.join(remote_path, filename)
-            await self.delete_file(dst_path=dst_path)
+    async def delete_files(self, filenames: list[str], remote_path: str) -> dict[str, str]:
+        """Delete multiple objects from S3 (see delete_objects)."""
+        return await self.delete_objects(
+            [os.path.join(remote_path, filename) for filename in filenames]
+        )
+
+    async def delete_objects(
+        self,
+        keys: Iterable[str],
+        batch_size: int = DELETE_OBJECTS_LIMIT,
+        max_concurrency: int = 4,
+    ) -> dict[str, str]:
+        """
+        Delete objects by DeleteObjects requests (up to 1000 keys per each one).
+        Batches are sent concurrently (no more than max_concurrency at once).
+
+        :return: failed keys with error's details (empty dict if all objects were deleted)
+        """
+        unique_keys = list(dict.fromkeys(str(key) for key in keys if key))
+        batch_size = min(batch_size, self.DELETE_OBJECTS_LIMIT)
+        batches = [
+            unique_keys[start : start + batch_size]
+            for start in range(0, len(unique_keys), batch_size)
+        ]
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def _delete_batch(batch: list[str]) -> dict[str, str]:
+
+            async def _delete_objects(s3: Any) -> dict:
+                return await s3.delete_objects(
+                    Bucket=self.settings.s3.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in batch], "Quiet": True},
+                )
+
+            async with semaphore:
+                code, response = await self._run_with_client(_delete_objects)
+
+            if code != self.CODE_OK:
+                return {key: "DeleteObjects request failed" for key in batch}
+
+            return {
+                error["Key"]: f"{error.get('Code')}: {error.get('Message')}"
+                for error in response.get("Errors", [])
+            }
+
+        failed: dict[str, str] = {}
+        for batch_failed in await asyncio.gather(*map(_delete_batch, batches)):
+            failed |= batch_failed
+
+        logger.info(
+            "Deleted %i objects from S3 (%i batches) | failed: %i",
+            len(unique_keys) - len(failed),
+            len(batches),
+            len(failed),
+        )
+        if failed:
+            logger.warning("Couldn't delete objects from S3: %s", failed)
+
+        return failed
 
     async def get_presigned_url(self, remote_path: str) -> str:
-        """Get or create cached presigned URL for object."""
-        redis = RedisClient()
-        cached_url = await redis.async_get(remote_path)
-        if isinstance(cached_url, str) and cached_url:
-            return cached_url
-
-        async def _presign(s3: Any) -> str:
-            # aioboto3 client may return a coroutine; botocore sync client returns str.
-            raw = s3.generate_presigned_url(
-                ClientMethod="get_object",
-                Params={
-                    "Bucket": self.settings.s3.bucket_name,
-                    "Key": remote_path,
-                },
-                ExpiresIn=self.settings.s3.link_expires_in,
-            )
-            if inspect.isawaitable(raw):
-                raw = await raw
-            return raw
+        """Get or create cached presigned URL for object (it's signed locally, no S3 request)."""
+        (url,) = await self.get_presigned_urls([remote_path])
+        return url
+
+    async def get_presigned_urls(self, remote_paths: Sequence[str]) -> list[str]:
+        """
+        Presigned URLs for objects (in the same order) by one Redis round trip for cached URLs
+        (MGET) and one more for the missed ones, which are signed locally (pipelined SETs).
+        """
+        if not remote_paths:
+            return []
 
-        _, url = await self._run_with_client(_presign)
-        if url:
-            await redis.async_set(
-                remote_path,
-                value=url,
-                ttl=self.settings.s3.link_cache_expires_in,
+        redis = RedisClient()
+        cached_urls = await redis.async_get_values(list(remote_paths))
+        urls = {
+            remote_path: url
+            for remote_path, url in zip(remote_paths, cached_urls, strict=True)
+            if isinstance(url, str) and url
+        }
+        cached_count = len(urls)
+        missed_paths = list(dict.fromkeys(path for path in remote_paths if path not in urls))
+        if missed_paths:
+            signed_urls = dict(
+                zip(missed_paths, get_presign_signer().presign_many(missed_paths), strict=True)
             )
+            await redis.async_set_many(signed_urls, ttl=self.settings.s3.link_cache_expires_in)
+            urls |= signed_urls
+
+        logger.debug("Presigned URLs: %i keys, %i cached", len(remote_paths), cached_count)
+        return [urls[remote_path] for remote_path in remote_paths]
+
+    async def _get_client(self) -> S3ClientT:
+        """
+        Shared S3 client bound to the current running event loop: endpoint resolution,
+        credentials and (kept-alive) connections are reused by all requests on this loop.
+        """
+        key = id(asyncio.get_running_loop())
+        if cached := _s3_client_for_loop.get(key):
+            return cached[1]
+
+        logger.debug("Creating shared S3 client for event loop %s", key)
+        client_ctx = self._session.client(
+            service_name="s3",
+            endpoint_url=self.settings.s3.storage_url,
+            config=AioConfig(
+                max_pool_connections=self.settings.s3.max_pool_connections,
+                connector_args={"keepalive_timeout": self.settings.s3.keepalive_timeout},
+            ),
+        )
+        client = await client_ctx.__aenter__()
+        if cached := _s3_client_for_loop.get(key):
+            # another coroutine has created the client while we were awaiting
+            await client_ctx.__aexit__(None, None, None)
+            return cached[1]
 
-        return url or ""
+        _s3_client_for_loop[key] = (client_ctx, client)
+        return client
 
     async def _run_with_client(
         self,
         handler: Callable[[Any], Awaitable[Any]],
         error_log_level: int = logging.ERROR,
     ) -> tuple[int, Any]:
-        """Run async handler with S3 client; return (code, result)."""
+        """Run async handler with (shared) S3 client; return (code, result)."""
         try:
-            async with self._session.client(
-                service_name="s3",
-                endpoint_url=self.settings.s3.storage_url,
-            ) as s3:
-                logger.debug("Executing S3 request: %s", handler.__name__)
-                response = await handler(s3)
-                return self.CODE_OK, response
+            s3 = await self._get_client()
+            logger.debug("Executing S3 request: %s", handler.__name__)
+            response = await handler(s3)
+            return self.CODE_OK, response
+
+        except UserCancellationError:
+            # cancellation is not a storage failure: callers have to stop processing
+            raise
 
         except botocore.exceptions.ClientError as exc:
             logger.log(
@@ -254,3 +498,135 @@ class StorageS3:
         except Exception as exc:
             logger.exception("S3 request failed %s: %r", handler.__name__, exc)
             return self.CODE_COMMON_ERROR, None
+
+
+async def close_s3_client() -> None:
+    """
+    Close the shared S3 client (and its connection pool) for the current event loop.
+
+    Call from the same loop during shutdown (app lifespan, end of RQ job asyncio.run)
+    so connections are not garbage-collected after the loop is already closed.
+    """
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+
+    cached = _s3_client_for_loop.pop(id(loop), None)
+    if cached is None:
+        return
+
+    client_ctx, _ = cached
+    try:
+        await client_ctx.__aexit__(None, None, None)
+    except Exception as exc:
+        logger.debug("S3 client wasn't closed: %r", exc)
+
+
+class S3PresignSigner:
+    """
+    Computes presigned (SigV4 query) GET URLs in-process: no S3 client, session or network.
+    Signing key is derived once per day, URLs of `presign_many` share timestamp, scope and
+    query, so each key costs one SHA-256 and one HMAC only. URLs are the same as client's
+    `generate_presigned_url` makes (path-style for custom endpoint S3_STORAGE_URL).
+    """
+
+    algorithm = "AWS4-HMAC-SHA256"
+
+    def __init__(
+        self,
+        *,
+        access_key_id: str,
+        secret_access_key: str,
+        bucket_name: str,
+        region_name: str,
+        expires_in: int,
+        storage_url: str | None = None,
+    ) -> None:
+        self.access_key_id = access_key_id
+        self.region_name = region_name
+        self.expires_in = expires_in
+        if storage_url:
+            endpoint = urllib.parse.urlsplit(storage_url)
+            self._origin = f"{endpoint.scheme}://{endpoint.netloc}"
+            self._host = endpoint.netloc
+            self._path_prefix = f"{endpoint.path.rstrip('/')}/{bucket_name}/"
+        else:
+            self._host = f"{bucket_name}.s3.{region_name}.amazonaws.com"
+            self._origin = f"https://{self._host}"
+            self._path_prefix = "/"
+
+        self._secret_key = f"AWS4{secret_access_key}".encode()
+        self._signing_key: tuple[str, bytes] = ("", b"")
+
+    def presign(self, remote_path: str) -> str:
+        """Presigned GET URL of one object"""
+        return self.presign_many([remote_path])[0]
+
+    def presign_many(self, remote_paths: Iterable[str], now: datetime | None = None) -> list[str]:
+        """Presigned GET URLs of objects (in the same order)"""
+        amz_date = (now or datetime.now(UTC)).strftime("%Y%m%dT%H%M%SZ")
+        scope = f"{amz_date[:8]}/{self.region_name}/s3/aws4_request"
+        credential = urllib.parse.quote(f"{self.access_key_id}/{scope}", safe="")
+        query = (
+            f"X-Amz-Algorithm={self.algorithm}&X-Amz-Credential={credential}"
+            f"&X-Amz-Date={amz_date}&X-Amz-Expires={self.expires_in}&X-Amz-SignedHeaders=host"
+        )
+        # canonical request: method, path, query, headers, signed headers, payload's hash
+        canonical_tail = f"\n{query}\nhost:{self._host}\n\nhost\nUNSIGNED-PAYLOAD".encode()
+        string_to_sign = f"{self.algorithm}\n{amz_date}\n{scope}\n".encode()
+        signing_key = self._get_signing_key(amz_date[:8])
+        url_prefix = self._origin
+        url_query = f"?{query}&X-Amz-Signature="
+
+        urls: list[str] = []
+        for remote_path in remote_paths:
+            path = self._path_prefix + urllib.parse.quote(remote_path, safe="/~")
+            canonical_hash = hashlib.sha256(b"GET\n" + path.encode() + canonical_tail)
+            signature = hmac.new(
+                signing_key,
+                string_to_sign + canonical_hash.hexdigest().encode(),
+                hashlib.sha256,
+            )
+            urls.append(f"{url_prefix}{path}{url_query}{signature.hexdigest()}")
+
+        return urls
+
+    def _get_signing_key(self, date_stamp: str) -> bytes:
+        signing_date, signing_key = self._signing_key
+        if signing_date != date_stamp:
+            signing_key = self._secret_key
+            for part in (date_stamp, self.region_name, "s3", "aws4_request"):
+                signing_key = hmac.new(signing_key, part.encode(), hashlib.sha256).digest()
+
+            self._signing_key = (date_stamp, signing_key)
+
+        return signing_key
+
+
+def get_presign_signer() -> S3PresignSigner:
+    """Signer for the current S3 settings (shared while settings are the same)"""
+    s3_settings = get_app_settings().s3
+    validate_s3_settings(s3_settings)
+    return _presign_signer(
+        access_key_id=str(s3_settings.access_key_id),
+        secret_access_key=(
+            s3_settings.secret_access_key.get_secret_value()
+            if s3_settings.secret_access_key
+            else ""
+        ),
+        bucket_name=s3_settings.bucket_name,
+        region_name=s3_settings.region_name or "us-east-1",
+        expires_in=s3_settings.link_expires_in,
+        storage_url=s3_settings.storage_url,
+    )
+
+
+@lru_cache(maxsize=4)
+def _presign_signer(**params: Any) -> S3PresignSigner:
+    return S3PresignSigner(**params)
+
+
+def generate_presigned_url(remote_path: str) -> str:
+    """Presigned GET URL for object, which is generated locally (see S3PresignSigner)"""
+    return get_presign_signer().presign(remote_path)
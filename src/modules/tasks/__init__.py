@@ -1,11 +1,12 @@
 from .download import DownloadEpisodeTask, UploadedEpisodeTask
 from .process import BaseEpisodePostProcessTask, DownloadEpisodeImageTask
-from .rss import GenerateRSSTask
+from .rss import GenerateRSSTask, DebouncedGenerateRSSTask
 
 __all__ = (
     "DownloadEpisodeTask",
     "UploadedEpisodeTask",
     "BaseEpisodePostProcessTask",
     "GenerateRSSTask",
+    "DebouncedGenerateRSSTask",
     "DownloadEpisodeImageTask",
 )
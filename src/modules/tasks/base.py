@@ -1,16 +1,21 @@
 import enum
 import asyncio
 import logging
+from collections.abc import Generator
+from contextlib import contextmanager
 
 from rq.job import Job
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from src.modules.db import SASessionUOW, close_database, initialize_database
 from src.modules.services.redis import RedisClient, close_async_redis_connection
+from src.modules.services.storage import close_s3_client
 from src.modules.utils.processing import TaskContext
 from src.settings.app import AppSettings, get_app_settings
 
 logger = logging.getLogger(__name__)
+# Long-lived loop shared by jobs of one worker process (see `persistent_event_loop`)
+_persistent_runner: asyncio.Runner | None = None
 
 
 class TaskResultCode(enum.StrEnum):
@@ -35,21 +40,39 @@ class RQTask:
 
     def __call__(self, *args, **kwargs) -> TaskResultCode:
         logger.info("==== STARTED task %s ====", self.name)
+        if _persistent_runner is not None:
+            finish_code = self._run_in_persistent_loop(_persistent_runner, *args, **kwargs)
+        else:
+            finish_code = asyncio.run(self._run_with_db(*args, **kwargs))
 
-        # RQ runs each job in asyncio.run(); async engine must bind to that loop, not the
-        # worker's outer lifespan loop (see worker.py DbStartMode.VERIFY).
-        async def _run_with_db() -> TaskResultCode:
-            await initialize_database()
-            try:
-                return await self._perform_and_run(*args, **kwargs)
-            finally:
-                await close_database()
-                await close_async_redis_connection()
-
-        finish_code = asyncio.run(_run_with_db())
         logger.info("==== SUCCESS task %s | code %s ====", self.name, finish_code)
         return finish_code
 
+    async def _run_with_db(self, *args, **kwargs) -> TaskResultCode:
+        """
+        RQ (fork mode) runs each job in asyncio.run(); async engine must bind to that loop,
+        not the worker's outer lifespan loop (see worker.py DbStartMode.VERIFY).
+        """
+        await initialize_database()
+        try:
+            return await self._perform_and_run(*args, **kwargs)
+        finally:
+            await close_database()
+            await close_async_redis_connection()
+            await close_s3_client()
+
+    def _run_in_persistent_loop(self, runner: asyncio.Runner, *args, **kwargs) -> TaskResultCode:
+        """
+        Run job on the worker's long-lived loop: DB engine and Redis client are already bound
+        to it, so they are reused instead of being created and disposed for every job.
+        Anything left running by the job (e.g. after RQ's timeout interrupted the loop) is
+        cancelled, so the next job starts on a clean loop.
+        """
+        try:
+            return runner.run(self._perform_and_run(*args, **kwargs))
+        finally:
+            runner.run(_cancel_pending_tasks())
+
     def __eq__(self, other):
         """Can be used for test's simplify"""
         return isinstance(other, self.__class__) and self.__class__ == other.__class__
@@ -131,3 +154,38 @@ class RQTask:
 
     def _prepare_task_context(self, *args, **kwargs) -> TaskContext:
         return TaskContext(job_id=self.get_job_id(*args, **kwargs))
+
+
+async def _cancel_pending_tasks() -> None:
+    """Cancel (and wait for) all tasks on the current loop except the calling one."""
+    current_task = asyncio.current_task()
+    pending = [task for task in asyncio.all_tasks() if task is not current_task and not task.done()]
+    if not pending:
+        return
+
+    logger.warning("Cancelling %i task(s) left by previous job", len(pending))
+    for task in pending:
+        task.cancel()
+
+    await asyncio.gather(*pending, return_exceptions=True)
+
+
+@contextmanager
+def persistent_event_loop() -> Generator[asyncio.Runner, None, None]:
+    """
+    Keep one event loop for all tasks executed in the current (non-forking) worker process.
+
+    While the context is active `RQTask.__call__` runs jobs on the yielded runner and skips
+    per-job DB/Redis initialization: resources must be opened on this loop by the caller
+    (e.g. `lifespan(..., db_start_mode=DbStartMode.INIT)` entered via `runner.run`).
+    """
+    global _persistent_runner
+    if _persistent_runner is not None:
+        raise RuntimeError("Persistent event loop is already running")
+
+    with asyncio.Runner() as runner:
+        _persistent_runner = runner
+        try:
+            yield runner
+        finally:
+            _persistent_runner = None
@@ -13,11 +13,13 @@ from src.modules.db.utils import cookie_file_ctx
 from src.modules.services.redis import RedisClient
 from src.modules.services.storage import StorageS3
 from src.modules.tasks.base import TaskResultCode, RQTask
-from src.modules.tasks.rss import GenerateRSSTask
+from src.modules.tasks.rss import schedule_rss_generation
 from src.modules.utils import processing as processing_utils
 from src.modules.utils import common as common_utils
 from src.modules.utils import ffmpeg as ffmpeg_utils
+from src.modules.utils import streaming as streaming_utils
 from src.modules.utils.common import SOURCE_CFG_MAP, SourceConfig
+from src.settings.app import get_app_settings
 
 log_levels = {
     TaskResultCode.SUCCESS: logging.INFO,
@@ -46,6 +48,8 @@ class DownloadEpisodeTask(RQTask):
     tmp_audio_path: Path
     episode_repository: EpisodeRepository
     file_repository: FileRepository
+    cancellation_listener: processing_utils.CancellationListener
+    progress_owner_ids: set[int]
 
     # pylint: disable=arguments-differ
     async def run(self, episode_id: int) -> TaskResultCode:
@@ -56,9 +60,13 @@ class DownloadEpisodeTask(RQTask):
 
         self.episode_repository = EpisodeRepository(self.db_session)
         self.file_repository = FileRepository(self.db_session)
+        self.progress_owner_ids = set()
 
         try:
-            code = await self.perform_run(int(episode_id))
+            async with processing_utils.CancellationListener(
+                int(episode_id), task_context=self.task_context
+            ) as self.cancellation_listener:
+                code = await self.perform_run(int(episode_id))
 
         except UserCancellationError as exc:
             message = "Episode downloading was interrupted by user canceling: %r"
@@ -81,7 +89,7 @@ class DownloadEpisodeTask(RQTask):
             code = TaskResultCode.ERROR
 
         finally:
-            await self._publish_redis_signal()
+            await self._publish_redis_signal(int(episode_id))
 
         return code
 
@@ -91,7 +99,8 @@ class DownloadEpisodeTask(RQTask):
 
         :raise: DownloadingInterrupted (if downloading is broken or unnecessary)
         """
-        episode = await self.episode_repository.get(episode_id)
+        # podcast's name is a part of episode's metadata
+        episode = await self.episode_repository.with_podcast().get(episode_id)
         logger.info(
             "=== [%s] START downloading process URL: %s ===",
             episode.source_id,
@@ -102,10 +111,18 @@ class DownloadEpisodeTask(RQTask):
         await self._check_is_needed(episode)
         await self._remove_unfinished(episode)
         await self._update_episodes(episode, update_data={"status": Episode.Status.DOWNLOADING})
-        self.tmp_audio_path = await self._download_episode(episode)
+        await self._bind_progress(episode)
+
+        remote_file_size: int | None = None
+        if get_app_settings().episode_streaming_mode:
+            remote_file_size = await self._stream_episode(episode)
+
+        if remote_file_size is None:
+            self.tmp_audio_path = await self._download_episode(episode)
+            await self._process_file(episode, self.tmp_audio_path)
+            remote_file_size = await self._upload_file(episode, self.tmp_audio_path)
+            processing_utils.delete_file(self.tmp_audio_path)
 
-        await self._process_file(episode, self.tmp_audio_path)
-        remote_file_size = await self._upload_file(episode, self.tmp_audio_path)
         await self._update_episodes(
             episode,
             update_data={
@@ -116,8 +133,6 @@ class DownloadEpisodeTask(RQTask):
         await self._update_files(episode, {"size": remote_file_size, "available": True})
         await self._update_all_rss(episode.source_id)
 
-        processing_utils.delete_file(self.tmp_audio_path)
-
         logger.info("=== [%s] DOWNLOADING total finished ===", episode.source_id)
         return TaskResultCode.SUCCESS
 
@@ -128,6 +143,24 @@ class DownloadEpisodeTask(RQTask):
             self.task_context.job_id,
         )
         self.task_context.save_to_redis(filename=episode.audio_filename)
+        self.cancellation_listener.watch(episode.audio_filename)
+
+    async def _bind_progress(self, episode: Episode, filename: str | None = None) -> None:
+        """Progress events are published for all episodes which share downloading file"""
+        episodes = await self.episode_repository.without_files().all(
+            source_id=episode.source_id,
+            source_type=episode.source_type,
+            status__ne=Episode.Status.ARCHIVED,
+        )
+        processing_utils.get_progress_reporter(filename or episode.audio_filename).bind(
+            processing_utils.ProgressTarget(
+                episode_id=related.id,
+                owner_id=related.owner_id,
+                podcast_id=related.podcast_id,
+            )
+            for related in episodes
+        )
+        self.progress_owner_ids = {related.owner_id for related in episodes}
 
     async def _check_is_needed(self, episode: Episode) -> None:
         """Finding already downloaded file for episode's audio file path"""
@@ -198,6 +231,49 @@ class DownloadEpisodeTask(RQTask):
         logger.info("=== [%s] DOWNLOADING was done ===", episode.source_id)
         return downloaded_path
 
+    async def _stream_episode(self, episode: Episode) -> int | None:
+        """
+        Download, process and upload episode in one pass (without tmp files).
+        Returns None if the source can't be streamed (file-based processing is used instead).
+        """
+        source_config: SourceConfig = SOURCE_CFG_MAP[episode.source_type]
+        if not (
+            source_config.need_downloading
+            and source_config.need_postprocessing
+            and episode.watch_url
+            and not episode.cookie_id
+        ):
+            return None
+
+        try:
+            stream_source = await streaming_utils.resolve_stream_source(
+                episode.watch_url, proxy_url=source_config.proxy_url
+            )
+        except YoutubeDLError as exc:
+            logger.warning(
+                "=== [%s] STREAMING: couldn't resolve source (%r), fallback to downloading ===",
+                episode.source_id,
+                exc,
+            )
+            return None
+
+        if stream_source is None:
+            return None
+
+        result = await streaming_utils.stream_episode(
+            stream_source,
+            filename=episode.audio_filename,
+            metadata=episode.generate_metadata(),
+            proxy_url=source_config.proxy_url,
+        )
+        if result is None:
+            await self._update_episodes(episode, {"status": Episode.Status.ERROR})
+            raise DownloadingInterrupted(code=TaskResultCode.ERROR)
+
+        await self._update_files(episode, {"path": result.remote_path})
+        logger.info("=== [%s] STREAMING was done (%i bytes) ===", episode.source_id, result.size)
+        return result.size
+
     async def _remove_unfinished(self, episode: Episode) -> None:
         """Finding unfinished downloading and remove file from the storage (S3)"""
 
@@ -220,10 +296,10 @@ class DownloadEpisodeTask(RQTask):
         source_config: SourceConfig = SOURCE_CFG_MAP[episode.source_type]
         if source_config.need_postprocessing:
             logger.info("=== [%s] POST PROCESSING === ", episode.source_id)
-            ffmpeg_utils.ffmpeg_preparation(src_path=tmp_audio_path)
-            ffmpeg_utils.ffmpeg_set_metadata(
+            await ffmpeg_utils.ffmpeg_preparation(
                 src_path=tmp_audio_path,
                 metadata=episode.generate_metadata(),
+                duration=episode.length,
             )
             logger.info("=== [%s] POST PROCESSING was done === ", episode.source_id)
         else:
@@ -249,14 +325,13 @@ class DownloadEpisodeTask(RQTask):
         return result_file_size
 
     async def _update_all_rss(self, source_id: str) -> None:
-        """Regenerating rss for all podcast with requested episode (by source_id)"""
+        """Scheduling rss regeneration for all podcast with requested episode (by source_id)"""
 
         logger.info("=== [%s] Updating rss for all podcast === ", source_id)
-        affected_episodes = await self.episode_repository.all(source_id=source_id)
-        podcast_ids = sorted([episode.podcast_id for episode in affected_episodes])
+        affected_episodes = await self.episode_repository.without_files().all(source_id=source_id)
+        podcast_ids = sorted({episode.podcast_id for episode in affected_episodes})
         logger.info("[%s] Found podcasts for rss updates: %s", source_id, podcast_ids)
-        generate_rss_task = GenerateRSSTask(db_session=self.db_session)
-        await generate_rss_task.run(*podcast_ids)
+        await schedule_rss_generation(podcast_ids)
 
     async def _update_episodes(self, episode: Episode, update_data: dict) -> None:
         """Updating data for episodes (filtered by source_id and source_type)"""
@@ -279,11 +354,26 @@ class DownloadEpisodeTask(RQTask):
             value=update_data,
         )
 
-    async def _publish_redis_signal(self) -> None:
-        await RedisClient().async_publish(
-            channel=self.settings.redis.progress_pubsub_ch,
-            message=self.settings.redis.progress_pubsub_signal,
-        )
+    async def _publish_redis_signal(self, episode_id: int) -> None:
+        """
+        Owners of processed episodes (incl. ones, which share its file) refetch their progress.
+        It's the best effort: errors are logged only (task's result is already known).
+        """
+        try:
+            owner_ids = self.progress_owner_ids
+            if not owner_ids:
+                # task is finished before progress' binding (e.g. skipped)
+                episode = await self.episode_repository.without_files().first(episode_id)
+                owner_ids = {episode.owner_id} if episode else set()
+
+            redis = RedisClient()
+            for owner_id in sorted(owner_ids):
+                await redis.async_publish(
+                    channel=self.settings.redis.progress_pubsub_ch,
+                    message=processing_utils.refresh_message(owner_id),
+                )
+        except Exception as exc:
+            logger.warning("Couldn't publish refresh signal: episode %s | %r", episode_id, exc)
 
 
 class UploadedEpisodeTask(DownloadEpisodeTask):
@@ -318,6 +408,8 @@ class UploadedEpisodeTask(DownloadEpisodeTask):
                 ),
             )
 
+        # remote copying reports progress of the uploaded file
+        await self._bind_progress(episode, filename=os.path.basename(episode.audio.path))
         remote_path = await self._copy_file(episode)
         remote_size = await self.storage.get_file_size(os.path.basename(remote_path))
 
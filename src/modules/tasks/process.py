@@ -90,7 +90,11 @@ class DownloadEpisodeImageTask(BaseEpisodePostProcessTask):
         if tmp_path is None:
             return None
 
-        ffmpeg.ffmpeg_preparation(src_path=tmp_path, ffmpeg_params=["-vf", "scale=600:-1"])
+        await ffmpeg.ffmpeg_preparation(
+            src_path=tmp_path,
+            ffmpeg_params=["-vf", "scale=600:-1"],
+            call_process_hook=False,
+        )
         return tmp_path
 
     async def _upload_cover(self, episode: Episode, tmp_path: Path) -> str:
@@ -115,7 +119,7 @@ class ApplyMetadataEpisodeTask(BaseEpisodePostProcessTask):
     async def perform_run(self, episode_id: int) -> TaskResultCode:
         """Apply chapter metadata to the episode audio file."""
         # getting episode from DB
-        episode = await self.episode_repository.first(episode_id)
+        episode = await self.episode_repository.with_podcast().first(episode_id)
         if not episode:
             logger.error("EpisodeMetaData %s: unable to find episode", episode_id)
             return TaskResultCode.ERROR
@@ -132,7 +136,7 @@ class ApplyMetadataEpisodeTask(BaseEpisodePostProcessTask):
         logger.debug("EpisodeMetaData: %r | episode downloaded: %r", episode, local_file_path)
 
         # apply prepared metadata to the downloaded file
-        ffmpeg.ffmpeg_set_metadata(
+        await ffmpeg.ffmpeg_set_metadata(
             src_path=local_file_path,
             metadata=episode.generate_metadata(),
         )
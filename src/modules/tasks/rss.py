@@ -1,22 +1,96 @@
+import json
+import asyncio
 import logging
+import os
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from datetime import UTC, datetime
+from functools import lru_cache, partial
+from hashlib import md5
 from pathlib import Path
+from typing import Any, NamedTuple
 
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from rq import Queue
 
-from src.modules.db.models import Podcast, File
+from src.exceptions import S3UploadingError
+from src.modules.db.models import Podcast, File, Episode
 from src.constants import FileType, EpisodeStatus
+from src.modules.db.session import after_commit
+from src.modules.services.feeds import RSSFeedService
+from src.modules.services.redis import RedisClient
 from src.modules.services.storage import StorageS3
 from src.modules.utils.processing import get_file_size
 from src.modules.tasks.base import RQTask, TaskResultCode
+from src.settings.app import get_app_settings
 from src.modules.db.repositories import (
     PodcastRepository,
     FileRepository,
     EpisodeRepository,
-    CreateT,
 )
 
-__all__ = ["GenerateRSSTask"]
+__all__ = ["GenerateRSSTask", "DebouncedGenerateRSSTask", "schedule_rss_generation"]
 logger = logging.getLogger(__name__)
+RSS_ITEM_CACHE_KEY = "rss-item:{episode_id}:{digest}"
+# time of the first change, which isn't included to podcast's RSS yet
+RSS_DIRTY_KEY = "rss-dirty:{podcast_id}"
+
+
+async def schedule_rss_generation(podcast_ids: Iterable[int]) -> None:
+    """
+    Mark podcasts' RSS as outdated and schedule its regeneration (instead of regenerating
+    it right now). Generation is postponed by every next change until RSS_DEBOUNCE_QUIET_WINDOW
+    passes without changes, but no longer than RSS_DEBOUNCE_MAX_LATENCY after the first one.
+    """
+    if podcast_ids := sorted(set(podcast_ids)):
+        await asyncio.to_thread(_schedule_rss_generation, podcast_ids)
+
+
+def _schedule_rss_generation(podcast_ids: list[int]) -> None:
+    settings = get_app_settings()
+    sync_redis = RedisClient().sync_redis
+    now = time.time()
+    pipeline = sync_redis.pipeline(transaction=False)
+    for podcast_id in podcast_ids:
+        dirty_key = RSS_DIRTY_KEY.format(podcast_id=podcast_id)
+        # expiration cleans marks up, if the scheduled job is lost
+        pipeline.set(dirty_key, repr(now), nx=True, ex=int(settings.rss_debounce_max_latency) * 2)
+        pipeline.get(dirty_key)
+
+    dirty_since = pipeline.execute()[1::2]
+    queue = Queue(
+        name=settings.rq_queue_name,
+        connection=sync_redis,
+        default_timeout=settings.rq_default_timeout,
+    )
+    for podcast_id, changed_at in zip(podcast_ids, dirty_since, strict=True):
+        changed_at = float(changed_at or now)
+        due_time = min(
+            now + settings.rss_debounce_quiet_window,
+            changed_at + settings.rss_debounce_max_latency,
+        )
+        # the same job for all changes since `changed_at`: rescheduling only moves it in time
+        job_id = f"{DebouncedGenerateRSSTask.get_job_id(podcast_id)}{int(changed_at * 1000)}"
+        queue.enqueue_at(
+            datetime.fromtimestamp(due_time, UTC),
+            DebouncedGenerateRSSTask(),
+            podcast_id,
+            job_id=job_id,
+        )
+        logger.debug("Podcast #%i: RSS generation is scheduled | job: %s", podcast_id, job_id)
+
+
+class RenderedRSS(NamedTuple):
+    path: Path
+    hash: str
+
+
+class UploadedRSS(NamedTuple):
+    podcast: Podcast
+    path: str
+    size: int
+    hash: str
 
 
 class GenerateRSSTask(RQTask):
@@ -27,7 +101,11 @@ class GenerateRSSTask(RQTask):
     file_repository: FileRepository
 
     async def run(self, *podcast_ids: int, **_) -> TaskResultCode:
-        """Run process for generation and upload RSS to the cloud (S3)"""
+        """
+        Run process for generation and upload RSS to the cloud (S3).
+        Feeds are rendered and uploaded concurrently (RSS_GENERATION_CONCURRENCY at once),
+        DB is queried and updated once for all podcasts. Unchanged feeds aren't uploaded.
+        """
 
         self.storage = StorageS3()
         self.podcast_repository = PodcastRepository(self.db_session)
@@ -35,73 +113,277 @@ class GenerateRSSTask(RQTask):
 
         filter_kwargs = {"ids": [int(pk) for pk in podcast_ids]} if podcast_ids else {}
         podcasts = await self.podcast_repository.all(**filter_kwargs)
-        results = {}
+        episodes = await self._get_published_episodes(podcasts)
+        semaphore = asyncio.Semaphore(self.settings.rss_generation_concurrency)
+
+        async def generate(podcast: Podcast) -> UploadedRSS | None:
+            async with semaphore:
+                return await self._generate(podcast, episodes[podcast.id])
 
-        for podcast in podcasts:
-            results.update(await self._generate(podcast))
+        results = await asyncio.gather(*map(generate, podcasts), return_exceptions=True)
+        uploaded: list[UploadedRSS] = []
+        failed = 0
+        for podcast, result in zip(podcasts, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error("Podcast #%i: couldn't generate RSS: %r", podcast.id, result)
+                failed += 1
+            elif result:
+                uploaded.append(result)
 
-        if TaskResultCode.ERROR in results.values():
+        await self._save_rss_files(uploaded)
+        logger.info(
+            "RSS generation finished: uploaded %i, not changed %i, failed %i",
+            len(uploaded),
+            len(podcasts) - len(uploaded) - failed,
+            failed,
+        )
+        if failed:
             return TaskResultCode.ERROR
 
         return TaskResultCode.SUCCESS
 
-    async def _generate(self, podcast: Podcast) -> dict:
-        """Render RSS and upload it"""
+    async def _get_published_episodes(self, podcasts: list[Podcast]) -> dict[int, list[Episode]]:
+        """Published episodes of all podcasts (by one query), grouped by podcast's ID"""
+        episodes: dict[int, list[Episode]] = defaultdict(list)
+        if not podcasts:
+            return episodes
+
+        episode_repository = EpisodeRepository(self.db_session)
+        for episode in await episode_repository.all(
+            podcast_id__in=[podcast.id for podcast in podcasts],
+            status=EpisodeStatus.PUBLISHED,
+            published_at__ne=None,
+        ):
+            episodes[episode.podcast_id].append(episode)
+
+        return episodes
+
+    async def _generate(self, podcast: Podcast, episodes: list[Episode]) -> UploadedRSS | None:
+        """
+        Render RSS and upload it. Rendered feed is compared with the uploaded one by content's
+        hash: byte-identical feed isn't uploaded again (returns None).
+        """
 
         logger.info("START rss generation for %s", podcast)
-        local_path = await self._render_rss_to_file(podcast)
+        rendered = await self._render_rss_to_file(podcast, episodes)
+        if podcast.rss and podcast.rss.available and podcast.rss.hash == rendered.hash:
+            logger.info("FINISH generation for %s | RSS isn't changed, upload skipped", podcast)
+            return None
+
         remote_path = await self.storage.upload_file(
-            local_path,
+            rendered.path,
             dst_path=self.settings.s3.bucket_rss_path,
+            cache_control=self.settings.rss_cache_control,
         )
         if not remote_path:
-            logger.error("Couldn't upload RSS file to storage. SKIP")
-            return {podcast.id: TaskResultCode.ERROR}
+            raise S3UploadingError(f"Couldn't upload RSS file {rendered.path} to storage")
 
-        rss_data: dict[str, CreateT] = {
-            "path": remote_path,
-            "size": get_file_size(local_path),
-            "available": True,
-        }
-        if podcast.rss_id:
-            await self.file_repository.update_by_ids([podcast.rss_id], value=rss_data)
-        else:
-            rss_file_data: dict[str, CreateT] = rss_data | {
-                "type": FileType.RSS,
-                "owner_id": podcast.owner_id,
-            }
-            rss_file: File = await self.file_repository.create(**rss_file_data)
-            await self.podcast_repository.update_by_filters(
-                filters={"id": podcast.id},
-                value={"rss_id": rss_file.id},
-            )
-
-        logger.info("Podcast #%i: RSS file uploaded, podcast record updated", podcast.id)
         logger.info("FINISH generation for %s | PATH: %s", podcast, remote_path)
-        return {podcast.id: TaskResultCode.SUCCESS}
+        return UploadedRSS(
+            podcast=podcast,
+            path=remote_path,
+            size=get_file_size(rendered.path),
+            hash=rendered.hash,
+        )
 
-    async def _render_rss_to_file(self, podcast: Podcast) -> Path:
-        """Generate rss for Podcast and Episodes marked as "published" """
+    async def _save_rss_files(self, uploaded: list[UploadedRSS]) -> None:
+        """Update existing RSS files and create missing ones by bulk statements"""
+        if existing := [rss for rss in uploaded if rss.podcast.rss_id]:
+            await self.file_repository.update_many(
+                [
+                    {
+                        "id": rss.podcast.rss_id,
+                        "path": rss.path,
+                        "size": rss.size,
+                        "hash": rss.hash,
+                        "available": True,
+                    }
+                    for rss in existing
+                ]
+            )
+            # feeds, served directly (RSS_DIRECT_SERVE), are read from S3 again after commit
+            after_commit(
+                self.db_session,
+                partial(
+                    RSSFeedService.invalidate,
+                    {rss.podcast.rss.access_token: rss.hash for rss in existing if rss.podcast.rss},
+                ),
+            )
 
-        logger.info("Podcast #%i: RSS generation has been started", podcast.id)
-        episode_repository = EpisodeRepository(self.db_session)
-        episodes = await episode_repository.all(
-            podcast_id=podcast.id,
-            status=EpisodeStatus.PUBLISHED,
-            published_at__ne=None,
+        if missing := [rss for rss in uploaded if not rss.podcast.rss_id]:
+            rss_files: list[File] = await self.file_repository.create_many(
+                [
+                    {
+                        "type": FileType.RSS,
+                        "owner_id": rss.podcast.owner_id,
+                        "path": rss.path,
+                        "size": rss.size,
+                        "hash": rss.hash,
+                        "available": True,
+                        "access_token": File.generate_token(),
+                    }
+                    for rss in missing
+                ]
+            )
+            await self.podcast_repository.update_many(
+                [
+                    {"id": rss.podcast.id, "rss_id": rss_file.id}
+                    for rss, rss_file in zip(missing, rss_files, strict=True)
+                ]
+            )
+
+        logger.info(
+            "RSS files saved: updated %i, created %i", len(existing), len(uploaded) - len(existing)
         )
-        context = {"episodes": episodes, "settings": self.settings}
-        logger.info("Podcast #%i: Adding chapters", podcast.id)
-        rss_path = self.settings.template_path / "rss" / "feed_template.xml"
 
-        with open(rss_path, encoding="utf-8") as f:
-            template = Template(f.read(), trim_blocks=True)
+    async def _render_rss_to_file(self, podcast: Podcast, episodes: list[Episode]) -> RenderedRSS:
+        """Generate rss for Podcast and its published episodes"""
 
+        logger.info("Podcast #%i: RSS generation has been started", podcast.id)
+        items = await self._render_items(podcast, episodes)
+        template = get_rss_environment(self.settings.template_path).get_template(
+            "feed_template.xml"
+        )
         rss_filename = self.settings.tmp_rss_path / f"{podcast.publish_id}.xml"
         logger.info("Podcast #%i: Generation new file rss [%s]", podcast.id, rss_filename)
-        with open(rss_filename, "wt", encoding="utf-8") as f:
-            result_rss = template.render(podcast=podcast, **context)
-            f.write(result_rss)
-
+        content_hash = await asyncio.to_thread(
+            _render_to_file,
+            template,
+            rss_filename,
+            podcast=podcast,
+            items=items,
+            settings=self.settings,
+        )
         logger.info("Podcast #%i: RSS file %s generated.", podcast.id, rss_filename)
-        return rss_filename
+        return RenderedRSS(path=rss_filename, hash=content_hash)
+
+    async def _render_items(self, podcast: Podcast, episodes: list[Episode]) -> list[str]:
+        """
+        Render `<item>` for each episode. Rendered items are cached in Redis by the hash of
+        episode's data (see `_item_cache_key`), so only new or changed episodes are rendered.
+        """
+        template = get_rss_environment(self.settings.template_path).get_template("feed_item.xml")
+        common_data = (
+            _template_digest(template),
+            self.settings.service_url,
+            self.settings.default_episode_cover,
+            self.settings.s3.storage_url,
+            self.settings.s3.bucket_name,
+        )
+        common_digest = md5(json.dumps(common_data).encode()).hexdigest()
+        keys = [self._item_cache_key(podcast, episode, common_digest) for episode in episodes]
+        redis_client = RedisClient()
+        cached_items = await redis_client.async_get_values(keys)
+        missed_episodes = {
+            key: episode
+            for key, episode, item in zip(keys, episodes, cached_items, strict=True)
+            if not isinstance(item, str)
+        }
+        rendered_items: dict[str, str] = {}
+        if missed_episodes:
+            rendered_items = await asyncio.to_thread(
+                _render_episodes, template, missed_episodes, podcast=podcast, settings=self.settings
+            )
+
+        items = [
+            item if isinstance(item, str) else rendered_items[key]
+            for key, item in zip(keys, cached_items, strict=True)
+        ]
+        await redis_client.async_set_many(rendered_items, ttl=self.settings.rss_item_cache_ttl)
+        logger.info(
+            "Podcast #%i: RSS items rendered: %i, found in cache: %i",
+            podcast.id,
+            len(rendered_items),
+            len(items) - len(rendered_items),
+        )
+        return items
+
+    @staticmethod
+    def _item_cache_key(podcast: Podcast, episode: Episode, common_digest: str) -> str:
+        """
+        Key of rendered item: changes with any value, which is used by `feed_item.xml`.
+        Files' URLs are built from their fields and settings (which are a part of
+        `common_digest`), so they aren't built for each episode here.
+        """
+        item_data = (
+            common_digest,
+            podcast.name,
+            episode.title,
+            episode.description,
+            episode.watch_url,
+            episode.author,
+            episode.chapters,
+            episode.published_at,
+            _file_data(episode.image),
+            _file_data(episode.audio),
+        )
+        digest = md5(json.dumps(item_data, default=str).encode()).hexdigest()
+        return RSS_ITEM_CACHE_KEY.format(episode_id=episode.id, digest=digest)
+
+
+class DebouncedGenerateRSSTask(GenerateRSSTask):
+    """RSS generation, which is scheduled by `schedule_rss_generation`"""
+
+    async def run(self, *podcast_ids: int, **kwargs) -> TaskResultCode:
+        """Changes after this moment will be included by the next (scheduled again) run"""
+        await RedisClient().async_redis.delete(
+            *(RSS_DIRTY_KEY.format(podcast_id=podcast_id) for podcast_id in podcast_ids)
+        )
+        return await super().run(*podcast_ids, **kwargs)
+
+
+@lru_cache
+def get_rss_environment(template_path: Path) -> Environment:
+    """
+    Jinja environment for RSS templates, shared by all tasks of the process: templates are
+    compiled once (and recompiled on change only). Compiled bytecode is cached on disk too,
+    so forked work-horses (each one renders feeds of a single job) skip compiling as well.
+    """
+    return Environment(
+        loader=FileSystemLoader(template_path / "rss"),
+        bytecode_cache=FileSystemBytecodeCache(),
+        trim_blocks=True,
+    )
+
+
+def _render_to_file(template: Template, path: Path, **context: Any) -> str:
+    """
+    Rendered document is written by chunks (it isn't kept in memory as a whole).
+    Returns MD5 of the written content: S3 uses the same one as ETag of (not multipart) object.
+    """
+    content_hash = md5()
+    with open(path, "wb") as f:
+        for chunk in template.generate(**context):
+            encoded = chunk.encode("utf-8")
+            content_hash.update(encoded)
+            f.write(encoded)
+
+    return content_hash.hexdigest()
+
+
+def _render_episodes(
+    template: Template, episodes: dict[str, Episode], **context: Any
+) -> dict[str, str]:
+    return {key: template.render(episode=episode, **context) for key, episode in episodes.items()}
+
+
+def _template_digest(template: Template) -> str:
+    if not template.filename:
+        raise ValueError(f"Template {template.name} isn't loaded from file")
+
+    return _file_digest(template.filename, os.path.getmtime(template.filename))
+
+
+@lru_cache(maxsize=16)
+def _file_digest(filename: str, mtime: float) -> str:
+    # mtime is a part of the cache's key only: changed file is read again
+    with open(filename, "rb") as f:
+        return md5(f.read()).hexdigest()
+
+
+def _file_data(file: File | None) -> tuple | None:
+    """File's fields, which its URL is built from"""
+    if not file:
+        return None
+
+    return file.path, file.size, file.available, file.public, file.source_url, file.access_token
@@ -1,16 +1,16 @@
 import os
 import re
 import uuid
+import asyncio
 import logging
 import hashlib
 import tempfile
-import subprocess
-from collections.abc import Buffer
+from collections.abc import Callable
+from functools import partial
 from pathlib import Path
 from typing import NamedTuple, TYPE_CHECKING
 from contextlib import suppress
-from multiprocessing import Process
-from src.constants import EpisodeStatus
+from src.constants import CoverFormat, EpisodeStatus
 from src.exceptions import UserCancellationError, FFMPegPreparationError, FFMPegParseError
 from src.modules.utils import common as common_utils
 from src.modules.utils import processing as proc_utils
@@ -23,6 +23,13 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 AUDIO_META_REGEXP = re.compile(r"(?P<meta>Metadata.+)?(?P<duration>Duration:\s?[\d:]+)", re.DOTALL)
+FFMPEG_ENCODE_PARAMS = ["-vn", "-acodec", "libmp3lame", "-q:a", "5"]
+# output format is set explicitly: renditions are written into temp files (see CoverCache)
+IMAGE_RENDITION_PARAMS: dict[CoverFormat, list[str]] = {
+    CoverFormat.AVIF: ["-c:v", "libaom-av1", "-still-picture", "1", "-crf", "32", "-f", "avif"],
+    CoverFormat.WEBP: ["-c:v", "libwebp", "-quality", "80", "-f", "webp"],
+    CoverFormat.JPEG: ["-c:v", "mjpeg", "-q:v", "4", "-pix_fmt", "yuvj420p", "-f", "mjpeg"],
+}
 
 
 class AudioMetaData(NamedTuple):
@@ -39,18 +46,56 @@ class CoverMetaData(NamedTuple):
     size: int
 
 
-def ffmpeg_preparation(
+class FFMpegProgress(NamedTuple):
+    """One block of ffmpeg's `-progress` report"""
+
+    out_time_us: int
+    total_size: int
+    finished: bool = False
+
+
+def build_ffmpeg_command(
+    src_path: str | Path,
+    dst_path: str | Path,
+    ffmpeg_params: list[str] | None = None,
+    metadata_path: Path | None = None,
+) -> list[str]:
+    """
+    Prepares ffmpeg's command for converting src_path -> dst_path (with given output params).
+    If metadata_path (FFMETADATA1 file) is passed, tags and chapters are taken from it
+    in the same pass, so encoding and applying metadata don't require separate rewrites.
+    """
+    command = ["ffmpeg", "-y", "-i", str(src_path)]
+    if metadata_path is not None:
+        command += [
+            "-i",
+            str(metadata_path.absolute()),
+            "-map_metadata",
+            "1",
+            "-map_chapters",
+            "1",
+        ]
+
+    return [*command, *(ffmpeg_params or FFMPEG_ENCODE_PARAMS), str(dst_path)]
+
+
+async def ffmpeg_preparation(
     src_path: str | Path,
     ffmpeg_params: list[str] | None = None,
     call_process_hook: bool = True,
+    metadata: "EpisodeMetadata | None" = None,
+    duration: int | None = None,
 ) -> None:
     """
     FFmpeg allows fixing problem with length of audio track
     (in metadata value for this is incorrect, but fact length is fully correct)
+    Episode's tags and chapters (metadata) are written during the same encoding.
+    Progress is calculated from ffmpeg's own report (encoded time against track's duration).
     """
     filename = os.path.basename(str(src_path))
     logger.info("Start FFMPEG preparations for %s === ", filename)
     total_bytes = proc_utils.get_file_size(src_path)
+    progress_callback: Callable[[FFMpegProgress], None] | None = None
     if call_process_hook:
         common_utils.episode_process_hook(
             status=EpisodeStatus.DL_EPISODE_POSTPROCESSING,
@@ -58,52 +103,40 @@ def ffmpeg_preparation(
             total_bytes=total_bytes,
             processed_bytes=0,
         )
+        if not duration:
+            with suppress(FFMPegPreparationError, FFMPegParseError):
+                duration = (await audio_metadata(src_path)).duration
+
+        progress_callback = partial(
+            _preparation_progress_hook,
+            filename=filename,
+            total_bytes=total_bytes,
+            duration=duration,
+        )
 
     settings = get_app_settings()
     tmp_path = settings.tmp_audio_path / f"tmp_{filename}"
-
-    logger.info("=== Start SUBPROCESS (filesize watching) for %s === ", filename)
-    watcher_process = Process(
-        target=proc_utils.post_processing_process_hook,
-        kwargs={
-            "filename": filename,
-            "target_path": tmp_path,
-            "total_bytes": total_bytes,
-            "src_file_path": src_path,
-        },
-    )
-    watcher_process.start()
-
+    metadata_path = write_metadata_file(metadata) if metadata else None
     try:
-        ffmpeg_params = ffmpeg_params or ["-vn", "-acodec", "libmp3lame", "-q:a", "5"]
-        completed_proc = subprocess.run(
-            ["ffmpeg", "-y", "-i", src_path, *ffmpeg_params, tmp_path],
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            check=True,
-            timeout=settings.ffmpeg_timeout,
+        output = await execute_ffmpeg(
+            build_ffmpeg_command(src_path, tmp_path, ffmpeg_params, metadata_path=metadata_path),
+            progress_callback=progress_callback,
         )
 
     except Exception as exc:
-        watcher_process.terminate()
-        # pylint: disable=no-member
-        if isinstance(exc, subprocess.CalledProcessError) and exc.returncode == 255:
-            raise UserCancellationError("Background FFMPEG processing was interrupted") from exc
-
-        common_utils.episode_process_hook(status=EpisodeStatus.ERROR, filename=filename)
         with suppress(IOError):
             os.remove(tmp_path)
 
-        watcher_process.terminate()
-        err_details = _get_error_details_from_exc(exc)
-        raise FFMPegPreparationError(err_details) from exc
+        if not isinstance(exc, UserCancellationError):
+            common_utils.episode_process_hook(status=EpisodeStatus.ERROR, filename=filename)
 
-    watcher_process.terminate()
-    logger.info(
-        "FFMPEG success done preparation for file %s:\n%s",
-        filename,
-        str(completed_proc.stdout, encoding="utf-8"),
-    )
+        raise
+
+    finally:
+        if metadata_path:
+            proc_utils.delete_file(metadata_path)
+
+    logger.info("FFMPEG success done preparation for file %s:\n%s", filename, output)
 
     try:
         if not tmp_path.exists():
@@ -127,26 +160,66 @@ def ffmpeg_preparation(
     logger.info("FFMPEG Preparation for %s was done", filename)
 
 
-def execute_ffmpeg(command: list[str]) -> str:
-    """Call ffmpeg's subprocess to execute given command"""
-    settings = get_app_settings()
+async def execute_ffmpeg(
+    command: list[str],
+    progress_callback: Callable[[FFMpegProgress], None] | None = None,
+    timeout: float | None = None,
+) -> str:
+    """
+    Run ffmpeg's command as asyncio subprocess (without blocking the event loop)
+    and return its output (ffmpeg's log). Process is terminated after `timeout` seconds
+    (FFMPEG_TIMEOUT by default).
+
+    If progress_callback is passed, ffmpeg reports its state via `-progress pipe:1`,
+    and the callback is called for each reported block. Any error raised by callback
+    (like UserCancellationError) terminates ffmpeg's process and is propagated.
+    """
+    timeout = timeout or get_app_settings().ffmpeg_timeout
+    if progress_callback is not None:
+        command = [command[0], "-progress", "pipe:1", "-nostats", *command[1:]]
+
+    logger.debug("Executing FFMPEG: '%s'", " ".join(map(str, command)))
     try:
-        logger.debug("Executing FFMPEG: '%s'", " ".join(map(str, command)))
-        completed_proc = subprocess.run(
-            command,
-            stdout=subprocess.PIPE,
-            stderr=subprocess.STDOUT,
-            check=True,
-            timeout=settings.ffmpeg_timeout,
+        process = await asyncio.create_subprocess_exec(
+            *command,
+            stdin=asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
         )
-    except (subprocess.CalledProcessError, subprocess.TimeoutExpired) as exc:
-        err_details = _get_error_details_from_exc(exc)
-        raise FFMPegPreparationError(err_details) from exc
+    except OSError as exc:
+        raise FFMPegPreparationError(f"FFMPEG failed with errors: {exc!r}") from exc
+
+    if process.stdout is None or process.stderr is None:
+        raise RuntimeError("FFMPEG subprocess was started without pipes")
+
+    stderr_reader = asyncio.create_task(process.stderr.read())
+    try:
+        async with asyncio.timeout(timeout):
+            await _read_progress(process.stdout, progress_callback)
+            return_code = await process.wait()
+            output = (await stderr_reader).decode(errors="replace")
+
+    except BaseException as exc:
+        logger.warning("Terminating FFMPEG process (pid %s): %r", process.pid, exc)
+        with suppress(ProcessLookupError):
+            process.terminate()
+
+        await process.wait()
+        stderr_reader.cancel()
+        if isinstance(exc, TimeoutError):
+            raise FFMPegPreparationError(
+                f"FFMPEG failed with errors: timeout {timeout}s exceeded"
+            ) from exc
 
-    return completed_proc.stdout.decode()
+        raise
 
+    if return_code != 0:
+        raise FFMPegPreparationError(f"FFMPEG failed with errors (code {return_code}):\n{output}")
 
-def ffmpeg_set_metadata(src_path: Path, metadata: "EpisodeMetadata") -> None:
+    return output
+
+
+async def ffmpeg_set_metadata(src_path: Path, metadata: "EpisodeMetadata") -> None:
     """
     Generates text-like metadata and apply to the target audio, placed on src_path
 
@@ -189,6 +262,36 @@ def ffmpeg_set_metadata(src_path: Path, metadata: "EpisodeMetadata") -> None:
 
     Stream #0:0: Audio: aac (LC) (mp4a / 0x6134706D), 44100 Hz, stereo, fltp, 128 kb/s
     """
+    logger.info(
+        "Start setting metadata for the file %s | chapters: %i",
+        src_path,
+        len(metadata.episode_chapters),
+    )
+    settings = get_app_settings()
+    tmp_audio_file = settings.tmp_audio_path / f"tmp_{src_path.name}"
+    metadata_file_path = write_metadata_file(metadata)
+    metadata_str = await execute_ffmpeg(
+        command=build_ffmpeg_command(
+            src_path,
+            tmp_audio_file,
+            ffmpeg_params=["-codec", "copy"],
+            metadata_path=metadata_file_path,
+        )
+    )
+    logger.debug("Generated metadata for the file %s:\n%s", src_path, metadata_str)
+    if metadata.episode_title not in metadata_str:
+        raise RuntimeError(f"Episode title '{metadata.episode_title}' not found in metadata")
+
+    logger.info("Finished setting metadata for the file %s", tmp_audio_file)
+    proc_utils.delete_file(metadata_file_path)
+
+    logger.debug("Moving updated file: %s -> %s", src_path, tmp_audio_file)
+    proc_utils.move_file(tmp_audio_file, src_path)
+    logger.info("Metadata was set for the file %s", src_path)
+
+
+def render_metadata(metadata: "EpisodeMetadata") -> str:
+    """Render episode's tags and chapters in ffmpeg's FFMETADATA1 format"""
     chapter_tpl = """
 [CHAPTER]
 TIMEBASE=1/1000
@@ -205,13 +308,7 @@ artist={episode_author}
 {chapters_rendered}
     """.lstrip()
 
-    logger.info(
-        "Start setting metadata for the file %s | chapters: %i",
-        src_path,
-        len(metadata.episode_chapters),
-    )
     settings = get_app_settings()
-    tmp_audio_file = settings.tmp_audio_path / f"tmp_{src_path.name}"
     chapters_rendered = ""
     for chapter in metadata.episode_chapters:
         chapters_rendered += chapter_tpl.rstrip().format(
@@ -220,48 +317,29 @@ artist={episode_author}
             title=cut_string(chapter.title, max_length=settings.episode_chapters_title_length),
         )
 
-    result_metadata = metadata_tpl.format(
+    return metadata_tpl.format(
         podcast_name=metadata.podcast_name,
         episode_title=metadata.episode_title,
         episode_author=metadata.episode_author or "",
         chapters_rendered=chapters_rendered,
     )
 
-    logger.debug("Generated metadata for the file %s:\n%s", src_path, result_metadata)
+
+def write_metadata_file(metadata: "EpisodeMetadata") -> Path:
+    """Store rendered metadata to tmp file (ready for using as ffmpeg's `-i` input)"""
+    settings = get_app_settings()
+    result_metadata = render_metadata(metadata)
+    logger.debug("Generated metadata for episode #%s:\n%s", metadata.episode_id, result_metadata)
     metadata_file_path = settings.tmp_meta_path / f"episode_{metadata.episode_id}.txt"
     metadata_file_path.write_text(result_metadata)
-    metadata_str = execute_ffmpeg(
-        command=[
-            "ffmpeg",
-            "-y",
-            "-i",
-            str(src_path),
-            "-i",
-            str(metadata_file_path.absolute()),
-            "-map_metadata",
-            "1",
-            "-codec",
-            "copy",
-            str(tmp_audio_file),
-        ]
-    )
-    logger.debug("Generated metadata for the file %s:\n%s", src_path, metadata_str)
-    if metadata.episode_title not in metadata_str:
-        raise RuntimeError(f"Episode title '{metadata.episode_title}' not found in metadata")
+    return metadata_file_path
 
-    logger.info("Finished setting metadata for the file %s", tmp_audio_file)
-    proc_utils.delete_file(metadata_file_path)
 
-    logger.debug("Moving updated file: %s -> %s", src_path, tmp_audio_file)
-    proc_utils.move_file(tmp_audio_file, src_path)
-    logger.info("Metadata was set for the file %s", src_path)
-
-
-def audio_metadata(file_path: Path | str) -> AudioMetaData:
+async def audio_metadata(file_path: Path | str) -> AudioMetaData:
     """Calculates (via ffmpeg) length of audio track and returns number of seconds"""
 
     with tempfile.NamedTemporaryFile() as tmp_metadata_file:
-        metadata_str = execute_ffmpeg(
+        metadata_str = await execute_ffmpeg(
             [
                 "ffmpeg",
                 "-y",
@@ -297,13 +375,13 @@ def audio_metadata(file_path: Path | str) -> AudioMetaData:
     )
 
 
-def audio_cover(audio_file_path: Path) -> CoverMetaData | None:
+async def audio_cover(audio_file_path: Path) -> CoverMetaData | None:
     """Extracts cover from audio file (if exists)"""
 
     settings = get_app_settings()
     try:
         cover_path = settings.tmp_image_path / f"tmp_cover_{uuid.uuid4().hex}.jpg"
-        execute_ffmpeg(
+        await execute_ffmpeg(
             [
                 "ffmpeg",
                 "-y",
@@ -330,6 +408,99 @@ def audio_cover(audio_file_path: Path) -> CoverMetaData | None:
     )
 
 
+async def image_rendition(
+    src_path: Path,
+    dst_path: Path,
+    width: int,
+    image_format: CoverFormat,
+) -> None:
+    """
+    Scales image down to the width (smaller images keep their size) and encodes it
+    (within COVER_RENDITION_TIMEOUT: covers are rendered while request is waiting)
+    """
+    await execute_ffmpeg(
+        build_ffmpeg_command(
+            src_path,
+            dst_path,
+            ffmpeg_params=[
+                "-frames:v",
+                "1",
+                "-vf",
+                f"scale=w='min({width},iw)':h=-2",
+                *IMAGE_RENDITION_PARAMS[image_format],
+            ],
+        ),
+        timeout=get_app_settings().cover_rendition_timeout,
+    )
+    logger.debug("Image rendition is prepared: %s -> %s (%ipx)", src_path, dst_path, width)
+
+
+def _preparation_progress_hook(
+    progress: FFMpegProgress,
+    filename: str,
+    total_bytes: int,
+    duration: int | None,
+) -> None:
+    """
+    Converts ffmpeg's progress to processed bytes of the source file (UI shows progress
+    as a ratio of bytes). Output size is used as estimation when duration is unknown.
+    """
+    if progress.finished:
+        processed_bytes = total_bytes
+    elif duration:
+        processed_bytes = int(total_bytes * progress.out_time_us / (duration * 1_000_000))
+    else:
+        processed_bytes = progress.total_size
+
+    common_utils.episode_process_hook(
+        status=EpisodeStatus.DL_EPISODE_POSTPROCESSING,
+        filename=filename,
+        total_bytes=total_bytes,
+        processed_bytes=min(processed_bytes, total_bytes),
+    )
+
+
+async def _read_progress(
+    stdout: asyncio.StreamReader,
+    progress_callback: Callable[[FFMpegProgress], None] | None,
+) -> None:
+    """
+    Reads ffmpeg's progress report (blocks of key=value lines, each one ends with
+    `progress=continue|end`) until the process closes its stdout.
+    """
+    progress_block: dict[str, str] = {}
+    async for raw_line in stdout:
+        key, _, value = raw_line.decode(errors="replace").strip().partition("=")
+        progress_block[key] = value
+        if key != "progress":
+            continue
+
+        if progress_callback is not None:
+            progress_callback(
+                FFMpegProgress(
+                    out_time_us=_safe_int(progress_block.get("out_time_us")),
+                    total_size=_safe_int(progress_block.get("total_size")),
+                    finished=(value == "end"),
+                )
+            )
+
+        progress_block = {}
+
+
+def _safe_int(value: str | None) -> int:
+    """
+    ffmpeg reports "N/A" for values which are unknown yet
+
+    >>> _safe_int("1024"), _safe_int("N/A"), _safe_int(None)
+    (1024, 0, 0)
+
+    """
+    try:
+        return int(value or 0)
+    except ValueError:
+        return 0
+
+
 def _get_file_hash(file_path: Path) -> str:
     file_content = file_path.read_bytes()
     return hashlib.sha256(file_content).hexdigest()[:32]
@@ -375,16 +546,3 @@ def _human_time_to_sec(time_str: str) -> int:
         res_time += round(float(time_item), 0) * pow(60, index)
 
     return int(res_time)
-
-
-def _get_error_details_from_exc(exc: Exception) -> str:
-    """
-    Just extracts stdout lines from given exception (if exists)
-    """
-
-    err_details = f"FFMPEG failed with errors: {exc}"
-    stdout: Buffer | None = getattr(exc, "stdout", None)
-    if stdout is not None:
-        err_details += f"\n{str(stdout, encoding='utf-8')}"
-
-    return err_details
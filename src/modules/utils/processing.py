@@ -3,12 +3,12 @@ import dataclasses
 import json
 import os
 import shutil
-import signal
-import subprocess
-import time
 import logging
+import threading
+import time
+from contextlib import suppress
 from pathlib import Path
-from typing import Iterable, Optional
+from typing import Any, Iterable, NamedTuple, Optional
 from functools import partial, lru_cache
 
 from litestar.datastructures import UploadFile
@@ -22,6 +22,8 @@ from src.modules.services.storage import StorageS3
 from src.settings.app import get_app_settings
 
 logger = logging.getLogger(__name__)
+# filename -> cancel flag of the task which processes this file (see CancellationListener)
+_cancel_flags: dict[str, threading.Event] = {}
 
 
 @dataclasses.dataclass
@@ -40,6 +42,9 @@ class TaskContext:
         """Persist this task context by source filename in Redis."""
         key = self._redis_key_pattern.format(filename)
         RedisClient().set(key, self.job_id)
+        # new task for the file: forget state cached by previous runs (persistent worker)
+        TaskContext.create_from_redis.cache_clear()
+        get_progress_reporter.cache_clear()
 
     @classmethod
     @lru_cache
@@ -53,6 +58,78 @@ class TaskContext:
         return None
 
 
+class CancellationListener:
+    """
+    Subscribes to the stop-downloading channel while the episode is processed.
+    Canceling message for the episode sets in-process flag, which is checked by progress hooks
+    of all stages for free (instead of fetching RQ job's status from redis).
+
+    >>> async with CancellationListener(episode_id, task_context) as listener:
+    ...     listener.watch(episode.audio_filename)
+    ...     ...  # hooks for episode.audio_filename raise UserCancellationError once it's canceled
+    """
+
+    def __init__(self, episode_id: int, task_context: TaskContext | None = None) -> None:
+        self.episode_id = episode_id
+        self.task_context = task_context
+        self.canceled = threading.Event()
+        self._filenames: set[str] = set()
+        self._pubsub: Any = None
+        self._listener: asyncio.Task | None = None
+
+    async def __aenter__(self) -> "CancellationListener":
+        settings = get_app_settings()
+        self._pubsub = RedisClient().async_pubsub(ignore_subscribe_messages=True)
+        await self._pubsub.subscribe(settings.redis.stop_downloading_pubsub_ch)
+        self._listener = asyncio.create_task(self._listen())
+        # canceling message could be published before subscription
+        if self.task_context and self.task_context.task_canceled():
+            self.canceled.set()
+
+        return self
+
+    async def __aexit__(self, *args: Any) -> None:
+        self._unwatch()
+        if self._listener is not None:
+            self._listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await self._listener
+
+        if self._pubsub is not None:
+            with suppress(Exception):
+                await self._pubsub.aclose()
+
+    def watch(self, filename: str) -> None:
+        """Make progress hooks of the file check this listener's flag"""
+        self._filenames.add(filename)
+        _cancel_flags[filename] = self.canceled
+
+    def _unwatch(self) -> None:
+        for filename in self._filenames:
+            if _cancel_flags.get(filename) is self.canceled:
+                del _cancel_flags[filename]
+
+        self._filenames.clear()
+
+    async def _listen(self) -> None:
+        try:
+            async for message in self._pubsub.listen():
+                try:
+                    data = json.loads(message["data"])
+                except (KeyError, TypeError, ValueError):  # fmt: skip
+                    continue
+
+                if isinstance(data, dict) and data.get("episode_id") == self.episode_id:
+                    logger.warning("Episode #%i: received canceling message", self.episode_id)
+                    self.canceled.set()
+                    return
+
+        except Exception as exc:
+            # hooks fall back to polling of RQ job's status
+            logger.exception("Episode #%i: canceling listener failed: %r", self.episode_id, exc)
+            self._unwatch()
+
+
 def delete_file(filepath: str | Path | None) -> None:
     """Delete local file"""
 
@@ -137,26 +214,153 @@ def upload_process_hook(filename: str, chunk: int) -> None:
     episode_process_hook(filename=filename, status=EpisodeStatus.DL_EPISODE_UPLOADING, chunk=chunk)
 
 
-def post_processing_process_hook(
-    filename: str,
-    target_path: str,
-    total_bytes: int,
-    src_file_path: str | Path = "",
-) -> None:
+class ProgressTarget(NamedTuple):
+    """Episode which progress' events are published for (file can be shared by episodes)"""
+
+    episode_id: int
+    owner_id: int
+    podcast_id: int
+
+
+class ProgressReporter:
     """
-    Allows handling progress for ffmpeg file's preparations
+    Processing progress of one episode's file. Updates are coalesced in memory and written
+    to redis (state + pub/sub signal in one pipeline) no more often than
+    `progress_max_flushes_per_sec` or immediately when the status is changed.
+    Events are published for bound episodes only (see `bind`): with episode_id and owner_id,
+    so they can be filtered per user. Unbound reporter keeps the state in redis only.
+    Task's cancellation is checked by the flag of CancellationListener (on each update) or,
+    if there is no listener for the file, by its own timer (`progress_cancel_check_interval`).
     """
-    processed_bytes = 0
-    while processed_bytes < total_bytes:
-        processed_bytes = get_file_size(target_path)
-        episode_process_hook(
-            filename=filename,
-            status=EpisodeStatus.DL_EPISODE_POSTPROCESSING,
-            total_bytes=total_bytes,
-            processed_bytes=processed_bytes,
-            processing_filepath=src_file_path,
+
+    def __init__(self, filename: str) -> None:
+        settings = get_app_settings()
+        self.filename = filename
+        self.event_key = RedisClient.get_key_by_filename(filename)
+        self.status: EpisodeStatus | None = None
+        self.total_bytes = 0
+        self.processed_bytes = 0
+        self.targets: list[ProgressTarget] = []
+        self._flush_interval = 1 / settings.progress_max_flushes_per_sec
+        self._cancel_check_interval = settings.progress_cancel_check_interval
+        self._flushed_at: float | None = None
+        self._cancel_checked_at: float | None = None
+        self._restored = False
+
+    def update(
+        self,
+        status: EpisodeStatus,
+        total_bytes: int = 0,
+        processed_bytes: int = 0,
+        chunk: int = 0,
+    ) -> None:
+        """
+        Apply progress' update (write it to redis if it's time to)
+
+        :raise UserCancellationError: when task was canceled by user
+        """
+        if not self._restored:
+            self._restore()
+
+        status_changed = status != self.status
+        self.status = status
+        self.total_bytes = total_bytes or self.total_bytes
+        self.processed_bytes = processed_bytes or self.processed_bytes + chunk
+
+        now = time.monotonic()
+        if status_changed or self._is_expired(self._flushed_at, self._flush_interval, now):
+            self.flush(now)
+
+        canceled = _cancel_flags.get(self.filename)
+        if canceled is not None:
+            if canceled.is_set():
+                raise UserCancellationError(f"Processing of {self.filename} was canceled")
+
+        elif self._is_expired(self._cancel_checked_at, self._cancel_check_interval, now):
+            # no listener for the file: poll RQ job's status
+            self._cancel_checked_at = now
+            self._check_canceled()
+
+    def bind(self, targets: Iterable[ProgressTarget]) -> None:
+        """Publish progress' events for given episodes"""
+        self.targets = list(targets)
+
+    def flush(self, now: float | None = None) -> None:
+        """Write current state to redis and notify progress' subscribers"""
+        if self.status is None:
+            return
+
+        settings = get_app_settings()
+        event_data: dict[str, str | int] = {
+            "event_key": self.event_key,
+            "status": str(self.status),
+            "processed_bytes": self.processed_bytes,
+            "total_bytes": self.total_bytes,
+        }
+        # events are published for owners of bound episodes only (SSE streams are per owner)
+        RedisClient().set_and_publish(
+            self.event_key,
+            event_data,
+            ttl=settings.download_event_redis_ttl,
+            channel=settings.redis.progress_pubsub_ch,
+            messages=[json.dumps(self._event(target)) for target in self.targets],
         )
-        time.sleep(1)
+        self._flushed_at = time.monotonic() if now is None else now
+        if self.processed_bytes and self.total_bytes:
+            progress = f"{self.processed_bytes / self.total_bytes:.2%}"
+        else:
+            progress = f"processed = {self.processed_bytes} | total = {self.total_bytes}"
+
+        logger.info("[%s] for %s: %s", self.status, self.filename, progress)
+
+    def _event(self, target: ProgressTarget) -> dict[str, str | int | float]:
+        completed = 0.0
+        if self.total_bytes:
+            completed = round(self.processed_bytes / self.total_bytes * 100, 2)
+
+        return {
+            "episode_id": target.episode_id,
+            "owner_id": target.owner_id,
+            "podcast_id": target.podcast_id,
+            "status": str(self.status),
+            "completed": completed,
+            "current_file_size": self.processed_bytes,
+            "total_file_size": self.total_bytes,
+        }
+
+    def _restore(self) -> None:
+        """Continue with the state left by previous stages (or previous run) of the task"""
+        current_event_data = RedisClient().get(self.event_key)
+        if current_event_data and isinstance(current_event_data, dict):
+            self.total_bytes = current_event_data.get("total_bytes", 0)
+            self.processed_bytes = current_event_data.get("processed_bytes", 0)
+
+        self._restored = True
+
+    def _check_canceled(self) -> None:
+        task_context = TaskContext.create_from_redis(self.filename)
+        if task_context and task_context.task_canceled():
+            # ffmpeg's runner terminates its subprocess when the hook raises cancellation
+            raise UserCancellationError(
+                f"Task with jobID {task_context.job_id} marked as 'canceled'"
+            )
+
+    @staticmethod
+    def _is_expired(last_time: float | None, interval: float, now: float) -> bool:
+        return last_time is None or now - last_time >= interval
+
+
+@lru_cache(maxsize=128)
+def get_progress_reporter(filename: str) -> ProgressReporter:
+    """Progress reporter (shared by all processing stages) for episode's file"""
+    return ProgressReporter(filename)
+
+
+def refresh_message(owner_id: int) -> str:
+    """Pub/sub message: statuses of owner's episodes were changed (SSE "refresh" event)"""
+    return json.dumps(
+        {"signal": get_app_settings().redis.progress_pubsub_signal, "owner_id": owner_id}
+    )
 
 
 def episode_process_hook(
@@ -165,44 +369,10 @@ def episode_process_hook(
     total_bytes: int = 0,
     processed_bytes: int = 0,
     chunk: int = 0,
-    processing_filepath: str | Path | None = None,
 ) -> None:
     """Allows handling processes of performing episode's file."""
-    redis_client = RedisClient()
-    filename = os.path.basename(filename)
-    event_key = redis_client.get_key_by_filename(filename)
-    current_event_data = redis_client.get(event_key)
-    if current_event_data and isinstance(current_event_data, dict):
-        total_bytes = total_bytes or current_event_data.get("total_bytes", 0)
-        processed_bytes = processed_bytes or current_event_data.get("processed_bytes", 0) + chunk
-
-    event_data: dict[str, str | int] = {
-        "event_key": event_key,
-        "status": str(status),
-        "processed_bytes": processed_bytes,
-        "total_bytes": total_bytes,
-    }
-    settings = get_app_settings()
-    redis_client.set(event_key, event_data, ttl=settings.download_event_redis_ttl)
-    redis_client.publish(
-        channel=settings.redis.progress_pubsub_ch,
-        message=settings.redis.progress_pubsub_signal,
-    )
-    task_context = TaskContext.create_from_redis(filename)
-    if task_context and task_context.task_canceled():
-        if status == EpisodeStatus.DL_EPISODE_POSTPROCESSING:
-            logger.warning("Canceling postprocessing task for file %s...", processing_filepath)
-            kill_process(grep=f"ffmpeg -y -i {processing_filepath}")
-            return
-
-        raise UserCancellationError(f"Task with jobID {task_context.job_id} marked as 'canceled'")
-
-    if processed_bytes and total_bytes:
-        progress = f"{processed_bytes / total_bytes:.2%}"
-    else:
-        progress = f"processed = {processed_bytes} | total = {total_bytes}"
-
-    logger.info("[%s] for %s: %s", status, filename, progress)
+    reporter = get_progress_reporter(os.path.basename(filename))
+    reporter.update(status, total_bytes=total_bytes, processed_bytes=processed_bytes, chunk=chunk)
 
 
 async def upload_episode(src_path: Path) -> str | None:
@@ -227,6 +397,8 @@ async def upload_episode(src_path: Path) -> str | None:
         episode_process_hook(filename=filename, status=EpisodeStatus.ERROR, processed_bytes=0)
         return None
 
+    # the last (coalesced) uploading progress
+    get_progress_reporter(filename).flush()
     logger.info("Great! uploading for %s was done!", filename)
     logger.debug("Finished uploading for file %s. \n Result url is %s", filename, remote_path)
     return remote_path
@@ -278,53 +450,3 @@ async def publish_redis_stop_downloading(episode_id: int) -> None:
         channel=settings.redis.stop_downloading_pubsub_ch,
         message=json.dumps({"episode_id": episode_id}),
     )
-
-
-def kill_process(grep: str) -> None:
-    """Finds (with grep) process and tries to kill it"""
-
-    try:
-        logger.debug("KILL: Trying to kill subprocess by grep: '%s'", grep)
-        process_list = subprocess.run(
-            ["ps", "aux"],
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-    except Exception as exc:
-        logger.error("KILL: Couldn't kill subprocess by grep: %s | err: %r", grep, exc)
-        return
-
-    killed_pids: list[int] = []
-    current_pid = os.getpid()
-    for line in process_list.stdout.splitlines():
-        if grep not in line:
-            continue
-
-        columns = line.split(None, 10)
-        if len(columns) < 2:
-            continue
-
-        try:
-            pid = int(columns[1])
-        except ValueError:
-            logger.warning("KILL: Couldn't parse pid from ps line: %s", line)
-            continue
-
-        if pid == current_pid:
-            continue
-
-        try:
-            os.kill(pid, signal.SIGTERM)
-        except ProcessLookupError:
-            logger.info("KILL: Process already gone for pid %s by grep: '%s'", pid, grep)
-        except PermissionError as exc:
-            logger.error("KILL: Couldn't kill pid %s by grep: %s | err: %r", pid, grep, exc)
-        else:
-            killed_pids.append(pid)
-
-    if killed_pids:
-        logger.info("KILL: Killed processes by grep: '%s' | pids: %s", grep, killed_pids)
-    else:
-        logger.info("KILL: No processes found by grep: '%s'", grep)
@@ -0,0 +1,287 @@
+"""
+Streaming episode processing: source bytes -> ffmpeg (stdin -> stdout) -> S3 multipart upload.
+
+All three stages run concurrently, so there are no intermediate tmp files and wall-clock time
+is close to the slowest stage instead of the sum of them. Only direct (http/https) sources
+can be streamed; callers fall back to the file-based processing otherwise.
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import httpx
+import yt_dlp
+
+from src.constants import EpisodeStatus
+from src.exceptions import FFMPegPreparationError, SourceFetchError
+from src.modules.services.storage import StorageS3
+from src.modules.utils import ffmpeg as ffmpeg_utils
+from src.modules.utils.processing import delete_file, episode_process_hook
+from src.settings.app import get_app_settings
+
+if TYPE_CHECKING:
+    from src.modules.db.models.podcasts import EpisodeMetadata
+
+__all__ = ("StreamSource", "StreamResult", "resolve_stream_source", "stream_episode")
+logger = logging.getLogger(__name__)
+STREAMABLE_PROTOCOLS = ("http", "https")
+# ffmpeg's stdout is consumed by chunks of this size (S3 parts are assembled from them)
+STREAM_READ_SIZE = 256 * 1024
+
+
+class StreamSource(NamedTuple):
+    """Direct media URL (resolved by yt-dlp) which can be read as HTTP stream"""
+
+    url: str
+    headers: dict[str, str]
+    filesize: int | None = None
+    # estimated by yt-dlp (it's used for progress only: actual size may differ)
+    filesize_approx: int | None = None
+    range_size: int | None = None
+
+
+class StreamResult(NamedTuple):
+    remote_path: str
+    size: int
+
+
+async def resolve_stream_source(
+    source_url: str,
+    cookie_path: Path | None = None,
+    proxy_url: str | None = None,
+) -> StreamSource | None:
+    """
+    Resolve direct URL of the best audio format without downloading it.
+    Returns None when the source can't be read as a single HTTP stream (fragmented
+    formats, merged audio+video, auth cookies) - it must be downloaded by yt-dlp itself.
+    """
+    if cookie_path:
+        logger.info("Streaming: source %s requires cookies, skip streaming", source_url)
+        return None
+
+    params: dict[str, Any] = {
+        "format": "bestaudio/best",
+        "logger": logging.getLogger("yt_dlp.YoutubeDL"),
+        "noplaylist": True,
+    }
+    if proxy_url:
+        params["proxy"] = proxy_url
+
+    with yt_dlp.YoutubeDL(params) as ydl:  # type: ignore
+        source_details = await asyncio.to_thread(ydl.extract_info, source_url, download=False)
+
+    requested_formats = source_details.get("requested_formats") or [source_details]
+    if len(requested_formats) != 1:
+        logger.info("Streaming: source %s has merged formats, skip streaming", source_url)
+        return None
+
+    media_format = requested_formats[0]
+    if media_format.get("protocol") not in STREAMABLE_PROTOCOLS or not media_format.get("url"):
+        logger.info(
+            "Streaming: source %s has not streamable protocol %r, skip streaming",
+            source_url,
+            media_format.get("protocol"),
+        )
+        return None
+
+    downloader_options = media_format.get("downloader_options") or {}
+    return StreamSource(
+        url=media_format["url"],
+        headers=dict(media_format.get("http_headers") or {}),
+        filesize=media_format.get("filesize"),
+        filesize_approx=media_format.get("filesize_approx"),
+        range_size=downloader_options.get("http_chunk_size"),
+    )
+
+
+async def stream_episode(
+    source: StreamSource,
+    filename: str,
+    metadata: "EpisodeMetadata",
+    proxy_url: str | None = None,
+) -> StreamResult | None:
+    """
+    Download source, re-encode it (with episode's tags and chapters) and upload result to S3
+    in one pass. Peak memory/disk usage is bounded by pipe buffers and ~2 multipart parts.
+
+    Note: mp3 written to a pipe has no seekable output, so ffmpeg can't rewrite Xing header
+    after encoding; players take duration from episode's metadata (RSS) in that case.
+
+    :raise UserCancellationError: when task was canceled while streaming
+    :return: uploaded file info or None if any of stages failed
+    """
+    settings = get_app_settings()
+    metadata_path = ffmpeg_utils.write_metadata_file(metadata)
+    command = ffmpeg_utils.build_ffmpeg_command(
+        "pipe:0",
+        "pipe:1",
+        ffmpeg_params=["-loglevel", "error", *ffmpeg_utils.FFMPEG_ENCODE_PARAMS, "-f", "mp3"],
+        metadata_path=metadata_path,
+    )
+    logger.info("=== Start STREAMING for %s === ", filename)
+    logger.debug("Streaming: executing FFMPEG: '%s'", " ".join(command))
+    process = await asyncio.create_subprocess_exec(
+        *command,
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    stdin, stdout, stderr = process.stdin, process.stdout, process.stderr
+    if stdin is None or stdout is None or stderr is None:
+        raise RuntimeError("FFMPEG subprocess was started without pipes")
+
+    stderr_reader = asyncio.create_task(stderr.read())
+
+    async def _feed_source() -> None:
+        try:
+            async for chunk in _iter_source(source, filename=filename, proxy_url=proxy_url):
+                stdin.write(chunk)
+                await stdin.drain()
+        finally:
+            stdin.close()
+
+    feeder = asyncio.create_task(_feed_source())
+    encoded_bytes = 0
+    uploaded_bytes = 0
+
+    async def _encoded_chunks() -> AsyncIterator[bytes]:
+        nonlocal encoded_bytes
+        while chunk := await stdout.read(STREAM_READ_SIZE):
+            encoded_bytes += len(chunk)
+            yield chunk
+
+        # source errors must fail the upload (not complete it with truncated content)
+        await feeder
+        return_code = await process.wait()
+        if return_code != 0:
+            err_details = (await stderr_reader).decode(errors="replace")
+            raise FFMPegPreparationError(f"FFMPEG failed with code {return_code}: {err_details}")
+
+    def _upload_process_hook(chunk: int) -> None:
+        nonlocal uploaded_bytes
+        uploaded_bytes += chunk
+        # while source is read, progress is reported by downloading (stages run concurrently)
+        if feeder.done():
+            episode_process_hook(
+                status=EpisodeStatus.DL_EPISODE_UPLOADING,
+                filename=filename,
+                total_bytes=encoded_bytes,
+                processed_bytes=uploaded_bytes,
+            )
+
+    try:
+        # the whole pipeline is limited: stalled source or hung ffmpeg must not hang the job
+        async with asyncio.timeout(settings.ffmpeg_timeout):
+            upload_result = await StorageS3().upload_stream(
+                _encoded_chunks(),
+                dst_path=settings.s3.bucket_audio_path,
+                filename=filename,
+                content_type="audio/mpeg",
+                callback=_upload_process_hook,
+            )
+    except TimeoutError:
+        logger.warning(
+            "Streaming: %s timed out (%is exceeded), terminating FFMPEG process (pid %s)",
+            filename,
+            settings.ffmpeg_timeout,
+            process.pid,
+        )
+        upload_result = None
+    finally:
+        feeder.cancel()
+        if process.returncode is None:
+            with suppress(ProcessLookupError):
+                process.kill()
+            await process.wait()
+
+        stderr_reader.cancel()
+        delete_file(metadata_path)
+
+    if upload_result is None:
+        logger.warning("=== STREAMING for %s was broken === ", filename)
+        episode_process_hook(filename=filename, status=EpisodeStatus.ERROR, processed_bytes=0)
+        return None
+
+    remote_path, size = upload_result
+    logger.info("=== STREAMING for %s was done (%i bytes) === ", filename, size)
+    return StreamResult(remote_path=remote_path, size=size)
+
+
+async def _iter_source(
+    source: StreamSource,
+    filename: str,
+    proxy_url: str | None = None,
+) -> AsyncIterator[bytes]:
+    """
+    Read source by HTTP ranges (like yt-dlp does for sources which throttle long responses)
+    or as one response when range size is unknown. Ranges are requested up to the exact size
+    or, if it's unknown, until a short (or 416) response. Server, which ignores ranges (200
+    instead of 206), sends the whole source: it's read from that response then.
+    Reports downloading progress.
+    """
+    total_bytes = source.filesize or source.filesize_approx or 0
+    processed_bytes = 0
+    filename = os.path.basename(filename)
+    async with httpx.AsyncClient(proxy=proxy_url, headers=source.headers, timeout=60) as client:
+        while True:
+            range_start, range_end = processed_bytes, None
+            headers = {}
+            if source.range_size:
+                range_end = range_start + source.range_size - 1
+                if source.filesize:
+                    range_end = min(range_end, source.filesize - 1)
+
+                headers = {"Range": f"bytes={range_start}-{range_end}"}
+
+            async with client.stream("GET", source.url, headers=headers) as response:
+                if response.status_code == 416 and range_start and not source.filesize:
+                    # the previous range has ended exactly at the end of the source
+                    break
+
+                response.raise_for_status()
+                is_partial = response.status_code == 206
+                # the whole source is sent: its already read part is skipped
+                skip_bytes = 0 if is_partial else range_start
+                async for chunk in response.aiter_bytes():
+                    if skip_bytes:
+                        chunk, skip_bytes = chunk[skip_bytes:], max(skip_bytes - len(chunk), 0)
+                        if not chunk:
+                            continue
+
+                    processed_bytes += len(chunk)
+                    # cheap: the hook coalesces updates and writes them to redis periodically
+                    episode_process_hook(
+                        status=EpisodeStatus.DL_EPISODE_DOWNLOADING,
+                        filename=filename,
+                        total_bytes=total_bytes,
+                        processed_bytes=processed_bytes,
+                    )
+
+                    yield chunk
+
+            if range_end is None or not is_partial:
+                break
+
+            if source.filesize and processed_bytes >= source.filesize:
+                break
+
+            if processed_bytes - range_start < range_end - range_start + 1:
+                if source.filesize:
+                    raise SourceFetchError(
+                        f"Source is truncated: {processed_bytes} of {source.filesize} bytes read"
+                    )
+
+                # short range: the end of the source (its size is unknown)
+                break
+
+    episode_process_hook(
+        status=EpisodeStatus.DL_EPISODE_DOWNLOADING,
+        filename=filename,
+        total_bytes=processed_bytes,
+        processed_bytes=processed_bytes,
+    )
@@ -150,7 +150,7 @@ class EpisodeDetailsController(BaseViewController):
         """Get episode detail page with edit form"""
         async with SASessionUOW() as uow:
             episode_repository = EpisodeRepository(session=uow.session, user_id=request.user.id)
-            episode = await episode_repository.first(episode_id)
+            episode = await episode_repository.with_podcast().first(episode_id)
             if not episode:
                 raise NotFoundException(f"Episode with id {episode_id} not found")
 
@@ -194,8 +194,16 @@ class EpisodeCoverController(BaseViewController):
     cache_file_prefix: ClassVar[str] = "episode_cover"
 
     @get("/episodes/{episode_id:int}/cover/")
-    async def get_cover(self, episode_id: int, request: AppRequest) -> File:
-        """Return episode cover image; download from S3 or source_url and cache."""
+    async def get_cover(
+        self,
+        episode_id: int,
+        request: AppRequest,
+        size: int | None = None,
+    ) -> File:
+        """
+        Return episode cover image; download from S3 or source_url and cache.
+        With `size` (width in px) the rendition is returned (in format, negotiated by Accept).
+        """
         async with SASessionUOW() as uow:
             episode_repository = EpisodeRepository(session=uow.session, user_id=request.user.id)
             episode = await episode_repository.first(episode_id)
@@ -207,12 +215,22 @@ class EpisodeCoverController(BaseViewController):
 
             image = episode.image
 
+        cover_service = CoverService()
+        rendition = cover_service.select_rendition(size, request.headers.get("Accept", ""))
         try:
-            cached_path = await CoverService().get_or_download(
-                file_obj=image,
-                cache_dir_prefix=self.cache_dir_prefix,
-                cache_file_prefix=self.cache_file_prefix,
-            )
+            if rendition:
+                cached_path = await cover_service.get_rendition(
+                    file_obj=image,
+                    cache_dir_prefix=self.cache_dir_prefix,
+                    cache_file_prefix=self.cache_file_prefix,
+                    rendition=rendition,
+                )
+            else:
+                cached_path = await cover_service.get_or_download(
+                    file_obj=image,
+                    cache_dir_prefix=self.cache_dir_prefix,
+                    cache_file_prefix=self.cache_file_prefix,
+                )
         except NotFoundException:
             settings = get_app_settings()
             cached_path = settings.app_dir / "static" / "img" / "podcast-default.jpg"
@@ -226,4 +244,10 @@ class EpisodeCoverController(BaseViewController):
             "application/octet-stream",
             None,
         )
-        return File(path=cached_path, filename=file_obj.name, media_type=media_type)
+        # format of renditions depends on Accept header (filename's extension follows it)
+        return File(
+            path=cached_path,
+            filename=f"{Path(file_obj.name).stem or 'cover'}{cached_path.suffix}",
+            media_type=media_type,
+            headers={"Vary": "Accept"},
+        )
@@ -15,7 +15,7 @@ class IndexController(BaseViewController):
             podcast_repository = PodcastRepository(session=uow.session, user_id=request.user.id)
             podcasts, _ = await podcast_repository.all_with_aggregations()
             episodes_repository = EpisodeRepository(session=uow.session, user_id=request.user.id)
-            recent_episodes, _ = await episodes_repository.all_paginated(limit=7)
+            recent_episodes, _ = await episodes_repository.with_podcast().all_paginated(limit=7)
             stats = await StatisticService(uow).get_app_statistics(owner_id=request.user.id)
 
         return self.get_response_template(
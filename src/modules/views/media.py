@@ -1,17 +1,24 @@
-"""Map secret token URLs (File.url) to S3 presigned redirects; no media bytes through Litestar."""
+"""
+Map secret token URLs (File.url) to S3 presigned redirects; no media bytes through Litestar
+(except RSS feeds in direct serve mode).
+"""
 
 import logging
 
-from litestar import get
+from litestar import Request, Response, get
 from litestar.exceptions import NotFoundException
 from litestar.response import Redirect
+from litestar.status_codes import HTTP_200_OK, HTTP_304_NOT_MODIFIED
 
 from src.constants import AuthSkip
-from src.exceptions import NotSupportedError
 from src.modules.db import SASessionUOW
 from src.modules.db.models.media import MediaType
 from src.modules.db.repositories import FileRepository
+from src.modules.services.feeds import RSSFeedService
+from src.modules.services.media_tokens import MediaToken, MediaTokenCache
+from src.modules.services.storage import generate_presigned_url
 from src.modules.views.base import BaseViewController
+from src.settings.app import get_app_settings
 
 logger = logging.getLogger(__name__)
 
@@ -36,41 +43,94 @@ class MediaByTokenController(BaseViewController):
         )
 
     @get("/r/{access_token:str}/")
-    async def get_rss_media(self, access_token: str) -> Redirect:
-        """RSS file tokens: redirect to S3."""
-        return await self._redirect_presigned(
-            access_token,
-            allowed_types=(MediaType.RSS,),
-        )
+    async def get_rss_media(self, access_token: str, request: Request) -> Redirect | Response:
+        """RSS file tokens: redirect to S3 or serve the feed from cache (RSS_DIRECT_SERVE)."""
+        if not get_app_settings().rss_direct_serve:
+            return await self._redirect_presigned(
+                access_token,
+                allowed_types=(MediaType.RSS,),
+            )
+
+        return await self._serve_rss(access_token, request.headers.get("if-none-match"))
 
     @staticmethod
+    async def _serve_rss(access_token: str, if_none_match: str | None) -> Response:
+        """Unchanged feed (client's ETag is the actual one) is answered by 304 without body"""
+        if not access_token or len(access_token) > 128:
+            raise NotFoundException("Media not found")
+
+        feed_service = RSSFeedService()
+        etag = await feed_service.get_etag(access_token)
+        headers = {"Cache-Control": get_app_settings().rss_cache_control}
+        if etag and if_none_match and (if_none_match == "*" or f'"{etag}"' in if_none_match):
+            headers["ETag"] = f'"{etag}"'
+            return Response(content=b"", status_code=HTTP_304_NOT_MODIFIED, headers=headers)
+
+        feed = await feed_service.get_feed(access_token, etag=etag)
+        headers["ETag"] = f'"{feed.etag}"'
+        return Response(
+            content=feed.content,
+            status_code=HTTP_200_OK,
+            media_type="application/rss+xml",
+            headers=headers,
+        )
+
+    @classmethod
     async def _redirect_presigned(
+        cls,
         access_token: str,
         allowed_types: tuple[MediaType, ...],
     ) -> Redirect:
+        """
+        Token's file is looked up in the cache (see MediaTokenCache) and URL is presigned
+        locally: warm requests cost neither DB query nor Redis request.
+        """
         if not access_token or len(access_token) > 128:
             raise NotFoundException("Media not found")
 
-        async with SASessionUOW() as uow:
-            repo = FileRepository(session=uow.session)
-            media_file = await repo.first_by_access_token(access_token)
-            if (
-                media_file is None
-                or not media_file.available
-                or media_file.type not in allowed_types
-            ):
-                raise NotFoundException("Media not found")
-
-        try:
-            url = await media_file.fetch_presigned_url()
-        except NotSupportedError as exc:
+        media_token = await cls._resolve_token(access_token)
+        if (
+            media_token is None
+            or not media_token.available
+            or media_token.type not in allowed_types
+        ):
+            raise NotFoundException("Media not found")
+
+        if not media_token.path:
             logger.warning(
-                "[media_token] presign failed file_id=%s type=%s: %s",
-                media_file.id,
-                media_file.type,
-                exc,
+                "[media_token] presign failed file_id=%s type=%s: file has no S3 key",
+                media_token.file_id,
+                media_token.type,
             )
-            raise NotFoundException("Media not found") from exc
+            raise NotFoundException("Media not found")
 
-        logger.info("[media_token] redirect file_id=%s type=%s", media_file.id, media_file.type)
+        url = generate_presigned_url(media_token.path)
+        logger.info(
+            "[media_token] redirect file_id=%s type=%s", media_token.file_id, media_token.type
+        )
         return Redirect(path=url, status_code=307)  # HTTP_307_TEMPORARY_REDIRECT
+
+    @staticmethod
+    async def _resolve_token(access_token: str) -> MediaToken | None:
+        """Cached token or token of the DB's file (only available files are cached)"""
+        if media_token := await MediaTokenCache.get(access_token):
+            return media_token
+
+        async with SASessionUOW() as uow:
+            repo = FileRepository(session=uow.session)
+            media_file = await repo.first_by_access_token(access_token)
+
+        if media_file is None:
+            return None
+
+        media_token = MediaToken(
+            file_id=media_file.id,
+            path=media_file.path,
+            type=media_file.type,
+            available=media_file.available,
+        )
+        # missing/unavailable files aren't cached: they become available soon (e.g. uploaded)
+        if media_token.available:
+            await MediaTokenCache.set(access_token, media_token)
+
+        return media_token
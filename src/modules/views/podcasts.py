@@ -78,8 +78,16 @@ class PodcastCoverController(BaseViewController):
     cache_file_prefix: ClassVar[str] = "podcast_cover"
 
     @get("/podcasts/{podcast_id:int}/cover/")
-    async def get_cover(self, podcast_id: int, request: AppRequest) -> File:
-        """Return podcast cover image; download from S3 or source_url and cache."""
+    async def get_cover(
+        self,
+        podcast_id: int,
+        request: AppRequest,
+        size: int | None = None,
+    ) -> File:
+        """
+        Return podcast cover image; download from S3 or source_url and cache.
+        With `size` (width in px) the rendition is returned (in format, negotiated by Accept).
+        """
 
         async with SASessionUOW() as uow:
             podcast_repository = PodcastRepository(session=uow.session, user_id=request.user.id)
@@ -90,11 +98,21 @@ class PodcastCoverController(BaseViewController):
             image = podcast.image
 
         cover_service = CoverService()
-        cached_path = await cover_service.get_or_download(
-            file_obj=image,
-            cache_dir_prefix=self.cache_dir_prefix,
-            cache_file_prefix=self.cache_file_prefix,
-        )
+        rendition = cover_service.select_rendition(size, request.headers.get("Accept", ""))
+        if rendition:
+            cached_path = await cover_service.get_rendition(
+                file_obj=image,
+                cache_dir_prefix=self.cache_dir_prefix,
+                cache_file_prefix=self.cache_file_prefix,
+                rendition=rendition,
+            )
+        else:
+            cached_path = await cover_service.get_or_download(
+                file_obj=image,
+                cache_dir_prefix=self.cache_dir_prefix,
+                cache_file_prefix=self.cache_file_prefix,
+            )
+
         return self._build_cover_file_response(cached_path, image)
 
     @staticmethod
@@ -102,4 +120,10 @@ class PodcastCoverController(BaseViewController):
         """Build File response for cover from local cache path."""
         media_type, _ = mimetypes.guess_type(str(cached_path))
         media_type = media_type or "application/octet-stream"
-        return File(path=cached_path, filename=file_obj.name, media_type=media_type)
+        # format of renditions depends on Accept header (filename's extension follows it)
+        return File(
+            path=cached_path,
+            filename=f"{Path(file_obj.name).stem or 'cover'}{cached_path.suffix}",
+            media_type=media_type,
+            headers={"Vary": "Accept"},
+        )
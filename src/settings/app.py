@@ -5,6 +5,7 @@ from pathlib import Path
 from pydantic import SecretStr, Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from src.constants import CoverFormat, WorkerMode
 from src.settings.db import DBSettings, RedisSettings, S3Settings
 from src.settings.utils import prepare_settings
 from src.settings.log import LogSettings
@@ -122,9 +123,82 @@ class AppSettings(BaseSettings):
         default=60 * 60,
         description="Download event Redis TTL in seconds",
     )
+    progress_max_flushes_per_sec: float = Field(
+        default=2.0,
+        gt=0,
+        description="Max writes of episode's processing progress to Redis per second",
+    )
+    progress_stream_keepalive: float = Field(
+        default=15.0,
+        gt=0,
+        description="Interval (in seconds) of keep-alive comments in progress' SSE stream",
+    )
+    progress_cancel_check_interval: float = Field(
+        default=2.0,
+        ge=0,
+        description="Interval (in seconds) of checking task's cancellation during processing",
+    )
+    rss_item_cache_ttl: int = Field(
+        default=30 * 24 * 3600,
+        description="TTL (in seconds) of rendered RSS items, which are reused by the next feeds",
+    )
+    rss_generation_concurrency: int = Field(
+        default=8,
+        gt=0,
+        description="Max number of podcasts, whose RSS feeds are rendered and uploaded at once",
+    )
+    rss_cache_control: str = Field(
+        default="no-cache",
+        description="Cache-Control of uploaded RSS: clients revalidate the feed by its ETag",
+    )
+    rss_direct_serve: bool = Field(
+        default=False,
+        description="Serve RSS by /r/{token}/ from cache (with ETag) instead of redirect to S3",
+    )
+    rss_feed_cache_ttl: int = Field(
+        default=24 * 3600,
+        description="TTL (in seconds) of RSS feeds, cached in Redis for direct serving",
+    )
+    rss_feed_local_cache_size: int = Field(
+        default=64 * 1024 * 1024,
+        ge=0,
+        description="Max size (in bytes) of RSS feeds, cached in memory of each app's process",
+    )
+    media_token_cache_ttl: int = Field(
+        default=3600,
+        description="TTL (in seconds) of media tokens' locations (/m/, /r/ links), cached in Redis",
+    )
+    media_token_local_ttl: float = Field(
+        default=10.0,
+        ge=0,
+        description="TTL (in seconds) of media tokens, cached in memory of each app's process",
+    )
+    media_token_local_cache_size: int = Field(
+        default=10_000,
+        ge=0,
+        description="Max number of media tokens, cached in memory of each app's process",
+    )
+    rss_debounce_quiet_window: float = Field(
+        default=30.0,
+        ge=0,
+        description="RSS is regenerated after this period (in seconds) without episodes' changes",
+    )
+    rss_debounce_max_latency: float = Field(
+        default=5 * 60.0,
+        gt=0,
+        description="Max delay (in seconds) of RSS regeneration after the first episode's change",
+    )
     rq_queue_name: str = "podcast"
     rq_default_timeout: int = Field(default=24 * 3600, description="RQ default timeout in seconds")
+    rq_worker_mode: WorkerMode = Field(
+        default=WorkerMode.FORK,
+        description="RQ worker mode: fork (loop per job) or persistent (shared loop and pools)",
+    )
     ffmpeg_timeout: int = Field(default=2 * 60 * 60, description="FFmpeg timeout in seconds")
+    episode_streaming_mode: bool = Field(
+        default=False,
+        description="Pipe source bytes through ffmpeg into S3 multipart upload (no tmp files)",
+    )
     max_upload_attempt: int = 5
     max_upload_audio_filesize: int = Field(
         default=1024 * 1024 * 512,
@@ -141,6 +215,25 @@ class AppSettings(BaseSettings):
         default_factory=lambda: ROOT_DIR / ".local" / "media_cache" / "episodes_cover",
         description="Local directory for cached episode cover images (env: MEDIA_CACHE_DIR)",
     )
+    media_cache_max_size: int = Field(
+        default=512 * 1024 * 1024,
+        ge=0,
+        description="Max size (in bytes) of cached cover images (LRU ones are evicted above it)",
+    )
+    media_cache_sweep_interval: float = Field(
+        default=5 * 60.0,
+        gt=0,
+        description="Period (in seconds) of cover cache's sweeping (by files on disk)",
+    )
+    cover_rendition_formats: list[CoverFormat] = Field(
+        default=[CoverFormat.AVIF, CoverFormat.WEBP],
+        description="Formats of cover renditions by preference (if accepted), JPEG is a fallback",
+    )
+    cover_rendition_timeout: float = Field(
+        default=10.0,
+        gt=0,
+        description="Timeout (in seconds) of one cover rendition's ffmpeg run",
+    )
     auth_password_hash_algorithm: str = "pbkdf2_sha256"
     auth_password_hash_iterations: int = 180000
     auth_cookie_secure: bool = True
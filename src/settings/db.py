@@ -35,6 +35,17 @@ class DBSettings(BaseSettings):
     retry_limit: int = 1
     retry_interval: int = 1
     echo: bool = False
+    count_cache_threshold: int = Field(
+        default=10_000,
+        ge=0,
+        description=(
+            "Paginated result sets with more items reuse the cached total count "
+            "instead of counting all rows on every page (0 disables caching)"
+        ),
+    )
+    count_cache_ttl: float = Field(
+        default=60.0, gt=0, description="Cached total count's TTL (in seconds)"
+    )
 
     @cached_property
     def database_dsn(self) -> str:
@@ -63,6 +74,25 @@ class S3Settings(BaseSettings):
     bucket_tmp_images_path: str = "tmp/images/"
     link_expires_in: int = Field(default=600, description="S3 link exp time in seconds")
     link_cache_expires_in: int = Field(default=120, description="S3 link cache exp time in seconds")
+    multipart_threshold: int = Field(
+        default=16 * 1024 * 1024,
+        ge=5 * 1024 * 1024,
+        description="Files larger than this (in bytes) are uploaded by multipart upload",
+    )
+    multipart_chunksize: int = Field(
+        default=8 * 1024 * 1024,
+        ge=5 * 1024 * 1024,
+        description="Size of each part for multipart uploads in bytes (S3 minimum is 5 MiB)",
+    )
+    multipart_max_concurrency: int = Field(
+        default=8, ge=1, description="Max number of parts uploaded concurrently"
+    )
+    max_pool_connections: int = Field(
+        default=20, ge=1, description="Max HTTP connections kept by the shared S3 client"
+    )
+    keepalive_timeout: float = Field(
+        default=30.0, gt=0, description="Idle time (sec) before a pooled S3 connection is closed"
+    )
 
     @cached_property
     def bucket_episode_images_path(self) -> Path:
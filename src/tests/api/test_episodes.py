@@ -7,6 +7,7 @@ from litestar.testing import TestClient
 from src.constants import EpisodeStatus, SourceType
 from src.main import PodcastApp
 from src.modules.db.models import User
+from src.modules.db.repositories import CursorPage
 from src.tests.factories import make_episode, make_file, make_podcast
 from src.tests.helpers import assert_error_response
 from src.tests.mocks import MockUOW
@@ -16,6 +17,7 @@ from src.tests.mocks import MockUOW
 def episode_repository(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
     repository = SimpleNamespace(
         all_paginated=AsyncMock(),
+        all_by_cursor=AsyncMock(),
         create=AsyncMock(),
         first=AsyncMock(),
         safe_delete=AsyncMock(),
@@ -64,6 +66,51 @@ class TestEpisodeListAPI:
             order_by="-created_at",
         )
 
+    def test_get_list__by_cursor(
+        self,
+        client: TestClient[PodcastApp],
+        current_user: User,
+        episode_repository: SimpleNamespace,
+    ) -> None:
+        episode = make_episode(id=1, owner_id=current_user.id)
+        episode_repository.all_by_cursor.return_value = CursorPage(
+            items=[episode], next_cursor="next-cursor", total=None
+        )
+
+        response = client.get("/api/episodes/", params={"cursor": "cursor", "limit": 1})
+
+        assert response.status_code == 200, response.text
+        response_data = response.json()
+        assert response_data["items"][0]["id"] == episode.id
+        assert response_data["next_cursor"] == "next-cursor"
+        assert response_data["total"] is None
+        episode_repository.all_by_cursor.assert_awaited_once_with(
+            cursor="cursor",
+            limit=1,
+            order_by="-created_at",
+            with_total=False,
+            owner_id=current_user.id,
+        )
+        episode_repository.all_paginated.assert_not_awaited()
+
+    def test_get_list__invalid_cursor__fail(
+        self,
+        client: TestClient[PodcastApp],
+        episode_repository: SimpleNamespace,
+    ) -> None:
+        episode_repository.all_by_cursor.side_effect = ValueError(
+            "Invalid pagination cursor: 'cursor'"
+        )
+
+        response = client.get("/api/episodes/", params={"cursor": "cursor"})
+
+        assert_error_response(
+            response,
+            status_code=400,
+            code="INVALID_PARAMETERS",
+            message="Invalid pagination cursor: 'cursor'",
+        )
+
     def test_get_podcast_episodes__ok(
         self,
         client: TestClient[PodcastApp],
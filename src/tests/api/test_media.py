@@ -95,7 +95,7 @@ class TestMediaUploadAPI:
         )
         monkeypatch.setattr("src.modules.api.media.get_file_size", Mock(return_value=512))
         monkeypatch.setattr(
-            "src.modules.api.media.ffmpeg_utils.audio_metadata", Mock(return_value=metadata)
+            "src.modules.api.media.ffmpeg_utils.audio_metadata", AsyncMock(return_value=metadata)
         )
 
         response = client.post(
@@ -163,11 +163,11 @@ class TestMediaUploadAPI:
         )
         monkeypatch.setattr("src.modules.api.media.get_file_size", Mock(return_value=512))
         monkeypatch.setattr(
-            "src.modules.api.media.ffmpeg_utils.audio_metadata", Mock(return_value=metadata)
+            "src.modules.api.media.ffmpeg_utils.audio_metadata", AsyncMock(return_value=metadata)
         )
         monkeypatch.setattr(
             "src.modules.api.media.ffmpeg_utils.audio_cover",
-            Mock(
+            AsyncMock(
                 return_value=SimpleNamespace(
                     path=Path("/tmp/cover.jpg"), hash=cover.hash, size=cover.size
                 )
@@ -201,11 +201,11 @@ class TestMediaUploadAPI:
         )
         monkeypatch.setattr("src.modules.api.media.get_file_size", Mock(return_value=512))
         monkeypatch.setattr(
-            "src.modules.api.media.ffmpeg_utils.audio_metadata", Mock(return_value=metadata)
+            "src.modules.api.media.ffmpeg_utils.audio_metadata", AsyncMock(return_value=metadata)
         )
         monkeypatch.setattr(
             "src.modules.api.media.ffmpeg_utils.audio_cover",
-            Mock(
+            AsyncMock(
                 return_value=SimpleNamespace(
                     path=Path("/tmp/cover.jpg"), hash="cover-hash", size=64
                 )
@@ -225,7 +225,7 @@ class TestMediaUploadAPI:
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         monkeypatch.setattr(
-            "src.modules.api.media.ffmpeg_utils.audio_cover", Mock(return_value=None)
+            "src.modules.api.media.ffmpeg_utils.audio_cover", AsyncMock(return_value=None)
         )
 
         assert await _upload_audio_cover(Path("/tmp/uploaded.mp3")) is None
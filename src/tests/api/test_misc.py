@@ -1,15 +1,17 @@
+import json
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from types import SimpleNamespace
-from unittest.mock import AsyncMock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from litestar.testing import TestClient
 
 from src.constants import EpisodeStatus, SourceType
 from src.main import PodcastApp
-from src.modules.api.misc import _prepare_description
+from src.modules.api.misc import _prepare_description, _progress_events
 from src.modules.db.models import User
+from src.settings.app import AppSettings
 from src.tests.factories import make_episode, make_podcast
 from src.tests.helpers import assert_error_response
 from src.tests.mocks import MockUOW
@@ -22,11 +24,11 @@ def misc_repositories(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
     monkeypatch.setattr("src.modules.api.misc.SASessionUOW", lambda: MockUOW())
     monkeypatch.setattr(
         "src.modules.api.misc.EpisodeRepository",
-        lambda session: episode_repository,
+        lambda session, **_: episode_repository,
     )
     monkeypatch.setattr(
         "src.modules.api.misc.PodcastRepository",
-        lambda session: podcast_repository,
+        lambda session, **_: podcast_repository,
     )
     return SimpleNamespace(episodes=episode_repository, podcasts=podcast_repository)
 
@@ -238,7 +240,66 @@ class TestProgressAPI:
         response_data = response.json()
         assert response_data["progressItems"][0]["episode"]["id"] == episode.id
         assert response_data["progressItems"][0]["podcast"]["id"] == podcast.id
-        misc_repositories.podcasts.all.assert_awaited_once_with(owner_id=current_user.id)
+        misc_repositories.podcasts.all.assert_awaited_once_with(ids=[podcast.id])
+
+
+class TestProgressStream:
+    @pytest.fixture
+    def pubsub(self, monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+        pubsub = SimpleNamespace(
+            subscribe=AsyncMock(return_value=None),
+            get_message=AsyncMock(return_value=None),
+            aclose=AsyncMock(return_value=None),
+        )
+        monkeypatch.setattr(
+            "src.modules.api.misc.RedisClient",
+            lambda: SimpleNamespace(async_pubsub=Mock(return_value=pubsub)),
+        )
+        return pubsub
+
+    async def test_progress_events__filtered_by_owner(
+        self,
+        app_settings: AppSettings,
+        pubsub: SimpleNamespace,
+    ) -> None:
+        own_event = json.dumps({"episode_id": 1, "owner_id": 10, "completed": 50.0})
+        signal = app_settings.redis.progress_pubsub_signal
+        own_refresh = json.dumps({"signal": signal, "owner_id": 10})
+        pubsub.get_message.side_effect = [
+            None,
+            {"data": json.dumps({"episode_id": 2, "owner_id": 20, "completed": 10.0})},
+            {"data": "unexpected"},
+            {"data": own_event},
+            {"data": json.dumps({"signal": signal, "owner_id": 20})},
+            {"data": own_refresh},
+        ]
+        events = _progress_events(owner_id=10, settings=app_settings)
+
+        progress_event = await anext(events)
+        refresh_event = await anext(events)
+        await events.aclose()
+
+        assert (progress_event.event, progress_event.data) == ("progress", own_event)
+        assert (refresh_event.event, refresh_event.data) == ("refresh", own_refresh)
+        pubsub.subscribe.assert_awaited_once_with(app_settings.redis.progress_pubsub_ch)
+        pubsub.aclose.assert_awaited_once_with()
+
+    async def test_progress_events__idle__keepalive(
+        self,
+        app_settings: AppSettings,
+        pubsub: SimpleNamespace,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        clock = iter([100.0, 101.0, 116.0, 116.0])
+        monkeypatch.setattr("src.modules.api.misc.time.monotonic", lambda: next(clock))
+        events = _progress_events(owner_id=10, settings=app_settings)
+
+        event = await anext(events)
+        await events.aclose()
+
+        assert event.comment == "keepalive"
+        assert pubsub.get_message.await_count == 2
+        pubsub.get_message.assert_awaited_with(timeout=app_settings.progress_stream_keepalive)
 
 
 @pytest.mark.parametrize(
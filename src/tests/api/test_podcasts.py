@@ -8,6 +8,7 @@ from litestar.testing import TestClient
 from src.main import PodcastApp
 from src.modules.api.podcasts import PodcastAPIController
 from src.modules.db.models import User
+from src.modules.db.repositories import CursorPage, PageCursor
 from src.tests.factories import make_episode, make_file, make_podcast
 from src.tests.helpers import assert_error_response
 from src.tests.mocks import MockUOW
@@ -17,6 +18,7 @@ from src.tests.mocks import MockUOW
 def podcast_repository(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
     repository = SimpleNamespace(
         all_with_aggregations=AsyncMock(),
+        all_with_aggregations_by_cursor=AsyncMock(),
         create=AsyncMock(),
         delete=AsyncMock(),
         first=AsyncMock(),
@@ -32,7 +34,7 @@ def podcast_repository(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
 def episode_repository(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
     repository = SimpleNamespace(
         all=AsyncMock(return_value=[]),
-        safe_delete=AsyncMock(return_value=None),
+        safe_delete=AsyncMock(return_value=[]),
     )
     monkeypatch.setattr("src.modules.api.podcasts.EpisodeRepository", lambda session: repository)
     return repository
@@ -72,6 +74,49 @@ class TestPodcastListCreateAPI:
             owner_id=current_user.id,
         )
 
+    def test_get_list__next_cursor(
+        self,
+        client: TestClient[PodcastApp],
+        current_user: User,
+        podcast_repository: SimpleNamespace,
+    ) -> None:
+        podcast = make_podcast(id=11, owner_id=current_user.id)
+        podcast_repository.all_with_aggregations.return_value = ([podcast], 2)
+
+        response = client.get(self.url, params={"limit": 1})
+
+        assert response.status_code == 200, response.text
+        response_data = response.json()
+        assert response_data["total"] == 2
+        assert response_data["next_cursor"] == PageCursor(podcast.created_at, podcast.id).encode()
+
+    def test_get_list__by_cursor(
+        self,
+        client: TestClient[PodcastApp],
+        current_user: User,
+        podcast_repository: SimpleNamespace,
+    ) -> None:
+        podcast = make_podcast(id=11, owner_id=current_user.id)
+        podcast_repository.all_with_aggregations_by_cursor.return_value = CursorPage(
+            items=[podcast], next_cursor=None, total=3
+        )
+
+        response = client.get(self.url, params={"cursor": "cursor", "with_total": True})
+
+        assert response.status_code == 200, response.text
+        response_data = response.json()
+        assert response_data["items"][0]["id"] == podcast.id
+        assert response_data["next_cursor"] is None
+        assert response_data["total"] == 3
+        podcast_repository.all_with_aggregations_by_cursor.assert_awaited_once_with(
+            cursor="cursor",
+            limit=10,
+            order_by="-created_at",
+            with_total=True,
+            owner_id=current_user.id,
+        )
+        podcast_repository.all_with_aggregations.assert_not_awaited()
+
     def test_create__ok(
         self,
         client: TestClient[PodcastApp],
@@ -345,6 +390,35 @@ class TestPodcastDetailsAPI:
         episode_repository.safe_delete.assert_awaited_once_with(episode)
         podcast_repository.delete.assert_awaited_once_with(podcast)
 
+    def test_delete__removes_files_from_storage__ok(
+        self,
+        client: TestClient[PodcastApp],
+        current_user: User,
+        podcast_repository: SimpleNamespace,
+        episode_repository: SimpleNamespace,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        podcast = make_podcast(id=44, owner_id=current_user.id)
+        episodes = [
+            make_episode(id=45, owner_id=current_user.id, podcast_id=podcast.id),
+            make_episode(id=46, owner_id=current_user.id, podcast_id=podcast.id),
+        ]
+        podcast_repository.first.return_value = podcast
+        episode_repository.all.return_value = episodes
+        episode_repository.safe_delete.side_effect = [
+            ["audio/episode-45.mp3", "images/episode-45.png"],
+            ["audio/episode-46.mp3"],
+        ]
+        storage = SimpleNamespace(delete_objects=AsyncMock(return_value={}))
+        monkeypatch.setattr("src.modules.api.podcasts.StorageS3", lambda: storage)
+
+        response = client.delete(self.url.format(podcast_id=podcast.id))
+
+        assert response.status_code == 204, response.text
+        storage.delete_objects.assert_awaited_once_with(
+            ["audio/episode-45.mp3", "images/episode-45.png", "audio/episode-46.mp3"]
+        )
+
     def test_delete__not_found__fail(
         self,
         client: TestClient[PodcastApp],
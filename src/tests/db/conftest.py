@@ -0,0 +1,168 @@
+"""
+Repositories are tested against in-memory sqlite (through a sync session),
+so the tests don't depend on any running DB.
+"""
+
+from collections.abc import Generator
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.schema import CreateColumn
+
+from src.constants import EpisodeStatus, SourceType
+from src.modules.db.models import BaseModel, File, User
+from src.modules.db.models.media import MediaType
+from src.modules.db.models.podcasts import Cookie, Episode, Podcast
+from src.modules.db.repositories import EpisodeRepository, PodcastRepository
+from src.modules.db.session import run_after_commit_callbacks
+from src.utils import utcnow
+
+PODCASTS_COUNT = 3
+EPISODES_PER_PODCAST = 4
+
+
+@compiles(JSONB, "sqlite")
+def _compile_jsonb(type_: JSONB, compiler: Any, **kw: Any) -> str:
+    return "JSON"
+
+
+@compiles(CreateColumn, "sqlite")
+def _compile_create_column(element: CreateColumn, compiler: Any, **kw: Any) -> str:
+    column_ddl = compiler.visit_create_column(element, **kw)
+    return column_ddl.replace("DEFAULT now()", "DEFAULT CURRENT_TIMESTAMP")
+
+
+class SyncSessionAdapter:
+    """Async session's interface (used by repositories) over the sync session"""
+
+    def __init__(self, session: Session) -> None:
+        self.sync_session = session
+
+    async def execute(self, *args: Any, **kwargs: Any) -> Any:
+        return self.sync_session.execute(*args, **kwargs)
+
+    async def scalar(self, *args: Any, **kwargs: Any) -> Any:
+        return self.sync_session.scalar(*args, **kwargs)
+
+    async def scalars(self, *args: Any, **kwargs: Any) -> Any:
+        return self.sync_session.scalars(*args, **kwargs)
+
+    async def flush(self) -> None:
+        self.sync_session.flush()
+
+    async def commit(self) -> None:
+        self.sync_session.commit()
+        await run_after_commit_callbacks(self)  # type: ignore[arg-type]
+
+    @property
+    def info(self) -> dict[str, Any]:
+        return self.sync_session.info
+
+
+class StatementsCounter:
+    def __init__(self, engine: sa.Engine) -> None:
+        self.statements: list[str] = []
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+
+    def _on_execute(self, conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        self.statements.append(statement)
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def reset(self) -> None:
+        self.statements.clear()
+
+
+@pytest.fixture(autouse=True)
+def db_settings(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    """Counts aren't cached by default: seeded result sets are far below the threshold"""
+    settings = SimpleNamespace(count_cache_threshold=10_000, count_cache_ttl=60.0)
+    monkeypatch.setattr("src.modules.db.repositories.get_db_settings", lambda: settings)
+    monkeypatch.setattr("src.modules.db.repositories._cached_counts", {})
+    return settings
+
+
+@pytest.fixture
+def db_engine() -> Generator[sa.Engine, None, None]:
+    engine = sa.create_engine("sqlite://")
+    tables = [User, File, Cookie, Podcast, Episode]
+    BaseModel.metadata.create_all(engine, tables=[model.__table__ for model in tables])
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db_session(db_engine: sa.Engine) -> Generator[Session, None, None]:
+    with Session(db_engine) as session:
+        user = User(email="user@podcast.dev", password="hashed-password", is_active=True)
+        session.add(user)
+        session.flush()
+        for podcast_num in range(PODCASTS_COUNT):
+            image = File(
+                type=MediaType.IMAGE,
+                path=f"images/{podcast_num}.png",
+                access_token=File.generate_token(),
+                owner_id=user.id,
+            )
+            session.add(image)
+            session.flush()
+            podcast = Podcast(
+                publish_id=f"publish-{podcast_num}",
+                name=f"Podcast {podcast_num}",
+                description="Podcast description",
+                owner_id=user.id,
+                image_id=image.id,
+            )
+            session.add(podcast)
+            session.flush()
+            for episode_num in range(EPISODES_PER_PODCAST):
+                audio = File(
+                    type=MediaType.AUDIO,
+                    path=f"audio/{podcast_num}-{episode_num}.mp3",
+                    size=1024,
+                    access_token=File.generate_token(),
+                    owner_id=user.id,
+                )
+                session.add(audio)
+                session.flush()
+                status = EpisodeStatus.PUBLISHED if episode_num % 2 else EpisodeStatus.DOWNLOADING
+                session.add(
+                    Episode(
+                        title=f"Episode {episode_num}",
+                        source_id=f"source-{podcast_num}-{episode_num}",
+                        source_type=SourceType.YOUTUBE,
+                        podcast_id=podcast.id,
+                        audio_id=audio.id,
+                        owner_id=user.id,
+                        length=60,
+                        status=status,
+                        published_at=utcnow() if status == EpisodeStatus.PUBLISHED else None,
+                    )
+                )
+
+        session.commit()
+        session.expunge_all()
+        yield session
+
+
+@pytest.fixture
+def statements(db_engine: sa.Engine, db_session: Session) -> StatementsCounter:
+    return StatementsCounter(db_engine)
+
+
+@pytest.fixture
+def podcast_repository(db_session: Session) -> PodcastRepository:
+    return PodcastRepository(session=SyncSessionAdapter(db_session))  # type: ignore[arg-type]
+
+
+@pytest.fixture
+def episode_repository(db_session: Session) -> EpisodeRepository:
+    return EpisodeRepository(session=SyncSessionAdapter(db_session))  # type: ignore[arg-type]
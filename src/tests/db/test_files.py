@@ -0,0 +1,70 @@
+from unittest.mock import AsyncMock
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from src.modules.db.models import File
+from src.modules.db.repositories import FileRepository
+from src.tests.db.conftest import SyncSessionAdapter
+
+
+@pytest.fixture
+def invalidate(monkeypatch: pytest.MonkeyPatch) -> AsyncMock:
+    invalidate = AsyncMock()
+    monkeypatch.setattr("src.modules.db.repositories.MediaTokenCache.invalidate", invalidate)
+    return invalidate
+
+
+@pytest.fixture
+def file_repository(db_session: Session) -> FileRepository:
+    return FileRepository(session=SyncSessionAdapter(db_session))  # type: ignore[arg-type]
+
+
+def _tokens(db_session: Session, *filters: sa.ColumnElement[bool]) -> list[str]:
+    return list(db_session.scalars(sa.select(File.access_token).filter(*filters).order_by(File.id)))
+
+
+class TestFileTokensInvalidation:
+    async def test_update_by_filters(
+        self,
+        db_session: Session,
+        file_repository: FileRepository,
+        invalidate: AsyncMock,
+    ) -> None:
+        await file_repository.update_by_filters(
+            filters={"path": "audio/0-1.mp3"}, value={"available": False}
+        )
+        invalidate.assert_not_awaited()
+        await file_repository.session.commit()
+
+        invalidate.assert_awaited_once_with(_tokens(db_session, File.path == "audio/0-1.mp3"))
+        assert db_session.scalar(sa.select(File.available).filter_by(path="audio/0-1.mp3")) is False
+
+    async def test_update_many__and_by_ids(
+        self,
+        db_session: Session,
+        file_repository: FileRepository,
+        invalidate: AsyncMock,
+    ) -> None:
+        expected_tokens = _tokens(db_session, File.id.in_([1, 2]))
+
+        await file_repository.update_many([{"id": 1, "size": 1}, {"id": 2, "size": 2}])
+        await file_repository.update_by_ids([1, 2], value={"size": 3})
+        await file_repository.session.commit()
+
+        assert [call.args for call in invalidate.await_args_list] == [(expected_tokens,)] * 2
+
+    async def test_delete_by_ids(
+        self,
+        db_session: Session,
+        file_repository: FileRepository,
+        invalidate: AsyncMock,
+    ) -> None:
+        expected_tokens = _tokens(db_session, File.id == 3)
+
+        await file_repository.delete_by_ids([3])
+        await file_repository.session.commit()
+
+        invalidate.assert_awaited_once_with(expected_tokens)
+        assert _tokens(db_session, File.id == 3) == []
@@ -0,0 +1,222 @@
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from src.modules.db.models.podcasts import Episode
+from src.modules.db.repositories import (
+    CursorPage,
+    EpisodeRepository,
+    PageCursor,
+    PodcastRepository,
+)
+from src.tests.db.conftest import EPISODES_PER_PODCAST, PODCASTS_COUNT, StatementsCounter
+
+EPISODES_COUNT = PODCASTS_COUNT * EPISODES_PER_PODCAST
+
+
+@pytest.fixture
+def same_created_at(db_session: Session) -> None:
+    """The most of episodes are created at the same moment: ID breaks ties"""
+    db_session.execute(
+        update(Episode).filter(Episode.id > 2).values(created_at=datetime(2025, 1, 1, 12))
+    )
+    db_session.commit()
+    db_session.expunge_all()
+
+
+class TestPageCursor:
+    def test_encode_decode(self) -> None:
+        cursor = PageCursor(created_at=datetime(2025, 1, 1, 12, 30), id=15)
+
+        assert PageCursor.decode(cursor.encode()) == cursor
+
+    @pytest.mark.parametrize("token", ["", "not-a-cursor", "WzFd", "eyJpZCI6IDF9"])
+    def test_decode__invalid__fail(self, token: str) -> None:
+        with pytest.raises(ValueError, match="Invalid pagination cursor"):
+            PageCursor.decode(token)
+
+    def test_page_from_offset(self) -> None:
+        episodes = [Episode(id=5, created_at=datetime(2025, 1, 1))]
+
+        page = CursorPage.from_offset(episodes, offset=0, total=2, order_by="-created_at")
+
+        assert page.next_cursor == PageCursor(created_at=datetime(2025, 1, 1), id=5).encode()
+        assert CursorPage.from_offset(episodes, 1, 2, order_by="-created_at").next_cursor is None
+        assert CursorPage.from_offset(episodes, 0, 2, order_by="title").next_cursor is None
+
+
+class TestCursorPagination:
+    @pytest.mark.usefixtures("same_created_at")
+    @pytest.mark.parametrize("order_by", ["-created_at", "created_at"])
+    async def test_episodes__all_pages(
+        self,
+        episode_repository: EpisodeRepository,
+        order_by: str,
+    ) -> None:
+        expected_ids = [
+            episode.id
+            for episode in sorted(
+                await episode_repository.all(),
+                key=lambda episode: (episode.created_at, episode.id),
+                reverse=order_by.startswith("-"),
+            )
+        ]
+        found_ids: list[int] = []
+        cursor: str | None = None
+        pages = 0
+        while True:
+            page = await episode_repository.all_by_cursor(
+                cursor=cursor, limit=5, order_by=order_by  # type: ignore[arg-type]
+            )
+            found_ids += [episode.id for episode in page.items]
+            pages += 1
+            if not (cursor := page.next_cursor):
+                break
+
+        assert found_ids == expected_ids
+        assert pages == 3
+
+    async def test_episodes__page_costs_single_query(
+        self,
+        episode_repository: EpisodeRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        first_page = await episode_repository.without_files().all_by_cursor(limit=2)
+        statements.reset()
+
+        page = await episode_repository.without_files().all_by_cursor(
+            cursor=first_page.next_cursor, limit=2, podcast_id=1
+        )
+
+        assert len(page.items) == 2
+        assert page.total is None
+        assert statements.count == 1
+        assert "(podcast_episodes.created_at, podcast_episodes.id) < (?, ?)" in (
+            statements.statements[0]
+        )
+
+    async def test_episodes__with_total(self, episode_repository: EpisodeRepository) -> None:
+        page = await episode_repository.all_by_cursor(limit=EPISODES_COUNT, with_total=True)
+
+        assert len(page.items) == EPISODES_COUNT
+        assert page.next_cursor is None
+        assert page.total == EPISODES_COUNT
+
+    async def test_episodes__unsupported_order__fail(
+        self,
+        episode_repository: EpisodeRepository,
+    ) -> None:
+        with pytest.raises(ValueError, match="doesn't support ordering by 'title'"):
+            await episode_repository.all_by_cursor(order_by="title")  # type: ignore[arg-type]
+
+    async def test_podcasts_with_aggregations(self, podcast_repository: PodcastRepository) -> None:
+        first_page = await podcast_repository.all_with_aggregations_by_cursor(
+            limit=2, with_total=True
+        )
+        last_page = await podcast_repository.all_with_aggregations_by_cursor(
+            cursor=first_page.next_cursor, limit=2
+        )
+
+        assert [podcast.id for podcast in first_page.items + last_page.items] == [3, 2, 1]
+        assert first_page.total == PODCASTS_COUNT
+        assert last_page.total is None
+        assert last_page.next_cursor is None
+        assert last_page.items[0].stat.episodes_count == EPISODES_PER_PODCAST
+
+
+class TestOffsetPagination:
+    async def test_episodes__total_by_window_function(
+        self,
+        episode_repository: EpisodeRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        episodes, total = await episode_repository.without_files().all_paginated(
+            offset=2, limit=5, podcast_id=1
+        )
+
+        assert len(episodes) == EPISODES_PER_PODCAST - 2
+        assert all(isinstance(episode, Episode) for episode in episodes)
+        assert total == EPISODES_PER_PODCAST
+        assert statements.count == 1
+        assert "count(*) OVER ()" in statements.statements[0]
+
+    async def test_episodes__out_of_range_page__counts_separately(
+        self,
+        episode_repository: EpisodeRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        episodes, total = await episode_repository.without_files().all_paginated(
+            offset=EPISODES_COUNT, limit=5
+        )
+
+        assert episodes == []
+        assert total == EPISODES_COUNT
+        assert statements.count == 2
+
+    async def test_episodes__empty_result(
+        self,
+        episode_repository: EpisodeRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        episodes, total = await episode_repository.all_paginated(podcast_id=100)
+
+        assert (episodes, total) == ([], 0)
+        assert statements.count == 1
+
+    async def test_episodes__large_total__cached(
+        self,
+        db_settings: SimpleNamespace,
+        db_session: Session,
+        episode_repository: EpisodeRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        db_settings.count_cache_threshold = EPISODES_PER_PODCAST
+        repository = episode_repository.without_files()
+        await repository.all_paginated(limit=1, podcast_id=1)
+        db_session.execute(update(Episode).filter(Episode.id == 5).values(podcast_id=1))
+        db_session.commit()
+        statements.reset()
+
+        episodes, total = await repository.all_paginated(offset=1, limit=1, podcast_id=1)
+        _, other_total = await repository.all_paginated(limit=1, podcast_id=2)
+
+        assert len(episodes) == 1
+        # count is cached for podcast #1 only (podcast #2 has less episodes than the threshold)
+        assert total == EPISODES_PER_PODCAST
+        assert other_total == EPISODES_PER_PODCAST - 1
+        assert "count(*) OVER ()" not in statements.statements[0]
+        assert "count(*) OVER ()" in statements.statements[1]
+
+    async def test_episodes__cached_total__dropped_after_commit(
+        self,
+        db_settings: SimpleNamespace,
+        episode_repository: EpisodeRepository,
+    ) -> None:
+        db_settings.count_cache_threshold = EPISODES_PER_PODCAST
+        repository = episode_repository.without_files()
+        await repository.all_paginated(limit=1, podcast_id=1)
+
+        await repository.update_by_ids([5], value={"podcast_id": 1})
+        _, total_before_commit = await repository.all_paginated(limit=1, podcast_id=1)
+        await repository.session.commit()
+        _, total = await repository.all_paginated(limit=1, podcast_id=1)
+
+        assert total_before_commit == EPISODES_PER_PODCAST
+        assert total == EPISODES_PER_PODCAST + 1
+
+    async def test_podcasts_with_aggregations__total_by_window_function(
+        self,
+        podcast_repository: PodcastRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        podcasts, total = await podcast_repository.all_with_aggregations(limit=2)
+
+        assert len(podcasts) == 2
+        assert podcasts[0].stat.episodes_count == EPISODES_PER_PODCAST
+        # total is a number of podcasts (groups), not of joined episodes
+        assert total == PODCASTS_COUNT
+        # podcasts with aggregations and total count + image
+        assert statements.count == 2
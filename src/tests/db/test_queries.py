@@ -0,0 +1,161 @@
+"""
+Regression tests for number of SQL statements, which repositories emit on hot paths.
+Counts must not grow with number of podcasts / episodes (no N+1).
+"""
+
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+
+from src.constants import EpisodeStatus
+from src.modules.db.models import BaseModel, File
+from src.modules.db.models.media import MediaType
+from src.modules.db.models.podcasts import Episode, Podcast
+from src.modules.db.repositories import EpisodeRepository, FileRepository, PodcastRepository
+from src.tests.db.conftest import (
+    EPISODES_PER_PODCAST,
+    PODCASTS_COUNT,
+    StatementsCounter,
+    SyncSessionAdapter,
+)
+
+
+def _is_loaded(instance: BaseModel, relation: str) -> bool:
+    return relation not in sa.inspect(instance).unloaded
+
+
+class TestPodcastQueries:
+    async def test_list__episodes_are_not_loaded(
+        self,
+        podcast_repository: PodcastRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        podcasts, total = await podcast_repository.all_with_aggregations(limit=PODCASTS_COUNT)
+
+        assert total == PODCASTS_COUNT
+        assert [podcast.stat.episodes_count for podcast in podcasts] == [4, 4, 4]
+        # podcasts with aggregations and total count + image (selectin, rss is empty -> skipped)
+        assert statements.count == 2
+        assert not any(_is_loaded(podcast, "episodes") for podcast in podcasts)
+        with pytest.raises(InvalidRequestError):
+            _ = podcasts[0].episodes
+
+    async def test_detail(
+        self,
+        podcast_repository: PodcastRepository,
+        episode_repository: EpisodeRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        podcast = await podcast_repository.get_first_with_aggregations(id=1)
+        assert podcast is not None
+        assert podcast.id == 1
+        assert podcast.image.path == "images/0.png"
+        assert statements.count == 2
+
+        statements.reset()
+        episodes, total = await episode_repository.all_paginated(podcast_id=podcast.id)
+
+        assert total == EPISODES_PER_PODCAST
+        assert [episode.audio.size for episode in episodes] == [1024] * EPISODES_PER_PODCAST
+        # episodes with total count + audio (selectin, image is empty -> skipped)
+        assert statements.count == 2
+
+
+class TestProgressQueries:
+    async def test_in_progress_episodes_and_their_podcasts(
+        self,
+        db_session: Session,
+        podcast_repository: PodcastRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        episodes = await Episode.get_in_progress(
+            SyncSessionAdapter(db_session), user_id=1  # type: ignore[arg-type]
+        )
+        podcast_ids = list({episode.podcast_id for episode in episodes})
+        podcasts = await podcast_repository.all(ids=podcast_ids)
+
+        assert len(episodes) == PODCASTS_COUNT * EPISODES_PER_PODCAST // 2
+        assert len(podcasts) == PODCASTS_COUNT
+        # episodes + audio + podcasts + image
+        assert statements.count == 4
+        assert not any(_is_loaded(podcast, "episodes") for podcast in podcasts)
+
+
+class TestRSSQueries:
+    async def test_published_episodes__without_podcast(
+        self,
+        episode_repository: EpisodeRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        episodes = await episode_repository.all(
+            podcast_id=1, status=EpisodeStatus.PUBLISHED, published_at__ne=None
+        )
+
+        assert len(episodes) == EPISODES_PER_PODCAST // 2
+        # episodes + audio (image is empty -> skipped)
+        assert statements.count == 2
+        with pytest.raises(InvalidRequestError):
+            _ = episodes[0].podcast
+
+    async def test_episodes_with_podcast(
+        self,
+        episode_repository: EpisodeRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        episodes = await episode_repository.with_podcast().all(status=EpisodeStatus.PUBLISHED)
+
+        assert {episode.podcast.name for episode in episodes} == {
+            f"Podcast {num}" for num in range(PODCASTS_COUNT)
+        }
+        # episodes + audio + podcasts + podcasts' image
+        assert statements.count == 4
+
+    async def test_episodes_without_files(
+        self,
+        episode_repository: EpisodeRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        episodes = await episode_repository.without_files().all(podcast_id=1)
+
+        assert len(episodes) == EPISODES_PER_PODCAST
+        assert statements.count == 1
+        with pytest.raises(InvalidRequestError):
+            _ = episodes[0].audio
+
+
+class TestBulkQueries:
+    async def test_create_many__returned_in_order(self, db_session: Session) -> None:
+        # sqlite inserts ordered RETURNING rows one by one, PostgreSQL does it by batches
+        file_repository = FileRepository(session=SyncSessionAdapter(db_session))  # type: ignore
+        values = [
+            {
+                "type": MediaType.RSS,
+                "path": f"rss/{num}.xml",
+                "owner_id": 1,
+                "access_token": File.generate_token(),
+            }
+            for num in range(3)
+        ]
+
+        files = await file_repository.create_many(values)
+
+        assert [file.path for file in files] == ["rss/0.xml", "rss/1.xml", "rss/2.xml"]
+        assert all(file.id for file in files)
+
+    async def test_update_many__own_values_by_ids(
+        self,
+        db_session: Session,
+        podcast_repository: PodcastRepository,
+        statements: StatementsCounter,
+    ) -> None:
+        await podcast_repository.update_many(
+            [{"id": 1, "name": "First"}, {"id": 3, "name": "Third"}]
+        )
+
+        assert statements.count == 1
+        assert dict(db_session.execute(sa.select(Podcast.id, Podcast.name)).all()) == {
+            1: "First",
+            2: "Podcast 1",
+            3: "Third",
+        }
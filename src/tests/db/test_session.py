@@ -0,0 +1,48 @@
+from unittest.mock import AsyncMock
+
+from src.modules.db.session import AppSession, after_commit
+
+
+class TestAppSession:
+    async def test_after_commit__run_once_after_commit(self) -> None:
+        session = AppSession()
+        callback = AsyncMock()
+
+        after_commit(session, callback)
+        callback.assert_not_awaited()
+        await session.commit()
+        await session.commit()
+
+        callback.assert_awaited_once_with()
+
+    async def test_after_commit__scheduled_once(self) -> None:
+        session = AppSession()
+        callback = AsyncMock()
+
+        after_commit(session, callback)
+        after_commit(session, callback)
+        await session.commit()
+
+        callback.assert_awaited_once_with()
+
+    async def test_after_commit__rollback__dropped(self) -> None:
+        session = AppSession()
+        callback = AsyncMock()
+
+        after_commit(session, callback)
+        await session.rollback()
+        await session.commit()
+
+        callback.assert_not_awaited()
+
+    async def test_after_commit__failed_callback__others_are_run(self) -> None:
+        session = AppSession()
+        failed_callback = AsyncMock(side_effect=ConnectionError("redis is down"))
+        callback = AsyncMock()
+
+        after_commit(session, failed_callback)
+        after_commit(session, callback)
+        await session.commit()
+
+        failed_callback.assert_awaited_once_with()
+        callback.assert_awaited_once_with()
@@ -1,12 +1,19 @@
+from typing import Any
 from unittest.mock import AsyncMock, Mock
 
+from src.modules.db.session import run_after_commit_callbacks
+
 
 class MockSession:
     def __init__(self) -> None:
-        self.commit = AsyncMock(return_value=None)
+        self.info: dict[str, Any] = {}
+        self.commit = AsyncMock(side_effect=self._commit)
         self.flush = AsyncMock(return_value=None)
         self.rollback = AsyncMock(return_value=None)
 
+    async def _commit(self) -> None:
+        await run_after_commit_callbacks(self)  # type: ignore[arg-type]
+
 
 class MockUOW:
     def __init__(self, session: MockSession | None = None) -> None:
@@ -27,8 +34,13 @@ class MockRedisClient:
         self.get = Mock(side_effect=lambda key: self.content.get(key))
         self.set = Mock(return_value=None)
         self.publish = Mock(return_value=None)
+        self.set_and_publish = Mock(return_value=None)
         self.async_get = AsyncMock(side_effect=lambda key: self.content.get(key))
         self.async_get_many = AsyncMock(return_value=self.content)
+        self.async_get_values = AsyncMock(
+            side_effect=lambda keys: [self.content.get(key) for key in keys]
+        )
+        self.async_set_many = AsyncMock(return_value=None)
         self.async_publish = AsyncMock(return_value=None)
         self.async_set = AsyncMock(return_value=None)
         self.async_pubsub = Mock(return_value=object())
@@ -44,6 +56,7 @@ class MockStorageS3:
         self.delete_file = AsyncMock(return_value={})
         self.download_file = AsyncMock(return_value="/tmp/downloaded.mp3")
         self.get_file_info = AsyncMock(return_value=None)
+        self.get_file_content = AsyncMock(return_value=None)
         self.get_file_size = AsyncMock(return_value=0)
         self.get_presigned_url = AsyncMock(return_value="https://storage/presigned")
         self.upload_file = AsyncMock(return_value="remote/uploaded.mp3")
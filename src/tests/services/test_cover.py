@@ -1,15 +1,32 @@
+import asyncio
+import os
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import ANY, AsyncMock, Mock
 
 import pytest
 from litestar.exceptions import NotFoundException
 
+from src.constants import CoverFormat
+from src.exceptions import FFMPegPreparationError
 from src.modules.db.models.media import MediaType
-from src.modules.services.cover import CoverService
+from src.modules.services import cover, cover_cache
+from src.modules.services.cover import CoverRendition, CoverService
+from src.modules.services.cover_cache import CoverCache, CoverCacheStats
 from src.tests.factories import make_file
 
 
+@pytest.fixture
+def cache(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> CoverCache:
+    cache = CoverCache(tmp_path, max_size=1024)
+    monkeypatch.setattr("src.modules.services.cover.get_cover_cache", lambda: cache)
+    return cache
+
+
+def _fill_with(content: bytes, dst_path: Path) -> None:
+    dst_path.write_bytes(content)
+
+
 class TestCoverServiceCache:
     def test_cache_key_and_ext__uses_path_first(self) -> None:
         file_obj = make_file(type=MediaType.IMAGE, path="images/cover.PNG")
@@ -46,6 +63,7 @@ class TestCoverServiceCache:
         self,
         monkeypatch: pytest.MonkeyPatch,
         tmp_path: Path,
+        cache: CoverCache,
     ) -> None:
         settings = SimpleNamespace(media_cache_dir=tmp_path)
         monkeypatch.setattr("src.modules.services.cover.get_app_settings", lambda: settings)
@@ -61,28 +79,32 @@ class TestCoverServiceCache:
 
         assert result == cached_path
         download_from_s3.assert_not_awaited()
+        assert cache.stats() == CoverCacheStats(hits=1, misses=0, evictions=0, files=1, size=6)
 
     async def test_get_or_download__public_url__downloads_url(
         self,
         monkeypatch: pytest.MonkeyPatch,
         tmp_path: Path,
+        cache: CoverCache,
     ) -> None:
         settings = SimpleNamespace(media_cache_dir=tmp_path)
         monkeypatch.setattr("src.modules.services.cover.get_app_settings", lambda: settings)
         file_obj = make_file(type=MediaType.IMAGE, path="")
         file_obj.public = True
         file_obj.source_url = "https://example.com/cover.jpg"
-        download_from_url = AsyncMock()
+        download_from_url = AsyncMock(
+            side_effect=lambda url, dst_path, _: _fill_with(b"x", dst_path)
+        )
         monkeypatch.setattr(CoverService, "_download_from_url", download_from_url)
 
         result = await CoverService().get_or_download(file_obj, "episodes", "cover")
 
         assert result.parent == tmp_path / "episodes"
-        download_from_url.assert_awaited_once_with(
-            file_obj.source_url,
-            result,
-            file_obj.type.value,
-        )
+        assert result.read_bytes() == b"x"
+        # downloaded into temp file, which is renamed then
+        download_from_url.assert_awaited_once_with(file_obj.source_url, ANY, file_obj.type.value)
+        assert download_from_url.await_args.args[1] != result
+        assert cache.stats().misses == 1
 
     async def test_download_from_s3__missing__fail(
         self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
@@ -126,6 +148,295 @@ class TestCoverServiceCache:
             )
 
 
+class TestCoverRenditions:
+    @pytest.fixture(autouse=True)
+    def settings(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> SimpleNamespace:
+        settings = SimpleNamespace(
+            media_cache_dir=tmp_path,
+            cover_rendition_formats=[CoverFormat.AVIF, CoverFormat.WEBP],
+        )
+        monkeypatch.setattr("src.modules.services.cover.get_app_settings", lambda: settings)
+        monkeypatch.setattr(cover, "_unsupported_formats", set())
+        return settings
+
+    @pytest.mark.parametrize(
+        "size, accept, expected",
+        [
+            (None, "image/avif,image/webp,*/*", None),
+            (64, "image/avif,image/webp,*/*", CoverRendition(64, CoverFormat.AVIF)),
+            (100, "image/webp,image/*;q=0.8", CoverRendition(160, CoverFormat.WEBP)),
+            (160, "image/avif;q=0,image/webp", CoverRendition(160, CoverFormat.WEBP)),
+            (1000, "*/*", CoverRendition(600, CoverFormat.JPEG)),
+            (600, "", CoverRendition(600, CoverFormat.JPEG)),
+        ],
+    )
+    def test_select_rendition(
+        self,
+        size: int | None,
+        accept: str,
+        expected: CoverRendition | None,
+    ) -> None:
+        assert CoverService.select_rendition(size, accept) == expected
+
+    def test_select_rendition__unsupported_format__skipped(self) -> None:
+        cover._unsupported_formats.add(CoverFormat.AVIF)
+
+        rendition = CoverService.select_rendition(64, "image/avif,image/webp")
+
+        assert rendition == CoverRendition(64, CoverFormat.WEBP)
+
+    async def test_get_rendition__rendered_once_from_original(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+        cache: CoverCache,
+    ) -> None:
+        file_obj = make_file(type=MediaType.IMAGE, path="images/cover.png")
+        download_from_s3 = AsyncMock(side_effect=lambda _, dst_path, __: _fill_with(b"x", dst_path))
+        monkeypatch.setattr(CoverService, "_download_from_s3", download_from_s3)
+        image_rendition = AsyncMock(
+            side_effect=lambda _, dst_path, **__: _fill_with(b"r", dst_path)
+        )
+        monkeypatch.setattr("src.modules.services.cover.ffmpeg.image_rendition", image_rendition)
+        rendition = CoverRendition(160, CoverFormat.WEBP)
+
+        results = [
+            await CoverService().get_rendition(file_obj, "podcasts", "cover", rendition)
+            for _ in range(2)
+        ]
+
+        original_path = (
+            tmp_path / "podcasts" / CoverService._cache_filename("images/cover.png", "cover", "png")
+        )
+        assert results == [original_path.with_name(f"{original_path.stem}_160.webp")] * 2
+        assert results[0].read_bytes() == b"r"
+        download_from_s3.assert_awaited_once()
+        image_rendition.assert_awaited_once_with(
+            original_path, ANY, width=160, image_format=CoverFormat.WEBP
+        )
+        assert cache.stats().misses == 2
+
+    async def test_get_rendition__unsupported_format__jpeg(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        cache: CoverCache,
+    ) -> None:
+        file_obj = make_file(type=MediaType.IMAGE, path="images/cover.jpg")
+        download_from_s3 = AsyncMock(side_effect=lambda _, dst_path, __: _fill_with(b"x", dst_path))
+        monkeypatch.setattr(CoverService, "_download_from_s3", download_from_s3)
+
+        async def image_rendition(_: Path, dst_path: Path, image_format: CoverFormat, **__) -> None:
+            if image_format == CoverFormat.AVIF:
+                raise FFMPegPreparationError("Unknown encoder 'libaom-av1'")
+
+            dst_path.write_bytes(b"r")
+
+        monkeypatch.setattr("src.modules.services.cover.ffmpeg.image_rendition", image_rendition)
+
+        result = await CoverService().get_rendition(
+            file_obj, "episodes", "cover", CoverRendition(64, CoverFormat.AVIF)
+        )
+
+        assert result.name.endswith("_64.jpeg")
+        assert cover._unsupported_formats == {CoverFormat.AVIF}
+
+    async def test_get_rendition__timeout__format_kept(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        cache: CoverCache,
+    ) -> None:
+        file_obj = make_file(type=MediaType.IMAGE, path="images/cover.jpg")
+        download_from_s3 = AsyncMock(side_effect=lambda _, dst_path, __: _fill_with(b"x", dst_path))
+        monkeypatch.setattr(CoverService, "_download_from_s3", download_from_s3)
+
+        async def image_rendition(_: Path, dst_path: Path, image_format: CoverFormat, **__) -> None:
+            if image_format == CoverFormat.AVIF:
+                raise FFMPegPreparationError("FFMPEG failed with errors: timeout 10.0s exceeded")
+
+            dst_path.write_bytes(b"r")
+
+        monkeypatch.setattr("src.modules.services.cover.ffmpeg.image_rendition", image_rendition)
+
+        result = await CoverService().get_rendition(
+            file_obj, "episodes", "cover", CoverRendition(64, CoverFormat.AVIF)
+        )
+
+        assert result.name.endswith("_64.jpeg")
+        # slow rendering of the format doesn't mean, that ffmpeg can't encode it
+        assert cover._unsupported_formats == set()
+
+    async def test_get_rendition__not_rendered__original(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        cache: CoverCache,
+    ) -> None:
+        file_obj = make_file(type=MediaType.IMAGE, path="images/cover.jpg")
+        download_from_s3 = AsyncMock(side_effect=lambda _, dst_path, __: _fill_with(b"x", dst_path))
+        monkeypatch.setattr(CoverService, "_download_from_s3", download_from_s3)
+        image_rendition = AsyncMock(side_effect=FFMPegPreparationError("Invalid data"))
+        monkeypatch.setattr("src.modules.services.cover.ffmpeg.image_rendition", image_rendition)
+
+        result = await CoverService().get_rendition(
+            file_obj, "episodes", "cover", CoverRendition(64, CoverFormat.WEBP)
+        )
+
+        assert result.read_bytes() == b"x"
+        assert image_rendition.await_count == 2
+        # broken image doesn't make formats unsupported
+        assert cover._unsupported_formats == set()
+
+    async def test_get_rendition__original_evicted__downloaded_again(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        cache: CoverCache,
+    ) -> None:
+        file_obj = make_file(type=MediaType.IMAGE, path="images/cover.jpg")
+        download_from_s3 = AsyncMock(side_effect=lambda _, dst_path, __: _fill_with(b"x", dst_path))
+        monkeypatch.setattr(CoverService, "_download_from_s3", download_from_s3)
+
+        async def image_rendition(src_path: Path, *_: object, **__: object) -> None:
+            # concurrent requests evict the original, while it's being rendered
+            assert src_path.exists()
+            src_path.unlink()
+            raise FFMPegPreparationError(f"{src_path}: No such file or directory")
+
+        monkeypatch.setattr("src.modules.services.cover.ffmpeg.image_rendition", image_rendition)
+
+        result = await CoverService().get_rendition(
+            file_obj, "episodes", "cover", CoverRendition(64, CoverFormat.WEBP)
+        )
+
+        assert result.read_bytes() == b"x"
+        assert download_from_s3.await_count == 3
+
+
+class TestCoverCache:
+    async def test_get_or_fill__miss_then_hit(self, tmp_path: Path) -> None:
+        cache = CoverCache(tmp_path, max_size=1024)
+        fill = AsyncMock(side_effect=lambda dst_path: _fill_with(b"cover", dst_path))
+        path = tmp_path / "episodes" / "cover.jpg"
+
+        assert await cache.get_or_fill(path, fill) == path
+        assert await cache.get_or_fill(path, fill) == path
+
+        fill.assert_awaited_once()
+        assert path.read_bytes() == b"cover"
+        assert list(path.parent.iterdir()) == [path]
+        assert cache.stats() == CoverCacheStats(hits=1, misses=1, evictions=0, files=1, size=5)
+
+    async def test_get_or_fill__concurrent_misses__filled_once(self, tmp_path: Path) -> None:
+        cache = CoverCache(tmp_path, max_size=1024)
+        calls = 0
+
+        async def fill(dst_path: Path) -> None:
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            dst_path.write_bytes(b"cover")
+
+        path = tmp_path / "cover.jpg"
+        results = await asyncio.gather(*(cache.get_or_fill(path, fill) for _ in range(5)))
+
+        assert results == [path] * 5
+        assert calls == 1
+        assert cache.stats() == CoverCacheStats(hits=4, misses=1, evictions=0, files=1, size=5)
+        assert cache._locks == {}
+
+    async def test_get_or_fill__failed__no_partial_files(self, tmp_path: Path) -> None:
+        cache = CoverCache(tmp_path, max_size=1024)
+
+        async def fill(dst_path: Path) -> None:
+            dst_path.write_bytes(b"part")
+            raise NotFoundException("cover not found")
+
+        with pytest.raises(NotFoundException):
+            await cache.get_or_fill(tmp_path / "cover.jpg", fill)
+
+        assert list(tmp_path.iterdir()) == []
+        assert cache._locks == {}
+        assert cache.stats().files == 0
+
+    async def test_get_or_fill__evicts_least_recently_used(self, tmp_path: Path) -> None:
+        cache = CoverCache(tmp_path, max_size=25)
+        fill = AsyncMock(side_effect=lambda dst_path: _fill_with(b"x" * 10, dst_path))
+        first, second, third = (tmp_path / f"{num}.jpg" for num in range(3))
+        await cache.get_or_fill(first, fill)
+        await cache.get_or_fill(second, fill)
+        await cache.get_or_fill(first, fill)
+
+        await cache.get_or_fill(third, fill)
+
+        assert sorted(tmp_path.iterdir()) == [first, third]
+        assert cache.stats() == CoverCacheStats(hits=1, misses=3, evictions=1, files=2, size=20)
+
+    async def test_sweep__by_access_time_and_stale_temp_files(self, tmp_path: Path) -> None:
+        cache = CoverCache(tmp_path, max_size=25)
+        old, recent, newest = (tmp_path / "podcasts" / f"{name}.jpg" for name in ("o", "r", "n"))
+        old.parent.mkdir()
+        for atime, path in enumerate((newest, old, recent)):
+            path.write_bytes(b"x" * 10)
+            os.utime(path, (1000 + atime * 100 if path is not newest else 2000, 1000))
+
+        stale_tmp = tmp_path / ".cover.jpg.0000.tmp"
+        stale_tmp.write_bytes(b"x")
+        os.utime(stale_tmp, (1000, 1000))
+        fresh_tmp = tmp_path / ".cover.jpg.1111.tmp"
+        fresh_tmp.write_bytes(b"x")
+
+        await cache.sweep()
+
+        assert not old.exists()
+        assert not stale_tmp.exists()
+        assert recent.exists() and newest.exists() and fresh_tmp.exists()
+        assert list(cache._index) == [recent, newest]
+        assert cache.stats() == CoverCacheStats(hits=0, misses=0, evictions=1, files=2, size=20)
+
+    async def test_sweep__keeps_entries_changed_while_scan(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        cache = CoverCache(tmp_path, max_size=1024)
+        on_disk, filled, removed = (tmp_path / f"{name}.jpg" for name in ("d", "f", "r"))
+        for path in (on_disk, removed):
+            path.write_bytes(b"x" * 10)
+
+        scan = cache._scan
+
+        def scan_and_change() -> list[tuple[float, Path, int]]:
+            entries = scan()
+            # the process fills in / drops cache's files while sweeper is waiting for the scan
+            filled.write_bytes(b"x" * 20)
+            cache._add(filled, 20)
+            removed.unlink()
+            cache._discard(removed)
+            return entries
+
+        monkeypatch.setattr(cache, "_scan", scan_and_change)
+
+        await cache.sweep()
+
+        assert list(cache._index) == [on_disk, filled]
+        assert cache.stats().size == 30
+
+    async def test_run_cover_cache_sweeper__swept_at_startup(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        settings = SimpleNamespace(
+            media_cache_dir=tmp_path, media_cache_max_size=1024, media_cache_sweep_interval=60
+        )
+        monkeypatch.setattr(cover_cache, "get_app_settings", lambda: settings)
+        sweep = AsyncMock()
+        monkeypatch.setattr(CoverCache, "sweep", sweep)
+
+        async with cover_cache.run_cover_cache_sweeper():
+            await asyncio.sleep(0)
+
+        sweep.assert_awaited_once_with()
+
+
 class _FakeAsyncClient:
     def __init__(self, response: object) -> None:
         self.response = response
@@ -0,0 +1,297 @@
+import copy
+import hashlib
+from types import SimpleNamespace
+from typing import Callable, Generator
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from litestar.exceptions import NotFoundException
+from redis.exceptions import WatchError
+
+from src.modules.db.models.media import MediaType
+from src.modules.services import feeds
+from src.modules.services.feeds import RSSFeed, RSSFeedService
+from src.tests.factories import make_file
+from src.tests.mocks import MockRedisClient, MockStorageS3, MockUOW
+
+FEED_CONTENT = b"<rss>feed</rss>"
+FEED_ETAG = hashlib.md5(FEED_CONTENT).hexdigest()
+
+
+class FakeRedisHashes:
+    """In-memory redis hashes (enough for RSSFeedService)"""
+
+    def __init__(self) -> None:
+        self.hashes: dict[str, dict[str, bytes | str]] = {}
+        self.calls: list[str] = []
+        self.expirations: dict[str, int] = {}
+
+    async def hget(self, key: str, field: str) -> bytes | str | None:
+        self.calls.append(f"hget:{field}")
+        return self.hashes.get(key, {}).get(field)
+
+    def pipeline(self, transaction: bool) -> "FakeRedisPipeline":
+        return FakeRedisPipeline(self)
+
+
+class FakeRedisPipeline:
+    """Transaction of FakeRedisHashes: it fails, if watched keys are changed before execution"""
+
+    def __init__(self, redis: FakeRedisHashes) -> None:
+        self.redis = redis
+        self.commands: list[Callable[[], object]] = []
+        self.watched: dict[str, dict[str, bytes | str] | None] = {}
+
+    async def __aenter__(self) -> "FakeRedisPipeline":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+    async def watch(self, key: str) -> None:
+        self.watched[key] = copy.deepcopy(self.redis.hashes.get(key))
+
+    async def hget(self, key: str, field: str) -> bytes | str | None:
+        return await self.redis.hget(key, field)
+
+    def multi(self) -> None:
+        return None
+
+    def delete(self, key: str) -> None:
+        self.commands.append(lambda: self.redis.hashes.pop(key, None))
+
+    def hset(
+        self,
+        key: str,
+        field: str | None = None,
+        value: str | None = None,
+        mapping: dict[str, bytes | str] | None = None,
+    ) -> None:
+        values = mapping or {field: value}
+        self.commands.append(lambda: self.redis.hashes.setdefault(key, {}).update(values))
+
+    def expire(self, key: str, ttl: int) -> None:
+        self.commands.append(lambda: self.redis.expirations.update({key: ttl}))
+
+    async def execute(self) -> None:
+        self.redis.calls.append("pipeline")
+        if any(self.redis.hashes.get(key) != value for key, value in self.watched.items()):
+            raise WatchError("Watched variable changed.")
+
+        for command in self.commands:
+            command()
+
+
+@pytest.fixture(autouse=True)
+def local_feeds() -> Generator[None, None, None]:
+    feeds._local_feeds.clear()
+    feeds._local_feeds_size = 0
+    yield
+    feeds._local_feeds.clear()
+    feeds._local_feeds_size = 0
+
+
+@pytest.fixture
+def settings(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    settings = SimpleNamespace(rss_feed_cache_ttl=3600, rss_feed_local_cache_size=1024)
+    monkeypatch.setattr("src.modules.services.feeds.get_app_settings", lambda: settings)
+    return settings
+
+
+@pytest.fixture
+def redis(monkeypatch: pytest.MonkeyPatch) -> FakeRedisHashes:
+    redis = FakeRedisHashes()
+    redis_client = MockRedisClient()
+    redis_client.async_redis = redis
+    monkeypatch.setattr("src.modules.services.feeds.RedisClient", Mock(return_value=redis_client))
+    return redis
+
+
+@pytest.fixture
+def storage(monkeypatch: pytest.MonkeyPatch) -> MockStorageS3:
+    storage = MockStorageS3()
+    storage.get_file_content.return_value = FEED_CONTENT
+    monkeypatch.setattr("src.modules.services.feeds.StorageS3", Mock(return_value=storage))
+    return storage
+
+
+def _mock_file_repository(
+    monkeypatch: pytest.MonkeyPatch,
+    media_file: object | None,
+) -> SimpleNamespace:
+    repository = SimpleNamespace(first_by_access_token=AsyncMock(return_value=media_file))
+    monkeypatch.setattr("src.modules.services.feeds.SASessionUOW", lambda: MockUOW())
+    monkeypatch.setattr("src.modules.services.feeds.FileRepository", Mock(return_value=repository))
+    return repository
+
+
+@pytest.mark.usefixtures("settings")
+class TestRSSFeedService:
+    async def test_get_feed__not_cached__read_from_storage_and_cached(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        redis: FakeRedisHashes,
+        storage: MockStorageS3,
+    ) -> None:
+        _mock_file_repository(
+            monkeypatch, make_file(type=MediaType.RSS, path="rss/feed.xml", hash=FEED_ETAG)
+        )
+        service = RSSFeedService()
+
+        feed = await service.get_feed("token")
+
+        assert feed == RSSFeed(etag=FEED_ETAG, content=FEED_CONTENT)
+        storage.get_file_content.assert_awaited_once_with("rss/feed.xml")
+        assert redis.hashes == {"rss-feed:token": {"etag": FEED_ETAG, "content": FEED_CONTENT}}
+        assert redis.expirations == {"rss-feed:token": 3600}
+        assert await service.get_etag("token") == FEED_ETAG
+
+    async def test_get_feed__local_hit__no_redis_and_storage(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        redis: FakeRedisHashes,
+        storage: MockStorageS3,
+    ) -> None:
+        _mock_file_repository(monkeypatch, make_file(type=MediaType.RSS, hash=FEED_ETAG))
+        service = RSSFeedService()
+        await service.get_feed("token")
+        redis.calls.clear()
+        storage.get_file_content.reset_mock()
+
+        feed = await service.get_feed("token", etag=FEED_ETAG)
+
+        assert feed == RSSFeed(etag=FEED_ETAG, content=FEED_CONTENT)
+        assert redis.calls == []
+        storage.get_file_content.assert_not_awaited()
+
+    async def test_get_feed__redis_hit__content_from_redis(
+        self,
+        redis: FakeRedisHashes,
+        storage: MockStorageS3,
+    ) -> None:
+        redis.hashes["rss-feed:token"] = {"etag": "redis-etag", "content": "<rss>redis</rss>"}
+
+        feed = await RSSFeedService().get_feed("token", etag="redis-etag")
+
+        assert feed == RSSFeed(etag="redis-etag", content=b"<rss>redis</rss>")
+        assert redis.calls == ["hget:content"]
+        storage.get_file_content.assert_not_awaited()
+        assert feeds._local_feeds["token"] == feed
+
+    @pytest.mark.parametrize(
+        "media_file",
+        [
+            None,
+            make_file(type=MediaType.RSS, available=False),
+            make_file(type=MediaType.AUDIO),
+        ],
+    )
+    @pytest.mark.usefixtures("redis", "storage")
+    async def test_get_feed__unavailable__fail(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        media_file: object | None,
+    ) -> None:
+        _mock_file_repository(monkeypatch, media_file)
+
+        with pytest.raises(NotFoundException, match="Media not found"):
+            await RSSFeedService().get_feed("token")
+
+    @pytest.mark.usefixtures("redis")
+    async def test_get_feed__missing_in_storage__fail(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        storage: MockStorageS3,
+    ) -> None:
+        _mock_file_repository(monkeypatch, make_file(type=MediaType.RSS))
+        storage.get_file_content.return_value = None
+
+        with pytest.raises(NotFoundException, match="Media not found"):
+            await RSSFeedService().get_feed("token")
+
+    async def test_invalidate(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        redis: FakeRedisHashes,
+        storage: MockStorageS3,
+    ) -> None:
+        _mock_file_repository(monkeypatch, make_file(type=MediaType.RSS, hash=FEED_ETAG))
+        await RSSFeedService().get_feed("token")
+        assert feeds._local_feeds
+
+        await RSSFeedService.invalidate({"token": "new-hash", "unknown-token": "hash"})
+
+        assert redis.hashes == {
+            "rss-feed:token": {"version": "new-hash"},
+            "rss-feed:unknown-token": {"version": "hash"},
+        }
+        assert redis.expirations["rss-feed:unknown-token"] == 3600
+        assert feeds._local_feeds == {}
+        assert feeds._local_feeds_size == 0
+        assert await RSSFeedService().get_etag("token") is None
+
+    async def test_get_feed__invalidated_while_fetched__not_cached(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        redis: FakeRedisHashes,
+        storage: MockStorageS3,
+    ) -> None:
+        _mock_file_repository(monkeypatch, make_file(type=MediaType.RSS, hash=FEED_ETAG))
+
+        async def get_file_content(_: str) -> bytes:
+            # new feed is committed, while the previous one is being read
+            await RSSFeedService.invalidate({"token": "new-hash"})
+            return FEED_CONTENT
+
+        storage.get_file_content.side_effect = get_file_content
+
+        feed = await RSSFeedService().get_feed("token")
+
+        assert feed == RSSFeed(etag=FEED_ETAG, content=FEED_CONTENT)
+        assert redis.hashes == {"rss-feed:token": {"version": "new-hash"}}
+        assert feeds._local_feeds == {}
+
+    async def test_get_feed__invalidated_while_stored__not_cached(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        redis: FakeRedisHashes,
+    ) -> None:
+        hget = redis.hget
+
+        async def hget_and_invalidate(key: str, field: str) -> bytes | str | None:
+            version = await hget(key, field)
+            await RSSFeedService.invalidate({"token": "new-hash"})
+            return version
+
+        monkeypatch.setattr(redis, "hget", hget_and_invalidate)
+
+        await RSSFeedService()._store("token", RSSFeed(etag=FEED_ETAG, content=FEED_CONTENT))
+
+        assert redis.hashes == {"rss-feed:token": {"version": "new-hash"}}
+        assert feeds._local_feeds == {}
+
+    @pytest.mark.usefixtures("storage")
+    async def test_get_feed__hash_isnt_committed__not_cached(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        redis: FakeRedisHashes,
+    ) -> None:
+        # the feed is uploaded already, but its hash isn't committed yet
+        _mock_file_repository(monkeypatch, make_file(type=MediaType.RSS, hash="previous-hash"))
+
+        feed = await RSSFeedService().get_feed("token")
+
+        assert feed == RSSFeed(etag=FEED_ETAG, content=FEED_CONTENT)
+        assert redis.hashes == {}
+
+    def test_store_local__evicts_least_recently_used(self, settings: SimpleNamespace) -> None:
+        settings.rss_feed_local_cache_size = 25
+        RSSFeedService._store_local("first", RSSFeed("etag-1", b"x" * 10))
+        RSSFeedService._store_local("second", RSSFeed("etag-2", b"x" * 10))
+        feeds._local_feeds.move_to_end("first")
+
+        RSSFeedService._store_local("third", RSSFeed("etag-3", b"x" * 10))
+        RSSFeedService._store_local("too-large", RSSFeed("etag-4", b"x" * 30))
+
+        assert list(feeds._local_feeds) == ["first", "third"]
+        assert feeds._local_feeds_size == 20
@@ -0,0 +1,105 @@
+import json
+from types import SimpleNamespace
+from typing import Generator
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from src.modules.db.models.media import MediaType
+from src.modules.services import media_tokens
+from src.modules.services.media_tokens import MediaToken, MediaTokenCache
+from src.tests.mocks import MockRedisClient
+
+MEDIA_TOKEN = MediaToken(file_id=1, path="audio/episode.mp3", type=MediaType.AUDIO, available=True)
+
+
+@pytest.fixture(autouse=True)
+def local_tokens() -> Generator[None, None, None]:
+    media_tokens._local_tokens.clear()
+    yield
+    media_tokens._local_tokens.clear()
+
+
+@pytest.fixture(autouse=True)
+def settings(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    settings = SimpleNamespace(
+        media_token_cache_ttl=3600,
+        media_token_local_ttl=10.0,
+        media_token_local_cache_size=2,
+    )
+    monkeypatch.setattr("src.modules.services.media_tokens.get_app_settings", lambda: settings)
+    return settings
+
+
+@pytest.fixture
+def redis_client(monkeypatch: pytest.MonkeyPatch) -> MockRedisClient:
+    redis_client = MockRedisClient()
+    redis_client.async_redis = SimpleNamespace(delete=AsyncMock())
+    monkeypatch.setattr(
+        "src.modules.services.media_tokens.RedisClient", Mock(return_value=redis_client)
+    )
+    return redis_client
+
+
+@pytest.fixture
+def monotonic(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    monotonic = Mock(return_value=100.0)
+    monkeypatch.setattr("src.modules.services.media_tokens.time.monotonic", monotonic)
+    return monotonic
+
+
+class TestMediaTokenCache:
+    async def test_set_and_get__local_hit__no_redis(self, redis_client: MockRedisClient) -> None:
+        await MediaTokenCache.set("token", MEDIA_TOKEN)
+
+        assert await MediaTokenCache.get("token") == MEDIA_TOKEN
+        redis_client.async_set.assert_awaited_once_with(
+            "media-token:token",
+            value=[1, "audio/episode.mp3", MediaType.AUDIO, True],
+            ttl=3600,
+        )
+        redis_client.async_get.assert_not_awaited()
+
+    async def test_get__from_redis__kept_locally(self, redis_client: MockRedisClient) -> None:
+        # the same value as stored in Redis by `set` (JSON)
+        redis_client.content["media-token:token"] = json.loads(json.dumps(list(MEDIA_TOKEN)))
+
+        assert await MediaTokenCache.get("token") == MEDIA_TOKEN
+        assert MediaTokenCache.get_local("token") == MEDIA_TOKEN
+
+    async def test_get__missing(self, redis_client: MockRedisClient) -> None:
+        assert await MediaTokenCache.get("token") is None
+        redis_client.async_get.assert_awaited_once_with("media-token:token")
+
+    @pytest.mark.usefixtures("redis_client")
+    async def test_get_local__expired(self, monotonic: Mock) -> None:
+        await MediaTokenCache.set("token", MEDIA_TOKEN)
+        monotonic.return_value = 110.5
+
+        assert MediaTokenCache.get_local("token") is None
+        assert "token" not in media_tokens._local_tokens
+
+    @pytest.mark.usefixtures("redis_client")
+    async def test_set__evicts_least_recently_used(self) -> None:
+        for access_token in ("first", "second"):
+            await MediaTokenCache.set(access_token, MEDIA_TOKEN)
+
+        MediaTokenCache.get_local("first")
+        await MediaTokenCache.set("third", MEDIA_TOKEN)
+
+        assert list(media_tokens._local_tokens) == ["first", "third"]
+
+    async def test_invalidate(self, redis_client: MockRedisClient) -> None:
+        await MediaTokenCache.set("token", MEDIA_TOKEN)
+
+        await MediaTokenCache.invalidate(["token", "", "other-token"])
+
+        assert MediaTokenCache.get_local("token") is None
+        redis_client.async_redis.delete.assert_awaited_once_with(
+            "media-token:token", "media-token:other-token"
+        )
+
+    async def test_invalidate__no_tokens(self, redis_client: MockRedisClient) -> None:
+        await MediaTokenCache.invalidate([""])
+
+        redis_client.async_redis.delete.assert_not_awaited()
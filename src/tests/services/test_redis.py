@@ -1,6 +1,6 @@
 import json
 from types import SimpleNamespace
-from unittest.mock import AsyncMock, Mock
+from unittest.mock import AsyncMock, Mock, call
 
 import pytest
 from redis.exceptions import ConnectionError
@@ -98,6 +98,23 @@ class TestRedisClientSync:
 
         sync_redis.publish.assert_called_once_with("test-channel", "test-message")
 
+    def test_set_and_publish__one_pipeline(self) -> None:
+        pipeline = SimpleNamespace(set=Mock(), publish=Mock(), execute=Mock(return_value=[]))
+        sync_redis = SimpleNamespace(pipeline=Mock(return_value=pipeline))
+        RedisClient._sync_redis = sync_redis
+
+        RedisClient().set_and_publish(
+            "my-key", TEST_DATA, ttl=180, channel="test-channel", messages=["msg-1", "msg-2"]
+        )
+
+        sync_redis.pipeline.assert_called_once_with(transaction=False)
+        pipeline.set.assert_called_once_with("my-key", json.dumps(TEST_DATA), ex=180)
+        assert pipeline.publish.call_args_list == [
+            call("test-channel", "msg-1"),
+            call("test-channel", "msg-2"),
+        ]
+        pipeline.execute.assert_called_once_with()
+
     def test_get_key_by_filename__ok(self) -> None:
         assert RedisClient().get_key_by_filename("test-file.mp3") == "test-file"
 
@@ -133,6 +150,27 @@ class TestRedisClientAsync:
 
         async_redis.set.assert_awaited_once_with("my-key", json.dumps(TEST_DATA), 180)
 
+    async def test_async_get_values__one_mget(self) -> None:
+        async_redis = SimpleNamespace(mget=AsyncMock(return_value=[json.dumps(TEST_DATA), None]))
+        _async_redis_for_loop[id(redis_module.asyncio.get_running_loop())] = async_redis
+
+        assert await RedisClient().async_get_values(["key-1", "key-2"]) == [TEST_DATA, None]
+        async_redis.mget.assert_awaited_once_with(["key-1", "key-2"])
+
+    async def test_async_set_many__one_pipeline(self) -> None:
+        pipeline = SimpleNamespace(set=Mock(), execute=AsyncMock(return_value=[]))
+        async_redis = SimpleNamespace(pipeline=Mock(return_value=pipeline))
+        _async_redis_for_loop[id(redis_module.asyncio.get_running_loop())] = async_redis
+
+        await RedisClient().async_set_many({"key-1": TEST_DATA, "key-2": "value"}, ttl=180)
+
+        async_redis.pipeline.assert_called_once_with(transaction=False)
+        assert pipeline.set.call_args_list == [
+            call("key-1", json.dumps(TEST_DATA), ex=180),
+            call("key-2", json.dumps("value"), ex=180),
+        ]
+        pipeline.execute.assert_awaited_once_with()
+
     async def test_async_publish__ok(self) -> None:
         async_redis = SimpleNamespace(publish=AsyncMock(return_value=None))
         _async_redis_for_loop[id(redis_module.asyncio.get_running_loop())] = async_redis
@@ -1,14 +1,30 @@
+from datetime import UTC, datetime
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import AsyncMock
+from unittest.mock import ANY, AsyncMock, Mock
 
+import botocore.config
 import botocore.exceptions
+import botocore.session
 import pytest
 from pydantic import SecretStr
 
 from src.exceptions import StorageConfigurationError
-from src.modules.services.storage import StorageS3, validate_s3_settings
+from src.modules.services import storage as storage_module
+from src.modules.services.storage import (
+    StorageS3,
+    close_s3_client,
+    generate_presigned_url,
+    get_presign_signer,
+    validate_s3_settings,
+)
 from src.settings.db import S3Settings
+from src.tests.mocks import MockRedisClient
+
+
+@pytest.fixture(autouse=True)
+def clear_s3_clients(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(storage_module, "_s3_client_for_loop", {})
 
 
 class TestStorageSettings:
@@ -42,8 +58,49 @@ class TestStorageS3Operations:
             Bucket="bucket",
             Key="audio/audio.mp3",
             Callback=None,
+            Config=ANY,
             ExtraArgs={"ContentType": "audio/mpeg"},
         )
+        transfer_config = s3.upload_file.await_args.kwargs["Config"]
+        assert transfer_config.multipart_threshold == 16
+        assert transfer_config.multipart_chunksize == 4
+        assert transfer_config.max_concurrency == 2
+
+    async def test_upload_file__overrides_and_part_progress(self, tmp_path: Path) -> None:
+        storage, s3 = _make_storage()
+        src_path = tmp_path / "audio.mp3"
+        src_path.write_bytes(b"audio")
+        reported: list[int] = []
+
+        async def upload_file(**kwargs) -> None:
+            for _ in range(7):
+                kwargs["Callback"](3)
+
+        s3.upload_file.side_effect = upload_file
+
+        await storage.upload_file(
+            src_path,
+            "audio",
+            callback=reported.append,
+            multipart_threshold=100,
+            part_size=10,
+            max_concurrency=5,
+        )
+
+        transfer_config = s3.upload_file.await_args.kwargs["Config"]
+        assert transfer_config.multipart_threshold == 100
+        assert transfer_config.multipart_chunksize == 10
+        assert transfer_config.max_concurrency == 5
+        assert reported == [12, 9]
+
+    async def test_upload_file__cache_control(self, tmp_path: Path) -> None:
+        storage, s3 = _make_storage()
+        src_path = tmp_path / "feed.xml"
+        src_path.write_bytes(b"<rss />")
+
+        await storage.upload_file(src_path, "rss", cache_control="no-cache")
+
+        assert s3.upload_file.await_args.kwargs["ExtraArgs"]["CacheControl"] == "no-cache"
 
     async def test_download_file__ok(self, tmp_path: Path) -> None:
         storage, s3 = _make_storage()
@@ -70,6 +127,15 @@ class TestStorageS3Operations:
             CopySource={"Bucket": "bucket", "Key": "tmp/source.mp3"},
         )
 
+    async def test_get_file_content__ok(self) -> None:
+        storage, s3 = _make_storage()
+        s3.get_object.return_value = {"Body": SimpleNamespace(read=AsyncMock(return_value=b"rss"))}
+
+        result = await storage.get_file_content("rss/feed.xml")
+
+        assert result == b"rss"
+        s3.get_object.assert_awaited_once_with(Key="rss/feed.xml", Bucket="bucket")
+
     async def test_get_file_size__uses_content_length(self) -> None:
         storage, _ = _make_storage(
             head_result={"ResponseMetadata": {"HTTPHeaders": {"content-length": "42"}}}
@@ -92,37 +158,193 @@ class TestStorageS3Operations:
         with pytest.raises(ValueError, match="At least one argument"):
             await storage.delete_file()
 
+    async def test_delete_objects__batches_keys(self) -> None:
+        storage, s3 = _make_storage()
+        keys = [f"audio/{index}.mp3" for index in range(5)]
+
+        result = await storage.delete_objects([*keys, keys[0], ""], batch_size=2)
+
+        assert result == {}
+        assert [
+            [item["Key"] for item in call.kwargs["Delete"]["Objects"]]
+            for call in s3.delete_objects.await_args_list
+        ] == [keys[0:2], keys[2:4], keys[4:5]]
+        assert all(call.kwargs["Bucket"] == "bucket" for call in s3.delete_objects.await_args_list)
+
+    async def test_delete_objects__returns_failed_keys(self) -> None:
+        storage, s3 = _make_storage()
+        s3.delete_objects.return_value = {
+            "Errors": [{"Key": "audio/2.mp3", "Code": "AccessDenied", "Message": "denied"}]
+        }
+
+        result = await storage.delete_objects(["audio/1.mp3", "audio/2.mp3"])
+
+        assert result == {"audio/2.mp3": "AccessDenied: denied"}
+
+    async def test_delete_objects__request_failed__all_batch_keys_failed(self) -> None:
+        storage, s3 = _make_storage()
+        s3.delete_objects.side_effect = botocore.exceptions.ClientError(
+            {"Error": {"Code": "500", "Message": "internal"}}, "DeleteObjects"
+        )
+
+        result = await storage.delete_objects(["audio/1.mp3", "audio/2.mp3"])
+
+        assert set(result) == {"audio/1.mp3", "audio/2.mp3"}
+
+    async def test_delete_files__uses_bulk_delete(self) -> None:
+        storage, s3 = _make_storage()
+
+        await storage.delete_files(["1.mp3", "2.mp3"], remote_path="audio")
+
+        s3.delete_objects.assert_awaited_once_with(
+            Bucket="bucket",
+            Delete={"Objects": [{"Key": "audio/1.mp3"}, {"Key": "audio/2.mp3"}], "Quiet": True},
+        )
+        s3.delete_object.assert_not_awaited()
+
     async def test_get_presigned_url__uses_cached_url(
         self, monkeypatch: pytest.MonkeyPatch
     ) -> None:
         storage, s3 = _make_storage()
-        redis = SimpleNamespace(async_get=AsyncMock(return_value="cached"), async_set=AsyncMock())
+        redis = MockRedisClient(content={"audio/source.mp3": "cached"})
         monkeypatch.setattr("src.modules.services.storage.RedisClient", lambda: redis)
 
         result = await storage.get_presigned_url("audio/source.mp3")
 
         assert result == "cached"
         s3.generate_presigned_url.assert_not_called()
-        redis.async_set.assert_not_awaited()
+        redis.async_set_many.assert_not_awaited()
 
     async def test_get_presigned_url__stores_generated_url(
         self,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         storage, s3 = _make_storage()
-        s3.generate_presigned_url.return_value = "generated"
-        redis = SimpleNamespace(async_get=AsyncMock(return_value=None), async_set=AsyncMock())
+        signer = SimpleNamespace(presign_many=Mock(return_value=["generated"]))
+        monkeypatch.setattr("src.modules.services.storage.get_presign_signer", lambda: signer)
+        redis = MockRedisClient()
         monkeypatch.setattr("src.modules.services.storage.RedisClient", lambda: redis)
 
         result = await storage.get_presigned_url("audio/source.mp3")
 
         assert result == "generated"
-        redis.async_set.assert_awaited_once_with(
-            "audio/source.mp3",
-            value="generated",
-            ttl=120,
+        signer.presign_many.assert_called_once_with(["audio/source.mp3"])
+        # signed locally: S3 client isn't used
+        s3.generate_presigned_url.assert_not_called()
+        redis.async_set_many.assert_awaited_once_with({"audio/source.mp3": "generated"}, ttl=120)
+
+    async def test_get_presigned_urls__one_round_trip_for_cached_and_one_for_missed(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        storage, _ = _make_storage()
+        signer = SimpleNamespace(
+            presign_many=Mock(side_effect=lambda keys: [f"signed:{key}" for key in keys])
+        )
+        monkeypatch.setattr("src.modules.services.storage.get_presign_signer", lambda: signer)
+        redis = MockRedisClient(content={"images/2.png": "cached:images/2.png"})
+        monkeypatch.setattr("src.modules.services.storage.RedisClient", lambda: redis)
+
+        result = await storage.get_presigned_urls(
+            ["audio/1.mp3", "images/2.png", "audio/3.mp3", "audio/1.mp3"]
         )
 
+        assert result == [
+            "signed:audio/1.mp3",
+            "cached:images/2.png",
+            "signed:audio/3.mp3",
+            "signed:audio/1.mp3",
+        ]
+        redis.async_get_values.assert_awaited_once_with(
+            ["audio/1.mp3", "images/2.png", "audio/3.mp3", "audio/1.mp3"]
+        )
+        signer.presign_many.assert_called_once_with(["audio/1.mp3", "audio/3.mp3"])
+        redis.async_set_many.assert_awaited_once_with(
+            {"audio/1.mp3": "signed:audio/1.mp3", "audio/3.mp3": "signed:audio/3.mp3"}, ttl=120
+        )
+
+    async def test_get_presigned_urls__no_keys(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        storage, _ = _make_storage()
+        redis = MockRedisClient()
+        monkeypatch.setattr("src.modules.services.storage.RedisClient", lambda: redis)
+
+        assert await storage.get_presigned_urls([]) == []
+        redis.async_get_values.assert_not_awaited()
+
+    async def test_upload_stream__ok(self) -> None:
+        storage, s3 = _make_storage()
+        uploaded: list[int] = []
+
+        result = await storage.upload_stream(
+            _iter_chunks(b"abc", b"defgh", b"ij"),
+            "audio",
+            "episode.mp3",
+            callback=uploaded.append,
+        )
+
+        assert result == ("audio/episode.mp3", 10)
+        assert [call.kwargs["Body"] for call in s3.upload_part.await_args_list] == [
+            b"abcd",
+            b"efgh",
+            b"ij",
+        ]
+        assert uploaded == [4, 4, 2]
+        s3.create_multipart_upload.assert_awaited_once_with(
+            Bucket="bucket", Key="audio/episode.mp3", ContentType="audio/mpeg"
+        )
+        s3.complete_multipart_upload.assert_awaited_once_with(
+            Bucket="bucket",
+            Key="audio/episode.mp3",
+            UploadId="upload-id",
+            MultipartUpload={
+                "Parts": [
+                    {"ETag": "etag-1", "PartNumber": 1},
+                    {"ETag": "etag-2", "PartNumber": 2},
+                    {"ETag": "etag-3", "PartNumber": 3},
+                ]
+            },
+        )
+        s3.abort_multipart_upload.assert_not_awaited()
+
+    async def test_upload_stream__source_error__aborts_upload(self) -> None:
+        storage, s3 = _make_storage()
+
+        async def _broken_chunks():
+            yield b"abcdef"
+            raise RuntimeError("source failed")
+
+        result = await storage.upload_stream(_broken_chunks(), "audio", "episode.mp3")
+
+        assert result is None
+        s3.complete_multipart_upload.assert_not_awaited()
+        s3.abort_multipart_upload.assert_awaited_once_with(
+            Bucket="bucket", Key="audio/episode.mp3", UploadId="upload-id"
+        )
+
+    async def test_run_with_client__reuses_client_in_loop(self) -> None:
+        storage, s3 = _make_storage()
+
+        await storage.get_file_size(filename="episode.mp3")
+        await storage.copy_file("tmp/source.mp3", "audio/result.mp3")
+
+        storage._session.client.assert_called_once()
+        assert s3.head_object.await_count == 1
+        assert s3.copy_object.await_count == 1
+
+    async def test_close_s3_client__closes_and_recreates(self) -> None:
+        storage, _ = _make_storage()
+        await storage.get_file_size(filename="episode.mp3")
+        client_ctx = storage._session.client.return_value
+
+        await close_s3_client()
+        await storage.get_file_size(filename="episode.mp3")
+
+        assert client_ctx.closed
+        assert storage._session.client.call_count == 2
+
+    async def test_close_s3_client__no_client__skip(self) -> None:
+        await close_s3_client()
+
     async def test_run_with_client__client_error__returns_error_code(self) -> None:
         storage, _ = _make_storage(
             client_error=botocore.exceptions.ClientError(
@@ -137,6 +359,88 @@ class TestStorageS3Operations:
         assert result is None
 
 
+SIGNED_AT = datetime(2026, 10, 17, 7, 12, 2, tzinfo=UTC)
+
+
+class TestS3PresignSigner:
+    @pytest.fixture
+    def s3_settings(self, monkeypatch: pytest.MonkeyPatch) -> S3Settings:
+        s3_settings = S3Settings(
+            storage_url="https://storage.local",
+            access_key_id="access-key",
+            secret_access_key=SecretStr("secret"),
+            region_name="ru-central1",
+            bucket_name="bucket",
+        )
+        monkeypatch.setattr(
+            "src.modules.services.storage.get_app_settings",
+            lambda: SimpleNamespace(s3=s3_settings),
+        )
+        return s3_settings
+
+    @pytest.mark.parametrize("storage_url", ["https://storage.local", None])
+    def test_same_as_client(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        s3_settings: S3Settings,
+        storage_url: str | None,
+    ) -> None:
+        s3_settings.storage_url = storage_url
+        remote_paths = ["audio/episode #1 (ü+).mp3", "images/cover~1.png"]
+        monkeypatch.setattr("botocore.auth.get_current_datetime", lambda: SIGNED_AT)
+        client = botocore.session.get_session().create_client(
+            "s3",
+            endpoint_url=storage_url or "https://s3.ru-central1.amazonaws.com",
+            region_name="ru-central1",
+            aws_access_key_id="access-key",
+            aws_secret_access_key="secret",
+            config=botocore.config.Config(
+                signature_version="s3v4",
+                s3={"addressing_style": "path" if storage_url else "virtual"},
+            ),
+        )
+        expected_urls = [
+            client.generate_presigned_url(
+                "get_object", Params={"Bucket": "bucket", "Key": remote_path}, ExpiresIn=600
+            )
+            for remote_path in remote_paths
+        ]
+
+        assert get_presign_signer().presign_many(remote_paths, now=SIGNED_AT) == expected_urls
+
+    @pytest.mark.usefixtures("s3_settings")
+    def test_signing_key__derived_once_per_day(self) -> None:
+        signer = get_presign_signer()
+
+        signer.presign_many(["audio/1.mp3", "audio/2.mp3"], now=SIGNED_AT)
+        signing_key = signer._signing_key
+        signer.presign_many(["audio/3.mp3"], now=SIGNED_AT.replace(hour=23))
+
+        assert signer._signing_key is signing_key
+        signer.presign_many(["audio/3.mp3"], now=SIGNED_AT.replace(day=18))
+        assert signer._signing_key[0] == "20261018"
+
+    def test_signer__shared_while_settings_are_same(self, s3_settings: S3Settings) -> None:
+        signer = get_presign_signer()
+
+        assert get_presign_signer() is signer
+        s3_settings.link_expires_in = 60
+        assert get_presign_signer() is not signer
+
+    @pytest.mark.usefixtures("s3_settings")
+    def test_generate_presigned_url(self) -> None:
+        url = generate_presigned_url("audio/episode.mp3")
+
+        assert url.startswith("https://storage.local/bucket/audio/episode.mp3?X-Amz-Algorithm=")
+        assert "X-Amz-Signature=" in url
+
+    def test_missing_credentials__fail(self, s3_settings: S3Settings) -> None:
+        s3_settings.secret_access_key = None
+
+        with pytest.raises(StorageConfigurationError, match="S3_SECRET_ACCESS_KEY"):
+            generate_presigned_url("audio/episode.mp3")
+
+
 def _make_storage(
     *,
     head_result: dict | None = None,
@@ -150,13 +454,23 @@ def _make_storage(
             storage_url="https://storage.local",
             link_expires_in=600,
             link_cache_expires_in=120,
+            multipart_threshold=16,
+            multipart_chunksize=4,
+            multipart_max_concurrency=2,
+            max_pool_connections=10,
+            keepalive_timeout=30.0,
         )
     )
     s3 = _FakeS3Client(head_result=head_result, client_error=client_error)
-    storage._session = SimpleNamespace(client=lambda **kwargs: _FakeS3Context(s3, client_error))
+    storage._session = SimpleNamespace(client=Mock(return_value=_FakeS3Context(s3, client_error)))
     return storage, s3
 
 
+async def _iter_chunks(*chunks: bytes):
+    for chunk in chunks:
+        yield chunk
+
+
 class _FakeS3Client:
     def __init__(
         self,
@@ -168,8 +482,16 @@ class _FakeS3Client:
         self.download_file = AsyncMock(return_value=None)
         self.copy_object = AsyncMock(return_value={})
         self.delete_object = AsyncMock(return_value={})
+        self.delete_objects = AsyncMock(return_value={})
         self.head_object = AsyncMock(return_value=head_result)
+        self.get_object = AsyncMock(return_value={})
         self.generate_presigned_url = AsyncMock(return_value="presigned")
+        self.create_multipart_upload = AsyncMock(return_value={"UploadId": "upload-id"})
+        self.upload_part = AsyncMock(
+            side_effect=lambda **kwargs: {"ETag": f"etag-{kwargs['PartNumber']}"}
+        )
+        self.complete_multipart_upload = AsyncMock(return_value={})
+        self.abort_multipart_upload = AsyncMock(return_value={})
         self.client_error = client_error
 
 
@@ -177,6 +499,7 @@ class _FakeS3Context:
     def __init__(self, client: _FakeS3Client, client_error: Exception | None) -> None:
         self.client = client
         self.client_error = client_error
+        self.closed = False
 
     async def __aenter__(self) -> _FakeS3Client:
         if self.client_error:
@@ -184,4 +507,4 @@ class _FakeS3Context:
         return self.client
 
     async def __aexit__(self, *args: object) -> None:
-        return None
+        self.closed = True
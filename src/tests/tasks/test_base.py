@@ -1,9 +1,10 @@
+import asyncio
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
 
 import pytest
 
-from src.modules.tasks.base import RQTask, TaskResultCode
+from src.modules.tasks.base import RQTask, TaskResultCode, persistent_event_loop
 from src.settings.app import AppSettings
 from src.tests.mocks import MockSession, MockUOW
 
@@ -131,6 +132,59 @@ class TestRQTaskRun:
         close_database.assert_awaited_once_with()
         close_async_redis_connection.assert_awaited_once_with()
 
+    def test_call__persistent_loop__reuses_loop_without_reinit(
+        self,
+        app_settings: AppSettings,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        task = SuccessfulTaskForTest()
+        used_loops: list[asyncio.AbstractEventLoop] = []
+        initialize_database = AsyncMock(return_value=None)
+        close_database = AsyncMock(return_value=None)
+
+        async def perform_and_run(*args: object, **kwargs: object) -> TaskResultCode:
+            used_loops.append(asyncio.get_running_loop())
+            return TaskResultCode.SUCCESS
+
+        monkeypatch.setattr(task, "_perform_and_run", perform_and_run)
+        monkeypatch.setattr("src.modules.tasks.base.initialize_database", initialize_database)
+        monkeypatch.setattr("src.modules.tasks.base.close_database", close_database)
+
+        with persistent_event_loop():
+            results = [task(episode_id=1), task(episode_id=2)]
+
+        assert results == [TaskResultCode.SUCCESS, TaskResultCode.SUCCESS]
+        assert len(used_loops) == 2
+        assert used_loops[0] is used_loops[1]
+        initialize_database.assert_not_awaited()
+        close_database.assert_not_awaited()
+
+    def test_call__persistent_loop__cancels_tasks_left_by_job(
+        self,
+        app_settings: AppSettings,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        task = SuccessfulTaskForTest()
+        leftovers: list[asyncio.Task] = []
+
+        async def perform_and_run(*args: object, **kwargs: object) -> TaskResultCode:
+            leftovers.append(asyncio.create_task(asyncio.sleep(60)))
+            return TaskResultCode.SUCCESS
+
+        monkeypatch.setattr(task, "_perform_and_run", perform_and_run)
+
+        with persistent_event_loop():
+            result = task(episode_id=1)
+
+        assert result == TaskResultCode.SUCCESS
+        assert leftovers[0].cancelled()
+
+    def test_persistent_event_loop__nested__fail(self) -> None:
+        with persistent_event_loop():
+            with pytest.raises(RuntimeError, match="already running"):
+                with persistent_event_loop():
+                    pass
+
 
 class TestRQTaskCancel:
     def test_cancel_task__ok(
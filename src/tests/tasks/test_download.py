@@ -1,3 +1,4 @@
+import json
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
@@ -10,6 +11,8 @@ from src.exceptions import DownloadingInterrupted, UserCancellationError
 from src.modules.tasks.base import TaskResultCode
 from src.modules.tasks.download import DownloadEpisodeTask, UploadedEpisodeTask
 from src.modules.db.models import Episode
+from src.modules.utils.processing import ProgressTarget
+from src.modules.utils.streaming import StreamResult, StreamSource
 from src.tests.factories import make_episode, make_file, make_podcast
 from src.tests.mocks import MockSession, MockStorageS3
 
@@ -25,7 +28,26 @@ def _episode_with_audio(**kwargs) -> Episode:
     return episode
 
 
+class FakeCancellationListener:
+    def __init__(self, episode_id: int, task_context: object = None) -> None:
+        self.episode_id = episode_id
+        self.watch = Mock()
+
+    async def __aenter__(self) -> "FakeCancellationListener":
+        return self
+
+    async def __aexit__(self, *args: object) -> None:
+        return None
+
+
 class TestDownloadEpisodeTaskRun:
+    @pytest.fixture(autouse=True)
+    def cancellation_listener(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        monkeypatch.setattr(
+            "src.modules.tasks.download.processing_utils.CancellationListener",
+            FakeCancellationListener,
+        )
+
     async def test_run__user_cancel__resets_episode_and_publishes_signal(
         self,
         monkeypatch: pytest.MonkeyPatch,
@@ -33,10 +55,14 @@ class TestDownloadEpisodeTaskRun:
         task = DownloadEpisodeTask(db_session=MockSession())
         update_by_ids = AsyncMock()
         publish = AsyncMock()
+        repository = SimpleNamespace(
+            update_by_ids=update_by_ids,
+            first=AsyncMock(return_value=make_episode(id=5, owner_id=10)),
+        )
+        repository.without_files = Mock(return_value=repository)
         monkeypatch.setattr("src.modules.tasks.download.StorageS3", MockStorageS3)
         monkeypatch.setattr(
-            "src.modules.tasks.download.EpisodeRepository",
-            Mock(return_value=SimpleNamespace(update_by_ids=update_by_ids)),
+            "src.modules.tasks.download.EpisodeRepository", Mock(return_value=repository)
         )
         monkeypatch.setattr(
             "src.modules.tasks.download.FileRepository",
@@ -52,10 +78,48 @@ class TestDownloadEpisodeTaskRun:
 
         assert result == TaskResultCode.CANCEL
         update_by_ids.assert_awaited_once_with([5], {"status": EpisodeStatus.NEW})
+        # owner-scoped: only the owner's SSE stream gets "refresh"
         publish.assert_awaited_once_with(
             channel=task.settings.redis.progress_pubsub_ch,
-            message=task.settings.redis.progress_pubsub_signal,
+            message=json.dumps(
+                {"signal": task.settings.redis.progress_pubsub_signal, "owner_id": 10}
+            ),
         )
+        repository.first.assert_awaited_once_with(5)
+
+    async def test_run__bound_progress__refresh_for_owners_of_related_episodes(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        task = DownloadEpisodeTask(db_session=MockSession())
+        publish = AsyncMock()
+        monkeypatch.setattr("src.modules.tasks.download.StorageS3", MockStorageS3)
+        monkeypatch.setattr(
+            "src.modules.tasks.download.EpisodeRepository", Mock(return_value=SimpleNamespace())
+        )
+        monkeypatch.setattr(
+            "src.modules.tasks.download.FileRepository",
+            Mock(return_value=SimpleNamespace()),
+        )
+
+        async def perform_run(_: int) -> TaskResultCode:
+            task.progress_owner_ids = {20, 10}
+            return TaskResultCode.SUCCESS
+
+        monkeypatch.setattr(task, "perform_run", perform_run)
+        monkeypatch.setattr(
+            "src.modules.tasks.download.RedisClient",
+            Mock(return_value=SimpleNamespace(async_publish=publish)),
+        )
+
+        assert await task.run(episode_id=5) == TaskResultCode.SUCCESS
+
+        assert [
+            json.loads(call.kwargs["message"])["owner_id"] for call in publish.await_args_list
+        ] == [
+            10,
+            20,
+        ]
 
     async def test_run__unexpected_error__marks_episode_error(
         self, monkeypatch: pytest.MonkeyPatch
@@ -84,6 +148,35 @@ class TestDownloadEpisodeTaskRun:
 
 
 class TestDownloadEpisodeTaskSteps:
+    async def test_bind_progress__related_episodes_are_targets(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        episode = _episode_with_audio(id=1, owner_id=10, podcast_id=100)
+        related = make_episode(id=2, owner_id=20, podcast_id=200)
+        task = DownloadEpisodeTask(db_session=MockSession())
+        task.episode_repository = SimpleNamespace(all=AsyncMock(return_value=[episode, related]))
+        task.episode_repository.without_files = Mock(return_value=task.episode_repository)
+        reporter = SimpleNamespace(bind=Mock())
+        get_reporter = Mock(return_value=reporter)
+        monkeypatch.setattr(
+            "src.modules.tasks.download.processing_utils.get_progress_reporter", get_reporter
+        )
+
+        await task._bind_progress(episode)
+
+        get_reporter.assert_called_once_with(episode.audio_filename)
+        assert list(reporter.bind.call_args.args[0]) == [
+            ProgressTarget(episode_id=1, owner_id=10, podcast_id=100),
+            ProgressTarget(episode_id=2, owner_id=20, podcast_id=200),
+        ]
+        task.episode_repository.all.assert_awaited_once_with(
+            source_id=episode.source_id,
+            source_type=episode.source_type,
+            status__ne=EpisodeStatus.ARCHIVED,
+        )
+        assert task.progress_owner_ids == {10, 20}
+
     async def test_check_is_needed__already_downloaded__updates_and_skips(self) -> None:
         episode = _episode_with_audio()
         task = DownloadEpisodeTask(db_session=MockSession())
@@ -159,14 +252,14 @@ class TestDownloadEpisodeTaskSteps:
         task._update_episodes.assert_awaited_once_with(episode, {"status": EpisodeStatus.ERROR})
         task._update_files.assert_awaited_once_with(episode, {"available": False})
 
-    async def test_process_file__youtube__sets_metadata(
+    async def test_process_file__youtube__sets_metadata_in_single_pass(
         self,
         monkeypatch: pytest.MonkeyPatch,
         tmp_path: Path,
     ) -> None:
         episode = _episode_with_audio(source_type=SourceType.YOUTUBE)
-        ffmpeg_preparation = Mock()
-        ffmpeg_set_metadata = Mock()
+        ffmpeg_preparation = AsyncMock()
+        ffmpeg_set_metadata = AsyncMock()
         monkeypatch.setattr(
             "src.modules.tasks.download.ffmpeg_utils.ffmpeg_preparation",
             ffmpeg_preparation,
@@ -178,8 +271,12 @@ class TestDownloadEpisodeTaskSteps:
 
         await DownloadEpisodeTask._process_file(episode, tmp_path / "episode.mp3")
 
-        ffmpeg_preparation.assert_called_once()
-        ffmpeg_set_metadata.assert_called_once()
+        ffmpeg_preparation.assert_awaited_once_with(
+            src_path=tmp_path / "episode.mp3",
+            metadata=episode.generate_metadata(),
+            duration=episode.length,
+        )
+        ffmpeg_set_metadata.assert_not_awaited()
 
     async def test_upload_file__success__updates_path_and_returns_size(
         self,
@@ -221,7 +318,74 @@ class TestDownloadEpisodeTaskSteps:
         assert exc.value.code == TaskResultCode.ERROR
         task._update_episodes.assert_awaited_once_with(episode, {"status": EpisodeStatus.ERROR})
 
-    async def test_update_all_rss__regenerates_sorted_podcast_ids(
+    async def test_stream_episode__not_streamable_source__fallback(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        episode = _episode_with_audio(source_type=SourceType.YOUTUBE)
+        task = DownloadEpisodeTask(db_session=MockSession())
+        stream_episode = AsyncMock()
+        monkeypatch.setattr(
+            "src.modules.tasks.download.streaming_utils.resolve_stream_source",
+            AsyncMock(return_value=None),
+        )
+        monkeypatch.setattr(
+            "src.modules.tasks.download.streaming_utils.stream_episode", stream_episode
+        )
+
+        result = await task._stream_episode(episode)
+
+        assert result is None
+        stream_episode.assert_not_awaited()
+
+    async def test_stream_episode__success__updates_path_and_returns_size(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        episode = _episode_with_audio(source_type=SourceType.YOUTUBE)
+        task = DownloadEpisodeTask(db_session=MockSession())
+        task._update_files = AsyncMock()
+        stream_source = StreamSource(url="https://cdn/audio.m4a", headers={})
+        monkeypatch.setattr(
+            "src.modules.tasks.download.streaming_utils.resolve_stream_source",
+            AsyncMock(return_value=stream_source),
+        )
+        stream_episode = AsyncMock(
+            return_value=StreamResult(remote_path="audio/result.mp3", size=456)
+        )
+        monkeypatch.setattr(
+            "src.modules.tasks.download.streaming_utils.stream_episode", stream_episode
+        )
+
+        result = await task._stream_episode(episode)
+
+        assert result == 456
+        assert stream_episode.await_args.args == (stream_source,)
+        task._update_files.assert_awaited_once_with(episode, {"path": "audio/result.mp3"})
+
+    async def test_stream_episode__failure__marks_episode_error(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        episode = _episode_with_audio(source_type=SourceType.YOUTUBE)
+        task = DownloadEpisodeTask(db_session=MockSession())
+        task._update_episodes = AsyncMock()
+        monkeypatch.setattr(
+            "src.modules.tasks.download.streaming_utils.resolve_stream_source",
+            AsyncMock(return_value=StreamSource(url="https://cdn/audio.m4a", headers={})),
+        )
+        monkeypatch.setattr(
+            "src.modules.tasks.download.streaming_utils.stream_episode",
+            AsyncMock(return_value=None),
+        )
+
+        with pytest.raises(DownloadingInterrupted) as exc:
+            await task._stream_episode(episode)
+
+        assert exc.value.code == TaskResultCode.ERROR
+        task._update_episodes.assert_awaited_once_with(episode, {"status": EpisodeStatus.ERROR})
+
+    async def test_update_all_rss__schedules_unique_podcast_ids(
         self,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
@@ -231,19 +395,20 @@ class TestDownloadEpisodeTaskSteps:
                 return_value=[
                     make_episode(podcast_id=2),
                     make_episode(podcast_id=1),
+                    make_episode(podcast_id=2),
                 ]
             )
         )
-        generate_rss_task = SimpleNamespace(run=AsyncMock())
+        task.episode_repository.without_files = Mock(return_value=task.episode_repository)
+        schedule_rss_generation = AsyncMock()
         monkeypatch.setattr(
-            "src.modules.tasks.download.GenerateRSSTask",
-            Mock(return_value=generate_rss_task),
+            "src.modules.tasks.download.schedule_rss_generation", schedule_rss_generation
         )
 
         await task._update_all_rss("source")
 
         task.episode_repository.all.assert_awaited_once_with(source_id="source")
-        generate_rss_task.run.assert_awaited_once_with(1, 2)
+        schedule_rss_generation.assert_awaited_once_with([1, 2])
 
 
 class TestUploadedEpisodeTask:
@@ -281,12 +446,14 @@ class TestUploadedEpisodeTask:
             update=AsyncMock(),
         )
         task.file_repository = SimpleNamespace(update=AsyncMock())
+        task._bind_progress = AsyncMock()
         task._copy_file = AsyncMock(return_value="audio/final.mp3")
         task._update_all_rss = AsyncMock()
 
         result = await task.perform_run(episode_id=1)
 
         assert result == TaskResultCode.SUCCESS
+        task._bind_progress.assert_awaited_once_with(episode, filename="source.mp3")
         task.episode_repository.update.assert_awaited_once_with(
             episode,
             status=EpisodeStatus.PUBLISHED,
@@ -126,7 +126,7 @@ class TestDownloadEpisodeImageTask:
         episode = make_episode()
         episode.image = make_file(type=MediaType.IMAGE, path="")
         downloaded = tmp_path / "source.jpg"
-        ffmpeg_preparation = Mock()
+        ffmpeg_preparation = AsyncMock()
         monkeypatch.setattr(
             "src.modules.tasks.process.download_content",
             AsyncMock(return_value=downloaded),
@@ -138,9 +138,10 @@ class TestDownloadEpisodeImageTask:
         result = await DownloadEpisodeImageTask._download_and_crop_image(episode)
 
         assert result == downloaded
-        ffmpeg_preparation.assert_called_once_with(
+        ffmpeg_preparation.assert_awaited_once_with(
             src_path=downloaded,
             ffmpeg_params=["-vf", "scale=600:-1"],
+            call_process_hook=False,
         )
 
     async def test_upload_cover__retries_until_success(
@@ -181,6 +182,7 @@ class TestApplyMetadataEpisodeTask:
     async def test_perform_run__episode_not_found__error(self) -> None:
         task = ApplyMetadataEpisodeTask(db_session=MockSession())
         task.episode_repository = SimpleNamespace(first=AsyncMock(return_value=None))
+        task.episode_repository.with_podcast = Mock(return_value=task.episode_repository)
 
         result = await task.perform_run(episode_id=1)
 
@@ -189,6 +191,7 @@ class TestApplyMetadataEpisodeTask:
     async def test_perform_run__without_chapters__skip(self) -> None:
         task = ApplyMetadataEpisodeTask(db_session=MockSession())
         task.episode_repository = SimpleNamespace(first=AsyncMock(return_value=make_episode()))
+        task.episode_repository.with_podcast = Mock(return_value=task.episode_repository)
 
         result = await task.perform_run(episode_id=1)
 
@@ -206,9 +209,10 @@ class TestApplyMetadataEpisodeTask:
         local_path = tmp_path / "episode.mp3"
         task = ApplyMetadataEpisodeTask(db_session=MockSession())
         task.episode_repository = SimpleNamespace(first=AsyncMock(return_value=episode))
+        task.episode_repository.with_podcast = Mock(return_value=task.episode_repository)
         monkeypatch.setattr(task, "_download_episode", AsyncMock(return_value=local_path))
         monkeypatch.setattr(task, "_upload_episode", AsyncMock(return_value="audio/episode.mp3"))
-        ffmpeg_set_metadata = Mock()
+        ffmpeg_set_metadata = AsyncMock()
         monkeypatch.setattr(
             "src.modules.tasks.process.ffmpeg.ffmpeg_set_metadata",
             ffmpeg_set_metadata,
@@ -217,7 +221,7 @@ class TestApplyMetadataEpisodeTask:
         result = await task.perform_run(episode_id=1)
 
         assert result == TaskResultCode.SUCCESS
-        ffmpeg_set_metadata.assert_called_once()
+        ffmpeg_set_metadata.assert_awaited_once()
         task._upload_episode.assert_awaited_once_with(episode=episode, tmp_path=local_path)
 
     async def test_download_episode__missing_storage_file__fail(self) -> None:
@@ -1,3 +1,7 @@
+import asyncio
+import hashlib
+import os
+from datetime import UTC, datetime
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
@@ -5,10 +9,39 @@ from unittest.mock import AsyncMock, Mock
 import pytest
 
 from src.constants import EpisodeStatus, FileType
+from src.exceptions import S3UploadingError
 from src.modules.tasks.base import TaskResultCode
-from src.modules.tasks.rss import GenerateRSSTask
+from src.modules.db.models import Podcast
+from src.modules.tasks.rss import (
+    DebouncedGenerateRSSTask,
+    GenerateRSSTask,
+    RenderedRSS,
+    UploadedRSS,
+    get_rss_environment,
+    schedule_rss_generation,
+)
 from src.tests.factories import make_episode, make_file, make_podcast
-from src.tests.mocks import MockSession, MockStorageS3
+from src.tests.mocks import MockRedisClient, MockSession, MockStorageS3
+
+
+def _patch_repositories(
+    monkeypatch: pytest.MonkeyPatch,
+    podcasts: list,
+    episodes: list | None = None,
+) -> SimpleNamespace:
+    repositories = SimpleNamespace(
+        podcast=SimpleNamespace(all=AsyncMock(return_value=podcasts), update_many=AsyncMock()),
+        episode=SimpleNamespace(all=AsyncMock(return_value=episodes or [])),
+        file=SimpleNamespace(update_many=AsyncMock(), create_many=AsyncMock(return_value=[])),
+    )
+    monkeypatch.setattr("src.modules.tasks.rss.StorageS3", MockStorageS3)
+    for name in ("podcast", "episode", "file"):
+        monkeypatch.setattr(
+            f"src.modules.tasks.rss.{name.capitalize()}Repository",
+            Mock(return_value=getattr(repositories, name)),
+        )
+
+    return repositories
 
 
 class TestGenerateRSSTaskRun:
@@ -16,150 +49,388 @@ class TestGenerateRSSTaskRun:
         self,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
-        podcasts = [make_podcast(id=1), make_podcast(id=2)]
-        podcast_repository = SimpleNamespace(all=AsyncMock(return_value=podcasts))
-        file_repository = SimpleNamespace()
-        monkeypatch.setattr(
-            "src.modules.tasks.rss.PodcastRepository",
-            Mock(return_value=podcast_repository),
-        )
-        monkeypatch.setattr(
-            "src.modules.tasks.rss.FileRepository", Mock(return_value=file_repository)
-        )
+        podcasts = [make_podcast(id=1), make_podcast(id=2), make_podcast(id=3)]
+        repositories = _patch_repositories(monkeypatch, podcasts)
+        uploaded = UploadedRSS(podcast=podcasts[0], path="rss/1.xml", size=10, hash="hash")
         task = GenerateRSSTask(db_session=MockSession())
-        task._generate = AsyncMock(
-            side_effect=[
-                {1: TaskResultCode.SUCCESS},
-                {2: TaskResultCode.ERROR},
-            ]
-        )
+        task._generate = AsyncMock(side_effect=[uploaded, None, RuntimeError("render failed")])
+        task._save_rss_files = AsyncMock()
 
-        result = await task.run(1, 2)
+        result = await task.run(1, 2, 3)
 
         assert result == TaskResultCode.ERROR
-        podcast_repository.all.assert_awaited_once_with(ids=[1, 2])
+        repositories.podcast.all.assert_awaited_once_with(ids=[1, 2, 3])
+        # feeds, which were uploaded successfully, are saved anyway
+        task._save_rss_files.assert_awaited_once_with([uploaded])
+
+    async def test_run__not_changed_feeds__success(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        _patch_repositories(monkeypatch, [make_podcast(id=1), make_podcast(id=2)])
+        task = GenerateRSSTask(db_session=MockSession())
+        task._generate = AsyncMock(return_value=None)
+        task._save_rss_files = AsyncMock()
+
+        assert await task.run() == TaskResultCode.SUCCESS
+        task._save_rss_files.assert_awaited_once_with([])
 
     async def test_run__all_generated__success(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        podcast_repository = SimpleNamespace(all=AsyncMock(return_value=[make_podcast()]))
-        monkeypatch.setattr(
-            "src.modules.tasks.rss.PodcastRepository",
-            Mock(return_value=podcast_repository),
-        )
-        monkeypatch.setattr(
-            "src.modules.tasks.rss.FileRepository", Mock(return_value=SimpleNamespace())
-        )
+        podcasts = [make_podcast(id=1), make_podcast(id=2)]
+        episodes = [make_episode(id=1, podcast_id=2), make_episode(id=2, podcast_id=1)]
+        repositories = _patch_repositories(monkeypatch, podcasts, episodes)
         task = GenerateRSSTask(db_session=MockSession())
-        task._generate = AsyncMock(return_value={1: TaskResultCode.SUCCESS})
+        task._generate = AsyncMock(
+            side_effect=lambda podcast, _: UploadedRSS(podcast, f"rss/{podcast.id}.xml", 10, "hash")
+        )
+        task._save_rss_files = AsyncMock()
 
         result = await task.run()
 
         assert result == TaskResultCode.SUCCESS
-        podcast_repository.all.assert_awaited_once_with()
+        repositories.podcast.all.assert_awaited_once_with()
+        # published episodes of all podcasts are selected by one query
+        repositories.episode.all.assert_awaited_once_with(
+            podcast_id__in=[1, 2],
+            status=EpisodeStatus.PUBLISHED,
+            published_at__ne=None,
+        )
+        assert [call.args for call in task._generate.await_args_list] == [
+            (podcasts[0], [episodes[1]]),
+            (podcasts[1], [episodes[0]]),
+        ]
+        assert len(task._save_rss_files.await_args.args[0]) == 2
+
+    async def test_run__generation_is_concurrent_but_limited(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        podcasts = [make_podcast(id=num) for num in range(1, 7)]
+        _patch_repositories(monkeypatch, podcasts)
+        running, max_running = 0, 0
+
+        async def generate(podcast: Podcast, _: list) -> UploadedRSS:
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return UploadedRSS(podcast, f"rss/{podcast.id}.xml", 10, "hash")
+
+        task = GenerateRSSTask(db_session=MockSession())
+        task.settings = SimpleNamespace(rss_generation_concurrency=3)
+        task._generate = generate
+        task._save_rss_files = AsyncMock()
+
+        assert await task.run() == TaskResultCode.SUCCESS
+        assert max_running == 3
 
 
 class TestGenerateRSSTaskGenerate:
-    async def test_generate__existing_rss__updates_file(
+    async def test_generate__uploaded(
         self,
         monkeypatch: pytest.MonkeyPatch,
         tmp_path: Path,
     ) -> None:
         podcast = make_podcast(id=10)
-        podcast.rss_id = 77
+        episodes = [make_episode(podcast_id=10)]
         local_path = tmp_path / "feed.xml"
         local_path.write_text("<rss />", encoding="utf-8")
         task = GenerateRSSTask(db_session=MockSession())
         task.storage = MockStorageS3()
         task.storage.upload_file.return_value = "rss/feed.xml"
-        task.file_repository = SimpleNamespace(update_by_ids=AsyncMock())
-        task.podcast_repository = SimpleNamespace(update_by_filters=AsyncMock())
-        task._render_rss_to_file = AsyncMock(return_value=local_path)
+        task._render_rss_to_file = AsyncMock(return_value=RenderedRSS(local_path, "new-hash"))
         monkeypatch.setattr("src.modules.tasks.rss.get_file_size", Mock(return_value=55))
 
-        result = await task._generate(podcast)
+        result = await task._generate(podcast, episodes)
 
-        assert result == {10: TaskResultCode.SUCCESS}
-        task.file_repository.update_by_ids.assert_awaited_once_with(
-            [77],
-            value={"path": "rss/feed.xml", "size": 55, "available": True},
+        assert result == UploadedRSS(podcast=podcast, path="rss/feed.xml", size=55, hash="new-hash")
+        task._render_rss_to_file.assert_awaited_once_with(podcast, episodes)
+        task.storage.upload_file.assert_awaited_once_with(
+            local_path,
+            dst_path=task.settings.s3.bucket_rss_path,
+            cache_control=task.settings.rss_cache_control,
         )
-        task.podcast_repository.update_by_filters.assert_not_awaited()
 
-    async def test_generate__new_rss__creates_file_and_links_podcast(
+    @pytest.mark.parametrize(
+        "rss_hash, rss_available, uploaded",
+        [
+            ("rss-hash", True, False),
+            ("old-hash", True, True),
+            ("rss-hash", False, True),
+        ],
+    )
+    async def test_generate__same_content__upload_skipped(
         self,
-        monkeypatch: pytest.MonkeyPatch,
         tmp_path: Path,
+        rss_hash: str,
+        rss_available: bool,
+        uploaded: bool,
     ) -> None:
         podcast = make_podcast(id=10)
-        podcast.rss_id = None
-        local_path = tmp_path / "feed.xml"
-        local_path.write_text("<rss />", encoding="utf-8")
-        rss_file = make_file(id=99, type=FileType.RSS, path="rss/feed.xml")
+        podcast.rss = make_file(type=FileType.RSS, hash=rss_hash, available=rss_available)
         task = GenerateRSSTask(db_session=MockSession())
         task.storage = MockStorageS3()
         task.storage.upload_file.return_value = "rss/feed.xml"
-        task.file_repository = SimpleNamespace(create=AsyncMock(return_value=rss_file))
-        task.podcast_repository = SimpleNamespace(update_by_filters=AsyncMock())
-        task._render_rss_to_file = AsyncMock(return_value=local_path)
-        monkeypatch.setattr("src.modules.tasks.rss.get_file_size", Mock(return_value=55))
+        task._render_rss_to_file = AsyncMock(
+            return_value=RenderedRSS(tmp_path / "feed.xml", "rss-hash")
+        )
 
-        result = await task._generate(podcast)
+        result = await task._generate(podcast, [])
 
-        assert result == {10: TaskResultCode.SUCCESS}
-        task.file_repository.create.assert_awaited_once_with(
-            path="rss/feed.xml",
-            size=55,
-            available=True,
-            type=FileType.RSS,
-            owner_id=podcast.owner_id,
-        )
-        task.podcast_repository.update_by_filters.assert_awaited_once_with(
-            filters={"id": podcast.id},
-            value={"rss_id": rss_file.id},
-        )
+        assert (result is not None) is uploaded
+        assert task.storage.upload_file.called is uploaded
 
-    async def test_generate__upload_failure__returns_error(self, tmp_path: Path) -> None:
+    async def test_generate__upload_failure__fail(self, tmp_path: Path) -> None:
         podcast = make_podcast(id=10)
         task = GenerateRSSTask(db_session=MockSession())
         task.storage = MockStorageS3()
         task.storage.upload_file.return_value = None
-        task.file_repository = SimpleNamespace(update_by_ids=AsyncMock(), create=AsyncMock())
-        task._render_rss_to_file = AsyncMock(return_value=tmp_path / "feed.xml")
+        task._render_rss_to_file = AsyncMock(
+            return_value=RenderedRSS(tmp_path / "feed.xml", "rss-hash")
+        )
 
-        result = await task._generate(podcast)
+        with pytest.raises(S3UploadingError):
+            await task._generate(podcast, [])
 
-        assert result == {10: TaskResultCode.ERROR}
-        task.file_repository.update_by_ids.assert_not_awaited()
-        task.file_repository.create.assert_not_awaited()
+    async def test_save_rss_files__bulk_update_and_create(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        invalidate = AsyncMock()
+        monkeypatch.setattr("src.modules.tasks.rss.RSSFeedService.invalidate", invalidate)
+        podcast_with_rss, podcast_without_rss = make_podcast(id=10), make_podcast(id=11)
+        podcast_with_rss.rss_id = 77
+        podcast_with_rss.rss = make_file(id=77, type=FileType.RSS, path="rss/10.xml")
+        podcast_without_rss.rss_id = None
+        rss_file = make_file(id=99, type=FileType.RSS, path="rss/11.xml")
+        task = GenerateRSSTask(db_session=MockSession())
+        task.file_repository = SimpleNamespace(
+            update_many=AsyncMock(), create_many=AsyncMock(return_value=[rss_file])
+        )
+        task.podcast_repository = SimpleNamespace(update_many=AsyncMock())
+
+        await task._save_rss_files(
+            [
+                UploadedRSS(podcast=podcast_with_rss, path="rss/10.xml", size=55, hash="hash-10"),
+                UploadedRSS(
+                    podcast=podcast_without_rss, path="rss/11.xml", size=66, hash="hash-11"
+                ),
+            ]
+        )
+
+        task.file_repository.update_many.assert_awaited_once_with(
+            [{"id": 77, "path": "rss/10.xml", "size": 55, "hash": "hash-10", "available": True}]
+        )
+        (created_files,) = task.file_repository.create_many.await_args.args
+        assert created_files == [
+            {
+                "type": FileType.RSS,
+                "owner_id": podcast_without_rss.owner_id,
+                "path": "rss/11.xml",
+                "size": 66,
+                "hash": "hash-11",
+                "available": True,
+                "access_token": created_files[0]["access_token"],
+            }
+        ]
+        task.podcast_repository.update_many.assert_awaited_once_with([{"id": 11, "rss_id": 99}])
+        # directly served feed is read again after commit of its new hash
+        invalidate.assert_not_awaited()
+        await task.db_session.commit()
+        invalidate.assert_awaited_once_with({"token77": "hash-10"})
 
     async def test_render_rss_to_file__renders_published_episodes(
         self,
         monkeypatch: pytest.MonkeyPatch,
         tmp_path: Path,
     ) -> None:
-        template_dir = tmp_path / "templates" / "rss"
-        template_dir.mkdir(parents=True)
-        (template_dir / "feed_template.xml").write_text(
-            "{{ podcast.name }}:{% for episode in episodes %}{{ episode.title }};{% endfor %}",
-            encoding="utf-8",
-        )
         rss_dir = tmp_path / "rss"
         rss_dir.mkdir()
         episodes = [make_episode(title="Published", status=EpisodeStatus.PUBLISHED)]
-        episode_repository = SimpleNamespace(all=AsyncMock(return_value=episodes))
-        monkeypatch.setattr(
-            "src.modules.tasks.rss.EpisodeRepository",
-            Mock(return_value=episode_repository),
-        )
-        task = GenerateRSSTask(db_session=MockSession())
-        task.settings = SimpleNamespace(template_path=tmp_path / "templates", tmp_rss_path=rss_dir)
+        monkeypatch.setattr("src.modules.tasks.rss.RedisClient", MockRedisClient)
+        task = _task_with_templates(tmp_path)
+        task.settings.tmp_rss_path = rss_dir
         podcast = make_podcast(id=10, name="Podcast")
 
-        result = await task._render_rss_to_file(podcast)
+        result = await task._render_rss_to_file(podcast, episodes)
 
-        assert result == rss_dir / f"{podcast.publish_id}.xml"
-        assert result.read_text(encoding="utf-8") == "Podcast:Published;"
-        episode_repository.all.assert_awaited_once_with(
-            podcast_id=podcast.id,
-            status=EpisodeStatus.PUBLISHED,
-            published_at__ne=None,
+        assert result == RenderedRSS(
+            path=rss_dir / f"{podcast.publish_id}.xml",
+            hash=hashlib.md5(b"Podcast:Published;").hexdigest(),
+        )
+        assert result.path.read_text(encoding="utf-8") == "Podcast:Published;"
+
+
+def _task_with_templates(tmp_path: Path) -> GenerateRSSTask:
+    template_dir = tmp_path / "templates" / "rss"
+    template_dir.mkdir(parents=True)
+    (template_dir / "feed_template.xml").write_text(
+        "{{ podcast.name }}:{% for item in items %}{{ item }}{% endfor %}", encoding="utf-8"
+    )
+    (template_dir / "feed_item.xml").write_text("{{ episode.title }};", encoding="utf-8")
+    task = GenerateRSSTask(db_session=MockSession())
+    task.settings = SimpleNamespace(
+        template_path=tmp_path / "templates",
+        rss_item_cache_ttl=3600,
+        service_url="https://podcast.dev/",
+        default_episode_cover="episode-default.jpg",
+        s3=SimpleNamespace(storage_url="https://storage.dev", bucket_name="podcast"),
+    )
+    return task
+
+
+class TestGenerateRSSTaskItems:
+    async def test_render_items__only_missed_items_are_rendered(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        podcast = make_podcast(id=10)
+        episodes = [make_episode(id=num, title=f"Episode {num}") for num in (1, 2, 3)]
+        task = _task_with_templates(tmp_path)
+        redis_client = MockRedisClient()
+        monkeypatch.setattr("src.modules.tasks.rss.RedisClient", Mock(return_value=redis_client))
+        await task._render_items(podcast, episodes)
+        cached_items = redis_client.async_set_many.await_args.args[0]
+        redis_client.content = cached_items | {
+            key: "cached;" for key in cached_items if key.startswith("rss-item:1:")
+        }
+        redis_client.async_set_many.reset_mock()
+        episodes[1].title = "Changed"
+
+        items = await task._render_items(podcast, episodes)
+
+        assert items == ["cached;", "Changed;", "Episode 3;"]
+        (rendered_items,), kwargs = redis_client.async_set_many.await_args
+        assert list(rendered_items.values()) == ["Changed;"]
+        assert kwargs == {"ttl": 3600}
+
+    def test_item_cache_key__depends_on_item_data(self) -> None:
+        podcast = make_podcast(id=10)
+        episode = make_episode(id=5)
+        episode.audio = make_file(id=7)
+        key = GenerateRSSTask._item_cache_key(podcast, episode, common_digest="v1")
+
+        assert key.startswith("rss-item:5:")
+        assert GenerateRSSTask._item_cache_key(podcast, episode, common_digest="v1") == key
+        assert GenerateRSSTask._item_cache_key(podcast, episode, common_digest="v2") != key
+        episode.audio.size += 1
+        assert GenerateRSSTask._item_cache_key(podcast, episode, common_digest="v1") != key
+        podcast.name = "Renamed podcast"
+        assert GenerateRSSTask._item_cache_key(podcast, episode, common_digest="v1") != key
+
+
+class TestRSSEnvironment:
+    def test_environment__templates_are_compiled_once(self, tmp_path: Path) -> None:
+        task = _task_with_templates(tmp_path)
+        environment = get_rss_environment(task.settings.template_path)
+
+        assert get_rss_environment(task.settings.template_path) is environment
+        assert environment.get_template("feed_item.xml") is environment.get_template(
+            "feed_item.xml"
+        )
+        assert environment.bytecode_cache is not None
+
+    async def test_render_items__template_changed__items_are_rendered_again(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        task = _task_with_templates(tmp_path)
+        redis_client = MockRedisClient()
+        monkeypatch.setattr("src.modules.tasks.rss.RedisClient", Mock(return_value=redis_client))
+        podcast, episodes = make_podcast(id=10), [make_episode(id=1, title="Episode")]
+        await task._render_items(podcast, episodes)
+        redis_client.content = redis_client.async_set_many.await_args.args[0]
+        item_template = task.settings.template_path / "rss" / "feed_item.xml"
+        item_template.write_text("<item>{{ episode.title }}</item>", encoding="utf-8")
+        os.utime(item_template, (0, item_template.stat().st_mtime + 10))
+
+        items = await task._render_items(podcast, episodes)
+
+        assert items == ["<item>Episode</item>"]
+
+
+class TestRSSScheduling:
+    @pytest.fixture
+    def scheduling(self, monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+        dirty_marks: dict[str, bytes] = {"rss-dirty:2": b"720.0"}
+        results: list[bool | bytes | None] = []
+
+        def execute() -> list[bool | bytes | None]:
+            executed = results.copy()
+            results.clear()
+            return executed
+
+        pipeline = SimpleNamespace(
+            set=lambda key, value, nx, ex: results.append(
+                dirty_marks.setdefault(key, value.encode()) == value.encode()
+            ),
+            get=lambda key: results.append(dirty_marks.get(key)),
+            execute=execute,
         )
+        queue = SimpleNamespace(enqueue_at=Mock())
+        redis_client = MockRedisClient()
+        redis_client.sync_redis = SimpleNamespace(pipeline=Mock(return_value=pipeline))
+        settings = SimpleNamespace(
+            rss_debounce_quiet_window=30.0,
+            rss_debounce_max_latency=300.0,
+            rq_queue_name="podcast",
+            rq_default_timeout=3600,
+        )
+        monkeypatch.setattr("src.modules.tasks.rss.RedisClient", Mock(return_value=redis_client))
+        monkeypatch.setattr("src.modules.tasks.rss.Queue", Mock(return_value=queue))
+        monkeypatch.setattr("src.modules.tasks.rss.get_app_settings", lambda: settings)
+        monkeypatch.setattr("src.modules.tasks.rss.time.time", lambda: 1000.0)
+        return SimpleNamespace(dirty_marks=dirty_marks, queue=queue)
+
+    async def test_schedule__quiet_window_and_max_latency(
+        self,
+        scheduling: SimpleNamespace,
+    ) -> None:
+        await schedule_rss_generation([2, 1, 2])
+
+        assert scheduling.dirty_marks == {"rss-dirty:1": b"1000.0", "rss-dirty:2": b"720.0"}
+        calls = scheduling.queue.enqueue_at.call_args_list
+        assert [(call.args[0], call.args[2], call.kwargs) for call in calls] == [
+            # the first change: generation is postponed by the quiet window
+            (
+                datetime.fromtimestamp(1030.0, UTC),
+                1,
+                {"job_id": "debouncedgeneratersstask_1__1000000"},
+            ),
+            # changes since 720: generation is postponed, but no later than max latency
+            (
+                datetime.fromtimestamp(1020.0, UTC),
+                2,
+                {"job_id": "debouncedgeneratersstask_2__720000"},
+            ),
+        ]
+        assert isinstance(calls[0].args[1], DebouncedGenerateRSSTask)
+
+    async def test_schedule__repeated_changes__same_job(self, scheduling: SimpleNamespace) -> None:
+        await schedule_rss_generation([1])
+        await schedule_rss_generation([1])
+
+        first_call, second_call = scheduling.queue.enqueue_at.call_args_list
+        assert first_call.kwargs == second_call.kwargs
+
+    async def test_schedule__no_podcasts__skip(self, scheduling: SimpleNamespace) -> None:
+        await schedule_rss_generation([])
+
+        scheduling.queue.enqueue_at.assert_not_called()
+
+    async def test_debounced_task__clears_marks_and_generates(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        async_redis = SimpleNamespace(delete=AsyncMock())
+        redis_client = MockRedisClient()
+        redis_client.async_redis = async_redis
+        monkeypatch.setattr("src.modules.tasks.rss.RedisClient", Mock(return_value=redis_client))
+        generate = AsyncMock(return_value=TaskResultCode.SUCCESS)
+        monkeypatch.setattr("src.modules.tasks.rss.GenerateRSSTask.run", generate)
+
+        result = await DebouncedGenerateRSSTask(db_session=MockSession()).run(5)
+
+        assert result == TaskResultCode.SUCCESS
+        async_redis.delete.assert_awaited_once_with("rss-dirty:5")
+        generate.assert_awaited_once_with(5)
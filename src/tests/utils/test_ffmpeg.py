@@ -1,57 +1,75 @@
-import subprocess
+import asyncio
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 
+from src.constants import CoverFormat
 from src.exceptions import FFMPegParseError, FFMPegPreparationError, UserCancellationError
 from src.modules.db.models.podcasts import EpisodeChapter, EpisodeMetadata
 from src.modules.utils.ffmpeg import (
     AudioMetaData,
     CoverMetaData,
-    _get_error_details_from_exc,
+    FFMpegProgress,
     _get_file_hash,
     _human_time_to_sec,
+    _preparation_progress_hook,
     _raw_meta_to_dict,
     audio_cover,
     audio_metadata,
+    build_ffmpeg_command,
     execute_ffmpeg,
     ffmpeg_preparation,
     ffmpeg_set_metadata,
+    image_rendition,
 )
 
 
 class TestFFmpegPreparation:
-    def test_ffmpeg_preparation__ok(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    async def test_ffmpeg_preparation__ok(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
         src_path = tmp_path / "episode.mp3"
         src_path.write_bytes(b"source")
         tmp_audio_path = tmp_path / "audio"
         tmp_audio_path.mkdir()
         settings = SimpleNamespace(tmp_audio_path=tmp_audio_path, ffmpeg_timeout=30)
-        process = _FakeProcess()
         hooks = Mock()
-
-        def run(command: list, **kwargs: object) -> SimpleNamespace:
-            Path(command[-1]).write_bytes(b"prepared")
-            return SimpleNamespace(stdout=b"ffmpeg ok")
-
+        execute = AsyncMock(side_effect=_write_output)
         monkeypatch.setattr("src.modules.utils.ffmpeg.get_app_settings", lambda: settings)
-        monkeypatch.setattr("src.modules.utils.ffmpeg.Process", Mock(return_value=process))
         monkeypatch.setattr(
             "src.modules.utils.ffmpeg.proc_utils.get_file_size", Mock(return_value=10)
         )
         monkeypatch.setattr("src.modules.utils.ffmpeg.common_utils.episode_process_hook", hooks)
-        monkeypatch.setattr("src.modules.utils.ffmpeg.subprocess.run", run)
+        monkeypatch.setattr("src.modules.utils.ffmpeg.execute_ffmpeg", execute)
 
-        ffmpeg_preparation(src_path)
+        await ffmpeg_preparation(src_path, duration=60)
 
         assert src_path.read_bytes() == b"prepared"
-        process.start.assert_called_once_with()
-        assert process.terminate.call_count == 1
+        assert execute.await_args.kwargs["progress_callback"] is not None
         assert hooks.call_count == 2
 
-    def test_ffmpeg_preparation__user_cancel__fail(
+    async def test_ffmpeg_preparation__without_hooks__no_progress(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
+        src_path = tmp_path / "cover.jpg"
+        src_path.write_bytes(b"source")
+        settings = SimpleNamespace(tmp_audio_path=tmp_path, ffmpeg_timeout=30)
+        hooks = Mock()
+        execute = AsyncMock(side_effect=_write_output)
+        monkeypatch.setattr("src.modules.utils.ffmpeg.get_app_settings", lambda: settings)
+        monkeypatch.setattr("src.modules.utils.ffmpeg.common_utils.episode_process_hook", hooks)
+        monkeypatch.setattr("src.modules.utils.ffmpeg.execute_ffmpeg", execute)
+
+        await ffmpeg_preparation(
+            src_path, ffmpeg_params=["-vf", "scale=600:-1"], call_process_hook=False
+        )
+
+        assert execute.await_args.kwargs["progress_callback"] is None
+        hooks.assert_not_called()
+
+    async def test_ffmpeg_preparation__with_metadata__single_command(
         self,
         monkeypatch: pytest.MonkeyPatch,
         tmp_path: Path,
@@ -59,23 +77,63 @@ class TestFFmpegPreparation:
         src_path = tmp_path / "episode.mp3"
         src_path.write_bytes(b"source")
         tmp_audio_path = tmp_path / "audio"
+        tmp_meta_path = tmp_path / "meta"
         tmp_audio_path.mkdir()
-        settings = SimpleNamespace(tmp_audio_path=tmp_audio_path, ffmpeg_timeout=30)
+        tmp_meta_path.mkdir()
+        settings = SimpleNamespace(
+            tmp_audio_path=tmp_audio_path,
+            tmp_meta_path=tmp_meta_path,
+            ffmpeg_timeout=30,
+            episode_chapters_title_length=8,
+        )
+        execute = AsyncMock(side_effect=_write_output)
         monkeypatch.setattr("src.modules.utils.ffmpeg.get_app_settings", lambda: settings)
-        monkeypatch.setattr("src.modules.utils.ffmpeg.Process", Mock(return_value=_FakeProcess()))
         monkeypatch.setattr(
             "src.modules.utils.ffmpeg.proc_utils.get_file_size", Mock(return_value=10)
         )
         monkeypatch.setattr("src.modules.utils.ffmpeg.common_utils.episode_process_hook", Mock())
+        monkeypatch.setattr("src.modules.utils.ffmpeg.execute_ffmpeg", execute)
+
+        await ffmpeg_preparation(src_path, metadata=_episode_metadata(), duration=60)
+
+        metadata_path = tmp_meta_path / "episode_10.txt"
+        execute.assert_awaited_once()
+        assert execute.await_args.args[0] == build_ffmpeg_command(
+            src_path,
+            tmp_audio_path / "tmp_episode.mp3",
+            metadata_path=metadata_path,
+        )
+        assert src_path.read_bytes() == b"prepared"
+        assert not metadata_path.exists()
+
+    async def test_ffmpeg_preparation__user_cancel__fail(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        tmp_path: Path,
+    ) -> None:
+        src_path = tmp_path / "episode.mp3"
+        src_path.write_bytes(b"source")
+        tmp_audio_path = tmp_path / "audio"
+        tmp_audio_path.mkdir()
+        settings = SimpleNamespace(tmp_audio_path=tmp_audio_path, ffmpeg_timeout=30)
+        hooks = Mock()
+        monkeypatch.setattr("src.modules.utils.ffmpeg.get_app_settings", lambda: settings)
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.proc_utils.get_file_size", Mock(return_value=10)
+        )
+        monkeypatch.setattr("src.modules.utils.ffmpeg.common_utils.episode_process_hook", hooks)
         monkeypatch.setattr(
-            "src.modules.utils.ffmpeg.subprocess.run",
-            Mock(side_effect=subprocess.CalledProcessError(returncode=255, cmd="ffmpeg")),
+            "src.modules.utils.ffmpeg.execute_ffmpeg",
+            AsyncMock(side_effect=UserCancellationError("canceled")),
         )
 
         with pytest.raises(UserCancellationError):
-            ffmpeg_preparation(src_path)
+            await ffmpeg_preparation(src_path, duration=60)
+
+        assert src_path.read_bytes() == b"source"
+        assert hooks.call_count == 1
 
-    def test_ffmpeg_preparation__missing_output__fail(
+    async def test_ffmpeg_preparation__missing_output__fail(
         self,
         monkeypatch: pytest.MonkeyPatch,
         tmp_path: Path,
@@ -86,53 +144,259 @@ class TestFFmpegPreparation:
         tmp_audio_path.mkdir()
         settings = SimpleNamespace(tmp_audio_path=tmp_audio_path, ffmpeg_timeout=30)
         monkeypatch.setattr("src.modules.utils.ffmpeg.get_app_settings", lambda: settings)
-        monkeypatch.setattr("src.modules.utils.ffmpeg.Process", Mock(return_value=_FakeProcess()))
         monkeypatch.setattr(
             "src.modules.utils.ffmpeg.proc_utils.get_file_size", Mock(return_value=10)
         )
         monkeypatch.setattr("src.modules.utils.ffmpeg.common_utils.episode_process_hook", Mock())
+        monkeypatch.setattr("src.modules.utils.ffmpeg.execute_ffmpeg", AsyncMock(return_value="ok"))
+
+        with pytest.raises(FFMPegPreparationError, match="Failed to rename/remove tmp file"):
+            await ffmpeg_preparation(src_path, duration=60)
+
+    @pytest.mark.parametrize(
+        ("progress", "duration", "expected_processed"),
+        [
+            (FFMpegProgress(out_time_us=30_000_000, total_size=5), 60, 50),
+            (FFMpegProgress(out_time_us=90_000_000, total_size=5), 60, 100),
+            (FFMpegProgress(out_time_us=0, total_size=40), None, 40),
+            (FFMpegProgress(out_time_us=0, total_size=0, finished=True), 60, 100),
+        ],
+    )
+    def test_preparation_progress_hook__calculates_processed_bytes(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        progress: FFMpegProgress,
+        duration: int | None,
+        expected_processed: int,
+    ) -> None:
+        hooks = Mock()
+        monkeypatch.setattr("src.modules.utils.ffmpeg.common_utils.episode_process_hook", hooks)
+
+        _preparation_progress_hook(
+            progress, filename="episode.mp3", total_bytes=100, duration=duration
+        )
+
+        assert hooks.call_args.kwargs["processed_bytes"] == expected_processed
+        assert hooks.call_args.kwargs["total_bytes"] == 100
+
+
+class TestBuildFFmpegCommand:
+    def test_build_ffmpeg_command__default_params(self) -> None:
+        result = build_ffmpeg_command("src.m4a", Path("dst.mp3"))
+
+        assert result == [
+            "ffmpeg",
+            "-y",
+            "-i",
+            "src.m4a",
+            "-vn",
+            "-acodec",
+            "libmp3lame",
+            "-q:a",
+            "5",
+            "dst.mp3",
+        ]
+
+    def test_build_ffmpeg_command__with_metadata(self, tmp_path: Path) -> None:
+        metadata_path = tmp_path / "episode_10.txt"
+
+        result = build_ffmpeg_command(
+            "src.mp3", "dst.mp3", ffmpeg_params=["-codec", "copy"], metadata_path=metadata_path
+        )
+
+        assert result == [
+            "ffmpeg",
+            "-y",
+            "-i",
+            "src.mp3",
+            "-i",
+            str(metadata_path),
+            "-map_metadata",
+            "1",
+            "-map_chapters",
+            "1",
+            "-codec",
+            "copy",
+            "dst.mp3",
+        ]
+
+
+class TestImageRendition:
+    async def test_image_rendition__scaled_down_in_format(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        execute = AsyncMock(return_value="ok")
+        monkeypatch.setattr("src.modules.utils.ffmpeg.execute_ffmpeg", execute)
         monkeypatch.setattr(
-            "src.modules.utils.ffmpeg.subprocess.run",
-            Mock(return_value=SimpleNamespace(stdout=b"ok")),
+            "src.modules.utils.ffmpeg.get_app_settings",
+            lambda: SimpleNamespace(cover_rendition_timeout=10.0),
         )
 
-        with pytest.raises(FFMPegPreparationError, match="Failed to rename/remove tmp file"):
-            ffmpeg_preparation(src_path)
+        await image_rendition(
+            Path("cover.png"), Path(".cover_160.webp.tmp"), width=160, image_format=CoverFormat.WEBP
+        )
+
+        execute.assert_awaited_once_with(
+            [
+                "ffmpeg",
+                "-y",
+                "-i",
+                "cover.png",
+                "-frames:v",
+                "1",
+                "-vf",
+                "scale=w='min(160,iw)':h=-2",
+                "-c:v",
+                "libwebp",
+                "-quality",
+                "80",
+                "-f",
+                "webp",
+                ".cover_160.webp.tmp",
+            ],
+            timeout=10.0,
+        )
 
 
 class TestExecuteFFmpeg:
-    def test_execute_ffmpeg__ok(self, monkeypatch: pytest.MonkeyPatch) -> None:
-        settings = SimpleNamespace(ffmpeg_timeout=30)
-        completed = SimpleNamespace(stdout=b"done")
-        run = Mock(return_value=completed)
-        monkeypatch.setattr("src.modules.utils.ffmpeg.get_app_settings", lambda: settings)
-        monkeypatch.setattr("src.modules.utils.ffmpeg.subprocess.run", run)
+    async def test_execute_ffmpeg__ok(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        process = _FakeFFMpegProcess(stderr=b"done")
+        create_process = AsyncMock(return_value=process)
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.get_app_settings", lambda: SimpleNamespace(ffmpeg_timeout=30)
+        )
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.asyncio.create_subprocess_exec", create_process
+        )
 
-        result = execute_ffmpeg(["ffmpeg", "-version"])
+        result = await execute_ffmpeg(["ffmpeg", "-version"])
 
         assert result == "done"
-        run.assert_called_once()
+        assert create_process.await_args.args == ("ffmpeg", "-version")
 
-    @pytest.mark.parametrize(
-        "exc",
-        [
-            subprocess.CalledProcessError(returncode=1, cmd="ffmpeg", output=b"bad", stderr=None),
-            subprocess.TimeoutExpired(cmd="ffmpeg", timeout=1, output=b"timeout"),
-        ],
-    )
-    def test_execute_ffmpeg__error__fail(
-        self, monkeypatch: pytest.MonkeyPatch, exc: Exception
+    async def test_execute_ffmpeg__progress__reports_blocks(
+        self, monkeypatch: pytest.MonkeyPatch
     ) -> None:
-        settings = SimpleNamespace(ffmpeg_timeout=30)
-        monkeypatch.setattr("src.modules.utils.ffmpeg.get_app_settings", lambda: settings)
-        monkeypatch.setattr("src.modules.utils.ffmpeg.subprocess.run", Mock(side_effect=exc))
+        process = _FakeFFMpegProcess(
+            stdout=(
+                b"out_time_us=N/A\ntotal_size=0\nprogress=continue\n"
+                b"out_time_us=1500000\ntotal_size=2048\nprogress=continue\n"
+                b"out_time_us=3000000\ntotal_size=4096\nprogress=end\n"
+            )
+        )
+        create_process = AsyncMock(return_value=process)
+        callback = Mock()
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.get_app_settings", lambda: SimpleNamespace(ffmpeg_timeout=30)
+        )
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.asyncio.create_subprocess_exec", create_process
+        )
+
+        await execute_ffmpeg(["ffmpeg", "-i", "src.mp3", "dst.mp3"], progress_callback=callback)
+
+        assert create_process.await_args.args == (
+            "ffmpeg",
+            "-progress",
+            "pipe:1",
+            "-nostats",
+            "-i",
+            "src.mp3",
+            "dst.mp3",
+        )
+        assert [call.args[0] for call in callback.call_args_list] == [
+            FFMpegProgress(out_time_us=0, total_size=0),
+            FFMpegProgress(out_time_us=1_500_000, total_size=2048),
+            FFMpegProgress(out_time_us=3_000_000, total_size=4096, finished=True),
+        ]
+
+    async def test_execute_ffmpeg__callback_cancel__terminates_process(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        process = _FakeFFMpegProcess(stdout=b"out_time_us=1\nprogress=continue\n")
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.get_app_settings", lambda: SimpleNamespace(ffmpeg_timeout=30)
+        )
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.asyncio.create_subprocess_exec",
+            AsyncMock(return_value=process),
+        )
+
+        with pytest.raises(UserCancellationError):
+            await execute_ffmpeg(
+                ["ffmpeg", "-i", "src.mp3", "dst.mp3"],
+                progress_callback=Mock(side_effect=UserCancellationError("canceled")),
+            )
+
+        process.terminate.assert_called_once_with()
+
+    async def test_execute_ffmpeg__error_code__fail(self, monkeypatch: pytest.MonkeyPatch) -> None:
+        process = _FakeFFMpegProcess(stderr=b"bad input", returncode=1)
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.get_app_settings", lambda: SimpleNamespace(ffmpeg_timeout=30)
+        )
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.asyncio.create_subprocess_exec",
+            AsyncMock(return_value=process),
+        )
+
+        with pytest.raises(FFMPegPreparationError, match="bad input"):
+            await execute_ffmpeg(["ffmpeg"])
+
+    async def test_execute_ffmpeg__timeout__terminates_process(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        process = _FakeFFMpegProcess(close_stdout=False)
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.get_app_settings",
+            lambda: SimpleNamespace(ffmpeg_timeout=0.01),
+        )
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.asyncio.create_subprocess_exec",
+            AsyncMock(return_value=process),
+        )
+
+        with pytest.raises(FFMPegPreparationError, match="timeout"):
+            await execute_ffmpeg(["ffmpeg"])
+
+        process.terminate.assert_called_once_with()
+
+    async def test_execute_ffmpeg__own_timeout__terminates_process(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        process = _FakeFFMpegProcess(close_stdout=False)
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.get_app_settings", lambda: SimpleNamespace(ffmpeg_timeout=30)
+        )
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.asyncio.create_subprocess_exec",
+            AsyncMock(return_value=process),
+        )
+
+        with pytest.raises(FFMPegPreparationError, match="timeout 0.01s"):
+            await execute_ffmpeg(["ffmpeg"], timeout=0.01)
+
+        process.terminate.assert_called_once_with()
+
+    async def test_execute_ffmpeg__missing_binary__fail(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.get_app_settings", lambda: SimpleNamespace(ffmpeg_timeout=30)
+        )
+        monkeypatch.setattr(
+            "src.modules.utils.ffmpeg.asyncio.create_subprocess_exec",
+            AsyncMock(side_effect=FileNotFoundError("ffmpeg")),
+        )
 
         with pytest.raises(FFMPegPreparationError):
-            execute_ffmpeg(["ffmpeg"])
+            await execute_ffmpeg(["ffmpeg"])
 
 
 class TestMetadata:
-    def test_ffmpeg_set_metadata__ok(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    async def test_ffmpeg_set_metadata__ok(
+        self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+    ) -> None:
         src_path = tmp_path / "episode.mp3"
         src_path.write_bytes(b"audio")
         tmp_audio_path = tmp_path / "audio"
@@ -144,14 +408,7 @@ class TestMetadata:
             tmp_meta_path=tmp_meta_path,
             episode_chapters_title_length=8,
         )
-        metadata = EpisodeMetadata(
-            podcast_name="Podcast",
-            episode_id=10,
-            episode_title="Episode",
-            episode_author="Author",
-            episode_chapters=[EpisodeChapter(title="Very long chapter title", start=1, end=2)],
-        )
-        execute = Mock(return_value="title=Episode")
+        execute = AsyncMock(return_value="title=Episode")
         move_file = Mock()
         delete_file = Mock()
         monkeypatch.setattr("src.modules.utils.ffmpeg.get_app_settings", lambda: settings)
@@ -159,15 +416,15 @@ class TestMetadata:
         monkeypatch.setattr("src.modules.utils.ffmpeg.proc_utils.move_file", move_file)
         monkeypatch.setattr("src.modules.utils.ffmpeg.proc_utils.delete_file", delete_file)
 
-        ffmpeg_set_metadata(src_path, metadata)
+        await ffmpeg_set_metadata(src_path, _episode_metadata())
 
         metadata_path = tmp_meta_path / "episode_10.txt"
         assert not metadata_path.exists() or "Very lon..." in metadata_path.read_text()
-        execute.assert_called_once()
+        execute.assert_awaited_once()
         delete_file.assert_called_once_with(metadata_path)
         move_file.assert_called_once_with(tmp_audio_path / "tmp_episode.mp3", src_path)
 
-    def test_ffmpeg_set_metadata__title_missing__fail(
+    async def test_ffmpeg_set_metadata__title_missing__fail(
         self,
         monkeypatch: pytest.MonkeyPatch,
         tmp_path: Path,
@@ -192,16 +449,16 @@ class TestMetadata:
         )
         monkeypatch.setattr("src.modules.utils.ffmpeg.get_app_settings", lambda: settings)
         monkeypatch.setattr(
-            "src.modules.utils.ffmpeg.execute_ffmpeg", Mock(return_value="no title")
+            "src.modules.utils.ffmpeg.execute_ffmpeg", AsyncMock(return_value="no title")
         )
 
         with pytest.raises(RuntimeError, match="Episode title"):
-            ffmpeg_set_metadata(src_path, metadata)
+            await ffmpeg_set_metadata(src_path, metadata)
 
-    def test_audio_metadata__ok(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def test_audio_metadata__ok(self, monkeypatch: pytest.MonkeyPatch) -> None:
         monkeypatch.setattr(
             "src.modules.utils.ffmpeg.execute_ffmpeg",
-            Mock(
+            AsyncMock(
                 return_value=(
                     "Metadata:\n"
                     "    title           : Episode\n"
@@ -212,7 +469,7 @@ class TestMetadata:
             ),
         )
 
-        result = audio_metadata("episode.mp3")
+        result = await audio_metadata("episode.mp3")
 
         assert result == AudioMetaData(
             title=None,
@@ -222,18 +479,18 @@ class TestMetadata:
             track=None,
         )
 
-    def test_audio_metadata__bad_output__fail(self, monkeypatch: pytest.MonkeyPatch) -> None:
+    async def test_audio_metadata__bad_output__fail(self, monkeypatch: pytest.MonkeyPatch) -> None:
         monkeypatch.setattr(
-            "src.modules.utils.ffmpeg.execute_ffmpeg", Mock(return_value="bad output")
+            "src.modules.utils.ffmpeg.execute_ffmpeg", AsyncMock(return_value="bad output")
         )
 
         with pytest.raises(FFMPegParseError):
-            audio_metadata("episode.mp3")
+            await audio_metadata("episode.mp3")
 
-    def test_audio_cover__ok(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    async def test_audio_cover__ok(self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
         settings = SimpleNamespace(tmp_image_path=tmp_path)
 
-        def execute(command: list[str]) -> str:
+        async def execute(command: list[str]) -> str:
             Path(command[-1]).write_bytes(b"cover")
             return "ok"
 
@@ -246,24 +503,24 @@ class TestMetadata:
             "src.modules.utils.ffmpeg.proc_utils.get_file_size", Mock(return_value=5)
         )
 
-        result = audio_cover(tmp_path / "episode.mp3")
+        result = await audio_cover(tmp_path / "episode.mp3")
 
         assert result is not None
         assert result == CoverMetaData(path=result.path, hash=result.hash, size=5)
         assert result.path.name == f"cover_{result.hash}.jpg"
         assert result.size == 5
 
-    def test_audio_cover__ffmpeg_error__none(
+    async def test_audio_cover__ffmpeg_error__none(
         self, monkeypatch: pytest.MonkeyPatch, tmp_path: Path
     ) -> None:
         settings = SimpleNamespace(tmp_image_path=tmp_path)
         monkeypatch.setattr("src.modules.utils.ffmpeg.get_app_settings", lambda: settings)
         monkeypatch.setattr(
             "src.modules.utils.ffmpeg.execute_ffmpeg",
-            Mock(side_effect=FFMPegPreparationError("broken")),
+            AsyncMock(side_effect=FFMPegPreparationError("broken")),
         )
 
-        assert audio_cover(tmp_path / "episode.mp3") is None
+        assert await audio_cover(tmp_path / "episode.mp3") is None
 
     def test_raw_meta_to_dict__ok(self) -> None:
         assert _raw_meta_to_dict(
@@ -287,14 +544,54 @@ class TestMetadata:
 
         assert len(_get_file_hash(file_path)) == 32
 
-    def test_get_error_details_from_exc__includes_stdout(self) -> None:
-        exc = subprocess.CalledProcessError(returncode=1, cmd="ffmpeg")
-        exc.stdout = b"stderr text"
 
-        assert "stderr text" in _get_error_details_from_exc(exc)
+def _episode_metadata() -> EpisodeMetadata:
+    return EpisodeMetadata(
+        podcast_name="Podcast",
+        episode_id=10,
+        episode_title="Episode",
+        episode_author="Author",
+        episode_chapters=[EpisodeChapter(title="Very long chapter title", start=1, end=2)],
+    )
+
+
+async def _write_output(command: list[str], **kwargs: object) -> str:
+    Path(command[-1]).write_bytes(b"prepared")
+    return "ffmpeg ok"
 
 
-class _FakeProcess:
-    def __init__(self) -> None:
-        self.start = Mock()
-        self.terminate = Mock()
+class _FakeFFMpegProcess:
+    def __init__(
+        self,
+        stdout: bytes = b"",
+        stderr: bytes = b"",
+        returncode: int = 0,
+        close_stdout: bool = True,
+    ) -> None:
+        self.pid = 100
+        self.returncode: int | None = None
+        self._exit_code = returncode
+        self._exited = asyncio.Event()
+        self.stdout = _stream_reader(stdout, close=close_stdout)
+        self.stderr = _stream_reader(stderr, close=True)
+        self.terminate = Mock(side_effect=self._terminate)
+        if close_stdout:
+            self._exited.set()
+
+    def _terminate(self) -> None:
+        self._exit_code = -15
+        self.stdout.feed_eof()
+        self._exited.set()
+
+    async def wait(self) -> int:
+        await self._exited.wait()
+        self.returncode = self._exit_code
+        return self.returncode
+
+
+def _stream_reader(data: bytes, close: bool) -> asyncio.StreamReader:
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    if close:
+        reader.feed_eof()
+    return reader
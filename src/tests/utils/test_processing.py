@@ -1,20 +1,24 @@
+import asyncio
 import json
 from pathlib import Path
 from types import SimpleNamespace
-from unittest.mock import Mock
+from unittest.mock import AsyncMock, Mock
 
 import pytest
 from litestar.datastructures import UploadFile
 
 from src.constants import EpisodeStatus
 from src.exceptions import UserCancellationError
-from src.modules.utils import processing
 from src.modules.utils.processing import (
+    CancellationListener,
+    ProgressReporter,
+    ProgressTarget,
     TaskContext,
     check_state,
     delete_file,
     episode_process_hook,
     get_file_size,
+    get_progress_reporter,
     move_file,
     publish_redis_stop_downloading,
     remote_copy_episode,
@@ -30,6 +34,15 @@ from src.tests.mocks import MockRedisClient, MockStorageS3
 @pytest.fixture(autouse=True)
 def clear_task_context_cache() -> None:
     TaskContext.create_from_redis.cache_clear()
+    get_progress_reporter.cache_clear()
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
 
 
 class TestFileUtils:
@@ -199,7 +212,7 @@ class TestProcessHooks:
             processed_bytes=25,
         )
 
-        redis.set.assert_called_once_with(
+        redis.set_and_publish.assert_called_once_with(
             "episode",
             {
                 "event_key": "episode",
@@ -208,11 +221,12 @@ class TestProcessHooks:
                 "total_bytes": 100,
             },
             ttl=app_settings.download_event_redis_ttl,
-        )
-        redis.publish.assert_called_once_with(
             channel=app_settings.redis.progress_pubsub_ch,
-            message=app_settings.redis.progress_pubsub_signal,
+            # not bound to episodes: nobody is notified
+            messages=[],
         )
+        redis.set.assert_not_called()
+        redis.publish.assert_not_called()
 
     def test_episode_process_hook__chunk_increments_existing_progress(
         self,
@@ -224,8 +238,8 @@ class TestProcessHooks:
 
         episode_process_hook(EpisodeStatus.DL_EPISODE_UPLOADING, "episode.mp3", chunk=10)
 
-        assert redis.set.call_args.args[1]["processed_bytes"] == 35
-        assert redis.set.call_args.args[1]["total_bytes"] == 100
+        assert redis.set_and_publish.call_args.args[1]["processed_bytes"] == 35
+        assert redis.set_and_publish.call_args.args[1]["total_bytes"] == 100
 
     def test_episode_process_hook__canceled_download__fail(
         self,
@@ -243,28 +257,36 @@ class TestProcessHooks:
         with pytest.raises(UserCancellationError, match="job-1"):
             episode_process_hook(EpisodeStatus.DL_EPISODE_UPLOADING, "episode.mp3")
 
-    def test_episode_process_hook__canceled_postprocessing__kills_process(
+    def test_episode_process_hook__canceled_postprocessing__raises(
         self,
         app_settings: AppSettings,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
         redis = MockRedisClient(content={})
-        kill_process = Mock(return_value=None)
         task_context = SimpleNamespace(job_id="job-1", task_canceled=Mock(return_value=True))
         monkeypatch.setattr("src.modules.utils.processing.RedisClient", lambda: redis)
-        monkeypatch.setattr("src.modules.utils.processing.kill_process", kill_process)
         monkeypatch.setattr(
             "src.modules.utils.processing.TaskContext.create_from_redis",
             Mock(return_value=task_context),
         )
 
-        episode_process_hook(
-            EpisodeStatus.DL_EPISODE_POSTPROCESSING,
-            "episode.mp3",
-            processing_filepath="/tmp/episode.mp3",
-        )
+        with pytest.raises(UserCancellationError, match="job-1"):
+            episode_process_hook(EpisodeStatus.DL_EPISODE_POSTPROCESSING, "episode.mp3")
+
+    def test_episode_process_hook__one_reporter_per_file(
+        self,
+        app_settings: AppSettings,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        redis = MockRedisClient(content={})
+        monkeypatch.setattr("src.modules.utils.processing.RedisClient", lambda: redis)
 
-        kill_process.assert_called_once_with(grep="ffmpeg -y -i /tmp/episode.mp3")
+        episode_process_hook(EpisodeStatus.DL_EPISODE_DOWNLOADING, "/tmp/episode.mp3")
+        episode_process_hook(EpisodeStatus.DL_EPISODE_DOWNLOADING, "episode.mp3")
+
+        assert get_progress_reporter.cache_info().currsize == 1
+        # state is read from redis once (by the first update)
+        redis.get.assert_called_once_with("episode")
 
     def test_upload_process_hook__delegates_to_episode_hook(
         self,
@@ -281,103 +303,211 @@ class TestProcessHooks:
             chunk=64,
         )
 
-    def test_post_processing_process_hook__ok(
+
+class TestProgressReporter:
+    @pytest.fixture(autouse=True)
+    def settings(self, app_settings: AppSettings, monkeypatch: pytest.MonkeyPatch) -> AppSettings:
+        monkeypatch.setattr("src.modules.utils.processing.get_app_settings", lambda: app_settings)
+        return app_settings
+
+    @pytest.fixture
+    def clock(self, monkeypatch: pytest.MonkeyPatch) -> FakeClock:
+        clock = FakeClock()
+        monkeypatch.setattr("src.modules.utils.processing.time.monotonic", clock)
+        return clock
+
+    @pytest.fixture
+    def redis(self, monkeypatch: pytest.MonkeyPatch) -> MockRedisClient:
+        redis = MockRedisClient(content={})
+        monkeypatch.setattr("src.modules.utils.processing.RedisClient", lambda: redis)
+        return redis
+
+    @pytest.fixture
+    def task_context(self, monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+        task_context = SimpleNamespace(job_id="job-1", task_canceled=Mock(return_value=False))
+        monkeypatch.setattr(
+            "src.modules.utils.processing.TaskContext.create_from_redis",
+            Mock(return_value=task_context),
+        )
+        return task_context
+
+    def test_update__transfer__bounded_redis_ops(
         self,
-        monkeypatch: pytest.MonkeyPatch,
+        settings: AppSettings,
+        clock: FakeClock,
+        redis: MockRedisClient,
+        task_context: SimpleNamespace,
     ) -> None:
-        episode_hook = Mock(return_value=None)
-        monkeypatch.setattr("src.modules.utils.processing.episode_process_hook", episode_hook)
-        monkeypatch.setattr("src.modules.utils.processing.get_file_size", Mock(return_value=100))
-        monkeypatch.setattr("src.modules.utils.processing.time.sleep", Mock(return_value=None))
+        settings.progress_max_flushes_per_sec = 2
+        settings.progress_cancel_check_interval = 5
+        reporter = ProgressReporter("episode.mp3")
+        reporter.update(EpisodeStatus.DL_EPISODE_UPLOADING, total_bytes=10_000)
+        # 10s transfer: 10k chunks (1ms each)
+        for _ in range(10_000):
+            clock.now += 0.001
+            reporter.update(EpisodeStatus.DL_EPISODE_UPLOADING, chunk=1)
+
+        reporter.flush()
+
+        # first update + 2 per second + the last one
+        assert redis.set_and_publish.call_count <= 1 + 2 * 10 + 1
+        assert redis.get.call_count == 1
+        assert task_context.task_canceled.call_count <= 1 + 10 // 5
+        assert redis.set_and_publish.call_args.args[1]["processed_bytes"] == 10_000
+
+    def test_update__status_changed__flushed_immediately(
+        self,
+        clock: FakeClock,
+        redis: MockRedisClient,
+        task_context: SimpleNamespace,
+    ) -> None:
+        reporter = ProgressReporter("episode.mp3")
 
-        processing.post_processing_process_hook(
-            filename="episode.mp3",
-            target_path="/tmp/result.mp3",
-            total_bytes=100,
-            src_file_path="/tmp/source.mp3",
-        )
+        reporter.update(EpisodeStatus.DL_EPISODE_DOWNLOADING, total_bytes=100, processed_bytes=10)
+        reporter.update(EpisodeStatus.DL_EPISODE_DOWNLOADING, processed_bytes=20)
+        reporter.update(EpisodeStatus.DL_EPISODE_POSTPROCESSING, processed_bytes=1)
 
-        episode_hook.assert_called_once_with(
-            filename="episode.mp3",
-            status=EpisodeStatus.DL_EPISODE_POSTPROCESSING,
-            total_bytes=100,
-            processed_bytes=100,
-            processing_filepath="/tmp/source.mp3",
-        )
+        statuses = [call.args[1]["status"] for call in redis.set_and_publish.call_args_list]
+        assert statuses == [
+            str(EpisodeStatus.DL_EPISODE_DOWNLOADING),
+            str(EpisodeStatus.DL_EPISODE_POSTPROCESSING),
+        ]
+
+    def test_update__canceled__checked_by_own_timer(
+        self,
+        settings: AppSettings,
+        clock: FakeClock,
+        redis: MockRedisClient,
+        task_context: SimpleNamespace,
+    ) -> None:
+        settings.progress_cancel_check_interval = 2
+        reporter = ProgressReporter("episode.mp3")
+        reporter.update(EpisodeStatus.DL_EPISODE_DOWNLOADING, total_bytes=100)
+        task_context.task_canceled.return_value = True
+
+        clock.now += 1
+        reporter.update(EpisodeStatus.DL_EPISODE_DOWNLOADING, chunk=10)
+        clock.now += 1
+        with pytest.raises(UserCancellationError, match="job-1"):
+            reporter.update(EpisodeStatus.DL_EPISODE_DOWNLOADING, chunk=10)
 
+        assert task_context.task_canceled.call_count == 2
 
-class TestKillProcess:
-    def test_kill_process__kills_matching_process(
+    def test_flush__bound_targets__event_per_episode(
         self,
-        monkeypatch: pytest.MonkeyPatch,
+        settings: AppSettings,
+        redis: MockRedisClient,
+        task_context: SimpleNamespace,
     ) -> None:
-        ps_output = "\n".join(
+        reporter = ProgressReporter("episode.mp3")
+        reporter.bind(
             [
-                "USER PID %CPU %MEM VSZ RSS TT STAT STARTED TIME COMMAND",
-                "user 1001 0.0 0.0 0 0 ?? S 10:00AM 0:00.01 ffmpeg -y -i /tmp/episode.mp3",
-                "user 1002 0.0 0.0 0 0 ?? S 10:00AM 0:00.01 python worker.py",
-                "user 1003 0.0 0.0 0 0 ?? S 10:00AM 0:00.01 ffmpeg -y -i /tmp/other.mp3",
+                ProgressTarget(episode_id=1, owner_id=10, podcast_id=100),
+                ProgressTarget(episode_id=2, owner_id=20, podcast_id=200),
             ]
         )
-        run = Mock(return_value=SimpleNamespace(stdout=ps_output))
-        kill = Mock(return_value=None)
-        monkeypatch.setattr("src.modules.utils.processing.subprocess.run", run)
-        monkeypatch.setattr("src.modules.utils.processing.os.kill", kill)
-        monkeypatch.setattr("src.modules.utils.processing.os.getpid", Mock(return_value=9999))
-
-        processing.kill_process(grep="ffmpeg -y -i /tmp/episode.mp3")
-
-        run.assert_called_once_with(
-            ["ps", "aux"],
-            check=True,
-            capture_output=True,
-            text=True,
-            timeout=5,
-        )
-        kill.assert_called_once_with(1001, processing.signal.SIGTERM)
 
-    def test_kill_process__skips_current_process(
+        reporter.update(EpisodeStatus.DL_EPISODE_DOWNLOADING, total_bytes=200, processed_bytes=50)
+
+        messages = redis.set_and_publish.call_args.kwargs["messages"]
+        assert [json.loads(message) for message in messages] == [
+            {
+                "episode_id": episode_id,
+                "owner_id": owner_id,
+                "podcast_id": podcast_id,
+                "status": str(EpisodeStatus.DL_EPISODE_DOWNLOADING),
+                "completed": 25.0,
+                "current_file_size": 50,
+                "total_file_size": 200,
+            }
+            for episode_id, owner_id, podcast_id in ((1, 10, 100), (2, 20, 200))
+        ]
+
+    def test_flush__no_updates__skip(self, redis: MockRedisClient) -> None:
+        ProgressReporter("episode.mp3").flush()
+
+        redis.set_and_publish.assert_not_called()
+
+
+class FakePubSub:
+    def __init__(self, messages: list[dict]) -> None:
+        self.messages = messages
+        self.subscribe = AsyncMock(return_value=None)
+        self.aclose = AsyncMock(return_value=None)
+
+    async def listen(self):
+        for message in self.messages:
+            yield message
+
+
+class TestCancellationListener:
+    @pytest.fixture
+    def redis(self, monkeypatch: pytest.MonkeyPatch) -> MockRedisClient:
+        redis = MockRedisClient(content={})
+        monkeypatch.setattr("src.modules.utils.processing.RedisClient", lambda: redis)
+        return redis
+
+    async def test_listen__episode_canceled__hooks_raise(
         self,
-        monkeypatch: pytest.MonkeyPatch,
+        app_settings: AppSettings,
+        redis: MockRedisClient,
     ) -> None:
-        ps_output = "\n".join(
-            [
-                "USER PID %CPU %MEM VSZ RSS TT STAT STARTED TIME COMMAND",
-                "user 1001 0.0 0.0 0 0 ?? S 10:00AM 0:00.01 ffmpeg -y -i /tmp/episode.mp3",
-            ]
+        pubsub = FakePubSub(
+            [{"data": json.dumps({"episode_id": 2})}, {"data": json.dumps({"episode_id": 1})}]
         )
-        monkeypatch.setattr(
-            "src.modules.utils.processing.subprocess.run",
-            Mock(return_value=SimpleNamespace(stdout=ps_output)),
+        redis.async_pubsub.return_value = pubsub
+        task_context = SimpleNamespace(job_id="job-1", task_canceled=Mock(return_value=False))
+
+        async with CancellationListener(1, task_context=task_context) as listener:
+            listener.watch("episode.mp3")
+            await asyncio.sleep(0)
+
+            assert listener.canceled.is_set()
+            with pytest.raises(UserCancellationError, match="episode.mp3"):
+                episode_process_hook(EpisodeStatus.DL_EPISODE_DOWNLOADING, "episode.mp3")
+
+        pubsub.subscribe.assert_awaited_once_with(app_settings.redis.stop_downloading_pubsub_ch)
+        pubsub.aclose.assert_awaited_once_with()
+        # RQ job's status is fetched once (for canceling before subscription) instead of polling
+        task_context.task_canceled.assert_called_once_with()
+
+    async def test_listen__other_episode__not_canceled(self, redis: MockRedisClient) -> None:
+        redis.async_pubsub.return_value = FakePubSub(
+            [{"data": "not-json"}, {"data": json.dumps({"episode_id": 2})}]
         )
-        kill = Mock(return_value=None)
-        monkeypatch.setattr("src.modules.utils.processing.os.kill", kill)
-        monkeypatch.setattr("src.modules.utils.processing.os.getpid", Mock(return_value=1001))
 
-        processing.kill_process(grep="ffmpeg -y -i /tmp/episode.mp3")
+        async with CancellationListener(1) as listener:
+            listener.watch("episode.mp3")
+            await asyncio.sleep(0)
+            episode_process_hook(EpisodeStatus.DL_EPISODE_DOWNLOADING, "episode.mp3")
 
-        kill.assert_not_called()
+        assert not listener.canceled.is_set()
+
+    async def test_enter__job_already_canceled__flag_set(self, redis: MockRedisClient) -> None:
+        redis.async_pubsub.return_value = FakePubSub([])
+        task_context = SimpleNamespace(job_id="job-1", task_canceled=Mock(return_value=True))
 
-    def test_kill_process__no_matching_process__skips_kill(
+        async with CancellationListener(1, task_context=task_context) as listener:
+            assert listener.canceled.is_set()
+
+    async def test_exit__flag_unwatched__hooks_poll_job_status(
         self,
+        redis: MockRedisClient,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
-        ps_output = "\n".join(
-            [
-                "USER PID %CPU %MEM VSZ RSS TT STAT STARTED TIME COMMAND",
-                "user 1001 0.0 0.0 0 0 ?? S 10:00AM 0:00.01 python worker.py",
-            ]
-        )
+        redis.async_pubsub.return_value = FakePubSub([])
+        create_from_redis = Mock(return_value=None)
         monkeypatch.setattr(
-            "src.modules.utils.processing.subprocess.run",
-            Mock(return_value=SimpleNamespace(stdout=ps_output)),
+            "src.modules.utils.processing.TaskContext.create_from_redis", create_from_redis
         )
-        kill = Mock(return_value=None)
-        monkeypatch.setattr("src.modules.utils.processing.os.kill", kill)
 
-        processing.kill_process(grep="ffmpeg -y -i /tmp/episode.mp3")
+        async with CancellationListener(1) as listener:
+            listener.watch("episode.mp3")
+            episode_process_hook(EpisodeStatus.DL_EPISODE_DOWNLOADING, "episode.mp3")
+            create_from_redis.assert_not_called()
 
-        kill.assert_not_called()
+        episode_process_hook(EpisodeStatus.DL_EPISODE_DOWNLOADING, "episode.mp3")
+        create_from_redis.assert_called_once_with("episode.mp3")
 
 
 class TestUploadHelpers:
@@ -0,0 +1,251 @@
+import asyncio
+import re
+from collections.abc import AsyncIterator
+from functools import partial
+from types import SimpleNamespace
+from unittest.mock import Mock
+
+import httpx
+import pytest
+
+from src.constants import EpisodeStatus
+from src.exceptions import SourceFetchError
+from src.modules.utils import streaming
+from src.modules.utils.streaming import StreamResult, StreamSource, stream_episode
+
+SOURCE = StreamSource(url="https://example.com/audio.m4a", headers={})
+SOURCE_CONTENT = bytes(range(25))
+
+
+class FakeFFmpegProcess:
+    """ffmpeg's process: stdout is fed by the test, stdin is drained"""
+
+    def __init__(self) -> None:
+        self.pid = 42
+        self.returncode: int | None = None
+        self.stdin = SimpleNamespace(write=Mock(), drain=self._noop, close=Mock())
+        self.stdout = asyncio.StreamReader()
+        self.stderr = asyncio.StreamReader()
+        self.stderr.feed_eof()
+        self.killed = False
+        self._exited = asyncio.Event()
+
+    @staticmethod
+    async def _noop() -> None:
+        return None
+
+    def finish(self, output: bytes) -> None:
+        self.stdout.feed_data(output)
+        self.stdout.feed_eof()
+        self.returncode = 0
+        self._exited.set()
+
+    def kill(self) -> None:
+        self.killed = True
+        self.returncode = -9
+        self._exited.set()
+
+    async def wait(self) -> int:
+        await self._exited.wait()
+        return self.returncode  # type: ignore[return-value]
+
+
+class FakeStorage:
+    def __init__(self) -> None:
+        self.chunks: list[bytes] = []
+
+    async def upload_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        callback: Mock,
+        **_: object,
+    ) -> tuple[str, int]:
+        async for chunk in chunks:
+            self.chunks.append(chunk)
+
+        size = len(b"".join(self.chunks))
+        callback(size)
+        return "audio/episode.mp3", size
+
+
+@pytest.fixture
+async def process(monkeypatch: pytest.MonkeyPatch) -> FakeFFmpegProcess:
+    process = FakeFFmpegProcess()
+
+    async def create_subprocess_exec(*_: object, **__: object) -> FakeFFmpegProcess:
+        return process
+
+    monkeypatch.setattr(
+        "src.modules.utils.streaming.asyncio.create_subprocess_exec", create_subprocess_exec
+    )
+    monkeypatch.setattr(
+        "src.modules.utils.streaming.ffmpeg_utils.write_metadata_file", Mock(return_value=None)
+    )
+    monkeypatch.setattr("src.modules.utils.streaming.delete_file", Mock())
+    return process
+
+
+@pytest.fixture
+def settings(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    settings = SimpleNamespace(
+        ffmpeg_timeout=5,
+        s3=SimpleNamespace(bucket_audio_path="audio/"),
+    )
+    monkeypatch.setattr("src.modules.utils.streaming.get_app_settings", lambda: settings)
+    return settings
+
+
+@pytest.fixture
+def process_hook(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    process_hook = Mock()
+    monkeypatch.setattr("src.modules.utils.streaming.episode_process_hook", process_hook)
+    return process_hook
+
+
+def _mock_source(monkeypatch: pytest.MonkeyPatch, *chunks: bytes, stall: bool = False) -> None:
+    async def iter_source(*_: object, **__: object) -> AsyncIterator[bytes]:
+        for chunk in chunks:
+            yield chunk
+
+        if stall:
+            await asyncio.Event().wait()
+
+    monkeypatch.setattr(streaming, "_iter_source", iter_source)
+
+
+class TestStreamEpisode:
+    async def test_stream_episode__uploaded__upload_progress_reported(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        process: FakeFFmpegProcess,
+        settings: SimpleNamespace,
+        process_hook: Mock,
+    ) -> None:
+        storage = FakeStorage()
+        monkeypatch.setattr("src.modules.utils.streaming.StorageS3", Mock(return_value=storage))
+        _mock_source(monkeypatch, b"source")
+        asyncio.get_running_loop().call_later(0.01, process.finish, b"encoded")
+
+        result = await stream_episode(SOURCE, filename="episode.mp3", metadata=Mock())
+
+        assert result == StreamResult(remote_path="audio/episode.mp3", size=7)
+        process_hook.assert_called_once_with(
+            status=EpisodeStatus.DL_EPISODE_UPLOADING,
+            filename="episode.mp3",
+            total_bytes=7,
+            processed_bytes=7,
+        )
+
+    async def test_stream_episode__stalled_source__timeout(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        process: FakeFFmpegProcess,
+        settings: SimpleNamespace,
+        process_hook: Mock,
+    ) -> None:
+        settings.ffmpeg_timeout = 0.05
+        monkeypatch.setattr(
+            "src.modules.utils.streaming.StorageS3", Mock(return_value=FakeStorage())
+        )
+        _mock_source(monkeypatch, b"source", stall=True)
+
+        result = await stream_episode(SOURCE, filename="episode.mp3", metadata=Mock())
+
+        assert result is None
+        assert process.killed
+        process_hook.assert_called_once_with(
+            filename="episode.mp3", status=EpisodeStatus.ERROR, processed_bytes=0
+        )
+
+
+class FakeSourceServer:
+    """HTTP source with SOURCE_CONTENT: it answers ranges with 206 (or ignores them)"""
+
+    def __init__(self, content: bytes = SOURCE_CONTENT) -> None:
+        self.content = content
+        # ranges are ignored (200 with the whole content) from this request's number
+        self.ignore_ranges_from: int | None = None
+        self.requested_ranges: list[str | None] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        byte_range = request.headers.get("Range")
+        self.requested_ranges.append(byte_range)
+        ignore_ranges = self.ignore_ranges_from is not None and (
+            len(self.requested_ranges) >= self.ignore_ranges_from
+        )
+        if not byte_range or ignore_ranges:
+            return httpx.Response(200, content=self.content)
+
+        start, end = map(int, re.findall(r"\d+", byte_range))
+        if start >= len(self.content):
+            return httpx.Response(416)
+
+        return httpx.Response(206, content=self.content[start : end + 1])
+
+
+@pytest.fixture
+def source_server(monkeypatch: pytest.MonkeyPatch) -> FakeSourceServer:
+    source_server = FakeSourceServer()
+    client = partial(httpx.AsyncClient, transport=httpx.MockTransport(source_server))
+    monkeypatch.setattr("src.modules.utils.streaming.httpx.AsyncClient", client)
+    return source_server
+
+
+async def _read_source(source: StreamSource) -> bytes:
+    return b"".join([chunk async for chunk in streaming._iter_source(source, "episode.mp3")])
+
+
+@pytest.mark.usefixtures("process_hook")
+class TestIterSource:
+    async def test_iter_source__exact_size__fixed_ranges(
+        self,
+        source_server: FakeSourceServer,
+    ) -> None:
+        source = SOURCE._replace(filesize=25, range_size=10)
+
+        assert await _read_source(source) == SOURCE_CONTENT
+        assert source_server.requested_ranges == ["bytes=0-9", "bytes=10-19", "bytes=20-24"]
+
+    @pytest.mark.parametrize(
+        ("content", "expected_ranges"),
+        [
+            # approximate size is too low: source is read until a short range
+            (SOURCE_CONTENT, ["bytes=0-9", "bytes=10-19", "bytes=20-29"]),
+            # approximate size is too high: source ends exactly with a range (416 is next)
+            (SOURCE_CONTENT[:20], ["bytes=0-9", "bytes=10-19", "bytes=20-29"]),
+        ],
+    )
+    async def test_iter_source__approximate_size__ranges_until_end(
+        self,
+        source_server: FakeSourceServer,
+        content: bytes,
+        expected_ranges: list[str],
+    ) -> None:
+        source_server.content = content
+        source = SOURCE._replace(filesize_approx=20 if len(content) > 20 else 40, range_size=10)
+
+        assert await _read_source(source) == content
+        assert source_server.requested_ranges == expected_ranges
+
+    @pytest.mark.parametrize("ignore_ranges_from", [1, 2])
+    async def test_iter_source__ranges_ignored__not_duplicated(
+        self,
+        source_server: FakeSourceServer,
+        ignore_ranges_from: int,
+    ) -> None:
+        source_server.ignore_ranges_from = ignore_ranges_from
+        source = SOURCE._replace(filesize=25, range_size=10)
+
+        assert await _read_source(source) == SOURCE_CONTENT
+        # response with the whole source is the last one
+        assert len(source_server.requested_ranges) == ignore_ranges_from
+
+    async def test_iter_source__exact_size__truncated__fail(
+        self,
+        source_server: FakeSourceServer,
+    ) -> None:
+        source_server.content = SOURCE_CONTENT[:15]
+        source = SOURCE._replace(filesize=25, range_size=10)
+
+        with pytest.raises(SourceFetchError):
+            await _read_source(source)
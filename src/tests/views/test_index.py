@@ -31,6 +31,7 @@ class TestIndexController:
         episode_repository = SimpleNamespace(
             all_paginated=AsyncMock(return_value=(recent_episodes, 1))
         )
+        episode_repository.with_podcast = Mock(return_value=episode_repository)
         statistic_service = SimpleNamespace(get_app_statistics=AsyncMock(return_value=stats))
         controller = _controller()
         controller.get_response_template = Mock(return_value=template)
@@ -2,12 +2,14 @@ from types import SimpleNamespace
 from unittest.mock import AsyncMock, Mock
 
 import pytest
+from litestar import Response
 from litestar.exceptions import NotFoundException
 from litestar.response import Redirect
-from litestar.status_codes import HTTP_307_TEMPORARY_REDIRECT
+from litestar.status_codes import HTTP_200_OK, HTTP_304_NOT_MODIFIED, HTTP_307_TEMPORARY_REDIRECT
 
-from src.exceptions import NotSupportedError
 from src.modules.db.models.media import MediaType
+from src.modules.services.feeds import RSSFeed
+from src.modules.services.media_tokens import MediaToken
 from src.modules.views.media import MediaByTokenController
 from src.tests.mocks import MockUOW
 
@@ -16,14 +18,9 @@ def _mock_media_file(
     *,
     media_type: MediaType = MediaType.AUDIO,
     available: bool = True,
-    presigned_url: str = "https://storage/presigned",
+    path: str = "audio/episode.mp3",
 ) -> SimpleNamespace:
-    return SimpleNamespace(
-        id=1,
-        type=media_type,
-        available=available,
-        fetch_presigned_url=AsyncMock(return_value=presigned_url),
-    )
+    return SimpleNamespace(id=1, type=media_type, available=available, path=path)
 
 
 def _mock_file_repository(
@@ -44,8 +41,45 @@ async def _get_private_media(controller: MediaByTokenController, access_token: s
     return await MediaByTokenController.get_private_media.fn(controller, access_token)
 
 
-async def _get_rss_media(controller: MediaByTokenController, access_token: str) -> Redirect:
-    return await MediaByTokenController.get_rss_media.fn(controller, access_token)
+async def _get_rss_media(
+    controller: MediaByTokenController,
+    access_token: str,
+    headers: dict[str, str] | None = None,
+) -> Redirect | Response:
+    request = SimpleNamespace(headers=headers or {})
+    return await MediaByTokenController.get_rss_media.fn(controller, access_token, request)
+
+
+@pytest.fixture(autouse=True)
+def token_cache(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    token_cache = SimpleNamespace(get=AsyncMock(return_value=None), set=AsyncMock())
+    monkeypatch.setattr("src.modules.views.media.MediaTokenCache", token_cache)
+    return token_cache
+
+
+@pytest.fixture(autouse=True)
+def presign(monkeypatch: pytest.MonkeyPatch) -> Mock:
+    presign = Mock(return_value="https://storage/presigned")
+    monkeypatch.setattr("src.modules.views.media.generate_presigned_url", presign)
+    return presign
+
+
+@pytest.fixture
+def app_settings(monkeypatch: pytest.MonkeyPatch) -> SimpleNamespace:
+    settings = SimpleNamespace(rss_direct_serve=False, rss_cache_control="no-cache")
+    monkeypatch.setattr("src.modules.views.media.get_app_settings", lambda: settings)
+    return settings
+
+
+@pytest.fixture
+def feed_service(monkeypatch: pytest.MonkeyPatch, app_settings: SimpleNamespace) -> SimpleNamespace:
+    app_settings.rss_direct_serve = True
+    feed_service = SimpleNamespace(
+        get_etag=AsyncMock(return_value="etag"),
+        get_feed=AsyncMock(return_value=RSSFeed(etag="etag", content=b"<rss />")),
+    )
+    monkeypatch.setattr("src.modules.views.media.RSSFeedService", Mock(return_value=feed_service))
+    return feed_service
 
 
 class TestMediaByTokenController:
@@ -53,6 +87,8 @@ class TestMediaByTokenController:
     async def test_get_private_media__redirects_allowed_media(
         self,
         monkeypatch: pytest.MonkeyPatch,
+        token_cache: SimpleNamespace,
+        presign: Mock,
         media_type: MediaType,
     ) -> None:
         media_file = _mock_media_file(media_type=media_type)
@@ -65,13 +101,34 @@ class TestMediaByTokenController:
         assert result.status_code == HTTP_307_TEMPORARY_REDIRECT
         assert result.url == "https://storage/presigned"
         repository.first_by_access_token.assert_awaited_once_with("token")
-        media_file.fetch_presigned_url.assert_awaited_once()
+        presign.assert_called_once_with("audio/episode.mp3")
+        token_cache.set.assert_awaited_once_with(
+            "token",
+            MediaToken(file_id=1, path="audio/episode.mp3", type=media_type, available=True),
+        )
+
+    async def test_get_private_media__cached_token__no_db(
+        self,
+        monkeypatch: pytest.MonkeyPatch,
+        token_cache: SimpleNamespace,
+        presign: Mock,
+    ) -> None:
+        token_cache.get.return_value = MediaToken(1, "images/cover.png", MediaType.IMAGE, True)
+        repository = _mock_file_repository(monkeypatch, None)
+
+        result = await _get_private_media(_controller(), "token")
 
+        assert result.url == "https://storage/presigned"
+        repository.first_by_access_token.assert_not_awaited()
+        token_cache.set.assert_not_awaited()
+        presign.assert_called_once_with("images/cover.png")
+
+    @pytest.mark.usefixtures("app_settings")
     async def test_get_rss_media__redirects_allowed_media(
         self,
         monkeypatch: pytest.MonkeyPatch,
     ) -> None:
-        media_file = _mock_media_file(media_type=MediaType.RSS)
+        media_file = _mock_media_file(media_type=MediaType.RSS, path="rss/feed.xml")
         repository = _mock_file_repository(monkeypatch, media_file)
         controller = _controller()
 
@@ -81,7 +138,6 @@ class TestMediaByTokenController:
         assert result.status_code == HTTP_307_TEMPORARY_REDIRECT
         assert result.url == "https://storage/presigned"
         repository.first_by_access_token.assert_awaited_once_with("token")
-        media_file.fetch_presigned_url.assert_awaited_once()
 
     @pytest.mark.parametrize("access_token", ["", "x" * 129])
     async def test_redirect_presigned__invalid_token__fail(
@@ -105,6 +161,7 @@ class TestMediaByTokenController:
     async def test_redirect_presigned__unavailable_media__fail(
         self,
         monkeypatch: pytest.MonkeyPatch,
+        token_cache: SimpleNamespace,
         media_file: object | None,
         allowed_types: tuple[MediaType, ...],
     ) -> None:
@@ -115,17 +172,56 @@ class TestMediaByTokenController:
             await controller._redirect_presigned("token", allowed_types=allowed_types)
 
         repository.first_by_access_token.assert_awaited_once_with("token")
+        if media_file is None or not media_file.available:  # type: ignore[attr-defined]
+            # missing/unavailable files aren't cached
+            token_cache.set.assert_not_awaited()
 
-    async def test_redirect_presigned__presign_error__fail(
+    async def test_redirect_presigned__no_path__fail(
         self,
         monkeypatch: pytest.MonkeyPatch,
+        presign: Mock,
     ) -> None:
-        media_file = _mock_media_file()
-        media_file.fetch_presigned_url.side_effect = NotSupportedError("no path")
-        _mock_file_repository(monkeypatch, media_file)
+        _mock_file_repository(monkeypatch, _mock_media_file(path=""))
         controller = _controller()
 
         with pytest.raises(NotFoundException, match="Media not found"):
             await _get_private_media(controller, "token")
 
-        media_file.fetch_presigned_url.assert_awaited_once()
+        presign.assert_not_called()
+
+
+class TestMediaByTokenControllerDirectRSS:
+    async def test_get_rss_media__serves_feed(self, feed_service: SimpleNamespace) -> None:
+        result = await _get_rss_media(_controller(), "token")
+
+        assert isinstance(result, Response)
+        assert result.status_code == HTTP_200_OK
+        assert result.content == b"<rss />"
+        assert result.media_type == "application/rss+xml"
+        assert result.headers == {"ETag": '"etag"', "Cache-Control": "no-cache"}
+        feed_service.get_feed.assert_awaited_once_with("token", etag="etag")
+
+    @pytest.mark.parametrize("if_none_match", ['"etag"', 'W/"etag"', '"other", "etag"', "*"])
+    async def test_get_rss_media__not_modified(
+        self,
+        feed_service: SimpleNamespace,
+        if_none_match: str,
+    ) -> None:
+        result = await _get_rss_media(_controller(), "token", {"if-none-match": if_none_match})
+
+        assert result.status_code == HTTP_304_NOT_MODIFIED
+        assert result.headers == {"ETag": '"etag"', "Cache-Control": "no-cache"}
+        feed_service.get_feed.assert_not_awaited()
+
+    async def test_get_rss_media__changed__serves_feed(self, feed_service: SimpleNamespace) -> None:
+        feed_service.get_etag.return_value = None
+
+        result = await _get_rss_media(_controller(), "token", {"if-none-match": '"etag"'})
+
+        assert result.status_code == HTTP_200_OK
+        feed_service.get_feed.assert_awaited_once_with("token", etag=None)
+
+    @pytest.mark.usefixtures("feed_service")
+    async def test_get_rss_media__invalid_token__fail(self) -> None:
+        with pytest.raises(NotFoundException, match="Media not found"):
+            await _get_rss_media(_controller(), "x" * 129)
@@ -196,6 +196,17 @@ class TestPodcastCoverController:
         with pytest.raises(NotFoundException):
             await _get_podcast_cover(_controller(PodcastCoverController), 1)
 
+    def test_build_cover_file_response__rendition__filename_in_its_format(self) -> None:
+        file_obj = make_file(type=MediaType.IMAGE, path="images/cover.jpg")
+
+        result = PodcastCoverController._build_cover_file_response(
+            Path("/tmp/podcast_cover_0123456789abcdef_160.webp"),
+            file_obj,
+        )
+
+        assert result.filename == "cover.webp"
+        assert result.media_type == "image/webp"
+
     def test_build_cover_file_response__unknown_extension__uses_octet_stream(
         self,
     ) -> None:
@@ -2,18 +2,67 @@ import asyncio
 import sys
 import logging
 import logging.config
+from collections.abc import Callable
 
 from redis import Redis
-from rq import Worker
+from rq import SimpleWorker, Worker
 import sentry_sdk
 from sentry_sdk.integrations.rq import RqIntegration
 from sentry_sdk.integrations.logging import LoggingIntegration
 
+from src.constants import WorkerMode
 from src.main import DbStartMode, lifespan
+from src.modules.tasks.base import persistent_event_loop
 from src.settings.app import AppSettings, get_app_settings
 
+logger = logging.getLogger(__name__)
 
-async def run_worker() -> None:
+
+async def run_fork_worker(settings: AppSettings, queue_names: list[str]) -> None:
+    """
+    Default RQ worker: each job runs in a forked work-horse with its own loop and engine.
+    Workers run RQ's scheduler too: it enqueues jobs, which are scheduled for later (like
+    debounced RSS generation, see `schedule_rss_generation`).
+    """
+    async with lifespan(
+        settings,
+        start_msg_suffix="background workers (RQ)",
+        db_start_mode=DbStartMode.VERIFY,
+    ):
+        Worker(queue_names, connection=Redis(*settings.redis.connection_tuple)).work(
+            with_scheduler=True
+        )
+
+
+def run_persistent_worker(settings: AppSettings, queue_names: list[str]) -> None:
+    """
+    Non-forking RQ worker: all jobs run in this process on one long-lived event loop,
+    so async DB engine and Redis client (opened once by lifespan) are reused across jobs.
+    """
+    with persistent_event_loop() as runner:
+        worker_lifespan = lifespan(
+            settings,
+            start_msg_suffix="background workers (RQ, persistent loop)",
+            db_start_mode=DbStartMode.INIT,
+        )
+        runner.run(worker_lifespan.__aenter__())
+        try:
+            SimpleWorker(queue_names, connection=Redis(*settings.redis.connection_tuple)).work(
+                with_scheduler=True
+            )
+        finally:
+            runner.run(worker_lifespan.__aexit__(None, None, None))
+
+
+_WORKER_RUNNERS: dict[WorkerMode, Callable[[AppSettings, list[str]], None]] = {
+    WorkerMode.FORK: lambda settings, queue_names: asyncio.run(
+        run_fork_worker(settings, queue_names)
+    ),
+    WorkerMode.PERSISTENT: run_persistent_worker,
+}
+
+
+def run_worker() -> None:
     """Runs RQ worker for consuming background tasks (like downloading providers tracks)"""
     settings: AppSettings = get_app_settings()
     logging.config.dictConfig(dict(settings.log.dict_config))
@@ -24,14 +73,9 @@ async def run_worker() -> None:
 
     # Must match `PodcastApp.rq_queue_name` (settings.rq_queue_name); can be overridden by args
     queue_names = sys.argv[1:] or [settings.rq_queue_name]
-
-    async with lifespan(
-        settings,
-        start_msg_suffix="background workers (RQ)",
-        db_start_mode=DbStartMode.VERIFY,
-    ):
-        Worker(queue_names, connection=Redis(*settings.redis.connection_tuple)).work()
+    logger.info("Starting RQ worker | mode: %s | queues: %s", settings.rq_worker_mode, queue_names)
+    _WORKER_RUNNERS[settings.rq_worker_mode](settings, queue_names)
 
 
 if __name__ == "__main__":
-    asyncio.run(run_worker())
+    run_worker()